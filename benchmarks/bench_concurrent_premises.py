@@ -0,0 +1,72 @@
+"""Benchmark for the concurrent execution of DataPremises inside `DataNode.run_premises`.
+
+A fake SQL connector with injected latency replaces BigQuery, so the benchmark measures only the
+time spent waiting on the "network". With N premises and N workers the concurrent run should take
+roughly the latency of a single query.
+
+Usage:
+
+```
+python benchmarks/bench_concurrent_premises.py --premises 30 --latency 0.2
+```
+"""
+import argparse
+import time
+
+import pandas as pd
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckIsNull
+
+
+class FakeConnectorSQL(ConnectorSQL):
+    """SQL connector that sleeps for a fixed latency before returning an empty result."""
+
+    source = "BigQuery"
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+
+    def run(self, query: str, max_results: int = None):
+        time.sleep(self.latency)
+        return pd.DataFrame([0], columns=["total"])
+
+
+def build_node(premise_count: int, latency: float) -> DataNodeBigQuery:
+    data_node = DataNodeBigQuery("benchmark", "project", "dataset", "table")
+    data_node.connectors["SQLBigQuery"] = FakeConnectorSQL(latency)
+    for i in range(premise_count):
+        data_node.insert_premise(
+            f"check_null_{i}", DataPremiseSQLCheckIsNull, f"col_{i}"
+        )
+    return data_node
+
+
+def timed_run(data_node: DataNodeBigQuery, max_workers: int = None) -> float:
+    start = time.perf_counter()
+    data_node.run_premises(max_workers=max_workers)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--premises", type=int, default=30)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    data_node = build_node(args.premises, args.latency)
+
+    serial = timed_run(data_node)
+    results = [("serial", 1, serial)]
+    for workers in (2, 4, 8, 16, args.premises):
+        results.append(("threads", workers, timed_run(data_node, workers)))
+
+    print(f"\n{'mode':<8} {'workers':>7} {'seconds':>8} {'speedup':>8}")
+    for mode, workers, elapsed in results:
+        print(f"{mode:<8} {workers:>7} {elapsed:>8.3f} {serial / elapsed:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
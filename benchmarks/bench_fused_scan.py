@@ -0,0 +1,68 @@
+"""Benchmark for the fused execution of the SQL DataPremises of a DataNode.
+
+A fake SQL connector with injected latency replaces BigQuery and counts the queries it receives.
+Every validation passes, so the fused run issues a single query against the table while the
+regular run issues one query per DataPremise.
+
+Usage:
+
+```
+python benchmarks/bench_fused_scan.py --premises 10 --latency 0.2
+```
+"""
+
+import argparse
+import re
+import time
+
+import pandas as pd
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckIsNull
+
+
+class FakeConnectorSQL(ConnectorSQL):
+    """SQL connector sleeping for a fixed latency and returning zero failed rows."""
+
+    source = "BigQuery"
+
+    def __init__(self, latency: float):
+        super().__init__()
+        self.latency = latency
+        self.queries = 0
+
+    def run(self, query: str, max_results: int = None):
+        time.sleep(self.latency)
+        self.queries += 1
+        aliases = re.findall(r"AS (p\d+)", query)
+        if aliases:
+            return pd.DataFrame([[0] * len(aliases)], columns=aliases)
+        return pd.DataFrame([0], columns=["total"])
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--premises", type=int, default=10)
+    parser.add_argument("--latency", type=float, default=0.2)
+    args = parser.parse_args()
+
+    print(f"\n{'mode':<8} {'queries':>7} {'seconds':>8}")
+    for fuse in (False, True):
+        data_node = DataNodeBigQuery("benchmark", "project", "dataset", "table")
+        connector = FakeConnectorSQL(args.latency)
+        data_node.connectors["SQLBigQuery"] = connector
+        for i in range(args.premises):
+            data_node.insert_premise(
+                f"check_null_{i}", DataPremiseSQLCheckIsNull, f"col_{i}"
+            )
+
+        start = time.perf_counter()
+        data_node.run_premises(fuse=fuse)
+        elapsed = time.perf_counter() - start
+        mode = "fused" if fuse else "regular"
+        print(f"{mode:<8} {connector.queries:>7} {elapsed:>8.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -13,12 +13,13 @@ connector_manager = ConnectorManager()
 bq_connector = ConnectorSQLBigQuery(credentials_path="credentials.json")
 
 connector_manager.define_default(bq_connector) # Registering bq_connector
+connector_manager.define_default(bq_connector, max_concurrency=50, requests_per_second=10)
 connector_manager.get_default(ConnectorSQLBigQuery) # Returns bq_connector
 connector_manager.remove_default(ConnectorSQLBigQuery) # Deletes bq_connector
 ```
 """
 import inspect
-from typing import Type, Any
+from typing import Type, Any, Optional
 from pipeline_penguin.core.connector import Connector
 from pipeline_penguin.exceptions import (
     WrongTypeReference,
@@ -82,11 +83,20 @@ class ConnectorManager:
         except TypeError as e:
             raise ConnectorManagerMissingCorrectArgs(str(e))
 
-    def define_default(self, connector: Connector) -> None:
+    def define_default(
+        self,
+        connector: Connector,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+    ) -> None:
         """Method for registering a given connetor in the connector manager.
 
         Args:
             connector: The Connector to be identified/registered on the internal data strucutre.
+            max_concurrency: Maximum number of requests in flight at the same time on the
+                             Connector, shared by every caller.
+            requests_per_second: Rate at which new requests may start on the Connector, shared by
+                                 every caller.
         Returns:
             None
         Raises:
@@ -94,6 +104,8 @@ class ConnectorManager:
         """
         try:
             if self._is_connector_subclass(connector.__class__):
+                if max_concurrency or requests_per_second:
+                    connector.set_limits(max_concurrency, requests_per_second)
                 self.__default_connectors.update(
                     {self._get_dict_key(connector=connector): connector}
                 )
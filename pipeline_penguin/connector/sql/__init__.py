@@ -5,4 +5,4 @@ upon execution of the data premises.
 
 Location: pipeline_penguin/connector/sql
 """
-__all__ = ["bigquery"]
+__all__ = ["bigquery", "table_catalog"]
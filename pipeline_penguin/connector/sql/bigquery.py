@@ -12,17 +12,60 @@ Example usage:
 bq_connector = ConnectorSQLBigQuery(credentials_path="credentials.json")
 
 query_results = bq_connector.run("SELECT * FROM `my_project.my_dataset.my_table`", max_results=500)
+
+# Inside a coroutine, without blocking the event loop while the job runs
+query_results = await bq_connector.arun("SELECT * FROM `my_project.my_dataset.my_table`")
+
+# Inside a run with a deadline, the BigQuery job times out when the deadline expires
+with Deadline(seconds=60).activate():
+    query_results = bq_connector.run("SELECT * FROM `my_project.my_dataset.my_table`")
+
+# Sending values as named query parameters
+query_results = bq_connector.run(
+    "SELECT * FROM `my_project.my_dataset.my_table` WHERE value > @threshold",
+    parameters={"threshold": 10},
+)
+
+# Estimating the bytes processed by a query, without running it
+estimated_bytes = bq_connector.dry_run("SELECT * FROM `my_project.my_dataset.my_table`")
+
+# Relaunching queries running for longer than the p95 of their previous executions
+bq_connector.set_hedging(HedgingPolicy(percentile=0.95, max_extra_fraction=0.05))
+
+# Answering queries on tables that did not change from previous results
+bq_connector.set_cache(ResultCache(ttl=3600, path=".pipeline_penguin/cache"))
+
+# Identical queries made at the same time by several threads or tasks run a single job
+bq_connector.single_flight.stats()
+
+# Metadata of every table of a dataset, fetched with a single query and kept for 10 minutes
+bq_connector.catalog.ttl = 600
+bq_connector.catalog.tables("my_project", "my_dataset")
 ```
 """
 
+import asyncio
+import datetime
+import decimal
+import numbers
+import re
+import time
 from os import path
+from typing import Any, Dict, List, Optional, Union
 
 import pandas as pd
+from google.api_core import exceptions as google_exceptions
+from google.cloud import bigquery
 from google.oauth2.service_account import Credentials
 import google.auth
 
 from pipeline_penguin.core.data_node import NodeType
 from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.core.runner import Deadline, RunReport
+from pipeline_penguin.exceptions import DeadlineExceeded
+from .table_catalog import TableCatalog
+
+QueryParameter = Union[bigquery.ScalarQueryParameter, bigquery.ArrayQueryParameter]
 
 
 class ConnectorSQLBigQuery(ConnectorSQL):
@@ -31,19 +74,36 @@ class ConnectorSQLBigQuery(ConnectorSQL):
     Args:
         credentials_path: Path to a service account JSON file.
         max_results: Default maximum row count for the resulting pandas dataframe (default: 1000).
+        poll_interval: Seconds between job status checks on `arun`, and on `run` when hedging
+                       (default: 1.0).
     Attributes:
         type: Base connector type, derived from the ConnectorSQL parent class (constant: "SQL").
         source: Source type (constant: "BigQuery").
         credentials_path: Path to a service account JSON file.
         max_results: Default maximum row count for the resulting pandas dataframe (default: 1000).
+        poll_interval: Seconds between job status checks.
+        catalog: TableCatalog caching the metadata of the tables read through this connector.
     Raises:
         FileNotFoundError: If the file located in the provided credentials_path is invalid or
                            cannot be accessed.
     """
 
     source = NodeType.BIG_QUERY
+    # Views and external tables may change without a new modification time
+    CACHEABLE_TABLE_TYPES = ("TABLE", "SNAPSHOT")
+    _TABLE_REFERENCE = re.compile(r"`([^`\s]+\.[^`\s]+\.[^`\s]+)`")
+    _VOLATILE_FUNCTION = re.compile(
+        r"\b(CURRENT_TIMESTAMP|CURRENT_DATETIME|CURRENT_TIME|RAND|GENERATE_UUID)\b",
+        re.IGNORECASE,
+    )
+    _CURRENT_DATE = re.compile(r"\bCURRENT_DATE\b", re.IGNORECASE)
 
-    def __init__(self, credentials_path: str = "default", max_results: int = 1000):
+    def __init__(
+        self,
+        credentials_path: str = "default",
+        max_results: int = 1000,
+        poll_interval: float = 1.0,
+    ):
         super().__init__()
 
         print(path.isfile)
@@ -57,27 +117,529 @@ class ConnectorSQLBigQuery(ConnectorSQL):
             raise FileNotFoundError(f"{credentials_path} does not exist")
 
         self.max_results = max_results
+        self.poll_interval = poll_interval
+        self.catalog = TableCatalog(self)
+        self._client = None
+
+    def get_client(self) -> bigquery.Client:
+        """Returns the BigQuery client used for job-based executions and metadata requests,
+        creating it on first use."""
+        if self._client is None:
+            project_id = self.project_id or getattr(
+                self.credentials, "project_id", None
+            )
+            self._client = bigquery.Client(
+                credentials=self.credentials, project=project_id
+            )
+        return self._client
+
+    @staticmethod
+    def _remaining_ms() -> Optional[int]:
+        """Returns the milliseconds left on the current Deadline, or None if there is none.
+
+        Raises:
+            DeadlineExceeded: If the current Deadline already expired.
+        """
+        deadline = Deadline.current()
+        if deadline is None:
+            return None
+        if deadline.expired():
+            raise DeadlineExceeded(
+                "the deadline expired before the query was submitted"
+            )
+        return max(1, int(deadline.remaining() * 1000))
+
+    @staticmethod
+    def _timed_out(error: Exception) -> bool:
+        """Returns whether an error raised by a query is a timeout caused by the expiration of
+        the current Deadline."""
+        deadline = Deadline.current()
+        if deadline is None or not deadline.expired():
+            return False
+        # pandas-gbq's QueryTimeout moved between modules across versions, so it is matched by name
+        return isinstance(
+            error, (google_exceptions.DeadlineExceeded, TimeoutError)
+        ) or any(cls.__name__ == "QueryTimeout" for cls in type(error).__mro__)
+
+    @staticmethod
+    def _query_parameter(name: str, value: Any) -> QueryParameter:
+        """Builds a BigQuery named query parameter, inferring its type from the value."""
+        if isinstance(value, (list, tuple, set)):
+            values = list(value)
+            element_type = (
+                ConnectorSQLBigQuery._parameter_type(values[0]) if values else "STRING"
+            )
+            return bigquery.ArrayQueryParameter(name, element_type, values)
+        return bigquery.ScalarQueryParameter(
+            name, ConnectorSQLBigQuery._parameter_type(value), value
+        )
+
+    @staticmethod
+    def _parameter_type(value: Any) -> str:
+        """Returns the BigQuery type of a scalar query parameter value."""
+        if isinstance(value, bool):
+            return "BOOL"
+        if isinstance(value, numbers.Integral):
+            return "INT64"
+        if isinstance(value, decimal.Decimal):
+            return "NUMERIC"
+        if isinstance(value, numbers.Real):
+            return "FLOAT64"
+        if isinstance(value, datetime.datetime):
+            return "DATETIME" if value.tzinfo is None else "TIMESTAMP"
+        if isinstance(value, datetime.date):
+            return "DATE"
+        if isinstance(value, bytes):
+            return "BYTES"
+        return "STRING"
+
+    @classmethod
+    def query_parameters(
+        cls, parameters: Optional[Dict[str, Any]]
+    ) -> List[QueryParameter]:
+        """Converts a dictionary of values into BigQuery named query parameters.
+
+        Args:
+            parameters: Dictionary mapping each parameter name to its value.
+        Returns:
+            A `list` of BigQuery query parameters.
+        """
+        return [
+            cls._query_parameter(name, value)
+            for name, value in (parameters or {}).items()
+        ]
+
+    def _submit(
+        self,
+        client: bigquery.Client,
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> bigquery.QueryJob:
+        """Submits a query job with the given query parameters, bounded by the time left on the
+        current Deadline."""
+        config = {}
+        timeout_ms = self._remaining_ms()
+        if timeout_ms is not None:
+            config["job_timeout_ms"] = timeout_ms
+        if parameters:
+            config["query_parameters"] = self.query_parameters(parameters)
+        if not config:
+            return client.query(query)
+        return client.query(query, job_config=bigquery.QueryJobConfig(**config))
+
+    def _poll(
+        self,
+        client: bigquery.Client,
+        query: str,
+        jobs: List[bigquery.QueryJob],
+        started: float,
+        threshold: Optional[float],
+        deadline: Optional[Deadline],
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> Optional[bigquery.QueryJob]:
+        """Checks the jobs of a query once, launching a hedge if the query is straggling.
+
+        Args:
+            client: BigQuery client used for submitting the hedge.
+            query: The query being executed.
+            jobs: Jobs of the query, the first one being the original. Hedges are appended to it.
+            started: Value of `time.perf_counter()` when the original job was submitted.
+            threshold: Seconds after which the query is hedged, None for never. The hedge is
+                       skipped while the ConnectorLimiter has no free slot for it.
+            deadline: Deadline of the current run, if any.
+            parameters: Query parameters of the query.
+        Returns:
+            The first finished job, or None if every job is still running.
+        Raises:
+            DeadlineExceeded: If the deadline expired, after cancelling every job.
+        """
+        for job in jobs:
+            if job.done():
+                return job
+
+        if deadline is not None and deadline.expired():
+            self._cancel(jobs)
+            raise DeadlineExceeded("the deadline expired before the job finished")
+
+        if (
+            len(jobs) == 1
+            and threshold is not None
+            and time.perf_counter() - started > threshold
+            and self.limiter.try_acquire()
+        ):
+            # The hedge holds its own limiter slot, released by `_release_hedge`
+            try:
+                if self.hedging.allow_hedge():
+                    jobs.append(self._submit(client, query, parameters))
+            finally:
+                if len(jobs) == 1:
+                    self.limiter.release()
+        return None
+
+    def _release_hedge(self, jobs: List[bigquery.QueryJob]) -> None:
+        """Frees the limiter slot taken by the hedge of a query, if it was hedged."""
+        if len(jobs) > 1:
+            self.limiter.release()
+
+    @staticmethod
+    def _cancel(jobs: List[bigquery.QueryJob], keep=None) -> None:
+        """Cancels every given job except "keep"."""
+        for job in jobs:
+            if job is not keep:
+                job.cancel()
+
+    def _settle(
+        self,
+        query: str,
+        jobs: List[bigquery.QueryJob],
+        winner: bigquery.QueryJob,
+        started: float,
+        threshold: Optional[float],
+    ) -> None:
+        """Cancels the jobs that lost the race and records the latency and hedge outcome."""
+        self._cancel(jobs, keep=winner)
+        if self.hedging is not None:
+            hedge_won = None if len(jobs) == 1 else winner is not jobs[0]
+            self.hedging.finished(
+                query, time.perf_counter() - started, hedge_won, threshold
+            )
+
+    def table_versions(self, query: str) -> Optional[Dict[str, Any]]:
+        """Returns the version of every table read by a query, used for caching its result.
+
+        Tables are identified by their fully qualified, backtick-quoted references. Queries
+        reading views, external tables or tables with a streaming buffer, using volatile
+        functions (such as CURRENT_TIMESTAMP) or without table references cannot be cached.
+
+        Table metadata is requested through the ConnectorLimiter and, during a validation run,
+        only once per table on the `RunReport` of the run.
+
+        Args:
+            query: SQL code in BigQuery's standard format.
+        Returns:
+            A `dictionary` mapping each table to its last modification time (and "CURRENT_DATE" to
+            the current date, for queries using it), or None if the result cannot be cached.
+        """
+        tables = sorted(set(self._TABLE_REFERENCE.findall(query)))
+        if not tables or self._VOLATILE_FUNCTION.search(query):
+            return None
+
+        report = RunReport.current()
+        versions = {}
+        for table_id in tables:
+            if report is None:
+                version = self._table_version(table_id)
+            else:
+                version = report.memoize(
+                    ("table_version", table_id), self._table_version, table_id
+                )
+            if version is None:
+                return None
+            versions[table_id] = version
+
+        if self._CURRENT_DATE.search(query):
+            today = datetime.datetime.now(datetime.timezone.utc).date()
+            versions["CURRENT_DATE"] = today.isoformat()
+        return versions
+
+    def _table_version(self, table_id: str) -> Optional[str]:
+        """Returns the last modification time of a cacheable table, or None if the table cannot
+        be read or its results cannot be cached."""
+        client = self.get_client()
+        try:
+            with self.limiter.acquire():
+                table = client.get_table(table_id)
+        except Exception:
+            return None
+        if (
+            table.table_type not in self.CACHEABLE_TABLE_TYPES
+            or table.modified is None
+            or table.streaming_buffer is not None
+        ):
+            return None
+        return table.modified.isoformat()
+
+    def _cache_key(
+        self, query: str, max_results: int, parameters: Optional[Dict[str, Any]]
+    ) -> Optional[str]:
+        """Returns the ResultCache key of a query, or None without cache or if its result cannot
+        be cached."""
+        if self.cache is None:
+            return None
+        versions = self.table_versions(query)
+        if versions is None:
+            return None
+        return self.cache.key(query, parameters, versions, max_results=max_results)
+
+    def _run_jobs(
+        self, query: str, max_results: int, parameters: Optional[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """Executes a query as BigQuery jobs, hedging it according to the HedgingPolicy."""
+        client = self.get_client()
+        deadline = Deadline.current()
+        threshold = self.hedging.threshold(query)
+        self.hedging.started()
+
+        started = time.perf_counter()
+        jobs = [self._submit(client, query, parameters)]
+        poll_args = (client, query, jobs, started, threshold, deadline, parameters)
+        try:
+            winner = self._poll(*poll_args)
+            while winner is None:
+                time.sleep(self.poll_interval)
+                winner = self._poll(*poll_args)
+
+            self._settle(query, jobs, winner, started, threshold)
+            return winner.result(max_results=max_results).to_dataframe()
+        finally:
+            self._release_hedge(jobs)
 
-    def run(self, query: str, max_results: int = None):
+    def run(
+        self,
+        query: str,
+        max_results: int = None,
+        parameters: Optional[Dict[str, Any]] = None,
+    ):
         """Method for executing a query and retrieving its results.
 
+        When called inside an active `Deadline`, the BigQuery job is submitted with a timeout
+        matching the time left, so it is cancelled server-side once the deadline expires.
+
+        With a `ResultCache`, queries on tables that did not change since a previous execution
+        are answered from the cache without running a BigQuery job (see `table_versions`).
+
+        With a `HedgingPolicy` the query is executed as BigQuery jobs polled every
+        `poll_interval` seconds, and a duplicate job is launched when it straggles. The duplicate
+        takes its own slot of the ConnectorLimiter, and is not launched while none is free.
+
+        With a `SingleFlight` (the default), calls made while an identical query is being
+        executed by another thread or task wait for it and receive a copy of its result.
+
         Args:
             query: SQL code in BigQuery's standard format. Reference:
                    https://cloud.google.com/bigquery/docs/reference/standard-sql/query-syntax
             max_results: Max row count for the resulting pandas dataframe. Uses the default when
                          not provided.
+            parameters: Values of the named query parameters ("@name") used by the query. Their
+                        types are inferred from the Python values (lists become arrays).
         Returns:
             A pandas `DataFrame` object with the results of the provided query up to the
             maximum number of rows allowed.
+        Raises:
+            DeadlineExceeded: If the current Deadline expired before the query finished.
         """
         # Using default max_results
         max_results = max_results if max_results else self.max_results
 
-        df = pd.read_gbq(
-            query=query,
-            credentials=self.credentials,
-            max_results=max_results,
-            project_id=self.project_id,
+        if self.single_flight is None:
+            return self._run(query, max_results, parameters)
+        flight = self.single_flight.key(query, parameters, max_results=max_results)
+        return self.single_flight.do(flight, self._run, query, max_results, parameters)
+
+    def _run(
+        self, query: str, max_results: int, parameters: Optional[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """Answers a query from the ResultCache or executes it, caching its result."""
+        key = self._cache_key(query, max_results, parameters)
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        df = self._execute(query, max_results, parameters)
+        if key is not None:
+            self.cache.put(key, df)
+        return df
+
+    def _execute(
+        self, query: str, max_results: int, parameters: Optional[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """Executes a query on BigQuery, through `read_gbq` or as hedged jobs."""
+        with self.limiter.acquire():
+            if self.hedging is not None:
+                return self._run_jobs(query, max_results, parameters)
+
+            kwargs = {}
+            configuration = {}
+            timeout_ms = self._remaining_ms()
+            if timeout_ms is not None:
+                configuration["timeoutMs"] = timeout_ms
+            if parameters:
+                configuration["parameterMode"] = "NAMED"
+                configuration["queryParameters"] = [
+                    parameter.to_api_repr()
+                    for parameter in self.query_parameters(parameters)
+                ]
+            if configuration:
+                kwargs["configuration"] = {"query": configuration}
+
+            try:
+                df = pd.read_gbq(
+                    query=query,
+                    credentials=self.credentials,
+                    max_results=max_results,
+                    project_id=self.project_id,
+                    **kwargs,
+                )
+            except Exception as error:
+                if self._timed_out(error):
+                    raise DeadlineExceeded(
+                        "the deadline expired before the query finished"
+                    ) from error
+                raise
+
+        return df
+
+    def dry_run(self, query: str, parameters: Optional[Dict[str, Any]] = None) -> int:
+        """Estimates the bytes processed by a query through a BigQuery dry run, which is not
+        billed and does not read the cache.
+
+        Args:
+            query: SQL code in BigQuery's standard format.
+            parameters: Values of the named query parameters ("@name") used by the query.
+        Returns:
+            The number of bytes the query would process.
+        """
+        config = bigquery.QueryJobConfig(dry_run=True, use_query_cache=False)
+        if parameters:
+            config.query_parameters = self.query_parameters(parameters)
+
+        client = self.get_client()
+        with self.limiter.acquire():
+            job = client.query(query, job_config=config)
+        return int(job.total_bytes_processed or 0)
+
+    def run_script(
+        self,
+        queries: List[str],
+        max_results: int = None,
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> List[pd.DataFrame]:
+        """Executes several queries as a single BigQuery multi-statement script, saving the
+        creation and polling overhead of one job per query.
+
+        Each statement of the script runs as a child job, whose results are read back in the
+        order of the statements.
+
+        Args:
+            queries: SELECT queries in BigQuery's standard format, without trailing semicolons.
+            max_results: Max row count for each resulting pandas dataframe. Uses the default when
+                         not provided.
+            parameters: Values of the named query parameters used by the queries, which must
+                        not share parameter names with different values.
+        Returns:
+            A `list` of pandas `DataFrame` objects, one for each query.
+        Raises:
+            DeadlineExceeded: If the current Deadline expired before the script was submitted.
+            ValueError: If the script did not produce one result for each query.
+        """
+        max_results = max_results if max_results else self.max_results
+        script = "".join(f"{query};\n" for query in queries)
+
+        client = self.get_client()
+        with self.limiter.acquire():
+            job = self._submit(client, script, parameters)
+            job.result()
+            children = sorted(
+                client.list_jobs(parent_job=job.job_id), key=lambda child: child.created
+            )
+
+        if len(children) != len(queries):
+            raise ValueError(
+                f"Script returned {len(children)} results for {len(queries)} queries"
+            )
+        return [
+            child.result(max_results=max_results).to_dataframe() for child in children
+        ]
+
+    async def arun(
+        self,
+        query: str,
+        max_results: int = None,
+        parameters: Optional[Dict[str, Any]] = None,
+    ) -> pd.DataFrame:
+        """Awaitable version of `run`.
+
+        The query is submitted as a BigQuery job and its status is polled without blocking the
+        event loop, so many queries can be in flight at the same time. Cancelling the awaiting
+        task, or reaching the current `Deadline`, also cancels the BigQuery job. Straggling jobs
+        are hedged as in `run`.
+
+        Both `run` and `arun` wait for the Connector's limiter, so threads and asyncio tasks share
+        the same concurrency and rate limits, and join the same SingleFlight, so identical
+        queries made from threads and tasks at the same time execute a single job.
+
+        Args:
+            query: SQL code in BigQuery's standard format.
+            max_results: Max row count for the resulting pandas dataframe. Uses the default when
+                         not provided.
+            parameters: Values of the named query parameters ("@name") used by the query.
+        Returns:
+            A pandas `DataFrame` object with the results of the provided query up to the
+            maximum number of rows allowed.
+        Raises:
+            DeadlineExceeded: If the current Deadline expired before the job finished.
+        """
+        max_results = max_results if max_results else self.max_results
+
+        if self.single_flight is None:
+            return await self._arun(query, max_results, parameters)
+        flight = self.single_flight.key(query, parameters, max_results=max_results)
+        return await self.single_flight.ado(
+            flight, self._arun, query, max_results, parameters
         )
 
+    async def _arun(
+        self, query: str, max_results: int, parameters: Optional[Dict[str, Any]]
+    ) -> pd.DataFrame:
+        """Awaitable version of `_run`."""
+        deadline = Deadline.current()
+
+        key = None
+        if self.cache is not None:
+            key = await asyncio.to_thread(
+                self._cache_key, query, max_results, parameters
+            )
+        if key is not None:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+
+        df = await self._aexecute(query, max_results, parameters, deadline)
+        if key is not None:
+            self.cache.put(key, df)
         return df
+
+    async def _aexecute(
+        self,
+        query: str,
+        max_results: int,
+        parameters: Optional[Dict[str, Any]],
+        deadline: Optional[Deadline],
+    ) -> pd.DataFrame:
+        """Executes a query as a BigQuery job polled without blocking the event loop."""
+        client = self.get_client()
+        async with self.limiter.aacquire():
+            threshold = None
+            if self.hedging is not None:
+                threshold = self.hedging.threshold(query)
+                self.hedging.started()
+
+            started = time.perf_counter()
+            jobs = [await asyncio.to_thread(self._submit, client, query, parameters)]
+            poll_args = (client, query, jobs, started, threshold, deadline, parameters)
+            try:
+                try:
+                    winner = await asyncio.to_thread(self._poll, *poll_args)
+                    while winner is None:
+                        await asyncio.sleep(self.poll_interval)
+                        winner = await asyncio.to_thread(self._poll, *poll_args)
+                except asyncio.CancelledError:
+                    self._cancel(jobs)
+                    raise
+
+                self._settle(query, jobs, winner, started, threshold)
+                rows = await asyncio.to_thread(winner.result, max_results=max_results)
+                return await asyncio.to_thread(rows.to_dataframe)
+            finally:
+                self._release_hedge(jobs)
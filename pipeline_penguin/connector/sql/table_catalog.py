@@ -0,0 +1,322 @@
+"""Contains the `TableCatalog` and `TableMetadata` classes, which cache the metadata of BigQuery
+tables.
+
+Freshness checks, scan-size estimates and cache invalidation all depend on table metadata (row
+count, size, modification time, partitioning and schema). Fetching it one table at a time costs
+one API call per table. A TableCatalog fetches the metadata of every table of a dataset with a
+single query over its `INFORMATION_SCHEMA` views and `__TABLES__`, and keeps it for a time to
+live, so every DataNode of the dataset is answered by the same round-trip.
+
+Every `ConnectorSQLBigQuery` holds a TableCatalog, reachable from its DataNodes through
+`DataNodeBigQuery.table_metadata`.
+
+Location: pipeline_penguin/connector/sql
+
+Example usage:
+
+```python
+metadata = data_node.table_metadata()
+metadata.row_count, metadata.size_bytes, metadata.modified
+metadata.partition_column
+# "ingestion_time"
+
+bq_connector.catalog.tables("my_project", "my_dataset")
+# {"my_table": <TableMetadata>, "other_table": <TableMetadata>}
+
+# Forgetting the metadata of a dataset after writing to it
+bq_connector.catalog.invalidate("my_project", "my_dataset")
+```
+"""
+import asyncio
+import datetime
+import threading
+import time
+from typing import Any, Dict, List, Optional, Tuple
+
+import pandas as pd
+
+from pipeline_penguin.core.runner import RunReport
+
+
+class TableMetadata:
+    """Metadata of a single BigQuery table, view or external table.
+
+    Args:
+        project_id: GCP project of the table.
+        dataset_id: BigQuery dataset of the table.
+        table_id: Name of the table.
+        table_type: Type of the table, as named by the BigQuery API ("TABLE", "VIEW",
+                    "MATERIALIZED_VIEW", "EXTERNAL" or "SNAPSHOT").
+        row_count: Number of rows stored on the table.
+        size_bytes: Logical size of the table in bytes.
+        created: Creation time of the table.
+        modified: Last modification time of the table.
+        schema: Dictionary mapping each column to its data type, in column order.
+        partition_column: Column the table is partitioned by, if any.
+        clustering_columns: Columns the table is clustered by, in clustering order.
+    Attributes:
+        project_id: GCP project of the table.
+        dataset_id: BigQuery dataset of the table.
+        table_id: Name of the table.
+        table_type: Type of the table.
+        row_count: Number of rows stored on the table.
+        size_bytes: Logical size of the table in bytes.
+        created: Creation time of the table.
+        modified: Last modification time of the table.
+        schema: Dictionary mapping each column to its data type.
+        partition_column: Column the table is partitioned by.
+        clustering_columns: Columns the table is clustered by.
+    """
+
+    def __init__(
+        self,
+        project_id: str,
+        dataset_id: str,
+        table_id: str,
+        table_type: str,
+        row_count: Optional[int] = None,
+        size_bytes: Optional[int] = None,
+        created: Optional[datetime.datetime] = None,
+        modified: Optional[datetime.datetime] = None,
+        schema: Optional[Dict[str, str]] = None,
+        partition_column: Optional[str] = None,
+        clustering_columns: Optional[List[str]] = None,
+    ):
+        self.project_id = project_id
+        self.dataset_id = dataset_id
+        self.table_id = table_id
+        self.table_type = table_type
+        self.row_count = row_count
+        self.size_bytes = size_bytes
+        self.created = created
+        self.modified = modified
+        self.schema = schema or {}
+        self.partition_column = partition_column
+        self.clustering_columns = clustering_columns or []
+
+    def to_serializeble_dict(self) -> dict:
+        """Returns a dictionary representation of the metadata using only built-in data types.
+
+        Returns:
+            dict -> Dictionary containing the attributes of this TableMetadata.
+        """
+        return {
+            "project_id": self.project_id,
+            "dataset_id": self.dataset_id,
+            "table_id": self.table_id,
+            "table_type": self.table_type,
+            "row_count": self.row_count,
+            "size_bytes": self.size_bytes,
+            "created": self.created.isoformat() if self.created else None,
+            "modified": self.modified.isoformat() if self.modified else None,
+            "schema": dict(self.schema),
+            "partition_column": self.partition_column,
+            "clustering_columns": list(self.clustering_columns),
+        }
+
+
+class TableCatalog:
+    """Cache of the metadata of BigQuery tables, fetched one dataset at a time.
+
+    Concurrent lookups on a dataset whose metadata is not cached wait for a single query.
+
+    Args:
+        connector: ConnectorSQLBigQuery used for querying the metadata.
+        ttl: Seconds the metadata of a dataset stays valid (default: 300).
+    Attributes:
+        connector: ConnectorSQLBigQuery used for querying the metadata.
+        ttl: Seconds the metadata of a dataset stays valid.
+    Raises:
+        ValueError: If "ttl" is negative.
+    """
+
+    # Names used by INFORMATION_SCHEMA.TABLES which differ from the BigQuery API
+    TABLE_TYPES = {
+        "BASE TABLE": "TABLE",
+        "CLONE": "TABLE",
+        "MATERIALIZED VIEW": "MATERIALIZED_VIEW",
+    }
+
+    def __init__(
+        self,
+        connector: "pipeline_penguin.connector.sql.bigquery.ConnectorSQLBigQuery",
+        ttl: float = 300.0,
+    ):
+        if ttl < 0:
+            raise ValueError("ttl must not be negative")
+        self.connector = connector
+        self.ttl = ttl
+        self._datasets: Dict[Tuple[str, str], Tuple[float, dict]] = {}
+        self._locks: Dict[Tuple[str, str], threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        """TableCatalogs are shared by the Connectors using them."""
+        return self
+
+    @staticmethod
+    def query(project_id: str, dataset_id: str) -> str:
+        """Builds the SQL query returning the metadata of every table of a dataset, with one row
+        for each column.
+
+        Args:
+            project_id: GCP project of the dataset.
+            dataset_id: BigQuery dataset.
+        Returns:
+            A `string` with the SQL query.
+        """
+        dataset = f"`{project_id}.{dataset_id}"
+        return (
+            "SELECT t.table_name, t.table_type, s.row_count, s.size_bytes, "
+            "TIMESTAMP_MILLIS(s.creation_time) AS created, "
+            "TIMESTAMP_MILLIS(s.last_modified_time) AS modified, "
+            "c.column_name, c.data_type, c.is_partitioning_column, "
+            "c.clustering_ordinal_position "
+            f"FROM {dataset}.INFORMATION_SCHEMA.TABLES` AS t "
+            f"LEFT JOIN {dataset}.__TABLES__` AS s ON s.table_id = t.table_name "
+            f"LEFT JOIN {dataset}.INFORMATION_SCHEMA.COLUMNS` AS c "
+            "ON c.table_name = t.table_name "
+            "ORDER BY t.table_name, c.ordinal_position"
+        )
+
+    def get(
+        self, project_id: str, dataset_id: str, table_id: str
+    ) -> Optional[TableMetadata]:
+        """Returns the metadata of a table, fetching the metadata of its dataset if it is not
+        cached or expired.
+
+        Args:
+            project_id: GCP project of the table.
+            dataset_id: BigQuery dataset of the table.
+            table_id: Name of the table.
+        Returns:
+            The `TableMetadata` of the table, or None if the dataset has no such table.
+        """
+        return self.tables(project_id, dataset_id).get(table_id)
+
+    async def aget(
+        self, project_id: str, dataset_id: str, table_id: str
+    ) -> Optional[TableMetadata]:
+        """Awaitable version of `get`, querying the metadata on a worker thread."""
+        return await asyncio.to_thread(self.get, project_id, dataset_id, table_id)
+
+    def tables(self, project_id: str, dataset_id: str) -> Dict[str, TableMetadata]:
+        """Returns the metadata of every table of a dataset, fetching it if it is not cached or
+        expired.
+
+        Args:
+            project_id: GCP project of the dataset.
+            dataset_id: BigQuery dataset.
+        Returns:
+            A `dictionary` mapping each table name to its `TableMetadata`.
+        """
+        key = (project_id, dataset_id)
+        tables = self._cached(key)
+        if tables is not None:
+            return dict(tables)
+
+        with self._lock:
+            lock = self._locks.setdefault(key, threading.Lock())
+        with lock:
+            # Another thread may have fetched the dataset while this one waited
+            tables = self._cached(key)
+            if tables is None:
+                tables = self._fetch(project_id, dataset_id)
+                with self._lock:
+                    self._datasets[key] = (time.monotonic(), tables)
+        return dict(tables)
+
+    def invalidate(
+        self, project_id: Optional[str] = None, dataset_id: Optional[str] = None
+    ) -> None:
+        """Forgets the cached metadata of a dataset, of every dataset of a project, or of every
+        dataset when no argument is given.
+
+        Args:
+            project_id: GCP project of the datasets.
+            dataset_id: BigQuery dataset.
+        """
+        with self._lock:
+            for key in list(self._datasets):
+                if project_id is not None and key[0] != project_id:
+                    continue
+                if dataset_id is not None and key[1] != dataset_id:
+                    continue
+                del self._datasets[key]
+
+    def _cached(self, key: Tuple[str, str]) -> Optional[Dict[str, TableMetadata]]:
+        """Returns the cached metadata of a dataset, or None if it is missing or expired."""
+        with self._lock:
+            entry = self._datasets.get(key)
+        if entry is None or time.monotonic() - entry[0] > self.ttl:
+            return None
+        return entry[1]
+
+    def _fetch(self, project_id: str, dataset_id: str) -> Dict[str, TableMetadata]:
+        """Queries the metadata of every table of a dataset."""
+        client = self.connector.get_client()
+        with self.connector.limiter.acquire():
+            job = client.query(self.query(project_id, dataset_id))
+            data_frame = job.result().to_dataframe()
+
+        report = RunReport.current()
+        if report is not None:
+            report.increment("metadata_queries")
+        return self.parse(project_id, dataset_id, data_frame)
+
+    @classmethod
+    def parse(
+        cls, project_id: str, dataset_id: str, data_frame: pd.DataFrame
+    ) -> Dict[str, TableMetadata]:
+        """Builds the TableMetadata of every table from the result of `query`.
+
+        Args:
+            project_id: GCP project of the dataset.
+            dataset_id: BigQuery dataset.
+            data_frame: Result of `query`, with one row for each column of each table.
+        Returns:
+            A `dictionary` mapping each table name to its `TableMetadata`.
+        """
+        tables = {}
+        clustering = {}
+        for row in data_frame.to_dict("records"):
+            row = {name: _python_value(value) for name, value in row.items()}
+            name = row["table_name"]
+            metadata = tables.get(name)
+            if metadata is None:
+                metadata = tables[name] = TableMetadata(
+                    project_id,
+                    dataset_id,
+                    name,
+                    cls.TABLE_TYPES.get(row["table_type"], row["table_type"]),
+                    row_count=row.get("row_count"),
+                    size_bytes=row.get("size_bytes"),
+                    created=row.get("created"),
+                    modified=row.get("modified"),
+                )
+                clustering[name] = []
+
+            column = row.get("column_name")
+            if column is None:
+                continue
+            metadata.schema[column] = row.get("data_type")
+            if row.get("is_partitioning_column") == "YES":
+                metadata.partition_column = column
+            if row.get("clustering_ordinal_position") is not None:
+                clustering[name].append((row["clustering_ordinal_position"], column))
+
+        for name, columns in clustering.items():
+            tables[name].clustering_columns = [column for _, column in sorted(columns)]
+        return tables
+
+
+def _python_value(value: Any) -> Any:
+    """Converts a value read by pandas into a built-in Python value (None for nulls)."""
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    if isinstance(value, pd.Timestamp):
+        return value.to_pydatetime()
+    if hasattr(value, "item"):
+        # numpy scalars
+        return value.item()
+    return value
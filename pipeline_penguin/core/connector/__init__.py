@@ -10,3 +10,7 @@ Location: pipeline_penguin/core/connector/
 """
 from .connector import Connector
 from .sql import ConnectorSQL
+from .limiter import ConnectorLimiter
+from .hedging import HedgingPolicy
+from .result_cache import ResultCache
+from .single_flight import SingleFlight
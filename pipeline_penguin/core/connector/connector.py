@@ -23,14 +23,89 @@ class ConnectorSQL(Connector):
         returns results
 ```
 """
+import asyncio
+from typing import Optional
+
+from .hedging import HedgingPolicy
+from .limiter import ConnectorLimiter
+from .result_cache import ResultCache
+from .single_flight import SingleFlight
 
 
 class Connector:
-    """Abstract parent constructor for building other Connector classes."""
+    """Abstract parent constructor for building other Connector classes.
+
+    Attributes:
+        limiter: ConnectorLimiter throttling the requests made by this Connector. Unlimited by
+                 default, see `set_limits`.
+        hedging: HedgingPolicy for relaunching straggling requests, on Connectors supporting it.
+                 Disabled by default, see `set_hedging`.
+        cache: ResultCache answering repeated requests, on Connectors supporting it. Disabled
+               by default, see `set_cache`.
+        single_flight: SingleFlight coalescing identical requests made at the same time, on
+                       Connectors supporting it. Enabled by default, see `set_single_flight`.
+    """
 
     def __init__(self):
-        pass
+        self.limiter = ConnectorLimiter()
+        self.hedging: Optional[HedgingPolicy] = None
+        self.cache: Optional[ResultCache] = None
+        self.single_flight: Optional[SingleFlight] = SingleFlight()
+
+    def __deepcopy__(self, memo):
+        """Connectors hold shared resources (clients and limits), so copies of a DataNode keep
+        using the same Connector instances."""
+        return self
+
+    def set_limits(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+    ) -> None:
+        """Defines the limits shared by every caller of this Connector, replacing the current
+        ones.
+
+        Args:
+            max_concurrency: Maximum number of requests in flight at the same time.
+            requests_per_second: Rate at which new requests may start.
+            burst: Maximum number of requests that may start at once after an idle period.
+        """
+        self.limiter = ConnectorLimiter(max_concurrency, requests_per_second, burst)
+
+    def set_hedging(self, policy: Optional[HedgingPolicy]) -> None:
+        """Defines the HedgingPolicy of this Connector, or disables hedging when None is given.
+
+        Args:
+            policy: HedgingPolicy deciding when a straggling request is duplicated.
+        """
+        self.hedging = policy
+
+    def set_cache(self, cache: Optional[ResultCache]) -> None:
+        """Defines the ResultCache of this Connector, or disables caching when None is given.
+
+        Args:
+            cache: ResultCache storing the results of the requests.
+        """
+        self.cache = cache
+
+    def set_single_flight(self, single_flight: Optional[SingleFlight]) -> None:
+        """Defines the SingleFlight of this Connector, or disables coalescing when None is
+        given.
+
+        Args:
+            single_flight: SingleFlight coalescing identical requests made at the same time.
+        """
+        self.single_flight = single_flight
 
     def run(self):
         """Method for extracting data from the related data source."""
         pass
+
+    async def arun(self, *args, **kwargs):
+        """Awaitable version of `run`.
+
+        By default the synchronous `run` method is executed on a worker thread, Connectors with a
+        native asynchronous client should override it.
+        """
+        return await asyncio.to_thread(self.run, *args, **kwargs)
@@ -0,0 +1,169 @@
+"""Core connector module, contains the `HedgingPolicy` class.
+
+A HedgingPolicy decides when a Connector should launch a duplicate ("hedge") of a straggling
+query. Each query keeps its own latency history: once a query runs for longer than a percentile of
+its past executions (p95 by default), a second job is started and the first one to finish wins,
+while the other is cancelled. The fraction of extra jobs is capped, so hedging cannot multiply the
+cost of a run.
+
+The history only stores latencies of original jobs. When a hedge finishes first, the original job
+is cancelled before its latency is known, so the time it had been running for is recorded instead:
+a censored latency, at least the hedging threshold, which keeps the slow tail in the percentile
+rather than teaching it the latency of the faster duplicate.
+
+Hedge counts and outcomes are available on `stats()` and, during a validation run, on the
+`RunReport` of the run.
+
+Location: pipeline_penguin/core/connector/
+
+Example usage:
+
+```python
+connector.set_hedging(HedgingPolicy(percentile=0.95, max_extra_fraction=0.05))
+
+connector.hedging.stats()
+# {"queries": 200, "hedged": 6, "hedge_wins": 5, "hedge_losses": 1}
+```
+"""
+import hashlib
+import math
+import threading
+from collections import deque
+from typing import Deque, Dict, Optional
+
+from pipeline_penguin.core.runner.run_report import RunReport
+
+
+class HedgingPolicy:
+    """Policy for launching duplicates of straggling queries.
+
+    Args:
+        percentile: Percentile of the query's latency history after which a hedge is launched
+                    (default: 0.95).
+        max_extra_fraction: Maximum number of hedges as a fraction of the queries executed
+                            (default: 0.1).
+        min_samples: Executions of a query required before it can be hedged (default: 5).
+        window: Number of latest executions kept for each query (default: 100).
+    Attributes:
+        percentile: Percentile of the latency history after which a hedge is launched.
+        max_extra_fraction: Maximum number of hedges as a fraction of the queries executed.
+        min_samples: Executions of a query required before it can be hedged.
+    Raises:
+        ValueError: If "percentile" is not in the (0, 1] interval or "max_extra_fraction" is
+                    negative.
+    """
+
+    def __init__(
+        self,
+        percentile: float = 0.95,
+        max_extra_fraction: float = 0.1,
+        min_samples: int = 5,
+        window: int = 100,
+    ):
+        if not 0 < percentile <= 1:
+            raise ValueError("percentile must be in the (0, 1] interval")
+        if max_extra_fraction < 0:
+            raise ValueError("max_extra_fraction must not be negative")
+
+        self.percentile = percentile
+        self.max_extra_fraction = max_extra_fraction
+        self.min_samples = min_samples
+        self.window = window
+        self._latencies: Dict[str, Deque[float]] = {}
+        self._counts = {"queries": 0, "hedged": 0, "hedge_wins": 0, "hedge_losses": 0}
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        """HedgingPolicies are shared by the Connectors using them."""
+        return self
+
+    @staticmethod
+    def _key(query: str) -> str:
+        """Returns the key of a query on the latency history."""
+        return hashlib.sha1(query.encode("utf-8")).hexdigest()
+
+    def threshold(self, query: str) -> Optional[float]:
+        """Returns after how many seconds a query should be hedged.
+
+        Args:
+            query: The query about to be executed.
+        Returns:
+            The latency percentile of the query, or None if its history is too short.
+        """
+        with self._lock:
+            latencies = sorted(self._latencies.get(self._key(query), ()))
+        if len(latencies) < max(1, self.min_samples):
+            return None
+        return latencies[math.ceil(self.percentile * len(latencies)) - 1]
+
+    def started(self) -> None:
+        """Counts a new query (not a hedge) executed under this policy."""
+        self._increment("queries")
+
+    def allow_hedge(self) -> bool:
+        """Reserves a hedge if the cap on extra jobs allows it.
+
+        Returns:
+            Whether a hedge may be launched.
+        """
+        with self._lock:
+            allowed = (
+                self._counts["hedged"] + 1
+                <= self.max_extra_fraction * self._counts["queries"]
+            )
+            if allowed:
+                self._counts["hedged"] += 1
+        if allowed:
+            self._report("hedged_queries")
+        return allowed
+
+    def finished(
+        self,
+        query: str,
+        seconds: float,
+        hedge_won: Optional[bool],
+        threshold: Optional[float] = None,
+    ) -> None:
+        """Records the latency of the original job of a query and the outcome of its hedge, if
+        any. When the hedge won the original job did not finish, so its latency is only known to
+        be at least "seconds" and the hedging threshold, and that lower bound is recorded.
+
+        Args:
+            query: The executed query.
+            seconds: Time from the submission of the original job until the first result was
+                     available.
+            hedge_won: Whether the hedge finished first, or None when it was not hedged.
+            threshold: Seconds after which the query was hedged, if any.
+        """
+        if hedge_won is True and threshold is not None:
+            seconds = max(seconds, threshold)
+        with self._lock:
+            latencies = self._latencies.setdefault(
+                self._key(query), deque(maxlen=self.window)
+            )
+            latencies.append(seconds)
+
+        if hedge_won is True:
+            self._increment("hedge_wins")
+        elif hedge_won is False:
+            self._increment("hedge_losses")
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many queries were executed and hedged, and how many hedges finished
+        first (wins) or last (losses)."""
+        with self._lock:
+            return dict(self._counts)
+
+    def _increment(self, name: str) -> None:
+        """Increments one of the counters, also reporting it on the current RunReport."""
+        with self._lock:
+            self._counts[name] += 1
+        if name != "queries":
+            self._report(name)
+
+    @staticmethod
+    def _report(name: str) -> None:
+        """Increments a metric on the RunReport of the current run, if any."""
+        report = RunReport.current()
+        if report is not None:
+            report.increment(name)
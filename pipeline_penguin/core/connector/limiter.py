@@ -0,0 +1,186 @@
+"""Contains the `ConnectorLimiter` class, used for throttling the requests made by a Connector.
+
+A ConnectorLimiter combines a cap on the number of concurrent requests with a token bucket
+limiting the number of requests started per second. The same limiter is shared by every caller of
+a Connector, either threads (`acquire`) or asyncio tasks (`aacquire`), so a parallel run can use
+the whole quota of a data source without exceeding it.
+
+The time spent by callers waiting for the limiter is recorded and exposed by `stats`.
+
+Location: pipeline_penguin/core/connector/
+
+Example usage:
+
+```python
+limiter = ConnectorLimiter(max_concurrency=50, requests_per_second=10)
+
+with limiter.acquire():
+    # ... request executed from a thread ...
+
+async with limiter.aacquire():
+    # ... request executed from a coroutine ...
+
+if limiter.try_acquire():
+    # ... optional request, skipped when the limits are reached ...
+    limiter.release()
+
+limiter.stats()  # {"acquired": 3, "in_flight": 0, "total_wait_seconds": 0.0, ...}
+```
+"""
+import asyncio
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from typing import Optional
+
+
+class ConnectorLimiter:
+    """Concurrency cap and token bucket shared by every caller of a Connector.
+
+    Args:
+        max_concurrency: Maximum number of requests in flight at the same time. Unbounded when not
+                         provided.
+        requests_per_second: Rate at which new requests may start. Unbounded when not provided.
+        burst: Maximum number of requests that may start at once after an idle period (default:
+               requests_per_second, at least 1).
+        poll_interval: Seconds between checks while an asyncio task waits for a free slot.
+    Attributes:
+        max_concurrency: Maximum number of requests in flight at the same time.
+        requests_per_second: Rate at which new requests may start.
+        burst: Capacity of the token bucket.
+    Raises:
+        ValueError: If any of the limits is not a positive number.
+    """
+
+    def __init__(
+        self,
+        max_concurrency: Optional[int] = None,
+        requests_per_second: Optional[float] = None,
+        burst: Optional[int] = None,
+        poll_interval: float = 0.01,
+    ):
+        for name, value in [
+            ("max_concurrency", max_concurrency),
+            ("requests_per_second", requests_per_second),
+            ("burst", burst),
+        ]:
+            if value is not None and value <= 0:
+                raise ValueError(f"{name} must be greater than 0")
+
+        self.max_concurrency = max_concurrency
+        self.requests_per_second = requests_per_second
+        self.burst = burst or max(1, int(requests_per_second or 1))
+        self.poll_interval = poll_interval
+
+        self._condition = threading.Condition()
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._in_flight = 0
+        self._acquired = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+
+    def __deepcopy__(self, memo):
+        """Limits are shared by every copy of the objects holding this limiter."""
+        return self
+
+    def _try_acquire(self) -> Optional[float]:
+        """Takes a slot and a token if both are available. Must be called holding the condition.
+
+        Returns:
+            `0` when acquired, the seconds until the next token otherwise, or `None` when waiting
+            for a slot to be released.
+        """
+        if self.max_concurrency and self._in_flight >= self.max_concurrency:
+            return None
+
+        if self.requests_per_second:
+            now = time.monotonic()
+            elapsed = now - self._last_refill
+            self._tokens = min(
+                self.burst, self._tokens + elapsed * self.requests_per_second
+            )
+            self._last_refill = now
+            if self._tokens < 1:
+                return (1 - self._tokens) / self.requests_per_second
+            self._tokens -= 1
+
+        self._in_flight += 1
+        return 0
+
+    def _record_wait(self, waited: float) -> None:
+        """Updates the wait metrics. Must be called holding the condition."""
+        self._acquired += 1
+        self._total_wait += waited
+        self._max_wait = max(self._max_wait, waited)
+
+    def release(self) -> None:
+        """Frees the slot taken by a finished request."""
+        with self._condition:
+            self._in_flight -= 1
+            self._condition.notify_all()
+
+    def try_acquire(self) -> bool:
+        """Takes a slot without waiting, for optional requests which are skipped when the limits
+        are reached. The slot must be freed with `release` once the request finishes.
+
+        Returns:
+            Whether the request is allowed to start.
+        """
+        with self._condition:
+            acquired = self._try_acquire() == 0
+            if acquired:
+                self._record_wait(0.0)
+        return acquired
+
+    @contextmanager
+    def acquire(self):
+        """Context manager blocking the current thread until the request is allowed to start."""
+        start = time.monotonic()
+        with self._condition:
+            wait = self._try_acquire()
+            while wait != 0:
+                self._condition.wait(wait)
+                wait = self._try_acquire()
+            self._record_wait(time.monotonic() - start)
+
+        try:
+            yield
+        finally:
+            self.release()
+
+    @asynccontextmanager
+    async def aacquire(self):
+        """Asynchronous context manager waiting, without blocking the event loop, until the
+        request is allowed to start."""
+        start = time.monotonic()
+        while True:
+            with self._condition:
+                wait = self._try_acquire()
+                if wait == 0:
+                    self._record_wait(time.monotonic() - start)
+                    break
+            await asyncio.sleep(wait if wait is not None else self.poll_interval)
+
+        try:
+            yield
+        finally:
+            self.release()
+
+    def stats(self) -> dict:
+        """Returns the metrics of this limiter.
+
+        Returns:
+            A `dictionary` with the number of acquired and in flight requests, and the total,
+            maximum and average time spent waiting for the limiter, in seconds.
+        """
+        with self._condition:
+            return {
+                "acquired": self._acquired,
+                "in_flight": self._in_flight,
+                "total_wait_seconds": self._total_wait,
+                "max_wait_seconds": self._max_wait,
+                "avg_wait_seconds": (
+                    self._total_wait / self._acquired if self._acquired else 0.0
+                ),
+            }
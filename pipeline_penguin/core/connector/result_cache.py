@@ -0,0 +1,264 @@
+"""Core connector module, contains the `ResultCache` class.
+
+A ResultCache stores the results of the queries executed by a Connector, so validation suites
+re-run on a schedule do not execute again the queries of tables that did not change since the
+last run. Results are keyed by the query, its parameters and the versions (last modification
+times) of the tables it reads, so any write to a table invalidates every result read from it.
+
+Entries are kept on an in-memory LRU and, optionally, on a local directory shared by consecutive
+processes. Both stores are bounded in number of entries and entries expire after a time to live.
+The directory holds JSON files (pandas' "table" orientation, which keeps the column types), so
+reading it never executes code. Results whose values do not survive the JSON conversion unchanged
+(i.e. DECIMAL or DATE columns) are only kept in memory.
+
+Hit and miss counts are available on `stats()` and, during a validation run, on the `RunReport`
+of the run as "cache_hits" and "cache_misses".
+
+Location: pipeline_penguin/core/connector/
+
+Example usage:
+
+```python
+connector.set_cache(ResultCache(max_entries=512, ttl=3600, path=".pipeline_penguin/cache"))
+
+connector.cache.stats()
+# {"hits": 180, "misses": 20}
+```
+"""
+import hashlib
+import io
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
+from pipeline_penguin.core.runner.run_report import RunReport
+
+
+class ResultCache:
+    """Size-bounded store of query results with a time to live.
+
+    Args:
+        max_entries: Maximum number of results kept in memory (default: 256).
+        ttl: Seconds a result stays valid. Results never expire when not provided.
+        path: Directory where results are also persisted. Kept in memory only when not provided.
+        max_disk_entries: Maximum number of results kept on the directory (default: 4096).
+    Attributes:
+        max_entries: Maximum number of results kept in memory.
+        ttl: Seconds a result stays valid.
+        path: Directory where results are persisted.
+        max_disk_entries: Maximum number of results kept on the directory.
+    Raises:
+        ValueError: If a maximum number of entries is lower than 1 or "ttl" is not positive.
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        ttl: Optional[float] = None,
+        path: Optional[str] = None,
+        max_disk_entries: int = 4096,
+    ):
+        if max_entries < 1 or max_disk_entries < 1:
+            raise ValueError("the maximum number of entries must be greater than 0")
+        if ttl is not None and ttl <= 0:
+            raise ValueError("ttl must be greater than 0")
+
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.max_disk_entries = max_disk_entries
+        self._entries: "OrderedDict[str, Tuple[float, pd.DataFrame]]" = OrderedDict()
+        self._counts = {"hits": 0, "misses": 0}
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        """ResultCaches are shared by the Connectors using them."""
+        return self
+
+    @staticmethod
+    def key(
+        query: str,
+        parameters: Optional[Dict[str, Any]] = None,
+        versions: Optional[Dict[str, Any]] = None,
+        **options,
+    ) -> str:
+        """Builds the cache key of a query.
+
+        Args:
+            query: The query to be executed.
+            parameters: Values of its query parameters.
+            versions: Dictionary mapping each table read by the query to its version (i.e. its
+                      last modification time).
+            **options: Other arguments changing the result, such as a row limit.
+        Returns:
+            A `str` with the hash of every argument.
+        """
+        content = json.dumps(
+            {
+                "query": query,
+                "parameters": parameters or {},
+                "versions": versions or {},
+                "options": options,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Optional[pd.DataFrame]:
+        """Returns a copy of the cached result of a key, counting a hit or a miss.
+
+        Args:
+            key: Key built by `key`.
+        Returns:
+            A pandas `DataFrame`, or None if there is no valid result for the key.
+        """
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and self._expired(entry[0]):
+                del self._entries[key]
+                entry = None
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+        if entry is None:
+            entry = self._load(key)
+            if entry is not None:
+                self._remember(key, entry)
+
+        self._count("hits" if entry is not None else "misses")
+        return None if entry is None else entry[1].copy()
+
+    def put(self, key: str, data_frame: pd.DataFrame) -> None:
+        """Stores the result of a key, evicting the least recently used results if needed.
+
+        Args:
+            key: Key built by `key`.
+            data_frame: Result of the query.
+        """
+        entry = (time.time(), data_frame.copy())
+        self._remember(key, entry)
+        self._dump(key, entry)
+
+    def clear(self) -> None:
+        """Removes every stored result, in memory and on disk."""
+        with self._lock:
+            self._entries.clear()
+        for file_path in self._disk_files():
+            self._remove(file_path)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many lookups found (hits) or did not find (misses) a valid result."""
+        with self._lock:
+            return dict(self._counts)
+
+    def _expired(self, stored_at: float) -> bool:
+        """Returns whether an entry stored at the given time is past its time to live."""
+        return self.ttl is not None and time.time() - stored_at > self.ttl
+
+    def _remember(self, key: str, entry: Tuple[float, pd.DataFrame]) -> None:
+        """Adds an entry to the in-memory LRU."""
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def _count(self, name: str) -> None:
+        """Increments a counter, also reporting it on the current RunReport."""
+        with self._lock:
+            self._counts[name] += 1
+        report = RunReport.current()
+        if report is not None:
+            report.increment(f"cache_{name}")
+
+    def _file_path(self, key: str) -> str:
+        """Returns the file storing the result of a key on disk."""
+        return os.path.join(self.path, f"{key}.json")
+
+    def _disk_files(self) -> list:
+        """Returns the result files on the cache directory."""
+        if not self.path or not os.path.isdir(self.path):
+            return []
+        return [
+            entry.path
+            for entry in os.scandir(self.path)
+            if entry.is_file() and entry.name.endswith(".json")
+        ]
+
+    def _load(self, key: str) -> Optional[Tuple[float, pd.DataFrame]]:
+        """Reads the entry of a key from disk, removing it if it expired or is unreadable."""
+        if not self.path:
+            return None
+        file_path = self._file_path(key)
+        try:
+            with open(file_path) as result_file:
+                content = json.load(result_file)
+            entry = (float(content["stored_at"]), self._parse(content["result"]))
+        except FileNotFoundError:
+            return None
+        except Exception:
+            self._remove(file_path)
+            return None
+
+        if self._expired(entry[0]):
+            self._remove(file_path)
+            return None
+        try:
+            # Keeps recently read files away from eviction
+            os.utime(file_path)
+        except OSError:
+            pass
+        return entry
+
+    def _dump(self, key: str, entry: Tuple[float, pd.DataFrame]) -> None:
+        """Writes an entry on disk, evicting the oldest files beyond `max_disk_entries`. Results
+        which cannot be converted to JSON without changes are not written."""
+        if not self.path:
+            return
+        stored_at, data_frame = entry
+        try:
+            result = data_frame.to_json(orient="table", date_unit="us")
+            if not self._parse(result).equals(data_frame):
+                return
+        except Exception:
+            return
+        os.makedirs(self.path, exist_ok=True)
+
+        file_path = self._file_path(key)
+        temporary_path = f"{file_path}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w") as result_file:
+            json.dump({"stored_at": stored_at, "result": result}, result_file)
+        os.replace(temporary_path, file_path)
+
+        files = self._disk_files()
+        if len(files) > self.max_disk_entries:
+            files.sort(key=self._modified_time)
+            for old_file in files[: len(files) - self.max_disk_entries]:
+                self._remove(old_file)
+
+    @staticmethod
+    def _parse(result: str) -> pd.DataFrame:
+        """Reads a result written by `_dump`."""
+        return pd.read_json(io.StringIO(result), orient="table")
+
+    @staticmethod
+    def _modified_time(file_path: str) -> float:
+        """Returns the modification time of a file, or 0 if it was already removed."""
+        try:
+            return os.path.getmtime(file_path)
+        except OSError:
+            return 0.0
+
+    @staticmethod
+    def _remove(file_path: str) -> None:
+        """Removes a file, ignoring files already removed."""
+        try:
+            os.remove(file_path)
+        except OSError:
+            pass
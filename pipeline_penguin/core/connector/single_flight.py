@@ -0,0 +1,202 @@
+"""Core connector module, contains the `SingleFlight` class.
+
+Copied DataNodes, or pipelines sharing a table, often make a Connector execute the same query
+from several threads or asyncio tasks at the same moment. With a SingleFlight, the first caller
+of a query executes it and every identical call arriving while it is in flight waits for that
+execution and receives its result instead of starting its own job.
+
+Queries are compared in their canonical form (see `canonical_query`), together with their query
+parameters and options such as the row limit. Callers sharing a flight receive a copy of
+DataFrame results, so they do not see each other's changes to it. A flight whose leader is
+cancelled, or reaches its own `Deadline`, is abandoned and its waiters execute the query again.
+
+Coalesced call counts are available on `stats()` and, during a validation run, on the
+`RunReport` of the run as "coalesced_queries".
+
+Location: pipeline_penguin/core/connector/
+
+Example usage:
+
+```python
+# Both threads execute a single BigQuery job
+with ThreadPoolExecutor() as executor:
+    results = list(executor.map(bq_connector.run, [query, query]))
+
+bq_connector.single_flight.stats()
+# {"executed": 120, "coalesced": 80}
+```
+"""
+
+import asyncio
+import hashlib
+import json
+import threading
+from concurrent.futures import Future, TimeoutError
+from typing import Any, Callable, Dict, Optional
+
+import pandas as pd
+
+from pipeline_penguin.core.runner.deadline import Deadline
+from pipeline_penguin.core.runner.deduplicated_query import canonical_query
+from pipeline_penguin.core.runner.run_report import RunReport
+from pipeline_penguin.exceptions import DeadlineExceeded
+
+
+class _Abandoned(Exception):
+    """Result of a flight whose leader stopped without an outcome valid for its waiters."""
+
+    pass
+
+
+class SingleFlight:
+    """Coalesces concurrent executions of identical queries, from threads and asyncio tasks."""
+
+    def __init__(self):
+        self._flights: Dict[str, Future] = {}
+        self._counts = {"executed": 0, "coalesced": 0}
+        self._lock = threading.Lock()
+
+    def __deepcopy__(self, memo):
+        """SingleFlights are shared by the Connectors using them."""
+        return self
+
+    @staticmethod
+    def key(query: str, parameters: Optional[Dict[str, Any]] = None, **options) -> str:
+        """Builds the flight key of a query.
+
+        Args:
+            query: The query to be executed.
+            parameters: Values of its query parameters.
+            **options: Other arguments changing the result, such as a row limit.
+        Returns:
+            A `str` with the hash of the canonical query and every argument.
+        """
+        content = json.dumps(
+            {
+                "query": canonical_query(query),
+                "parameters": parameters or {},
+                "options": options,
+            },
+            sort_keys=True,
+            default=repr,
+        )
+        return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+    def do(self, key: str, function: Callable, *args) -> Any:
+        """Executes `function(*args)`, unless a call with the same key is in flight, in which
+        case its result is awaited instead.
+
+        Args:
+            key: Key built by `key`.
+            function: Function executing the query.
+            *args: Arguments of the function.
+        Returns:
+            The result of the function, or a copy of it for coalesced calls.
+        Raises:
+            DeadlineExceeded: If the current Deadline expires while waiting for the flight.
+            Exception: Any exception raised by the function, on every caller of the flight.
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = function(*args)
+                except BaseException as error:
+                    self._land(key, future, error=self._outcome(error))
+                    raise
+                self._land(key, future, result=result)
+                return result
+
+            try:
+                return self._share(future.result(timeout=self._timeout()))
+            except TimeoutError:
+                raise DeadlineExceeded(
+                    "the deadline expired while waiting for an identical query"
+                )
+            except _Abandoned:
+                continue
+
+    async def ado(self, key: str, function: Callable, *args) -> Any:
+        """Awaitable version of `do`, for a coroutine function."""
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                try:
+                    result = await function(*args)
+                except BaseException as error:
+                    self._land(key, future, error=self._outcome(error))
+                    raise
+                self._land(key, future, result=result)
+                return result
+
+            try:
+                # Shielded, so a cancelled waiter does not cancel the flight
+                result = await asyncio.wait_for(
+                    asyncio.shield(asyncio.wrap_future(future)), self._timeout()
+                )
+            except asyncio.TimeoutError:
+                raise DeadlineExceeded(
+                    "the deadline expired while waiting for an identical query"
+                )
+            except _Abandoned:
+                continue
+            return self._share(result)
+
+    def stats(self) -> Dict[str, int]:
+        """Returns how many calls executed their query and how many were coalesced."""
+        with self._lock:
+            return dict(self._counts)
+
+    def _join(self, key: str):
+        """Returns the flight of a key and whether the caller leads it, starting a new flight
+        if there is none."""
+        with self._lock:
+            future = self._flights.get(key)
+            leader = future is None
+            if leader:
+                future = self._flights[key] = Future()
+            self._counts["executed" if leader else "coalesced"] += 1
+
+        if not leader:
+            report = RunReport.current()
+            if report is not None:
+                report.increment("coalesced_queries")
+        return future, leader
+
+    def _land(
+        self,
+        key: str,
+        future: Future,
+        result: Any = None,
+        error: Optional[BaseException] = None,
+    ) -> None:
+        """Ends a flight, giving its outcome to the waiting callers."""
+        with self._lock:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+        if error is not None:
+            future.set_exception(error)
+        else:
+            future.set_result(result)
+
+    @staticmethod
+    def _outcome(error: BaseException) -> BaseException:
+        """Returns the exception given to the waiters of a failed flight. Failures specific to
+        the leader (its deadline, cancellation or interruption) abandon the flight instead.
+        """
+        if isinstance(error, DeadlineExceeded) or not isinstance(error, Exception):
+            return _Abandoned()
+        return error
+
+    @staticmethod
+    def _timeout() -> Optional[float]:
+        """Returns the seconds left on the current Deadline, or None if there is none."""
+        deadline = Deadline.current()
+        return None if deadline is None else deadline.remaining()
+
+    @staticmethod
+    def _share(result: Any) -> Any:
+        """Returns the result given to a coalesced call."""
+        if isinstance(result, pd.DataFrame):
+            return result.copy()
+        return result
@@ -7,6 +7,9 @@ NoSQL, etc).
 Location: pipeline_penguin/core/connector/
 """
 
+import asyncio
+from typing import Any, Dict, List, Optional
+
 from .connector import Connector
 
 
@@ -22,9 +25,62 @@ class ConnectorSQL(Connector):
     def __init__(self):
         super().__init__()
 
-    def run(self, query: str):
+    def run(self, query: str, *args, parameters: Optional[Dict[str, Any]] = None):
         """Method for executing a SQL query against the related database.
         Args:
             query: SQL query to be executed
+            parameters: Values of the named query parameters ("@name") used by the query.
         """
         pass
+
+    async def arun(self, query: str, *args, **kwargs):
+        """Awaitable version of `run`, executed on a worker thread unless overridden.
+
+        Args:
+            query: SQL query to be executed
+        """
+        return await super().arun(query, *args, **kwargs)
+
+    def dry_run(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        """Estimates the bytes processed by a SQL query without executing it.
+
+        Args:
+            query: SQL query to be estimated
+            parameters: Values of the named query parameters ("@name") used by the query.
+        Returns:
+            The estimated number of bytes, or None if the database does not support estimates.
+        """
+        return None
+
+    async def adry_run(
+        self, query: str, parameters: Optional[Dict[str, Any]] = None
+    ) -> Optional[int]:
+        """Awaitable version of `dry_run`, executed on a worker thread.
+
+        Args:
+            query: SQL query to be estimated
+        """
+        return await asyncio.to_thread(self.dry_run, query, parameters)
+
+    def run_script(self, queries: List[str], *args, **kwargs) -> list:
+        """Executes several SQL queries, returning their results in the same order.
+
+        The queries are executed one after another by default, Connectors whose database supports
+        multi-statement scripts should override it for executing them on a single request.
+
+        Args:
+            queries: SQL queries to be executed
+        Returns:
+            A `list` with the results of each query.
+        """
+        return [self.run(query, *args, **kwargs) for query in queries]
+
+    async def arun_script(self, queries: List[str], *args, **kwargs) -> list:
+        """Awaitable version of `run_script`, executed on a worker thread.
+
+        Args:
+            queries: SQL queries to be executed
+        """
+        return await asyncio.to_thread(self.run_script, queries, *args, **kwargs)
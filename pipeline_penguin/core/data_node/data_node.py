@@ -29,10 +29,12 @@ from xmlrpc.client import Boolean
 from pipeline_penguin.core.connector.connector import Connector
 from pipeline_penguin.core.premise_output.output_manager import OutputManager
 from pipeline_penguin.core.data_premise import DataPremise
+from pipeline_penguin.core.data_premise.query_plan import stamp, stamp_of
 from pipeline_penguin.exceptions import WrongTypeReference
 from pipeline_penguin.core.node_relation.node_relation import NodeRelation
+from pipeline_penguin.core.runner import PremiseRunner, Deadline
 import inspect
-from typing import Dict, Type, Any
+from typing import Dict, Type, Any, Optional
 
 
 class DataNode:
@@ -49,6 +51,8 @@ class DataNode:
         supported_premise_types: Array of premise types allowed to be registered on the DataNode.
         connectors: Custom data Connectors to be used while extracting data for this specific
                     DataNode (In contrast to the Default Connectors used by the ConnectorManager)
+        version: Stamp renewed whenever a public attribute is assigned (i.e. by `set_scope`),
+                 invalidating the compiled query plans of its DataPremises.
     """
 
     def __init__(self, name: str, source: str):
@@ -59,6 +63,16 @@ class DataNode:
         self.connectors = {}
         self.relations = []
 
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            stamp(self)
+
+    @property
+    def version(self) -> int:
+        """Stamp renewed whenever a public attribute of this DataNode is assigned."""
+        return stamp_of(self)
+
     @staticmethod
     def _is_data_premise_subclass(premise_factory: Any) -> bool:
         """Return whether the given constructor class is DataPremise subclass or not.
@@ -122,17 +136,81 @@ class DataNode:
         """
         return
 
-    def run_premises(self) -> OutputManager:
+    def run_premises(
+        self,
+        max_workers: Optional[int] = None,
+        deadline: Optional[float] = None,
+        fuse: bool = False,
+        sample_limit: Optional[int] = None,
+    ) -> OutputManager:
         """Run every DataPremise validation for this DataNode, printing their validation status and
         saving them on a Dictionary.
 
+        Args:
+            max_workers: Maximum number of DataPremises validated concurrently. When not provided
+                         the validations are executed one after another.
+            deadline: Time budget in seconds for the validations. DataPremises that do not finish
+                      in time receive a "Not run" PremiseOutput. Unbounded when not provided.
+            fuse: When True, the SQL DataPremises are computed on a single table scan.
+            sample_limit: When provided, the SQL DataPremises supporting it only compute their
+                          exact failed count and download at most this number of failing rows.
+        Returns:
+            A `dictionary` object consolidating all validations executed.
+        """
+        premises = list(self.premises.values())
+        runner = PremiseRunner(
+            max_workers, Deadline.after(deadline), fuse=fuse, sample_limit=sample_limit
+        )
+        premise_outputs = runner.run(premises)
+
+        return self._collect_outputs(premises, premise_outputs)
+
+    async def arun_premises(
+        self,
+        max_concurrency: Optional[int] = None,
+        deadline: Optional[float] = None,
+        fuse: bool = False,
+        sample_limit: Optional[int] = None,
+    ) -> OutputManager:
+        """Awaitable version of `run_premises`, validating every DataPremise of this DataNode on
+        the running event loop.
+
+        Args:
+            max_concurrency: Maximum number of DataPremises in flight at the same time. Unbounded
+                             when not provided.
+            deadline: Time budget in seconds for the validations. DataPremises still in flight when
+                      it expires are cancelled. Unbounded when not provided.
+            fuse: When True, the SQL DataPremises are computed on a single table scan.
+            sample_limit: When provided, the SQL DataPremises supporting it only compute their
+                          exact failed count and download at most this number of failing rows.
         Returns:
             A `dictionary` object consolidating all validations executed.
         """
+        premises = list(self.premises.values())
+        runner = PremiseRunner(
+            max_concurrency,
+            Deadline.after(deadline),
+            fuse=fuse,
+            sample_limit=sample_limit,
+        )
+        premise_outputs = await runner.arun(premises)
+
+        return self._collect_outputs(premises, premise_outputs)
+
+    def _collect_outputs(self, premises: list, premise_outputs: list) -> OutputManager:
+        """Stores the PremiseOutputs of this DataNode on an OutputManager, printing their
+        validation status.
+
+        Args:
+            premises: DataPremises of this DataNode that were validated.
+            premise_outputs: PremiseOutputs returned by the DataPremises, in the same order.
+        Returns:
+            An `OutputManager` with the PremiseOutputs keyed by DataPremise name.
+        """
         output_mgr = OutputManager()
 
-        for premise_name, premise in self.premises.items():
-            premise_output = premise.validate()
+        for premise, premise_output in zip(premises, premise_outputs):
+            premise_name = premise.name
             output_mgr.outputs.update({premise_name: premise_output})
             print(
                 f"{self.name} - {premise_name}: \
@@ -26,8 +26,10 @@ class DataPremiseSQL(DataPremise):
         return {}
 ```
 """
-from typing import Dict
+import asyncio
+from typing import Any, Dict
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from .query_plan import stamp, stamp_of
 
 
 class DataPremise:
@@ -41,6 +43,8 @@ class DataPremise:
     Attributes:
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
+        version: Stamp renewed whenever a public attribute is assigned, invalidating the
+                 compiled query plans of the premise.
     """
 
     def __init__(
@@ -49,11 +53,32 @@ class DataPremise:
         self.name = name
         self.data_node = data_node
 
+    def __setattr__(self, name: str, value: Any):
+        super().__setattr__(name, value)
+        if not name.startswith("_"):
+            stamp(self)
+
+    @property
+    def version(self) -> int:
+        """Stamp renewed whenever a public attribute of this DataPremise is assigned."""
+        return stamp_of(self)
+
     def validate(self) -> PremiseOutput:
         """Abstract method for executing the validation test."""
 
         pass
 
+    async def avalidate(self) -> PremiseOutput:
+        """Awaitable version of `validate`.
+
+        By default the synchronous `validate` method is executed on a worker thread, so DataPremises
+        without a native asynchronous implementation can still be awaited.
+
+        Returns:
+            PremiseOutput: Object storing the results for this validation.
+        """
+        return await asyncio.to_thread(self.validate)
+
     def to_serializeble_dict(self) -> Dict:
         """Method for constructing a dictionary representation of the current DataPremise using
         only built-in data types.
@@ -0,0 +1,103 @@
+"""Core data_premise module, contains the `QueryPlan` class.
+
+A QueryPlan is the compiled form of a `DataPremiseSQL`: the SQL rendered from its template, the
+values sent as query parameters and the queries used by count-only validations. Premises compile
+their plan once and reuse it on every validation, so suites with many DataPremises do not render
+their templates again on every run, and the runner optimisations (fused scans, deduplication,
+latency history) work on the same, stable query text.
+
+Plans are immutable. DataPremises and DataNodes receive a new version stamp whenever one of their
+public attributes is assigned, which invalidates the plans compiled from them. Stamps are kept
+outside of the objects, so they do not change their attributes.
+
+Location: pipeline_penguin/core/data_premise/
+
+Example usage:
+
+```python
+plan = data_premise.query_plan()
+plan.query
+# "SELECT col as result FROM `project.dataset.table` WHERE col BETWEEN @lower_bound AND ..."
+plan.parameters
+# {"lower_bound": 0, "upper_bound": 10}
+
+data_node.set_scope(row_filter="country = 'BR'")
+data_premise.query_plan() is plan
+# False
+```
+"""
+
+import itertools
+import weakref
+from types import MappingProxyType
+from typing import Any, Mapping, Optional
+
+_versions = itertools.count(1)
+_stamps: "weakref.WeakKeyDictionary[Any, int]" = weakref.WeakKeyDictionary()
+
+
+def stamp(instance: Any) -> None:
+    """Gives an object a new version stamp, unique within the process."""
+    _stamps[instance] = next(_versions)
+
+
+def stamp_of(instance: Any) -> int:
+    """Returns the version stamp of an object, 0 if it was never stamped (i.e. a copy)."""
+    return _stamps.get(instance, 0)
+
+
+class QueryPlan:
+    """Immutable compiled query of a DataPremiseSQL.
+
+    Args:
+        query: SQL query executed by the premise, with "@name" parameter placeholders.
+        parameters: Values of the query parameters.
+        column: Column read by the premise, mapped to its PremiseOutput.
+        table: Table expression read by the premise, if any.
+        count_query: Query computing the failed count of the premise on the server, if supported.
+    Attributes:
+        query: SQL query executed by the premise.
+        parameters: Read-only mapping with the values of the query parameters.
+        column: Column read by the premise.
+        table: Table expression read by the premise.
+        count_query: Query computing the failed count of the premise on the server.
+    """
+
+    __slots__ = ("query", "parameters", "column", "table", "count_query")
+
+    def __init__(
+        self,
+        query: str,
+        parameters: Mapping[str, Any],
+        column: Optional[str] = None,
+        table: Optional[str] = None,
+        count_query: Optional[str] = None,
+    ):
+        object.__setattr__(self, "query", query)
+        object.__setattr__(self, "parameters", MappingProxyType(dict(parameters)))
+        object.__setattr__(self, "column", column)
+        object.__setattr__(self, "table", table)
+        object.__setattr__(self, "count_query", count_query)
+
+    def __setattr__(self, name: str, value: Any):
+        raise AttributeError("QueryPlan objects are immutable")
+
+    def __delattr__(self, name: str):
+        raise AttributeError("QueryPlan objects are immutable")
+
+    def __deepcopy__(self, memo):
+        """QueryPlans are immutable, so copies of a DataPremise share them."""
+        return self
+
+    def __reduce__(self):
+        """Rebuilds the QueryPlan from its constructor arguments when pickled."""
+        return (
+            QueryPlan,
+            (
+                self.query,
+                dict(self.parameters),
+                self.column,
+                self.table,
+                self.count_query,
+            ),
+        )
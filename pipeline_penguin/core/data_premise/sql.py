@@ -18,15 +18,23 @@ class DataPremiseSQLCheckIsNull(DataPremiseSQL):
         # ...
         super().__init__()
 
-    def validate(self):
+    def build_output(self, data_frame):
         # ...
-        # Code for validating the DataPremise
+        # Code for building the PremiseOutput from the query results
         # ...
         return output
 ```
 """
+
+from typing import Any, Dict, Optional, Tuple
+
+import pandas as pd
+
 from pipeline_penguin.core.data_node.data_node import DataNode
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
 from . import DataPremise, PremiseType
+from .query_plan import QueryPlan
+from .sql_value import SQLExpression
 
 
 class DataPremiseSQL(DataPremise):
@@ -41,9 +49,20 @@ class DataPremiseSQL(DataPremise):
         data_node: Reference to the DataNode used in the validation.
         type: Type indicator of the premise. It is always "SQL".
         column: Column to be read by the premise.
+        condition_template: Optional SQL predicate matching the failing rows, formatted with
+                            "query_args". Premises defining it can be fused into a single table
+                            scan (see `failed_count_expression`).
+        parameter_names: Names of the "query_args" holding values (thresholds, patterns, arrays)
+                         instead of identifiers. They are sent as named query parameters and
+                         rendered as "@name" placeholders, so premises sharing a structure
+                         render the same query text and values are never interpolated into SQL.
+                         Values wrapped on a `SQLExpression` are rendered as SQL instead.
+        version: Stamp renewed whenever a public attribute is assigned, invalidating the
+                 compiled `QueryPlan` of the premise.
     """
 
     type = PremiseType.SQL
+    parameter_names: Tuple[str, ...] = ()
 
     def __init__(
         self,
@@ -58,6 +77,381 @@ class DataPremiseSQL(DataPremise):
         """Returns the arguments to be used while building the SQL query on premise execution"""
         return {}
 
+    def query_parameters(self, prefix: str = "") -> Dict[str, Any]:
+        """Returns the values of this premise sent as named query parameters.
+
+        Args:
+            prefix: Prefix added to the parameter names, for combining the parameters of several
+                    premises on a single query.
+        Returns:
+            A `dictionary` mapping each parameter name to its value.
+        """
+        args = self.query_args()
+        return {
+            f"{prefix}{name}": args[name]
+            for name in self.parameter_names
+            if name in args and not isinstance(args[name], SQLExpression)
+        }
+
+    def _format(self, template: str, prefix: str = "") -> str:
+        """Formats a template with the "query_args", replacing the values sent as query
+        parameters by their "@name" placeholders."""
+        args = self.query_args()
+        args.update({name: f"@{prefix}{name}" for name in self.query_parameters()})
+        return template.format(**args)
+
+    def query_plan(self) -> QueryPlan:
+        """Returns the compiled QueryPlan of this premise, compiling it again only when the
+        premise or its DataNode changed since the last compilation.
+
+        Changes are tracked through the attributes assigned on both objects, so mutable values
+        (i.e. a list of accepted values) must be replaced instead of modified in place.
+
+        Returns:
+            The `QueryPlan` of this premise.
+        """
+        state = self._plan_state()
+        cached = getattr(self, "_query_plan", None)
+        if state is not None and cached is not None and cached[0] == state:
+            return cached[1]
+
+        plan = self.compile()
+        if state is not None:
+            self._query_plan = (state, plan)
+        return plan
+
+    def _plan_state(self) -> Optional[tuple]:
+        """Returns the versions the compiled QueryPlan depends on, or None when they cannot be
+        tracked (i.e. the DataNode does not inherit from DataNode)."""
+        if not isinstance(self.data_node, DataNode):
+            return None
+        return (self.version, self.data_node.version)
+
+    def compile(self) -> QueryPlan:
+        """Renders the queries and parameters of this premise into a new QueryPlan.
+
+        Returns:
+            A `QueryPlan`, whose query is None when the premise has no "query_template".
+        """
+        query = None
+        if hasattr(self, "query_template"):
+            query = self._render_query()
+        return QueryPlan(
+            query,
+            self.query_parameters(),
+            self.column,
+            self.table_reference(),
+            self._count_query(),
+        )
+
+    def render_query(
+        self, prefix: str = "", sample_percent: Optional[float] = None
+    ) -> str:
+        """Builds the SQL query executed by this premise from its "query_template" and
+        "query_args". Values are rendered as "@name" placeholders for the parameters returned
+        by `query_parameters`.
+
+        When the DataNode is scoped (i.e. by a partition filter), every reference to its table is
+        replaced by the scoped table expression returned by `table_reference`.
+
+        The query without prefix nor sample is read from the compiled `query_plan`.
+
+        Args:
+            prefix: Prefix added to the parameter placeholders.
+            sample_percent: When provided, the query reads only this percent of the table (see
+                            `validate_sample`).
+        Returns:
+            A `string` with the SQL query.
+        """
+        if not prefix and sample_percent is None:
+            query = self.query_plan().query
+            if query is not None:
+                return query
+        return self._render_query(prefix, sample_percent)
+
+    def _render_query(
+        self, prefix: str = "", sample_percent: Optional[float] = None
+    ) -> str:
+        """Renders the query described by `render_query`, without using the QueryPlan."""
+        query = self._format(self.query_template, prefix)
+        table = self._table_name()
+        if table is None:
+            return query
+        return query.replace(table, self.table_reference(sample_percent))
+
+    def batchable(self) -> bool:
+        """Returns whether this premise is validated by a single query built by `render_query`
+        and `build_output`, so it can be executed on a script together with other premises.
+        """
+        return type(self).validate is DataPremiseSQL.validate and hasattr(
+            self, "query_template"
+        )
+
+    def sampleable(self) -> bool:
+        """Returns whether this premise can be validated on a sample of its table, which requires
+        a single query (see `batchable`) on a DataNode supporting `TABLESAMPLE`."""
+        return self.batchable() and callable(
+            getattr(self.data_node, "scoped_table", None)
+        )
+
+    def table_reference(self, sample_percent: Optional[float] = None) -> Optional[str]:
+        """Returns the fully qualified table validated by this premise, or None when its
+        "query_args" do not identify one. If the DataNode is scoped, the filtering subquery built
+        by its `scoped_table` method is returned instead.
+
+        Args:
+            sample_percent: When provided, the table is read on a sample of this percent of its
+                            data, if the DataNode supports it.
+        """
+        table = self._table_name()
+        scoped_table = getattr(self.data_node, "scoped_table", None)
+        if table is None or not callable(scoped_table):
+            return table
+        if sample_percent is None:
+            return scoped_table(table)
+        return scoped_table(table, sample_percent=sample_percent)
+
+    def _table_name(self) -> Optional[str]:
+        """Returns the fully qualified table name built from the "query_args", if any."""
+        args = self.query_args()
+        if not all(key in args for key in ("project", "dataset", "table")):
+            return None
+        return f"`{args['project']}.{args['dataset']}.{args['table']}`"
+
+    def failed_count_expression(self, prefix: str = "") -> Optional[str]:
+        """Builds a SQL aggregate expression computing the number of failing rows of this premise
+        over its table, so it can be computed together with other premises on a single scan.
+
+        Args:
+            prefix: Prefix added to the parameter placeholders.
+        Returns:
+            A `string` with the expression, or None if this premise cannot be fused.
+        """
+        condition_template = getattr(self, "condition_template", None)
+        if condition_template is None:
+            return None
+        return f"COUNTIF({self._format(condition_template, prefix)})"
+
+    def sample_query(self, limit: int) -> Optional[str]:
+        """Builds a SQL query returning a bounded sample of the failing rows of this premise.
+
+        Args:
+            limit: Maximum number of rows returned.
+        Returns:
+            A `string` with the SQL query, or None if this premise has no failing rows to sample.
+        """
+        condition_template = getattr(self, "condition_template", None)
+        if condition_template is None:
+            return None
+        args = self.query_args()
+        condition = self._format(condition_template)
+        return (
+            f"SELECT {args['column']} AS result FROM {self.table_reference()} "
+            f"WHERE {condition} LIMIT {int(limit)}"
+        )
+
+    def build_count_output(
+        self, failed_count: int, samples: Optional[pd.DataFrame] = None
+    ) -> PremiseOutput:
+        """Builds the PremiseOutput of this premise from a failed count computed elsewhere (i.e. a
+        fused scan).
+
+        Args:
+            failed_count: Exact number of failing rows.
+            samples: Optional sample of the failing rows.
+        Returns:
+            PremiseOutput: Object storing the results for this validation.
+        """
+        failed_values = samples if samples is not None else pd.DataFrame()
+        return PremiseOutput(
+            self,
+            self.data_node,
+            self.column,
+            failed_count == 0,
+            failed_count,
+            failed_values,
+        )
+
+    def count_query(self) -> Optional[str]:
+        """Returns the SQL query computing the exact number of failing rows of this premise on the
+        server, returned on a "failed_count" column, from the compiled `query_plan`.
+
+        Returns:
+            A `string` with the SQL query, or None if this premise does not support counting.
+        """
+        return self.query_plan().count_query
+
+    def _count_query(self) -> Optional[str]:
+        """Builds the query returned by `count_query`."""
+        expression = self.failed_count_expression()
+        table = self.table_reference()
+        if expression is None or table is None:
+            return None
+        return f"SELECT {expression} AS failed_count FROM {table}"
+
+    def validate_count(self, sample_limit: int = 100) -> PremiseOutput:
+        """Count-only version of `validate`. The number of failing rows is computed on the server
+        and at most `sample_limit` of them are downloaded, and only when the validation fails, so
+        the "failed_count" of the output is exact while memory and egress stay bounded.
+
+        Args:
+            sample_limit: Maximum number of failing rows downloaded (default: 100).
+        Returns:
+            PremiseOutput: Object storing the results for this validation.
+        Raises:
+            ValueError: If this premise does not support counting (see `count_query`).
+        """
+        query = self._checked_count_query()
+        failed_count = int(self.run_query(query)["failed_count"][0])
+
+        samples = None
+        if failed_count and sample_limit > 0:
+            samples = self.run_query(self.sample_query(sample_limit))
+        return self.build_count_output(failed_count, samples)
+
+    async def avalidate_count(self, sample_limit: int = 100) -> PremiseOutput:
+        """Awaitable version of `validate_count`, executing the queries through the Connector's
+        `arun` method."""
+        query = self._checked_count_query()
+        failed_count = int((await self.arun_query(query))["failed_count"][0])
+
+        samples = None
+        if failed_count and sample_limit > 0:
+            samples = await self.arun_query(self.sample_query(sample_limit))
+        return self.build_count_output(failed_count, samples)
+
+    def _checked_count_query(self) -> str:
+        """Returns the `count_query` of this premise, raising a ValueError if there is none."""
+        query = self.count_query()
+        if query is None:
+            raise ValueError(
+                f"Premise {self.name} does not support count-only validation"
+            )
+        return query
+
+    def run_query(self, query: str) -> pd.DataFrame:
+        """Executes a query built by this premise on its Connector, with its query parameters.
+
+        Args:
+            query: SQL query rendered without parameter prefix (i.e. by `render_query`).
+        Returns:
+            A pandas `DataFrame` with the results of the query.
+        """
+        connector = self.data_node.get_connector(self.type)
+        parameters = dict(self.query_plan().parameters)
+        if not parameters:
+            return connector.run(query)
+        return connector.run(query, parameters=parameters)
+
+    async def arun_query(self, query: str) -> pd.DataFrame:
+        """Awaitable version of `run_query`, executing the query through the Connector's `arun`
+        method."""
+        connector = self.data_node.get_connector(self.type)
+        parameters = dict(self.query_plan().parameters)
+        if not parameters:
+            return await connector.arun(query)
+        return await connector.arun(query, parameters=parameters)
+
+    def estimate_bytes(self) -> Optional[int]:
+        """Estimates the bytes processed by the query of this premise through a dry run on its
+        Connector, without executing it.
+
+        Returns:
+            The estimated number of bytes, or None if this premise is not validated by a single
+            query or its Connector does not support dry runs.
+        """
+        if not self.batchable():
+            return None
+        connector = self.data_node.get_connector(self.type)
+        dry_run = getattr(connector, "dry_run", None)
+        if not callable(dry_run):
+            return None
+        plan = self.query_plan()
+        return dry_run(plan.query, parameters=dict(plan.parameters))
+
+    async def aestimate_bytes(self) -> Optional[int]:
+        """Awaitable version of `estimate_bytes`."""
+        if not self.batchable():
+            return None
+        connector = self.data_node.get_connector(self.type)
+        adry_run = getattr(connector, "adry_run", None)
+        if not callable(adry_run):
+            return None
+        plan = self.query_plan()
+        return await adry_run(plan.query, parameters=dict(plan.parameters))
+
+    def validate_sample(self, sample_percent: float) -> PremiseOutput:
+        """Sampled version of `validate`, reading only a `TABLESAMPLE` of the table. Used for
+        validations exceeding the scan budget of a run, so the failed count of the output only
+        covers the sampled rows.
+
+        Args:
+            sample_percent: Percent of the table read, in the (0, 100] range.
+        Returns:
+            PremiseOutput: Object storing the results for this validation, with a message stating
+            the sample size.
+        Raises:
+            ValueError: If this premise cannot be sampled (see `sampleable`).
+        """
+        query = self._checked_sample_query(sample_percent)
+        return self._sampled_output(self.run_query(query), sample_percent)
+
+    async def avalidate_sample(self, sample_percent: float) -> PremiseOutput:
+        """Awaitable version of `validate_sample`."""
+        query = self._checked_sample_query(sample_percent)
+        return self._sampled_output(await self.arun_query(query), sample_percent)
+
+    def _checked_sample_query(self, sample_percent: float) -> str:
+        """Renders the sampled query of this premise, raising a ValueError if it cannot be
+        sampled."""
+        if not self.sampleable():
+            raise ValueError(f"Premise {self.name} does not support sampling")
+        return self.render_query(sample_percent=sample_percent)
+
+    def _sampled_output(
+        self, data_frame: pd.DataFrame, sample_percent: float
+    ) -> PremiseOutput:
+        """Builds the PremiseOutput of a sampled validation, stating the sample size."""
+        premise_output = self.build_output(data_frame)
+        premise_output.sampled = True
+        premise_output.message = f"sampled {sample_percent:.2f}% of the table"
+        return premise_output
+
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Abstract method for building the PremiseOutput from the results of the SQL query.
+
+        Args:
+            data_frame: Results of the query returned by `render_query`.
+        """
+        pass
+
+    def validate(self) -> PremiseOutput:
+        """Method for executing the validation over the DataNode.
+
+        Returns:
+            PremiseOutput: Object storing the results for this validation.
+        """
+        data_frame = self.run_query(self.render_query())
+
+        return self.build_output(data_frame)
+
+    async def avalidate(self) -> PremiseOutput:
+        """Awaitable version of `validate`, executing the query through the Connector's `arun`
+        method.
+
+        Subclasses that override `validate` with their own logic are executed on a worker thread
+        instead.
+
+        Returns:
+            PremiseOutput: Object storing the results for this validation.
+        """
+        if type(self).validate is not DataPremiseSQL.validate:
+            return await super().avalidate()
+
+        data_frame = await self.arun_query(self.render_query())
+
+        return self.build_output(data_frame)
+
     def to_serializeble_dict(self) -> dict:
         """Method for constructing a dictionary representation of the current DataPremise using
         only built-in data types.
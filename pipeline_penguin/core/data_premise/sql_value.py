@@ -0,0 +1,109 @@
+"""Core data_premise module, contains the `SQLExpression` class and the `parse_sql_literal`
+function.
+
+Values given to SQL DataPremises (thresholds, bounds) are sent as query parameters, so they are
+never interpolated into the query text. Raw SQL is only rendered when explicitly wrapped on a
+SQLExpression, which must only hold trusted code.
+
+Older versions of pipeline_penguin interpolated string values as SQL, so bounds were given as SQL
+literals (i.e. "10", "'abc'" or "DATE '2020-01-01'"). `parse_sql_literal` converts such literals
+into the typed Python values bound as query parameters.
+
+Location: pipeline_penguin/core/data_premise/
+
+Example usage:
+
+```python
+parse_sql_literal("DATE '2020-01-01'")
+# datetime.date(2020, 1, 1)
+
+# Comparing a column with a SQL expression instead of a value
+data_node.insert_premise(
+    "not_in_future", DataPremiseSQLCheckLogicalComparisonWithValue, "created", "<=",
+    SQLExpression("CURRENT_DATE()"),
+)
+```
+"""
+import datetime
+import re
+from typing import Any
+
+
+class SQLExpression:
+    """Raw SQL code given as the value of a DataPremise argument. It is rendered on the query as it
+    is, instead of being sent as a query parameter, so it must only hold trusted code.
+
+    Args:
+        sql: SQL expression, such as "CURRENT_DATE()".
+    Attributes:
+        sql: SQL expression.
+    """
+
+    def __init__(self, sql: str):
+        self.sql = sql
+
+    def __str__(self) -> str:
+        return self.sql
+
+    def __repr__(self) -> str:
+        return f"SQLExpression({self.sql!r})"
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, SQLExpression) and other.sql == self.sql
+
+    def __hash__(self) -> int:
+        return hash(self.sql)
+
+
+_INTEGER = re.compile(r"[+-]?\d+")
+_FLOAT = re.compile(r"[+-]?(\d+\.\d*|\.\d+|\d+)([eE][+-]?\d+)?")
+_QUOTED = re.compile(r"'((?:[^'\\]|\\.)*)'|\"((?:[^\"\\]|\\.)*)\"", re.DOTALL)
+_TYPED = re.compile(r"(DATE|DATETIME|TIMESTAMP)\s*'([^']*)'", re.IGNORECASE)
+_ESCAPE = re.compile(r"\\(.)", re.DOTALL)
+
+
+def parse_sql_literal(literal: str) -> Any:
+    """Converts a SQL literal into the Python value bound as a query parameter.
+
+    Supports numbers, quoted strings, booleans and DATE, DATETIME and TIMESTAMP literals
+    (TIMESTAMPs without a time zone are in UTC).
+
+    Args:
+        literal: SQL literal, such as "10", "'abc'" or "DATE '2020-01-01'".
+    Returns:
+        The `int`, `float`, `str`, `bool`, `datetime.date` or `datetime.datetime` value.
+    Raises:
+        ValueError: If the string is not a supported SQL literal.
+    """
+    text = literal.strip()
+    if _INTEGER.fullmatch(text):
+        return int(text)
+    if _FLOAT.fullmatch(text):
+        return float(text)
+    if text.upper() in ("TRUE", "FALSE"):
+        return text.upper() == "TRUE"
+
+    quoted = _QUOTED.fullmatch(text)
+    if quoted:
+        content = quoted.group(1) if quoted.group(1) is not None else quoted.group(2)
+        return _ESCAPE.sub(r"\1", content)
+
+    typed = _TYPED.fullmatch(text)
+    if typed:
+        kind, value = typed.group(1).upper(), typed.group(2).strip()
+        try:
+            if kind == "DATE":
+                return datetime.date.fromisoformat(value)
+            parsed = datetime.datetime.fromisoformat(value)
+        except ValueError:
+            raise ValueError(f"invalid {kind} literal: {literal}")
+        if kind == "DATETIME":
+            return parsed.replace(tzinfo=None)
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=datetime.timezone.utc)
+        return parsed
+
+    raise ValueError(
+        f"{literal!r} is not a SQL literal, pass a typed value or wrap SQL code on a "
+        "SQLExpression"
+    )
@@ -16,9 +16,15 @@ formatter = _mock_formatter()
 expected_results = {"test_data_node": {"test_data_premise": "{}"}}
 
 output_manager.format_outputs(formatter) == expected_results
+
+# Exporting the results while the validations are still running
+OutputManager.export_stream(node_manager.iter_run(max_workers=16), formatter, exporter)
 ```
 """
 
+import asyncio
+from typing import AsyncIterable, Iterable
+
 
 class OutputManager:
     """An OutputManager stores "PremiseOutputs" returned by DataPremises validations.
@@ -49,3 +55,59 @@ class OutputManager:
 
         for data_premise_name, premise_output in self.outputs.items():
             premise_output.export(formatter, exporter, *args, **kwargs)
+
+    @staticmethod
+    def export_stream(
+        premise_outputs: Iterable["pipeline_penguin.core.premise_output.PremiseOutput"],
+        formatter: "pipeline_penguin.core.premise_output.OutputFormatter",
+        exporter: "pipeline_penguin.core.premise_output.OutputExporter",
+        *args,
+        **kwargs
+    ) -> int:
+        """Method for sending each validation result of a stream (i.e. `NodeManager.iter_run`) to
+        a given destination as soon as it is available, without storing it.
+
+        Args:
+            premise_outputs: Iterable of PremiseOutputs
+            formatter (OutputFormatter): Formatter to use on the PremiseOutputs
+            exporter (OutputExporter): Exporter to use for sending the results
+
+        Returns:
+            The number of PremiseOutputs exported
+        """
+        exported = 0
+        for premise_output in premise_outputs:
+            premise_output.export(formatter, exporter, *args, **kwargs)
+            exported += 1
+
+        return exported
+
+    @staticmethod
+    async def aexport_stream(
+        premise_outputs: AsyncIterable[
+            "pipeline_penguin.core.premise_output.PremiseOutput"
+        ],
+        formatter: "pipeline_penguin.core.premise_output.OutputFormatter",
+        exporter: "pipeline_penguin.core.premise_output.OutputExporter",
+        *args,
+        **kwargs
+    ) -> int:
+        """Asynchronous version of `export_stream`, consuming an asynchronous stream (i.e.
+        `NodeManager.aiter_run`). Exports run on a thread, so they do not block the event loop.
+
+        Args:
+            premise_outputs: Asynchronous iterable of PremiseOutputs
+            formatter (OutputFormatter): Formatter to use on the PremiseOutputs
+            exporter (OutputExporter): Exporter to use for sending the results
+
+        Returns:
+            The number of PremiseOutputs exported
+        """
+        exported = 0
+        async for premise_output in premise_outputs:
+            await asyncio.to_thread(
+                premise_output.export, formatter, exporter, *args, **kwargs
+            )
+            exported += 1
+
+        return exported
@@ -24,7 +24,23 @@ class DataPremiseSQLCheckNull(DataPremiseSQL):
 ```
 """
 import pandas as pd
-from typing import Dict
+from typing import Dict, Optional
+
+
+class PremiseStatus:
+    """Constants for identifying the final state of a DataPremise execution"""
+
+    PASSED = "Passed"
+    FAILED = "Failed"
+    ERROR = "Error"
+    SKIPPED = "Skipped"
+    NOT_RUN = "Not run"
+    # The data was validated, but the result cannot tell whether it passed (i.e. an approximate
+    # count within its error bound)
+    INCONCLUSIVE = "Inconclusive"
+
+    # Statuses of the DataPremises whose validation query ran to completion
+    COMPLETED = (PASSED, FAILED, INCONCLUSIVE)
 
 
 class PremiseOutput:
@@ -37,6 +53,10 @@ class PremiseOutput:
         pass_validation: Indicated whether the data passed the validation or not.
         failed_count: Number of incorrect results returned by the DataPremise.
         failed_values: A pandas dataframe with the incorrect results returned by the DataPremise
+        status: One of the `PremiseStatus` constants. Derived from "pass_validation" when not
+                provided.
+        message: Optional description of why the validation did not run as expected (i.e. the
+                 exception raised by the DataPremise).
     Attributes
         data_premise: The DataPremise that generated this output.
         data_node: The DataNode related to the DataPremise ran on.
@@ -44,6 +64,10 @@ class PremiseOutput:
         pass_validation: Indicated whether the data passed the validation or not.
         failed_count: Number of incorrect results returned by the DataPremise.
         failed_values: A pandas dataframe with the incorrect results returned by the DataPremise
+        status: One of the `PremiseStatus` constants.
+        message: Optional description of why the validation did not run as expected.
+        sampled: Whether only a sample of the table was validated (see
+                 `DataPremiseSQL.validate_sample`), so "failed_count" does not cover every row.
     """
 
     def __init__(
@@ -54,6 +78,8 @@ class PremiseOutput:
         pass_validation: bool,
         failed_count: int,
         failed_values: pd.DataFrame,
+        status: Optional[str] = None,
+        message: Optional[str] = None,
     ):
         self.data_premise = data_premise
         self.data_node = data_node
@@ -61,6 +87,39 @@ class PremiseOutput:
         self.pass_validation = pass_validation
         self.failed_count = failed_count
         self.failed_values = failed_values
+        if status is None:
+            status = PremiseStatus.PASSED if pass_validation else PremiseStatus.FAILED
+        self.status = status
+        self.message = message
+        self.sampled = False
+
+    @classmethod
+    def from_status(
+        cls,
+        data_premise: "pipeline_penguin.core.data_premise.DataPremise",
+        status: str,
+        message: str,
+    ) -> "PremiseOutput":
+        """Builds a failed PremiseOutput for a DataPremise whose validation did not produce any
+        results (i.e. it raised an exception or was skipped).
+
+        Args:
+            data_premise: The DataPremise related to this output.
+            status: One of the `PremiseStatus` constants.
+            message: Description of what happened to the validation.
+        Returns:
+            A `PremiseOutput` with no failed values.
+        """
+        return cls(
+            data_premise,
+            data_premise.data_node,
+            getattr(data_premise, "column", None),
+            False,
+            0,
+            pd.DataFrame(),
+            status=status,
+            message=message,
+        )
 
     def to_serializeble_dict(self) -> Dict:
         """Returns a dictionary representation of the current PremiseOutput using
@@ -74,6 +133,8 @@ class PremiseOutput:
             "failed_values": self.failed_values.to_dict(),
             "failed_count": self.failed_count,
         }
+        if self.message is not None:
+            results.update({"status": self.status, "message": self.message})
         results.update({"data_premise": self.data_premise.to_serializeble_dict()})
         results.update({"data_node": self.data_node.to_serializeble_dict()})
 
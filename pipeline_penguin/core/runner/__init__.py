@@ -0,0 +1,31 @@
+"""Core runner package, contains the `PremiseRunner` class.
+
+This package stores the execution machinery used by `DataNode.run_premises` and
+`NodeManager.run_premises` for validating DataPremises, either serially or concurrently, and the
+`NodeGraph` and `NodeScheduler` used for running them in lineage order, skipping DataNodes
+downstream from failed validations according to a `FailFastPolicy`. Runs can be bounded by a
+`Deadline`, ordered by a `LatencyHistory` and described by a `RunReport`. A `FusedScan` computes
+the SQL DataPremises of a DataNode on a single table scan, and a `ScriptBatch` executes the queries
+of many DataPremises on a single multi-statement script. A `WatermarkStore` restricts incremental
+DataNodes to the rows added since their last run, and a `DeduplicatedQuery` executes the queries
+rendered by several DataPremises only once. A `ScanBudget` dry-runs the queries of a run, refusing
+or sampling the DataPremises that would process too many bytes. The options of a
+`NodeManager` run are gathered on a `RunOptions`.
+
+Location: pipeline_penguin/core/runner/
+"""
+
+from .premise_runner import PremiseRunner
+from .node_graph import NodeGraph
+from .fail_fast import FailFastPolicy
+from .node_scheduler import NodeScheduler
+from .deadline import Deadline
+from .latency_history import LatencyHistory
+from .run_report import RunReport
+from .fused_scan import FusedScan
+from .shared_query import SharedQuery
+from .script_batch import ScriptBatch
+from .watermark_store import WatermarkStore
+from .deduplicated_query import DeduplicatedQuery
+from .scan_budget import ScanBudget
+from .run_options import RunOptions
@@ -0,0 +1,73 @@
+"""Core runner module, contains the `Deadline` class.
+
+A Deadline represents the time budget of a whole validation run. The `PremiseRunner` stops
+starting new DataPremises once it expires, and Connectors can read the Deadline of the current
+execution through `Deadline.current()` for bounding (or cancelling) the jobs they submit.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+deadline = Deadline(seconds=300)
+
+with deadline.activate():
+    # Code executed here sees the deadline through Deadline.current()
+    connector.run(query)
+
+deadline.remaining()  # Seconds left before the deadline
+```
+"""
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Optional
+
+_current_deadline: ContextVar[Optional["Deadline"]] = ContextVar(
+    "current_deadline", default=None
+)
+
+
+class Deadline:
+    """Time budget shared by every DataPremise of a validation run.
+
+    Args:
+        seconds: Seconds available from now until the deadline.
+    Attributes:
+        expires_at: Value of `time.monotonic()` when the deadline expires.
+    Raises:
+        ValueError: If "seconds" is negative.
+    """
+
+    def __init__(self, seconds: float):
+        if seconds < 0:
+            raise ValueError("seconds must not be negative")
+        self.expires_at = time.monotonic() + seconds
+
+    @classmethod
+    def after(cls, seconds: Optional[float]) -> Optional["Deadline"]:
+        """Builds a Deadline expiring in the given seconds, or returns None when no time budget
+        was provided."""
+        return None if seconds is None else cls(seconds)
+
+    def remaining(self) -> float:
+        """Returns the seconds left before the deadline, or `0` if it already expired."""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """Returns whether the deadline already expired."""
+        return time.monotonic() >= self.expires_at
+
+    @staticmethod
+    def current() -> Optional["Deadline"]:
+        """Returns the Deadline of the current execution context, if any."""
+        return _current_deadline.get()
+
+    @contextmanager
+    def activate(self):
+        """Context manager making this Deadline the current one for the code it wraps."""
+        token = _current_deadline.set(self)
+        try:
+            yield self
+        finally:
+            _current_deadline.reset(token)
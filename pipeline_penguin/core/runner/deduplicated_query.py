@@ -0,0 +1,158 @@
+"""Core runner module, contains the `DeduplicatedQuery` class.
+
+DataNodes copied with `NodeManager.copy_node`, or generated from configuration files, often have
+DataPremises rendering exactly the same SQL (i.e. several pipelines checking the same shared
+table). A DeduplicatedQuery executes such a query once per run and gives its result to every
+DataPremise that needs it, each one still building its own PremiseOutput.
+
+Queries are compared in a canonical form, with whitespace outside of quoted strings and
+identifiers collapsed and trailing semicolons removed, together with their query parameters.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+queries = DeduplicatedQuery.plan(premises)
+
+for premise, query in queries.items():
+    output = query.validate(premise)
+```
+"""
+import json
+import re
+from typing import Dict, List
+
+import pandas as pd
+
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from .run_report import RunReport
+from .shared_query import SharedQuery
+
+_TOKENS = re.compile(r"""('(?:[^'\\]|\\.)*'|"(?:[^"\\]|\\.)*"|`[^`]*`)|\s+""")
+
+
+def canonical_query(query: str) -> str:
+    """Normalizes a SQL query for comparison, collapsing whitespace outside of quoted strings
+    and identifiers and removing trailing semicolons.
+
+    Args:
+        query: SQL query to be normalized.
+    Returns:
+        A `string` with the canonical form of the query.
+    """
+    collapsed = _TOKENS.sub(lambda match: match.group(1) or " ", query)
+    return collapsed.strip().rstrip(";").rstrip()
+
+
+class DeduplicatedQuery(SharedQuery):
+    """Query shared by several DataPremiseSQL rendering the same SQL on the same Connector.
+
+    Unlike other SharedQueries, a failure is not retried by each DataPremise, as their own
+    validations would execute the same query again.
+
+    Args:
+        premises: DataPremises rendering the same query.
+        connector: Connector shared by the DataPremises.
+    Attributes:
+        premises: DataPremises rendering the same query.
+        connector: Connector shared by the DataPremises.
+        query: The query executed on behalf of the DataPremises.
+        parameters: Query parameters shared by the DataPremises.
+    """
+
+    def __init__(
+        self,
+        premises: List["pipeline_penguin.core.data_premise.sql.DataPremiseSQL"],
+        connector: "pipeline_penguin.core.connector.Connector",
+    ):
+        super().__init__()
+        self.premises = premises
+        self.connector = connector
+        plan = premises[0].query_plan()
+        self.query = plan.query
+        self.parameters = dict(plan.parameters)
+
+    @classmethod
+    def plan(
+        cls, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> Dict["pipeline_penguin.core.data_premise.DataPremise", "DeduplicatedQuery"]:
+        """Groups the single-query DataPremises by Connector, canonical query and parameters.
+
+        Only queries rendered by two or more DataPremises are shared.
+
+        Args:
+            premises: DataPremises to be validated.
+        Returns:
+            A `dictionary` mapping every deduplicated DataPremise to its DeduplicatedQuery.
+        """
+        groups = {}
+        for premise in premises:
+            if not getattr(premise, "batchable", lambda: False)():
+                continue
+            try:
+                connector = premise.data_node.get_connector(premise.type)
+                plan = premise.query_plan()
+                query = canonical_query(plan.query)
+                parameters = json.dumps(
+                    dict(plan.parameters), sort_keys=True, default=repr
+                )
+            except Exception:
+                continue
+            key = (id(connector), query, parameters)
+            group = groups.setdefault(key, (connector, []))
+            group[1].append(premise)
+
+        queries = {}
+        for connector, group in groups.values():
+            if len(group) > 1:
+                shared = cls(group, connector)
+                queries.update({premise: shared for premise in group})
+        return queries
+
+    def _report(self) -> None:
+        """Reports the number of queries saved on the RunReport of the current run, if any."""
+        report = RunReport.current()
+        if report is not None:
+            report.increment("deduplicated_queries", len(self.premises) - 1)
+
+    def execute(self) -> pd.DataFrame:
+        """Executes the query."""
+        result = self.premises[0].run_query(self.query)
+        self._report()
+        return result
+
+    async def aexecute(self) -> pd.DataFrame:
+        """Awaitable version of `execute`."""
+        result = await self.premises[0].arun_query(self.query)
+        self._report()
+        return result
+
+    def build_output(
+        self,
+        premise: "pipeline_penguin.core.data_premise.sql.DataPremiseSQL",
+        data_frame: pd.DataFrame,
+    ) -> PremiseOutput:
+        """Builds the PremiseOutput of a DataPremise from a copy of the shared result, so
+        DataPremises do not see each other's changes to it."""
+        return premise.build_output(data_frame.copy())
+
+    def validate(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Validates a DataPremise of the group from the shared result.
+
+        Args:
+            premise: One of the DataPremises of the group.
+        Returns:
+            The `PremiseOutput` of the DataPremise.
+        Raises:
+            Exception: Any exception raised by the shared query.
+        """
+        return self.build_output(premise, self.result())
+
+    async def avalidate(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Awaitable version of `validate`."""
+        return await self.abuild_output(premise, await self.aresult())
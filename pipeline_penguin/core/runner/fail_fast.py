@@ -0,0 +1,53 @@
+"""Core runner module, contains the `FailFastPolicy` class.
+
+A FailFastPolicy decides whether the results of a DataNode should stop the validation of every
+DataNode downstream from it. When a source table fails its validations the tables built from it
+are expected to fail as well, so their DataPremises are skipped instead of scanning them.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+# Any failed premise blocks the downstream DataNodes
+node_manager.run_premises(fail_fast=FailFastPolicy())
+
+# Only the listed premises block the downstream DataNodes
+node_manager.run_premises(
+    fail_fast=FailFastPolicy(premises={"raw": ["Primary key is not null"]})
+)
+```
+"""
+from typing import Dict, List, Optional
+
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+
+
+class FailFastPolicy:
+    """Policy deciding which failed DataPremises block the validation of downstream DataNodes.
+
+    Args:
+        premises: Dictionary mapping DataNode names to the names of their blocking DataPremises.
+                  When not provided any failed DataPremise is blocking.
+    Attributes:
+        premises: Dictionary mapping DataNode names to the names of their blocking DataPremises.
+    """
+
+    def __init__(self, premises: Optional[Dict[str, List[str]]] = None):
+        self.premises = premises
+
+    def blocks(self, premise_output: PremiseOutput) -> bool:
+        """Returns whether the given PremiseOutput should block the downstream DataNodes.
+
+        Args:
+            premise_output: Results of an executed DataPremise.
+        Returns:
+            A `boolean` indicating if the downstream DataNodes must be skipped.
+        """
+        if premise_output.pass_validation:
+            return False
+        if self.premises is None:
+            return True
+
+        node_name = premise_output.data_node.name
+        return premise_output.data_premise.name in self.premises.get(node_name, ())
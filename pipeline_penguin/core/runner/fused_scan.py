@@ -0,0 +1,176 @@
+"""Core runner module, contains the `FusedScan` class.
+
+A FusedScan computes the failed counts of every fusable DataPremiseSQL of a DataNode on a single
+table scan:
+
+```sql
+SELECT COUNTIF(col_a is null) AS p0, COUNTIF(col_b BETWEEN 0 AND 10) AS p1, ...
+FROM `project.dataset.table`
+```
+
+As a `SharedQuery`, the scan is executed once, by the first DataPremise asking for its count, and
+shared by the other DataPremises of the group. Failing-row samples are then fetched only for the DataPremises that
+failed. If the fused query itself fails, each DataPremise falls back to its own validation.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+scans = FusedScan.plan(list(data_node.premises.values()))
+
+for premise, scan in scans.items():
+    output = scan.validate(premise)
+```
+"""
+from typing import Any, Dict, List
+
+import pandas as pd
+
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from .run_report import RunReport
+from .shared_query import SharedQuery
+
+
+class FusedScan(SharedQuery):
+    """Single table scan shared by several DataPremiseSQL of the same DataNode.
+
+    Args:
+        premises: DataPremises validating the same table, all supporting
+                  `failed_count_expression`.
+        sample_limit: Maximum number of failing rows fetched for each failed DataPremise
+                      (default: 100).
+    Attributes:
+        premises: DataPremises computed by the scan.
+        aliases: Dictionary mapping each DataPremise to its column on the fused query.
+        sample_limit: Maximum number of failing rows fetched for each failed DataPremise.
+    """
+
+    def __init__(
+        self,
+        premises: List["pipeline_penguin.core.data_premise.sql.DataPremiseSQL"],
+        sample_limit: int = 100,
+    ):
+        super().__init__()
+        self.premises = premises
+        self.aliases = {premise: f"p{i}" for i, premise in enumerate(premises)}
+        self.sample_limit = sample_limit
+
+    @classmethod
+    def plan(
+        cls,
+        premises: List["pipeline_penguin.core.data_premise.DataPremise"],
+        sample_limit: int = 100,
+    ) -> Dict["pipeline_penguin.core.data_premise.DataPremise", "FusedScan"]:
+        """Groups the fusable DataPremises by DataNode and table.
+
+        Only groups with two or more DataPremises are fused, the other DataPremises keep their
+        own queries.
+
+        Args:
+            premises: DataPremises to be validated.
+            sample_limit: Maximum number of failing rows fetched for each failed DataPremise.
+        Returns:
+            A `dictionary` mapping every fused DataPremise to its FusedScan.
+        """
+        groups = {}
+        for premise in premises:
+            if not hasattr(premise, "failed_count_expression"):
+                continue
+            try:
+                expression = premise.failed_count_expression()
+                table = premise.table_reference()
+            except Exception:
+                continue
+            if expression is not None and table is not None:
+                groups.setdefault((id(premise.data_node), table), []).append(premise)
+
+        scans = {}
+        for group in groups.values():
+            if len(group) > 1:
+                scan = cls(group, sample_limit)
+                scans.update({premise: scan for premise in group})
+        return scans
+
+    def render_query(self) -> str:
+        """Builds the fused query computing every failed count.
+
+        Returns:
+            A `string` with the SQL query.
+        """
+        expressions = ", ".join(
+            f"{premise.failed_count_expression(f'{alias}_')} AS {alias}"
+            for premise, alias in self.aliases.items()
+        )
+        return f"SELECT {expressions} FROM {self.premises[0].table_reference()}"
+
+    def query_parameters(self) -> Dict[str, Any]:
+        """Returns the query parameters of every DataPremise, prefixed by their aliases."""
+        parameters = {}
+        for premise, alias in self.aliases.items():
+            parameters.update(premise.query_parameters(f"{alias}_"))
+        return parameters
+
+    def _connector(self) -> "pipeline_penguin.core.connector.Connector":
+        """Returns the Connector used by the DataPremises of the scan."""
+        premise = self.premises[0]
+        return premise.data_node.get_connector(premise.type)
+
+    def _parse(self, data_frame: pd.DataFrame) -> Dict[str, int]:
+        """Reads the failed counts from the single row returned by the fused query."""
+        report = RunReport.current()
+        if report is not None:
+            report.increment("fused_scans")
+            report.increment("fused_premises", len(self.premises))
+        return {alias: int(data_frame[alias][0]) for alias in self.aliases.values()}
+
+    def execute(self) -> Dict[str, int]:
+        """Executes the fused query.
+
+        Returns:
+            A `dictionary` mapping each alias to its failed count.
+        """
+        parameters = self.query_parameters()
+        if not parameters:
+            return self._parse(self._connector().run(self.render_query()))
+        return self._parse(
+            self._connector().run(self.render_query(), parameters=parameters)
+        )
+
+    async def aexecute(self) -> Dict[str, int]:
+        """Awaitable version of `execute`."""
+        parameters = self.query_parameters()
+        if not parameters:
+            return self._parse(await self._connector().arun(self.render_query()))
+        return self._parse(
+            await self._connector().arun(self.render_query(), parameters=parameters)
+        )
+
+    def build_output(
+        self,
+        premise: "pipeline_penguin.core.data_premise.sql.DataPremiseSQL",
+        counts: Dict[str, int],
+    ) -> PremiseOutput:
+        """Builds the PremiseOutput of a DataPremise, fetching failing samples only if it failed.
+
+        Args:
+            premise: One of the DataPremises of the scan.
+            counts: Failed counts returned by the fused query.
+        Returns:
+            The `PremiseOutput` of the DataPremise.
+        """
+        failed_count = counts[self.aliases[premise]]
+        sample_query = premise.sample_query(self.sample_limit) if failed_count else None
+        samples = premise.run_query(sample_query) if sample_query else None
+        return premise.build_count_output(failed_count, samples)
+
+    async def abuild_output(
+        self,
+        premise: "pipeline_penguin.core.data_premise.sql.DataPremiseSQL",
+        counts: Dict[str, int],
+    ) -> PremiseOutput:
+        """Awaitable version of `build_output`."""
+        failed_count = counts[self.aliases[premise]]
+        sample_query = premise.sample_query(self.sample_limit) if failed_count else None
+        samples = await premise.arun_query(sample_query) if sample_query else None
+        return premise.build_count_output(failed_count, samples)
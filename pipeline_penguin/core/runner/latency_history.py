@@ -0,0 +1,210 @@
+"""Core runner module, contains the `LatencyHistory` class.
+
+The LatencyHistory keeps the execution times of previous DataPremise validations, optionally on a
+local JSON file, so the `PremiseRunner` can start the longest validations first (longest
+processing time first scheduling). With a bounded number of workers this reduces the time spent
+waiting for a single slow DataPremise at the end of the run.
+
+Latencies are keyed by DataNode name, DataPremise name and a hash of the query template
+formatted with its arguments, so changing a DataPremise discards its history. The key ignores the
+scope of the DataNode (partition filter, watermark range or table snapshot), which changes from one
+run to the next. DataPremises without history are estimated by a fallback function. By default,
+the size of their table (see `DataNodeBigQuery.table_metadata`) is divided by the scan throughput
+of the recorded executions, and the average of every known latency is used for DataNodes without
+table metadata.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+history = LatencyHistory(path=".pipeline_penguin/latency.json")
+runner = PremiseRunner(max_workers=8, history=history)
+runner.run(premises)
+
+runner.report.to_serializeble_dict()
+# {"predicted_makespan_seconds": 12.0, "makespan_seconds": 13.1}
+```
+"""
+import hashlib
+import json
+import os
+import threading
+from typing import Callable, Dict, List, Optional
+
+
+class LatencyHistory:
+    """Store of past DataPremise execution times.
+
+    Args:
+        path: JSON file where the history is persisted. Kept in memory only when not provided.
+        fallback: Function estimating the latency in seconds of a DataPremise without history.
+                  Defaults to an estimate from the size of its table, or to the average of every
+                  known latency when the size is not known.
+        smoothing: Weight of the newest execution on the stored latency, between 0 and 1
+                   (default: 0.5).
+    Attributes:
+        path: JSON file where the history is persisted.
+        latencies: Dictionary mapping each key to its expected latency in seconds.
+    Raises:
+        ValueError: If "smoothing" is not in the (0, 1] interval.
+    """
+
+    # Scan throughput assumed for estimating latencies from table sizes before any execution
+    # with a known table size is recorded
+    BYTES_PER_SECOND = 1e9
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        fallback: Optional[
+            Callable[["pipeline_penguin.core.data_premise.DataPremise"], float]
+        ] = None,
+        smoothing: float = 0.5,
+    ):
+        if not 0 < smoothing <= 1:
+            raise ValueError("smoothing must be in the (0, 1] interval")
+
+        self.path = path
+        self.fallback = fallback
+        self.smoothing = smoothing
+        self.latencies: Dict[str, float] = {}
+        self._sizes: Dict[str, int] = {}
+        # Bytes and seconds of the executions with a known size
+        self._scanned = [0.0, 0.0]
+        self._lock = threading.Lock()
+
+        if path and os.path.isfile(path):
+            with open(path) as history_file:
+                self.latencies = json.load(history_file)
+
+    @staticmethod
+    def key(premise: "pipeline_penguin.core.data_premise.DataPremise") -> str:
+        """Builds the history key of a DataPremise.
+
+        Args:
+            premise: DataPremise to build the key for.
+        Returns:
+            A `str` joining the DataNode name, the DataPremise name and the query hash.
+        """
+        try:
+            query = premise.query_template.format(**premise.query_args())
+        except Exception:
+            query = ""
+        query_hash = hashlib.sha1(str(query).encode("utf-8")).hexdigest()[:16]
+        return f"{premise.data_node.name}/{premise.name}/{query_hash}"
+
+    def predict(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> float:
+        """Returns the expected latency of a DataPremise in seconds.
+
+        Args:
+            premise: DataPremise to be estimated.
+        Returns:
+            The stored latency, or the fallback estimate when there is no history.
+        """
+        key = self.key(premise)
+        latency = self.latencies.get(key)
+        if latency is not None:
+            return latency
+        if self.fallback is not None:
+            return self.fallback(premise)
+
+        size = self._table_size(premise)
+        if size is not None:
+            with self._lock:
+                self._sizes[key] = size
+                scanned_bytes, seconds = self._scanned
+            if scanned_bytes and seconds:
+                return size * seconds / scanned_bytes
+            return size / self.BYTES_PER_SECOND
+        if self.latencies:
+            return sum(self.latencies.values()) / len(self.latencies)
+        return 0.0
+
+    def record(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise", seconds: float
+    ) -> None:
+        """Stores the latency of an execution, smoothed with the previous ones.
+
+        Args:
+            premise: The executed DataPremise.
+            seconds: How long its validation took.
+        """
+        key = self.key(premise)
+        with self._lock:
+            size = self._sizes.get(key)
+            if size:
+                self._scanned[0] += size
+                self._scanned[1] += seconds
+            previous = self.latencies.get(key)
+            if previous is None:
+                self.latencies[key] = seconds
+            else:
+                self.latencies[key] = (
+                    self.smoothing * seconds + (1 - self.smoothing) * previous
+                )
+
+    @staticmethod
+    def _table_size(
+        premise: "pipeline_penguin.core.data_premise.DataPremise",
+    ) -> Optional[int]:
+        """Returns the size in bytes of the table of a DataPremise from the metadata of its
+        DataNode, or None when the DataNode does not provide it."""
+        table_metadata = getattr(premise.data_node, "table_metadata", None)
+        if not callable(table_metadata):
+            return None
+        try:
+            size = getattr(table_metadata(), "size_bytes", None)
+        except Exception:
+            return None
+        return size if isinstance(size, int) and size >= 0 else None
+
+    def order(
+        self, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> List["pipeline_penguin.core.data_premise.DataPremise"]:
+        """Sorts DataPremises from the longest to the shortest expected latency.
+
+        Args:
+            premises: DataPremises to be sorted.
+        Returns:
+            A new `list` with the sorted DataPremises.
+        """
+        predictions = {premise: self.predict(premise) for premise in premises}
+        return sorted(premises, key=predictions.get, reverse=True)
+
+    def makespan(
+        self,
+        premises: List["pipeline_penguin.core.data_premise.DataPremise"],
+        workers: int = 1,
+    ) -> float:
+        """Predicts how long validating the DataPremises takes when started in the given order.
+
+        Args:
+            premises: DataPremises in the order they are started.
+            workers: Number of validations running at the same time.
+        Returns:
+            The predicted makespan in seconds.
+        """
+        finish_times = [0.0] * max(1, min(workers, len(premises) or 1))
+        for premise in premises:
+            earliest = finish_times.index(min(finish_times))
+            finish_times[earliest] += self.predict(premise)
+        return max(finish_times)
+
+    def save(self) -> None:
+        """Writes the history to its JSON file, if a path was provided."""
+        if not self.path:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = dict(self.latencies)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as history_file:
+            json.dump(data, history_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.path)
@@ -0,0 +1,90 @@
+"""Core runner module, contains the `NodeGraph` class.
+
+The NodeGraph builds the lineage graph of a pipeline from the `NodeRelation` objects registered on
+each DataNode (see `DataNode.add_relation`). It is used for running the DataPremises of upstream
+DataNodes before the ones of their downstream DataNodes.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+raw = node_manager.create_node("raw", DataNodeBigQuery, ...)
+trusted = node_manager.create_node("trusted", DataNodeBigQuery, ...)
+raw.add_relation(trusted, isDestination=True)
+
+graph = NodeGraph({"raw": raw, "trusted": trusted})
+graph.levels()  # [["raw"], ["trusted"]]
+```
+"""
+from typing import Dict, List, Set
+
+from pipeline_penguin.exceptions import CyclicNodeRelation
+
+
+class NodeGraph:
+    """Directed graph of DataNodes, built from their NodeRelations.
+
+    Relations pointing to DataNodes outside the given dictionary are ignored. The ends of a
+    NodeRelation may be either DataNode instances or DataNode names.
+
+    Args:
+        nodes: Dictionary of DataNodes keyed by their names.
+    Attributes:
+        nodes: Dictionary of DataNodes keyed by their names.
+        downstream: Dictionary mapping each DataNode name to the names of the DataNodes it writes
+                    to.
+        upstream: Dictionary mapping each DataNode name to the names of the DataNodes it reads
+                  from.
+    """
+
+    def __init__(self, nodes: Dict[str, "pipeline_penguin.core.data_node.DataNode"]):
+        self.nodes = nodes
+        self.downstream: Dict[str, Set[str]] = {name: set() for name in nodes}
+        self.upstream: Dict[str, Set[str]] = {name: set() for name in nodes}
+
+        for data_node in nodes.values():
+            for relation in data_node.get_relations():
+                source = self._node_name(relation.get_source())
+                destination = self._node_name(relation.get_destination())
+                if source in nodes and destination in nodes:
+                    self.downstream[source].add(destination)
+                    self.upstream[destination].add(source)
+
+    @staticmethod
+    def _node_name(node: "pipeline_penguin.core.data_node.DataNode") -> str:
+        """Returns the name of a NodeRelation end, which may be a DataNode or its name."""
+        return getattr(node, "name", node)
+
+    def levels(self) -> List[List[str]]:
+        """Orders the DataNodes topologically, grouping them in levels. Every DataNode of a level
+        only depends on DataNodes from previous levels, so the DataNodes of a same level can be
+        validated at the same time.
+
+        Raises:
+            CyclicNodeRelation: If the NodeRelations form a cycle.
+        Returns:
+            A `list` of levels, each one being a list of DataNode names in insertion order.
+        """
+        pending = {name: len(upstream) for name, upstream in self.upstream.items()}
+        level = [name for name, count in pending.items() if count == 0]
+        levels = []
+
+        while level:
+            levels.append(level)
+            for name in level:
+                del pending[name]
+            next_level = set()
+            for name in level:
+                for destination in self.downstream[name]:
+                    pending[destination] -= 1
+                    if pending[destination] == 0:
+                        next_level.add(destination)
+            level = [name for name in self.nodes if name in next_level]
+
+        if pending:
+            raise CyclicNodeRelation(
+                f"NodeRelations form a cycle between the DataNodes: {sorted(pending)}"
+            )
+
+        return levels
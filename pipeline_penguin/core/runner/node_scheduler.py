@@ -0,0 +1,150 @@
+"""Core runner module, contains the `NodeScheduler` class.
+
+The NodeScheduler decides which DataPremises of a set of DataNodes are executed together. It
+yields batches of DataPremises to a `PremiseRunner` and collects their outputs, which allows it to
+follow the lineage of the DataNodes and to skip DataNodes whose upstream validations failed.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+scheduler = NodeScheduler(nodes, lineage=True, fail_fast=FailFastPolicy())
+for premises in scheduler.batches():
+    scheduler.record(premises, runner.run(premises))
+
+scheduler.outputs  # {DataPremise: PremiseOutput}
+
+# Streaming the outputs instead of keeping them
+for premises in scheduler.batches():
+    for premise, output in runner.iter_run(premises):
+        scheduler.record_output(premise, output)
+        handle(scheduler.pop_outputs())
+```
+"""
+from typing import Dict, Iterator, List, Optional
+
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
+from .fail_fast import FailFastPolicy
+from .node_graph import NodeGraph
+
+
+class NodeScheduler:
+    """Splits the DataPremises of a set of DataNodes into batches executed one after another.
+
+    Without lineage, every DataPremise is placed on a single batch. With lineage, each level of the
+    lineage graph becomes a batch, so upstream DataNodes are validated first. A `FailFastPolicy`
+    implies lineage: the DataPremises of every DataNode downstream from a blocking failure are not
+    executed and receive a "Skipped" PremiseOutput instead.
+
+    Args:
+        nodes: Dictionary of DataNodes keyed by their names.
+        lineage: Whether to follow the lineage graph of the DataNodes.
+        fail_fast: Policy for skipping DataNodes downstream from failed validations.
+    Attributes:
+        outputs: Dictionary mapping every DataPremise already handled to its PremiseOutput.
+    Raises:
+        CyclicNodeRelation: If lineage is used and the NodeRelations form a cycle.
+    """
+
+    def __init__(
+        self,
+        nodes: Dict[str, "pipeline_penguin.core.data_node.DataNode"],
+        lineage: bool = False,
+        fail_fast: Optional[FailFastPolicy] = None,
+    ):
+        self.nodes = nodes
+        self.fail_fast = fail_fast
+        self.graph = NodeGraph(nodes) if lineage or fail_fast else None
+        self.levels = self.graph.levels() if self.graph else [list(nodes)]
+        self.outputs: Dict[
+            "pipeline_penguin.core.data_premise.DataPremise", PremiseOutput
+        ] = {}
+        self._blocked_by: Dict[str, str] = {}
+
+    def batches(
+        self,
+    ) -> Iterator[List["pipeline_penguin.core.data_premise.DataPremise"]]:
+        """Yields the batches of DataPremises to be executed.
+
+        The outputs of each batch must be given to `record` before the next batch is requested.
+
+        Yields:
+            A `list` of DataPremises, ordered by DataNode.
+        """
+        for level in self.levels:
+            premises = []
+            for name in level:
+                node_premises = self.nodes[name].premises.values()
+                if name in self._blocked_by:
+                    for premise in node_premises:
+                        self.outputs[premise] = self._skipped_output(premise, name)
+                else:
+                    premises.extend(node_premises)
+
+            if premises:
+                yield premises
+
+    def record(
+        self,
+        premises: List["pipeline_penguin.core.data_premise.DataPremise"],
+        premise_outputs: List[PremiseOutput],
+    ) -> None:
+        """Stores the outputs of an executed batch, blocking the DataNodes downstream from any
+        failure matching the FailFastPolicy.
+
+        Args:
+            premises: DataPremises of the batch.
+            premise_outputs: PremiseOutputs of the batch, in the same order.
+        """
+        for premise, premise_output in zip(premises, premise_outputs):
+            self.record_output(premise, premise_output)
+
+    def record_output(
+        self,
+        premise: "pipeline_penguin.core.data_premise.DataPremise",
+        premise_output: PremiseOutput,
+    ) -> None:
+        """Stores the output of a single executed DataPremise, blocking the DataNodes downstream
+        from it if it is a failure matching the FailFastPolicy.
+
+        Args:
+            premise: The executed DataPremise.
+            premise_output: Its PremiseOutput.
+        """
+        self.outputs[premise] = premise_output
+        if self.fail_fast and self.fail_fast.blocks(premise_output):
+            self._block_downstream(premise.data_node.name)
+
+    def pop_outputs(self) -> List[PremiseOutput]:
+        """Removes and returns every output stored so far, so streaming consumers do not keep
+        them in memory.
+
+        Returns:
+            A `list` with the stored PremiseOutputs, in the order they were stored.
+        """
+        premise_outputs = list(self.outputs.values())
+        self.outputs.clear()
+        return premise_outputs
+
+    def _block_downstream(self, name: str) -> None:
+        """Marks every DataNode downstream from the given one as blocked by it."""
+        to_visit = list(self.graph.downstream[name])
+        while to_visit:
+            current = to_visit.pop()
+            if current not in self._blocked_by:
+                self._blocked_by[current] = name
+                to_visit.extend(self.graph.downstream[current])
+
+    def _skipped_output(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise", name: str
+    ) -> PremiseOutput:
+        """Builds the output of a DataPremise skipped because of an upstream failure."""
+        return PremiseOutput.from_status(
+            premise,
+            PremiseStatus.SKIPPED,
+            f"skipped: upstream failed ({self._blocked_by[name]})",
+        )
@@ -0,0 +1,527 @@
+"""Core runner module, contains the `PremiseRunner` class.
+
+The PremiseRunner executes the validation of a list of DataPremises and returns their
+`PremiseOutput` objects in the same order as the DataPremises were given, regardless of the order
+they finished in.
+
+By default the validations are executed one after another and an exception raised by a DataPremise
+propagates to the caller. When a `max_workers` value is provided they are executed concurrently on
+a thread pool, which is useful since most of the time spent by a DataPremise is waiting on the
+database, and exceptions are captured as "Error" outputs instead (see `capture_errors`).
+
+The `arun` coroutine executes the validations on the running event loop instead, awaiting each
+DataPremise's `avalidate` method. In this case `max_workers` limits how many validations are in
+flight at the same time.
+
+When a `Deadline` is given, DataPremises that did not start before it expires are reported with
+the "Not run" status, and the runner stops waiting for the ones still in flight: asyncio tasks are
+cancelled (which cancels their BigQuery jobs), while Connectors running on threads bound their
+jobs to the remaining time through `Deadline.current()`.
+
+With `fuse`, the SQL DataPremises of each DataNode are computed on a single table scan (see
+`FusedScan`). With `batch_size`, the queries of DataPremises sharing a Connector, even from
+different DataNodes, are executed together on multi-statement scripts (see `ScriptBatch`).
+
+With a `sample_limit`, the SQL DataPremises supporting it run in count-only mode: the exact number
+of failing rows is computed on the server and at most `sample_limit` of them are downloaded (see
+`DataPremiseSQL.validate_count`).
+
+With `dedupe`, DataPremises rendering the same query on the same Connector share a single
+execution of it (see `DeduplicatedQuery`).
+
+With a `ScanBudget`, the queries of the SQL DataPremises are dry-run before the run starts, and
+those exceeding the budget are not executed or, when downgrading, validated on a sample of their
+table (see `DataPremiseSQL.validate_sample`).
+
+With a `LatencyHistory`, the DataPremises expected to take longer are started first and the
+predicted and actual makespans of the run are stored on the runner's `RunReport`.
+
+The `iter_run` and `aiter_run` generators yield each output as soon as its validation finishes,
+so results can be exported while the remaining DataPremises are still running.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+runner = PremiseRunner(max_workers=8)
+outputs = runner.run(list(data_node.premises.values()))
+
+# Inside a coroutine
+outputs = await runner.arun(list(data_node.premises.values()))
+
+for premise, output in runner.iter_run(list(data_node.premises.values())):
+    output.export(formatter, exporter)
+```
+"""
+
+import asyncio
+import time
+from contextlib import contextmanager
+from concurrent.futures import ThreadPoolExecutor, TimeoutError, as_completed
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
+from pipeline_penguin.exceptions import DeadlineExceeded
+from .deadline import Deadline
+from .deduplicated_query import DeduplicatedQuery
+from .fused_scan import FusedScan
+from .script_batch import ScriptBatch
+from .shared_query import SharedQuery
+from .latency_history import LatencyHistory
+from .run_report import RunReport
+from .scan_budget import ScanBudget
+
+
+class PremiseRunner:
+    """Executes DataPremise validations serially, on a bounded thread pool or on an event loop.
+
+    On concurrent runs (with "max_workers" or through `arun`) the exceptions raised by a
+    DataPremise are captured as a failed `PremiseOutput` with the "Error" status, so a single
+    broken validation does not abort the others. Serial runs raise them, unless "capture_errors"
+    is set.
+
+    Args:
+        max_workers: Maximum number of validations running at the same time. Validations are
+                     executed serially when not provided.
+        deadline: Deadline for the whole run. Unbounded when not provided.
+        history: LatencyHistory used for starting the longest validations first. The execution
+                 time of every validation is recorded on it.
+        fuse: When True, the SQL DataPremises of the same DataNode are computed on a single
+              `FusedScan` of their table.
+        batch_size: When provided, the queries of the SQL DataPremises sharing a Connector are
+                    executed on multi-statement scripts (`ScriptBatch`) of up to this size.
+        sample_limit: When provided, the SQL DataPremises supporting it are validated in
+                      count-only mode, downloading at most this number of failing rows. Also used
+                      as the sample size of fused scans.
+        dedupe: When True, identical queries of different DataPremises are executed only once.
+        budget: ScanBudget limiting the bytes processed by the SQL DataPremises, estimated by
+                dry runs before the validations start.
+        capture_errors: Whether exceptions raised by the DataPremises are captured as "Error"
+                        outputs. Defaults to True on concurrent runs and False on serial runs.
+    Attributes:
+        max_workers: Maximum number of validations running at the same time.
+        deadline: Deadline for the whole run.
+        history: LatencyHistory used for ordering the validations.
+        fuse: Whether the SQL DataPremises of the same DataNode are fused.
+        batch_size: Maximum number of queries on a single script.
+        sample_limit: Maximum number of failing rows downloaded by count-only validations.
+        dedupe: Whether identical queries are executed only once.
+        budget: ScanBudget limiting the bytes processed by the run.
+        capture_errors: Whether exceptions are captured as "Error" outputs, None for the default.
+        report: RunReport with the actual (and, with a history, predicted) makespan of the runs.
+    """
+
+    NOT_STARTED_MESSAGE = "not run (deadline)"
+    CANCELLED_MESSAGE = "cancelled (deadline)"
+    OVER_BUDGET_MESSAGE = "not run (scan budget: {} bytes estimated)"
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        deadline: Optional[Deadline] = None,
+        history: Optional[LatencyHistory] = None,
+        fuse: bool = False,
+        batch_size: Optional[int] = None,
+        sample_limit: Optional[int] = None,
+        dedupe: bool = False,
+        budget: Optional[ScanBudget] = None,
+        capture_errors: Optional[bool] = None,
+    ):
+        if max_workers is not None and max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+        self.max_workers = max_workers
+        self.deadline = deadline
+        self.history = history
+        if batch_size is not None and batch_size < 2:
+            raise ValueError("batch_size must be greater than 1")
+        if sample_limit is not None and sample_limit < 0:
+            raise ValueError("sample_limit must not be negative")
+        self.fuse = fuse
+        self.batch_size = batch_size
+        self.sample_limit = sample_limit
+        self.dedupe = dedupe
+        self.budget = budget
+        self.capture_errors = capture_errors
+        self.report = RunReport()
+        self._shared: Dict[
+            "pipeline_penguin.core.data_premise.DataPremise", SharedQuery
+        ] = {}
+        self._counted = set()
+        self._estimates: Dict[
+            "pipeline_penguin.core.data_premise.DataPremise", int
+        ] = {}
+        self._allowances: Dict[
+            "pipeline_penguin.core.data_premise.DataPremise", float
+        ] = {}
+        self._budget_spent = 0.0
+
+    def _execute(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Validates a single DataPremise, converting exceptions into failed outputs when
+        capturing them.
+
+        Args:
+            premise: DataPremise to be validated.
+        Returns:
+            The `PremiseOutput` of the validation.
+        """
+        if self.deadline is not None and self.deadline.expired():
+            return self._not_run_output(premise, self.NOT_STARTED_MESSAGE)
+
+        start = time.perf_counter()
+        with self._activate():
+            premise_output = self._validate(premise)
+
+        self._record_latency(premise, premise_output, time.perf_counter() - start)
+        return premise_output
+
+    @contextmanager
+    def _activate(self):
+        """Context manager making the runner's RunReport and Deadline visible to the Connectors
+        through `RunReport.current()` and `Deadline.current()`."""
+        with self.report.activate():
+            if self.deadline is None:
+                yield
+            else:
+                with self.deadline.activate():
+                    yield
+
+    def _record_latency(
+        self,
+        premise: "pipeline_penguin.core.data_premise.DataPremise",
+        premise_output: PremiseOutput,
+        seconds: float,
+    ) -> None:
+        """Stores the execution time of a DataPremise on the history, if any. Only completed
+        validations of the whole table are recorded, as errors, cancellations and samples do not
+        reflect the real latency.
+        """
+        if (
+            self.history is not None
+            and premise_output.status in PremiseStatus.COMPLETED
+            and not premise_output.sampled
+        ):
+            self.history.record(premise, seconds)
+
+    def _plan(
+        self,
+        premises: List["pipeline_penguin.core.data_premise.DataPremise"],
+        estimates: Optional[
+            Dict["pipeline_penguin.core.data_premise.DataPremise", int]
+        ] = None,
+    ) -> List["pipeline_penguin.core.data_premise.DataPremise"]:
+        """Returns the DataPremises in the order they should be started, reporting the predicted
+        makespan when there is a history, and plans the shared queries of the batch.
+
+        Args:
+            premises: DataPremises of the batch.
+            estimates: Estimated bytes of the DataPremises, when there is a ScanBudget.
+        """
+        self._allocate(estimates or {})
+        eligible = [
+            premise
+            for premise in premises
+            if self._allowances.get(premise, 100.0) == 100.0
+        ]
+        sample_limit = 100 if self.sample_limit is None else self.sample_limit
+        self._shared = FusedScan.plan(eligible, sample_limit) if self.fuse else {}
+        remaining = [premise for premise in eligible if premise not in self._shared]
+        if self.dedupe:
+            self._shared.update(DeduplicatedQuery.plan(remaining))
+            remaining = [
+                premise for premise in remaining if premise not in self._shared
+            ]
+        self._counted = set()
+        if self.sample_limit is not None:
+            self._counted = {p for p in remaining if PremiseRunner._countable(p)}
+            remaining = [p for p in remaining if p not in self._counted]
+        if self.batch_size:
+            self._shared.update(ScriptBatch.plan(remaining, self.batch_size))
+        if self.history is None:
+            return premises
+
+        ordered = self.history.order(premises)
+        self.report.increment(
+            "predicted_makespan_seconds",
+            self.history.makespan(ordered, self.max_workers or 1),
+        )
+        return ordered
+
+    def _allocate(
+        self, estimates: Dict["pipeline_penguin.core.data_premise.DataPremise", int]
+    ) -> None:
+        """Applies the ScanBudget to the estimated DataPremises of a batch, keeping track of the
+        bytes allocated to previous batches of the run."""
+        self._estimates = estimates
+        self._allowances = {}
+        if self.budget is None:
+            return
+        self._allowances = self.budget.allocate(
+            estimates, int(self._budget_spent), self.report
+        )
+        self._budget_spent += sum(
+            estimates[premise] * percent / 100
+            for premise, percent in self._allowances.items()
+        )
+
+    @staticmethod
+    def _countable(premise: "pipeline_penguin.core.data_premise.DataPremise") -> bool:
+        """Returns whether a DataPremise can be validated in count-only mode."""
+        try:
+            return premise.count_query() is not None
+        except Exception:
+            return False
+
+    def _finish(self, start: float) -> None:
+        """Reports the makespan of a run started at the given time and saves the history."""
+        self.report.increment("makespan_seconds", time.perf_counter() - start)
+        if self.history is not None:
+            self.history.save()
+
+    def _validate(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Calls the DataPremise's `validate` (or `validate_count` and `validate_sample`) method,
+        or its SharedQuery, converting exceptions into failed outputs when capturing them.
+        """
+        shared = self._shared.get(premise)
+        allowance = self._allowances.get(premise, 100.0)
+        try:
+            if allowance == 0:
+                return self._over_budget_output(premise)
+            if allowance < 100:
+                return premise.validate_sample(allowance)
+            if shared:
+                return shared.validate(premise)
+            if premise in self._counted:
+                return premise.validate_count(self.sample_limit)
+            return premise.validate()
+        except DeadlineExceeded:
+            return PremiseRunner._not_run_output(
+                premise, PremiseRunner.CANCELLED_MESSAGE
+            )
+        except Exception as e:
+            capture_errors = self.capture_errors
+            if capture_errors is None:
+                capture_errors = self.max_workers is not None
+            if not capture_errors:
+                raise
+            return PremiseRunner._error_output(premise, e)
+
+    @staticmethod
+    def _not_run_output(
+        premise: "pipeline_penguin.core.data_premise.DataPremise", message: str
+    ) -> PremiseOutput:
+        """Builds the output of a DataPremise that did not finish before the deadline."""
+        return PremiseOutput.from_status(premise, PremiseStatus.NOT_RUN, message)
+
+    def _over_budget_output(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Builds the output of a DataPremise not executed for exceeding the ScanBudget."""
+        return self._not_run_output(
+            premise, self.OVER_BUDGET_MESSAGE.format(self._estimates[premise])
+        )
+
+    @staticmethod
+    def _error_output(
+        premise: "pipeline_penguin.core.data_premise.DataPremise", error: Exception
+    ) -> PremiseOutput:
+        """Builds the failed output of a DataPremise that raised an exception.
+
+        Args:
+            premise: DataPremise that raised the exception.
+            error: The exception raised.
+        Returns:
+            A `PremiseOutput` with the "Error" status.
+        """
+        return PremiseOutput.from_status(
+            premise, PremiseStatus.ERROR, f"{type(error).__name__}: {error}"
+        )
+
+    def run(
+        self, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> List[PremiseOutput]:
+        """Validates every given DataPremise.
+
+        Args:
+            premises: DataPremises to be validated.
+        Returns:
+            A `list` of PremiseOutputs in the same order as the provided DataPremises.
+        """
+        outputs = dict(self.iter_run(premises))
+        return [outputs[premise] for premise in premises]
+
+    def iter_run(
+        self, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> Iterator[
+        Tuple["pipeline_penguin.core.data_premise.DataPremise", PremiseOutput]
+    ]:
+        """Validates every given DataPremise, yielding each output as soon as it is ready.
+
+        Closing the generator before it is exhausted cancels the validations not started yet.
+
+        Args:
+            premises: DataPremises to be validated.
+        Yields:
+            `(DataPremise, PremiseOutput)` tuples, in the order the validations finished.
+        """
+        start = time.perf_counter()
+        estimates = self.budget.estimate(premises) if self.budget else None
+        premises = self._plan(premises, estimates)
+
+        if self.max_workers is None or len(premises) <= 1:
+            try:
+                for premise in premises:
+                    yield premise, self._execute(premise)
+            finally:
+                self._finish(start)
+            return
+
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        futures = {
+            executor.submit(self._execute, premise): premise for premise in premises
+        }
+        timeout = self.deadline.remaining() if self.deadline else None
+        try:
+            for future in as_completed(futures, timeout=timeout):
+                yield futures.pop(future), future.result()
+        except TimeoutError:
+            pass
+        finally:
+            # Threads still running are not joined, their jobs are bound to the deadline
+            executor.shutdown(wait=False, cancel_futures=True)
+            self._finish(start)
+
+        for future, premise in futures.items():
+            if future.done() and not future.cancelled():
+                yield premise, future.result()
+            elif future.running():
+                yield premise, self._not_run_output(premise, self.CANCELLED_MESSAGE)
+            else:
+                yield premise, self._not_run_output(premise, self.NOT_STARTED_MESSAGE)
+
+    async def arun(
+        self, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> List[PremiseOutput]:
+        """Validates every given DataPremise concurrently on the running event loop.
+
+        Args:
+            premises: DataPremises to be validated.
+        Returns:
+            A `list` of PremiseOutputs in the same order as the provided DataPremises.
+        """
+        outputs = {
+            premise: output async for premise, output in self.aiter_run(premises)
+        }
+        return [outputs[premise] for premise in premises]
+
+    async def aiter_run(
+        self, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> AsyncIterator[
+        Tuple["pipeline_penguin.core.data_premise.DataPremise", PremiseOutput]
+    ]:
+        """Asynchronous version of `iter_run`, validating the DataPremises on the running event
+        loop.
+
+        Closing the generator before it is exhausted cancels the validations still pending.
+
+        Args:
+            premises: DataPremises to be validated.
+        Yields:
+            `(DataPremise, PremiseOutput)` tuples, in the order the validations finished.
+        """
+        start = time.perf_counter()
+        estimates = await self.budget.aestimate(premises) if self.budget else None
+        premises = self._plan(premises, estimates)
+        semaphore = asyncio.Semaphore(self.max_workers) if self.max_workers else None
+        started = set()
+
+        async def execute(premise):
+            if semaphore is None:
+                return await self._aexecute(premise, started)
+            async with semaphore:
+                return await self._aexecute(premise, started)
+
+        tasks = {
+            asyncio.ensure_future(execute(premise)): premise for premise in premises
+        }
+        try:
+            while tasks:
+                timeout = self.deadline.remaining() if self.deadline else None
+                done, _ = await asyncio.wait(
+                    tasks, timeout=timeout, return_when=asyncio.FIRST_COMPLETED
+                )
+                if not done:
+                    break
+                for task in done:
+                    yield tasks.pop(task), task.result()
+        finally:
+            for task in tasks:
+                task.cancel()
+            if tasks:
+                await asyncio.wait(tasks)
+            self._finish(start)
+
+        for premise in tasks.values():
+            message = (
+                self.CANCELLED_MESSAGE
+                if premise in started
+                else self.NOT_STARTED_MESSAGE
+            )
+            yield premise, self._not_run_output(premise, message)
+
+    async def _aexecute(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise", started: set
+    ) -> PremiseOutput:
+        """Awaits the validation of a single DataPremise, converting exceptions into failed
+        outputs unless "capture_errors" is False.
+
+        Args:
+            premise: DataPremise to be validated.
+            started: Set where the DataPremise is added when its validation starts.
+        Returns:
+            The `PremiseOutput` of the validation.
+        """
+        if self.deadline is not None and self.deadline.expired():
+            return self._not_run_output(premise, self.NOT_STARTED_MESSAGE)
+
+        started.add(premise)
+        start = time.perf_counter()
+        with self._activate():
+            premise_output = await self._avalidate(premise)
+
+        self._record_latency(premise, premise_output, time.perf_counter() - start)
+        return premise_output
+
+    async def _avalidate(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Awaits the DataPremise's `avalidate` (or `avalidate_count` and `avalidate_sample`)
+        method, or its SharedQuery, converting exceptions into failed outputs unless
+        "capture_errors" is False."""
+        shared = self._shared.get(premise)
+        allowance = self._allowances.get(premise, 100.0)
+        try:
+            if allowance == 0:
+                return self._over_budget_output(premise)
+            if allowance < 100:
+                return await premise.avalidate_sample(allowance)
+            if shared:
+                return await shared.avalidate(premise)
+            if premise in self._counted:
+                return await premise.avalidate_count(self.sample_limit)
+            return await premise.avalidate()
+        except DeadlineExceeded:
+            return PremiseRunner._not_run_output(
+                premise, PremiseRunner.CANCELLED_MESSAGE
+            )
+        except Exception as e:
+            if self.capture_errors is False:
+                raise
+            return PremiseRunner._error_output(premise, e)
@@ -0,0 +1,166 @@
+"""Core runner module, contains the `RunOptions` class.
+
+RunOptions gathers every option of a validation run of `NodeManager` (`run_premises`,
+`arun_premises`, `iter_run` and `aiter_run`) on a single value object, so the same options can be
+built once and reused by several runs. Those methods also accept the options as keyword arguments.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+options = RunOptions(max_workers=16, deadline=540, snapshot=True)
+
+node_manager.run_premises(options)
+node_manager.run_premises(options.replace(full_rescan=True))
+
+# The same as
+node_manager.run_premises(max_workers=16, deadline=540, snapshot=True)
+```
+"""
+import datetime
+from typing import Optional, Union
+
+from .deadline import Deadline
+from .fail_fast import FailFastPolicy
+from .latency_history import LatencyHistory
+from .premise_runner import PremiseRunner
+from .scan_budget import ScanBudget
+from .watermark_store import WatermarkStore
+
+
+class RunOptions:
+    """Options of a validation run over every DataNode of a NodeManager.
+
+    Args:
+        max_workers: Maximum number of DataPremises validated concurrently across all DataNodes.
+                     When not provided the validations are executed one after another, or without
+                     a bound by the asynchronous methods.
+        max_concurrency: Alias of "max_workers", named after the asynchronous methods.
+        lineage: When True, the DataNodes are validated in topological order of their
+                 NodeRelations: each level of the lineage graph is validated at the same time,
+                 after every upstream level has finished.
+        fail_fast: Policy for skipping the DataNodes downstream from failed validations. Their
+                   DataPremises are not executed and receive a "Skipped" PremiseOutput. Implies
+                   "lineage".
+        deadline: Time budget in seconds for the whole run, shared by every lineage level.
+                  DataPremises that do not finish in time receive a "Not run" PremiseOutput.
+                  Unbounded when not provided.
+        history: LatencyHistory used for starting the DataPremises expected to take longer first.
+                 Their execution times are recorded on it.
+        fuse: When True, the SQL DataPremises of each DataNode are computed on a single table
+              scan, fetching failing rows only for the DataPremises that failed.
+        batch_size: When provided, the queries of the DataPremises sharing a Connector, across
+                    DataNodes, are executed on multi-statement scripts of up to this size.
+        sample_limit: When provided, the SQL DataPremises supporting it only compute their exact
+                      failed count on the server and download at most this number of failing
+                      rows.
+        watermarks: WatermarkStore used for validating only the rows added since the last run on
+                    DataNodes with a watermark column. Their new watermarks and running failed
+                    totals are stored on it at the end of the run.
+        full_rescan: When True, the stored watermarks are ignored and every row is validated,
+                     resetting the running totals.
+        snapshot: When True, every DataNode supporting it is read from the snapshot of its table
+                  at the beginning of the run (`FOR SYSTEM_TIME AS OF`), so all DataPremises see
+                  the same data. A datetime pins that snapshot instead, making re-runs within the
+                  time travel window deterministic.
+        dedupe: When True, DataPremises rendering the same query, even on different DataNodes,
+                share a single execution of it. The number of queries saved is reported as
+                "deduplicated_queries".
+        budget: ScanBudget limiting the bytes processed by the run. The queries of the SQL
+                DataPremises are dry-run before each lineage level, and the estimated bytes of the
+                run and of each DataNode are reported as "estimated_bytes".
+        capture_errors: Whether exceptions raised by the DataPremises are reported as "Error"
+                        PremiseOutputs instead of propagating. Defaults to True on concurrent runs
+                        and False on serial ones.
+    Attributes:
+        max_workers: Maximum number of DataPremises validated concurrently.
+        lineage: Whether the DataNodes are validated in lineage order.
+        fail_fast: Policy for skipping the DataNodes downstream from failed validations.
+        deadline: Time budget in seconds for the whole run.
+        history: LatencyHistory used for ordering the DataPremises.
+        fuse: Whether the SQL DataPremises of each DataNode share a single table scan.
+        batch_size: Maximum number of queries on each multi-statement script.
+        sample_limit: Maximum number of failing rows downloaded by each DataPremise.
+        watermarks: WatermarkStore used for incremental validations.
+        full_rescan: Whether the stored watermarks are ignored.
+        snapshot: Whether, or at which time, the DataNodes are pinned to a table snapshot.
+        dedupe: Whether identical queries are executed only once.
+        budget: ScanBudget limiting the bytes processed by the run.
+        capture_errors: Whether exceptions are reported as "Error" PremiseOutputs.
+    """
+
+    def __init__(
+        self,
+        max_workers: Optional[int] = None,
+        lineage: bool = False,
+        fail_fast: Optional[FailFastPolicy] = None,
+        deadline: Optional[float] = None,
+        history: Optional[LatencyHistory] = None,
+        fuse: bool = False,
+        batch_size: Optional[int] = None,
+        sample_limit: Optional[int] = None,
+        watermarks: Optional[WatermarkStore] = None,
+        full_rescan: bool = False,
+        snapshot: Union[bool, datetime.datetime] = False,
+        dedupe: bool = False,
+        budget: Optional[ScanBudget] = None,
+        capture_errors: Optional[bool] = None,
+        max_concurrency: Optional[int] = None,
+    ):
+        self.max_workers = max_workers if max_concurrency is None else max_concurrency
+        self.lineage = lineage
+        self.fail_fast = fail_fast
+        self.deadline = deadline
+        self.history = history
+        self.fuse = fuse
+        self.batch_size = batch_size
+        self.sample_limit = sample_limit
+        self.watermarks = watermarks
+        self.full_rescan = full_rescan
+        self.snapshot = snapshot
+        self.dedupe = dedupe
+        self.budget = budget
+        self.capture_errors = capture_errors
+
+    @classmethod
+    def of(cls, options: Optional["RunOptions"] = None, **changes) -> "RunOptions":
+        """Returns the options of a run given either as a RunOptions, as keyword arguments or
+        as a RunOptions updated by keyword arguments.
+
+        Raises:
+            TypeError: If a keyword argument is not a run option.
+        """
+        if options is None:
+            return cls(**changes)
+        return options.replace(**changes) if changes else options
+
+    def replace(self, **changes) -> "RunOptions":
+        """Returns a copy of these options with the given options changed.
+
+        Raises:
+            TypeError: If a keyword argument is not a run option.
+        """
+        arguments = dict(vars(self))
+        if "max_concurrency" in changes:
+            arguments.pop("max_workers")
+        arguments.update(changes)
+        return RunOptions(**arguments)
+
+    def runner(self) -> PremiseRunner:
+        """Builds the PremiseRunner executing a run with these options, starting its Deadline.
+
+        Raises:
+            ValueError: If an option given to the PremiseRunner is invalid.
+        """
+        return PremiseRunner(
+            self.max_workers,
+            Deadline.after(self.deadline),
+            self.history,
+            self.fuse,
+            self.batch_size,
+            self.sample_limit,
+            self.dedupe,
+            self.budget,
+            self.capture_errors,
+        )
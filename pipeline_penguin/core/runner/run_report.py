@@ -0,0 +1,124 @@
+"""Core runner module, contains the `RunReport` class.
+
+A RunReport gathers the metrics of a validation run (timings, counters, estimates) produced by the
+different parts of the execution machinery, so they can be inspected once the run finishes. The
+`PremiseRunner` activates its report while validating, so Connectors can add their own metrics
+through `RunReport.current()`. Values that must be looked up only once per run (i.e. table
+metadata) can be memoized on it.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+report = RunReport()
+report.increment("makespan_seconds", 1.5)
+report.set("predicted_makespan_seconds", 1.2)
+
+report.to_serializeble_dict()
+# {"makespan_seconds": 1.5, "predicted_makespan_seconds": 1.2}
+
+# Inside a Connector
+report = RunReport.current()
+if report is not None:
+    report.increment("hedged_queries")
+    table = report.memoize(("table", table_id), client.get_table, table_id)
+```
+"""
+import threading
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Callable, Dict, Hashable, Optional, Union
+
+Number = Union[int, float]
+
+_current_report: ContextVar[Optional["RunReport"]] = ContextVar(
+    "current_report", default=None
+)
+
+
+class RunReport:
+    """Thread-safe collection of named metrics of a validation run.
+
+    Attributes:
+        metrics: Dictionary with the value of every metric reported so far.
+    """
+
+    def __init__(self):
+        self.metrics: Dict[str, Number] = {}
+        self._memo: Dict[Hashable, Any] = {}
+        self._memo_locks: Dict[Hashable, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def increment(self, name: str, value: Number = 1) -> None:
+        """Adds the given value to a metric, starting it from zero if it does not exist.
+
+        Args:
+            name: Name of the metric.
+            value: Amount to be added (default: 1).
+        """
+        with self._lock:
+            self.metrics[name] = self.metrics.get(name, 0) + value
+
+    def set(self, name: str, value: Number) -> None:
+        """Replaces the value of a metric.
+
+        Args:
+            name: Name of the metric.
+            value: New value of the metric.
+        """
+        with self._lock:
+            self.metrics[name] = value
+
+    def get(self, name: str, default: Number = 0) -> Number:
+        """Returns the value of a metric, or the given default if it was never reported."""
+        return self.metrics.get(name, default)
+
+    def memoize(self, key: Hashable, function: Callable, *args) -> Any:
+        """Returns the value of `function(*args)` computed by the first call with the given key
+        during this run. Concurrent calls with the same key wait for that computation.
+
+        Args:
+            key: Key identifying the value.
+            function: Function computing the value.
+            *args: Arguments of the function.
+        Returns:
+            The memoized value.
+        """
+        with self._lock:
+            if key in self._memo:
+                return self._memo[key]
+            lock = self._memo_locks.setdefault(key, threading.Lock())
+        with lock:
+            with self._lock:
+                # Another thread may have computed the value while this one waited
+                if key in self._memo:
+                    return self._memo[key]
+            value = function(*args)
+            with self._lock:
+                self._memo[key] = value
+        return value
+
+    @staticmethod
+    def current() -> Optional["RunReport"]:
+        """Returns the RunReport of the current execution context, if any."""
+        return _current_report.get()
+
+    @contextmanager
+    def activate(self):
+        """Context manager making this RunReport the current one for the code it wraps."""
+        token = _current_report.set(self)
+        try:
+            yield self
+        finally:
+            _current_report.reset(token)
+
+    def to_serializeble_dict(self) -> Dict[str, Number]:
+        """Method for constructing a dictionary representation of the report using only built-in
+        data types.
+
+        Returns:
+            A `dictionary` object with every metric.
+        """
+        with self._lock:
+            return dict(self.metrics)
@@ -0,0 +1,207 @@
+"""Core runner module, contains the `ScanBudget` class.
+
+Before a run, the ScanBudget dry-runs the query of every SQL DataPremise in parallel, estimating
+the bytes each of them would process, and guards the run against unexpectedly expensive scans
+(i.e. a new DataPremise on a large unpartitioned table).
+
+DataPremises exceeding the per-premise budget, or not fitting in what is left of the per-run
+budget, are not executed. With `downgrade`, they are validated on a `TABLESAMPLE` of their table
+sized to fit the budget instead, when their DataNode supports it. The estimated bytes of the run
+and of each DataNode are stored on the runner's `RunReport`.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+budget = ScanBudget(max_premise_bytes=10 * 1024 ** 3, max_run_bytes=100 * 1024 ** 3)
+runner = PremiseRunner(max_workers=8, budget=budget)
+runner.run(premises)
+
+runner.report.get("estimated_bytes")
+```
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional
+
+from .run_report import RunReport
+
+
+class ScanBudget:
+    """Limits on the bytes processed by the SQL DataPremises of a run, estimated by dry runs.
+
+    Args:
+        max_premise_bytes: Maximum bytes processed by a single DataPremise. Unbounded when not
+                           provided.
+        max_run_bytes: Maximum bytes processed by the whole run. Unbounded when not provided.
+        downgrade: When True, DataPremises exceeding the budget are validated on a sample of
+                   their table instead of not being executed.
+        min_sample_percent: Smallest sample, in percent of the table, a DataPremise is downgraded
+                            to. DataPremises that would need a smaller one are not executed
+                            (default: 1.0).
+        max_workers: Maximum number of dry runs executed at the same time (default: 8).
+    Attributes:
+        max_premise_bytes: Maximum bytes processed by a single DataPremise.
+        max_run_bytes: Maximum bytes processed by the whole run.
+        downgrade: Whether DataPremises exceeding the budget are sampled.
+        min_sample_percent: Smallest sample a DataPremise is downgraded to.
+        max_workers: Maximum number of dry runs executed at the same time.
+    Raises:
+        ValueError: If a budget is negative, min_sample_percent is not in the (0, 100] range or
+                    max_workers is lower than 1.
+    """
+
+    def __init__(
+        self,
+        max_premise_bytes: Optional[int] = None,
+        max_run_bytes: Optional[int] = None,
+        downgrade: bool = False,
+        min_sample_percent: float = 1.0,
+        max_workers: int = 8,
+    ):
+        for budget in (max_premise_bytes, max_run_bytes):
+            if budget is not None and budget < 0:
+                raise ValueError("byte budgets must not be negative")
+        if not 0 < min_sample_percent <= 100:
+            raise ValueError("min_sample_percent must be in the (0, 100] range")
+        if max_workers < 1:
+            raise ValueError("max_workers must be greater than 0")
+        self.max_premise_bytes = max_premise_bytes
+        self.max_run_bytes = max_run_bytes
+        self.downgrade = downgrade
+        self.min_sample_percent = min_sample_percent
+        self.max_workers = max_workers
+
+    @staticmethod
+    def _estimate(
+        premise: "pipeline_penguin.core.data_premise.DataPremise",
+    ) -> Optional[int]:
+        """Returns the estimated bytes of a DataPremise, or None if it cannot be estimated."""
+        try:
+            return premise.estimate_bytes()
+        except Exception:
+            # Left to the validation, which reports the error
+            return None
+
+    @staticmethod
+    async def _aestimate(
+        premise: "pipeline_penguin.core.data_premise.DataPremise",
+    ) -> Optional[int]:
+        """Awaitable version of `_estimate`."""
+        try:
+            return await premise.aestimate_bytes()
+        except Exception:
+            return None
+
+    @staticmethod
+    def _estimable(
+        premises: List["pipeline_penguin.core.data_premise.DataPremise"],
+    ) -> List["pipeline_penguin.core.data_premise.DataPremise"]:
+        """Returns the DataPremises supporting byte estimation."""
+        return [premise for premise in premises if hasattr(premise, "estimate_bytes")]
+
+    def estimate(
+        self, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> Dict["pipeline_penguin.core.data_premise.DataPremise", int]:
+        """Dry-runs the queries of the given DataPremises on a thread pool.
+
+        Args:
+            premises: DataPremises to be validated.
+        Returns:
+            A `dictionary` mapping every DataPremise that could be estimated to its bytes.
+        """
+        premises = self._estimable(premises)
+        if not premises:
+            return {}
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            estimates = list(executor.map(self._estimate, premises))
+        return {
+            premise: estimate
+            for premise, estimate in zip(premises, estimates)
+            if estimate is not None
+        }
+
+    async def aestimate(
+        self, premises: List["pipeline_penguin.core.data_premise.DataPremise"]
+    ) -> Dict["pipeline_penguin.core.data_premise.DataPremise", int]:
+        """Awaitable version of `estimate`, dry-running the queries on the running event loop."""
+        premises = self._estimable(premises)
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def estimate(premise):
+            async with semaphore:
+                return await self._aestimate(premise)
+
+        estimates = await asyncio.gather(*(estimate(premise) for premise in premises))
+        return {
+            premise: estimate
+            for premise, estimate in zip(premises, estimates)
+            if estimate is not None
+        }
+
+    def allocate(
+        self,
+        estimates: Dict["pipeline_penguin.core.data_premise.DataPremise", int],
+        spent: int = 0,
+        report: Optional[RunReport] = None,
+    ) -> Dict["pipeline_penguin.core.data_premise.DataPremise", float]:
+        """Decides which part of its table each estimated DataPremise may read.
+
+        The cheapest DataPremises are admitted first, so the per-run budget fits as many complete
+        validations as possible.
+
+        Args:
+            estimates: Estimated bytes of each DataPremise.
+            spent: Bytes already allocated to previous batches of the same run.
+            report: RunReport where the estimated bytes of the run ("estimated_bytes") and of
+                    each DataNode ("estimated_bytes.<node name>"), and the number of
+                    "refused_premises" and "sampled_premises", are stored.
+        Returns:
+            A `dictionary` mapping each DataPremise to the percent of its table it may read: 100
+            for a complete validation, 0 when it must not be executed.
+        """
+        allowances = {}
+        for premise, estimate in sorted(estimates.items(), key=lambda item: item[1]):
+            allowance = estimate
+            if self.max_premise_bytes is not None:
+                allowance = min(allowance, self.max_premise_bytes)
+            if self.max_run_bytes is not None:
+                allowance = min(allowance, max(self.max_run_bytes - spent, 0))
+
+            percent = 100.0
+            if estimate > allowance:
+                percent = 100.0 * allowance / estimate if self.downgrade else 0.0
+                if percent < self.min_sample_percent or not self._sampleable(premise):
+                    percent = 0.0
+            allowances[premise] = percent
+            spent += estimate * percent / 100
+
+        if report is not None:
+            self._report(estimates, allowances, report)
+        return allowances
+
+    @staticmethod
+    def _sampleable(premise: "pipeline_penguin.core.data_premise.DataPremise") -> bool:
+        """Returns whether a DataPremise can be validated on a sample of its table."""
+        sampleable = getattr(premise, "sampleable", None)
+        return callable(sampleable) and sampleable()
+
+    @staticmethod
+    def _report(
+        estimates: Dict["pipeline_penguin.core.data_premise.DataPremise", int],
+        allowances: Dict["pipeline_penguin.core.data_premise.DataPremise", float],
+        report: RunReport,
+    ) -> None:
+        """Stores the estimated bytes and the decisions of `allocate` on a RunReport."""
+        for premise, estimate in estimates.items():
+            report.increment("estimated_bytes", estimate)
+            report.increment(f"estimated_bytes.{premise.data_node.name}", estimate)
+        report.increment(
+            "refused_premises",
+            sum(1 for percent in allowances.values() if percent == 0),
+        )
+        report.increment(
+            "sampled_premises",
+            sum(1 for percent in allowances.values() if 0 < percent < 100),
+        )
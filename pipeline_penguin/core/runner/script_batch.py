@@ -0,0 +1,167 @@
+"""Core runner module, contains the `ScriptBatch` class.
+
+A ScriptBatch packs the queries of several DataPremiseSQL, possibly from different DataNodes, into
+a single multi-statement script executed through the `run_script` method of their Connector. The
+result of each statement is then given back to its DataPremise for building its PremiseOutput.
+
+Batches are limited both by number of queries and by the total length of the script, as databases
+limit the size of a single request (BigQuery accepts queries up to 1024K characters).
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+batches = ScriptBatch.plan(premises, batch_size=50)
+
+for premise, batch in batches.items():
+    output = batch.validate(premise)
+```
+"""
+from typing import Dict, Iterator, List, Tuple
+
+import pandas as pd
+
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from .run_report import RunReport
+from .shared_query import SharedQuery
+
+MAX_SCRIPT_LENGTH = 1_000_000
+
+
+class ScriptBatch(SharedQuery):
+    """Multi-statement script shared by several DataPremiseSQL using the same Connector.
+
+    Args:
+        premises: DataPremises whose queries are executed by the script.
+        connector: Connector shared by the DataPremises.
+    Attributes:
+        premises: DataPremises whose queries are executed by the script.
+        connector: Connector shared by the DataPremises.
+        queries: Dictionary mapping each DataPremise to its rendered query. The parameter
+                 placeholders of each statement are prefixed by its position ("s0_", ...).
+        parameters: Query parameters of every statement.
+    """
+
+    def __init__(
+        self,
+        premises: List["pipeline_penguin.core.data_premise.sql.DataPremiseSQL"],
+        connector: "pipeline_penguin.core.connector.sql.ConnectorSQL",
+    ):
+        super().__init__()
+        self.premises = premises
+        self.connector = connector
+        self.queries = {
+            premise: premise.render_query(f"s{i}_")
+            for i, premise in enumerate(premises)
+        }
+        self.parameters = {}
+        for i, premise in enumerate(premises):
+            self.parameters.update(premise.query_parameters(f"s{i}_"))
+
+    @classmethod
+    def plan(
+        cls,
+        premises: List["pipeline_penguin.core.data_premise.DataPremise"],
+        batch_size: int,
+        max_script_length: int = MAX_SCRIPT_LENGTH,
+    ) -> Dict["pipeline_penguin.core.data_premise.DataPremise", "ScriptBatch"]:
+        """Groups the batchable DataPremises by Connector into scripts.
+
+        Args:
+            premises: DataPremises to be validated.
+            batch_size: Maximum number of queries on a single script.
+            max_script_length: Maximum number of characters of a single script.
+        Returns:
+            A `dictionary` mapping every batched DataPremise to its ScriptBatch.
+        Raises:
+            ValueError: If "batch_size" is smaller than 2.
+        """
+        if batch_size < 2:
+            raise ValueError("batch_size must be greater than 1")
+
+        groups = {}
+        for premise in premises:
+            if not getattr(premise, "batchable", lambda: False)():
+                continue
+            try:
+                connector = premise.data_node.get_connector(premise.type)
+                length = len(premise.render_query()) + 2
+            except Exception:
+                continue
+            if hasattr(connector, "run_script") and length <= max_script_length:
+                group = groups.setdefault(id(connector), (connector, []))
+                group[1].append((premise, length))
+
+        scripts = {}
+        for connector, entries in groups.values():
+            for batch in cls._split(entries, batch_size, max_script_length):
+                if len(batch) > 1:
+                    script = cls(batch, connector)
+                    scripts.update({premise: script for premise in batch})
+        return scripts
+
+    @staticmethod
+    def _split(
+        entries: List[Tuple["pipeline_penguin.core.data_premise.DataPremise", int]],
+        batch_size: int,
+        max_script_length: int,
+    ) -> Iterator[List["pipeline_penguin.core.data_premise.DataPremise"]]:
+        """Splits (DataPremise, query length) pairs into batches respecting both limits."""
+        batch, batch_length = [], 0
+        for premise, length in entries:
+            if len(batch) >= batch_size or batch_length + length > max_script_length:
+                yield batch
+                batch, batch_length = [], 0
+            batch.append(premise)
+            batch_length += length
+        if batch:
+            yield batch
+
+    def _report(self) -> None:
+        """Reports the script on the RunReport of the current run, if any."""
+        report = RunReport.current()
+        if report is not None:
+            report.increment("batched_scripts")
+            report.increment("batched_queries", len(self.premises))
+
+    def execute(self) -> List[pd.DataFrame]:
+        """Executes the script.
+
+        Returns:
+            A `list` with the results of each query, in the order of the DataPremises.
+        """
+        queries = list(self.queries.values())
+        if self.parameters:
+            results = self.connector.run_script(queries, parameters=self.parameters)
+        else:
+            results = self.connector.run_script(queries)
+        self._report()
+        return results
+
+    async def aexecute(self) -> List[pd.DataFrame]:
+        """Awaitable version of `execute`."""
+        queries = list(self.queries.values())
+        if self.parameters:
+            results = await self.connector.arun_script(
+                queries, parameters=self.parameters
+            )
+        else:
+            results = await self.connector.arun_script(queries)
+        self._report()
+        return results
+
+    def build_output(
+        self,
+        premise: "pipeline_penguin.core.data_premise.sql.DataPremiseSQL",
+        results: List[pd.DataFrame],
+    ) -> PremiseOutput:
+        """Builds the PremiseOutput of a DataPremise from the result of its statement.
+
+        Args:
+            premise: One of the DataPremises of the script.
+            results: Results of every statement of the script.
+        Returns:
+            The `PremiseOutput` of the DataPremise.
+        """
+        return premise.build_output(results[self.premises.index(premise)])
@@ -0,0 +1,114 @@
+"""Core runner module, contains the abstract `SharedQuery` class.
+
+A SharedQuery is a query computing the results of several DataPremises at once (i.e. a
+`FusedScan` or a `ScriptBatch`). It is executed a single time, by the first DataPremise asking for
+its results, while the other DataPremises of the group wait for it, either on threads or on the
+event loop. If the shared query fails, each DataPremise falls back to its own validation.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+class MySharedQuery(SharedQuery):
+    def execute(self):
+        return connector.run(query)
+
+    async def aexecute(self):
+        return await connector.arun(query)
+
+    def build_output(self, premise, result):
+        return premise.build_output(result)
+```
+"""
+import asyncio
+import threading
+from typing import Any, Optional
+
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from pipeline_penguin.exceptions import DeadlineExceeded
+
+
+class SharedQuery:
+    """Abstract query executed once on behalf of a group of DataPremises."""
+
+    def __init__(self):
+        self._done = False
+        self._result: Any = None
+        self._error: Optional[Exception] = None
+        self._lock = threading.Lock()
+        self._future: Optional[asyncio.Future] = None
+
+    def execute(self) -> Any:
+        """Abstract method executing the shared query and returning its result."""
+        pass
+
+    async def aexecute(self) -> Any:
+        """Awaitable version of `execute`, runs it on a worker thread by default."""
+        return await asyncio.to_thread(self.execute)
+
+    def build_output(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise", result: Any
+    ) -> PremiseOutput:
+        """Abstract method building the PremiseOutput of a DataPremise from the shared result."""
+        pass
+
+    async def abuild_output(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise", result: Any
+    ) -> PremiseOutput:
+        """Awaitable version of `build_output`, for outputs requiring further queries."""
+        return self.build_output(premise, result)
+
+    def result(self) -> Any:
+        """Returns the result of the shared query, executing it on the first call.
+
+        Raises:
+            Exception: Any exception raised by the shared query.
+        """
+        with self._lock:
+            if not self._done:
+                try:
+                    self._result = self.execute()
+                except Exception as e:
+                    self._error = e
+                self._done = True
+            if self._error is not None:
+                raise self._error
+            return self._result
+
+    async def aresult(self) -> Any:
+        """Awaitable version of `result`. The query keeps running when the DataPremise that
+        started it is cancelled, as other DataPremises may still be waiting on it."""
+        if self._future is None:
+            self._future = asyncio.ensure_future(self.aexecute())
+        return await asyncio.shield(self._future)
+
+    def validate(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Validates a DataPremise of the group from the shared result.
+
+        Args:
+            premise: One of the DataPremises of the group.
+        Returns:
+            The `PremiseOutput` of the DataPremise.
+        """
+        try:
+            result = self.result()
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            return premise.validate()
+        return self.build_output(premise, result)
+
+    async def avalidate(
+        self, premise: "pipeline_penguin.core.data_premise.DataPremise"
+    ) -> PremiseOutput:
+        """Awaitable version of `validate`."""
+        try:
+            result = await self.aresult()
+        except DeadlineExceeded:
+            raise
+        except Exception:
+            return await premise.avalidate()
+        return await self.abuild_output(premise, result)
@@ -0,0 +1,201 @@
+"""Core runner module, contains the `WatermarkStore` class.
+
+The WatermarkStore enables incremental validations: DataNodes with a "watermark_column" (a
+monotonically increasing column, such as an ingestion timestamp or an incremental id) only
+validate the rows added since the last run.
+
+At the beginning of a run the store queries the current high-water mark of each DataNode and
+restricts its DataPremises to the rows in the `(last watermark, current watermark]` range. When
+the run finishes, the new watermark is persisted, optionally on a local JSON file, and the failed
+counts of the DataPremises are added to their running totals. A DataNode whose DataPremises did
+not all complete (errors, skipped or not run validations) or were validated on a sample of their
+rows (see `ScanBudget`) keeps its previous watermark, so its rows are validated again on the next
+run.
+
+A full rescan ignores the stored watermark and resets the running totals of the DataNodes.
+
+Location: pipeline_penguin/core/runner/
+
+Example usage:
+
+```python
+data_node.set_watermark("ingestion_time")
+watermarks = WatermarkStore(path=".pipeline_penguin/watermarks.json")
+
+node_manager.run_premises(watermarks=watermarks)
+watermarks.total(data_node.name, "check_nulls")
+
+node_manager.run_premises(watermarks=watermarks, full_rescan=True)
+```
+"""
+import asyncio
+import json
+import os
+import threading
+from typing import Dict, List, Optional
+
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
+
+
+class WatermarkStore:
+    """Store of the high-water marks and running failed totals of incremental DataNodes.
+
+    Args:
+        path: JSON file where the watermarks are persisted. Kept in memory only when not
+              provided.
+    Attributes:
+        path: JSON file where the watermarks are persisted.
+        watermarks: Dictionary mapping each DataNode name to its "watermark" (a SQL literal) and
+                    the running "totals" of its DataPremises.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.watermarks: Dict[str, dict] = {}
+        self._pending: Dict[str, dict] = {}
+        self._lock = threading.Lock()
+
+        if path and os.path.isfile(path):
+            with open(path) as watermarks_file:
+                self.watermarks = json.load(watermarks_file)
+
+    def watermark(self, node_name: str) -> Optional[str]:
+        """Returns the stored high-water mark of a DataNode as a SQL literal, if any."""
+        return self.watermarks.get(node_name, {}).get("watermark")
+
+    def total(self, node_name: str, premise_name: str) -> int:
+        """Returns the running total of failed rows of a DataPremise.
+
+        Args:
+            node_name: Name of the DataNode.
+            premise_name: Name of the DataPremise.
+        Returns:
+            The sum of the failed counts of every committed run since the last full rescan.
+        """
+        return self.watermarks.get(node_name, {}).get("totals", {}).get(premise_name, 0)
+
+    def reset(self, node_name: Optional[str] = None) -> None:
+        """Forgets the watermark and running totals of a DataNode, or of every DataNode when no
+        name is provided."""
+        with self._lock:
+            if node_name is None:
+                self.watermarks.clear()
+            else:
+                self.watermarks.pop(node_name, None)
+
+    @staticmethod
+    def _incremental(
+        nodes: List["pipeline_penguin.core.data_node.DataNode"],
+    ) -> List["pipeline_penguin.core.data_node.DataNode"]:
+        """Returns the DataNodes with a watermark column."""
+        return [node for node in nodes if getattr(node, "watermark_column", None)]
+
+    def begin(
+        self,
+        nodes: List["pipeline_penguin.core.data_node.DataNode"],
+        full_rescan: bool = False,
+    ) -> None:
+        """Restricts the incremental DataNodes to the rows added since their last watermark.
+
+        Args:
+            nodes: DataNodes about to be validated. Those without a watermark column are ignored.
+            full_rescan: When True, the stored watermarks are ignored and every row is validated.
+        """
+        for node in self._incremental(nodes):
+            low = None if full_rescan else self.watermark(node.name)
+            self._start(node, low, node.fetch_watermark(low), full_rescan)
+
+    async def abegin(
+        self,
+        nodes: List["pipeline_penguin.core.data_node.DataNode"],
+        full_rescan: bool = False,
+    ) -> None:
+        """Awaitable version of `begin`, querying the watermarks of every DataNode concurrently."""
+        nodes = self._incremental(nodes)
+        lows = [None if full_rescan else self.watermark(node.name) for node in nodes]
+        highs = await asyncio.gather(
+            *(node.afetch_watermark(low) for node, low in zip(nodes, lows))
+        )
+        for node, low, high in zip(nodes, lows, highs):
+            self._start(node, low, high, full_rescan)
+
+    def _start(
+        self,
+        node: "pipeline_penguin.core.data_node.DataNode",
+        low: Optional[str],
+        high: Optional[str],
+        full_rescan: bool,
+    ) -> None:
+        """Scopes a DataNode to the (low, high] range and tracks it until `commit`."""
+        if high is None:
+            # No rows beyond the previous watermark
+            high = low
+        node.watermark_range = (low, high)
+        with self._lock:
+            self._pending[node.name] = {
+                "node": node,
+                "watermark": high,
+                "full_rescan": full_rescan,
+                "outputs": {},
+            }
+
+    def record(self, premise_output: PremiseOutput) -> None:
+        """Stores the status and failed count of a DataPremise of an incremental DataNode, if any.
+
+        Args:
+            premise_output: PremiseOutput of the current run.
+        """
+        with self._lock:
+            pending = self._pending.get(premise_output.data_node.name)
+            if pending is not None:
+                pending["outputs"][premise_output.data_premise.name] = (
+                    premise_output.status,
+                    int(premise_output.failed_count or 0),
+                    premise_output.sampled,
+                )
+
+    def commit(self) -> None:
+        """Finishes the current run, removing the watermark range of the DataNodes and advancing
+        the watermark and running totals of those whose DataPremises all completed on every
+        row."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            for node_name, run in pending.items():
+                run["node"].watermark_range = None
+                outputs = run["outputs"]
+                if not all(
+                    name in outputs
+                    and outputs[name][0] in PremiseStatus.COMPLETED
+                    and not outputs[name][2]
+                    for name in run["node"].premises
+                ):
+                    continue
+
+                state = self.watermarks.get(node_name, {})
+                totals = {} if run["full_rescan"] else dict(state.get("totals", {}))
+                for name, (_, failed_count, _) in outputs.items():
+                    totals[name] = totals.get(name, 0) + failed_count
+                self.watermarks[node_name] = {
+                    "watermark": run["watermark"],
+                    "totals": totals,
+                }
+        self.save()
+
+    def save(self) -> None:
+        """Writes the watermarks to their JSON file, if a path was provided."""
+        if not self.path:
+            return
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with self._lock:
+            data = dict(self.watermarks)
+        temporary_path = f"{self.path}.tmp"
+        with open(temporary_path, "w") as watermarks_file:
+            json.dump(data, watermarks_file, indent=2, sort_keys=True)
+        os.replace(temporary_path, self.path)
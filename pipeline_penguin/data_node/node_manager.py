@@ -21,11 +21,26 @@ data_node = node_manager.create_node(
 bigquery_args.update({"source": "BigQuery", "premises": {}})
 
 node_manager.remove_node(name="Pipeline X - Table Y")
+
+# Creating every DataNode of a pipeline from a spec file, compiled once and cached on disk
+node_manager.load_spec("pipeline.yaml", cache_dir="/tmp/pipeline_penguin/plans")
 ```
 """
 import copy
+import datetime
 import inspect
-from typing import Type, Optional, Union, Any, List
+from contextlib import contextmanager
+from typing import (
+    Type,
+    Optional,
+    Union,
+    Any,
+    List,
+    Tuple,
+    Iterable,
+    Iterator,
+    AsyncIterator,
+)
 
 from pipeline_penguin.core.data_node import DataNode
 from pipeline_penguin.exceptions import (
@@ -34,6 +49,15 @@ from pipeline_penguin.exceptions import (
 )
 from pipeline_penguin.core.premise_output.output_formatter import OutputFormatter
 from pipeline_penguin.core.premise_output.output_manager import OutputManager
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from .pipeline_spec import PipelineSpec
+from pipeline_penguin.core.runner import (
+    PremiseRunner,
+    NodeScheduler,
+    RunOptions,
+    RunReport,
+    WatermarkStore,
+)
 
 
 class NodeManager:
@@ -41,9 +65,12 @@ class NodeManager:
 
     Attributes:
         __nodes: Protected dictionary for storing the added DataNodes.
+        last_report: RunReport of the last validation run.
     """
 
     _instance = None
+    # Margin for clock differences, a snapshot in the future is rejected by BigQuery
+    SNAPSHOT_LAG = datetime.timedelta(seconds=5)
 
     def __new__(cls):
         """Magic method for maintaining the singleton pattern."""
@@ -53,6 +80,7 @@ class NodeManager:
 
     def __init__(self):
         self.__nodes = {}
+        self.last_report: Optional[RunReport] = None
 
     @staticmethod
     def _is_data_node_class(node_factory: Any) -> bool:
@@ -96,6 +124,23 @@ class NodeManager:
         self.__nodes.update({name: node})
         return node
 
+    def load_spec(self, path: str, cache_dir: Optional[str] = None) -> List[DataNode]:
+        """Method for creating the DataNodes, DataPremises, relations and Connectors described
+        by a YAML or JSON spec file (see `PipelineSpec`).
+
+        Args:
+            path: Path to the spec file.
+            cache_dir: Directory where the compiled plan of the spec is cached, keyed by the
+                       content hash of the file.
+        Raises:
+            InvalidPipelineSpec: If the spec is not valid.
+        Returns:
+            A `list` with the newly created `DataNode` instances.
+        """
+        nodes = PipelineSpec(path, cache_dir).build()
+        self.__nodes.update({node.name: node for node in nodes})
+        return nodes
+
     def get_node(self, name: str) -> Optional[Type[DataNode]]:
         """Method for retrieving a DataNode by its name.
 
@@ -157,17 +202,214 @@ class NodeManager:
 
             return copied_node
 
-    def run_premises(self) -> OutputManager:
+    def run_premises(
+        self, options: Optional[RunOptions] = None, **kwargs
+    ) -> OutputManager:
         """Run DataPremise validations for every DataNode registered on the internal __nodes
         dictionary while storing their results on a OutputManager object.
 
+        Every (DataNode, DataPremise) pair is placed on a single work queue shared by all
+        DataNodes, so a slow DataPremise does not hold back the validations of other DataNodes.
+
+        Args:
+            options: RunOptions of the run (concurrency, lineage order, deadline, snapshot...).
+            **kwargs: Arguments of a RunOptions, overriding the ones of "options".
+        Raises:
+            CyclicNodeRelation: If lineage is used and the NodeRelations form a cycle.
         Returns:
             A `OutPutManager` instance consolidating all validation results on its "output"
             attribute
         """
+        options = RunOptions.of(options, **kwargs)
+        with self._run(options) as (runner, scheduler):
+            if options.watermarks is not None:
+                options.watermarks.begin(
+                    list(self.__nodes.values()), options.full_rescan
+                )
+            for premises in scheduler.batches():
+                scheduler.record(premises, runner.run(premises))
+
+        return self._group_outputs(scheduler.outputs)
+
+    async def arun_premises(
+        self, options: Optional[RunOptions] = None, **kwargs
+    ) -> OutputManager:
+        """Awaitable version of `run_premises`, validating the DataPremises of every DataNode on
+        the running event loop. Without a "max_workers" (or "max_concurrency") option, every
+        DataPremise may be in flight at the same time.
+
+        Args:
+            options: RunOptions of the run.
+            **kwargs: Arguments of a RunOptions, overriding the ones of "options".
+        Raises:
+            CyclicNodeRelation: If lineage is used and the NodeRelations form a cycle.
+        Returns:
+            A `OutPutManager` instance consolidating all validation results on its "output"
+            attribute
+        """
+        options = RunOptions.of(options, **kwargs)
+        with self._run(options) as (runner, scheduler):
+            if options.watermarks is not None:
+                await options.watermarks.abegin(
+                    list(self.__nodes.values()), options.full_rescan
+                )
+            for premises in scheduler.batches():
+                scheduler.record(premises, await runner.arun(premises))
+
+        return self._group_outputs(scheduler.outputs)
+
+    def iter_run(
+        self, options: Optional[RunOptions] = None, **kwargs
+    ) -> Iterator[PremiseOutput]:
+        """Streaming version of `run_premises`, yielding every PremiseOutput as soon as its
+        validation finishes instead of collecting them on an OutputManager.
+
+        No reference to the yielded outputs is kept, so memory usage does not grow with the
+        number of DataPremises as long as the consumer releases them after use.
+
+        Args:
+            options: RunOptions of the run.
+            **kwargs: Arguments of a RunOptions, overriding the ones of "options".
+        Raises:
+            CyclicNodeRelation: If lineage is used and the NodeRelations form a cycle.
+        Yields:
+            The `PremiseOutput` of every DataPremise, in the order they finished.
+        """
+        options = RunOptions.of(options, **kwargs)
+        watermarks = options.watermarks
+        with self._run(options, stream=True) as (runner, scheduler):
+            if watermarks is not None:
+                watermarks.begin(list(self.__nodes.values()), options.full_rescan)
+            for premises in scheduler.batches():
+                yield from self._pop_outputs(scheduler, watermarks)
+                for premise, premise_output in runner.iter_run(premises):
+                    scheduler.record_output(premise, premise_output)
+                    yield from self._pop_outputs(scheduler, watermarks)
+
+            yield from self._pop_outputs(scheduler, watermarks)
+
+    async def aiter_run(
+        self, options: Optional[RunOptions] = None, **kwargs
+    ) -> AsyncIterator[PremiseOutput]:
+        """Asynchronous version of `iter_run`, validating the DataPremises on the running event
+        loop.
+
+        Args:
+            options: RunOptions of the run.
+            **kwargs: Arguments of a RunOptions, overriding the ones of "options".
+        Raises:
+            CyclicNodeRelation: If lineage is used and the NodeRelations form a cycle.
+        Yields:
+            The `PremiseOutput` of every DataPremise, in the order they finished.
+        """
+        options = RunOptions.of(options, **kwargs)
+        watermarks = options.watermarks
+        with self._run(options, stream=True) as (runner, scheduler):
+            if watermarks is not None:
+                await watermarks.abegin(
+                    list(self.__nodes.values()), options.full_rescan
+                )
+            for premises in scheduler.batches():
+                for premise_output in self._pop_outputs(scheduler, watermarks):
+                    yield premise_output
+                async for premise, premise_output in runner.aiter_run(premises):
+                    scheduler.record_output(premise, premise_output)
+                    for stored_output in self._pop_outputs(scheduler, watermarks):
+                        yield stored_output
+
+            for premise_output in self._pop_outputs(scheduler, watermarks):
+                yield premise_output
+
+    @contextmanager
+    def _run(
+        self, options: RunOptions, stream: bool = False
+    ) -> Iterator[Tuple[PremiseRunner, NodeScheduler]]:
+        """Prepares a validation run shared by `run_premises`, `arun_premises`, `iter_run` and
+        `aiter_run`: pins the table snapshot of the run and, once it ends, unpins it and commits
+        the watermarks.
+
+        Args:
+            options: RunOptions of the run.
+            stream: Whether the outputs are streamed, in which case they are recorded on the
+                    WatermarkStore as they are yielded instead of at the end of the run.
+        Yields:
+            The `PremiseRunner` and `NodeScheduler` executing the run.
+        """
+        runner = options.runner()
+        self.last_report = runner.report
+        scheduler = NodeScheduler(self.__nodes, options.lineage, options.fail_fast)
+
+        try:
+            self._pin_snapshot(options.snapshot, runner.report)
+            yield runner, scheduler
+        finally:
+            if options.snapshot is not False:
+                self._pin_snapshot(None)
+            self._commit_watermarks(
+                options.watermarks, [] if stream else scheduler.outputs.values()
+            )
+
+    def _pin_snapshot(
+        self,
+        snapshot: Union[bool, datetime.datetime, None],
+        report: Optional[RunReport] = None,
+    ) -> None:
+        """Pins the DataNodes supporting it to a single table snapshot, reporting its POSIX
+        timestamp as "snapshot_timestamp", or unpins them when "snapshot" is None.
+
+        Args:
+            snapshot: True for the current time, a datetime, None for unpinning the DataNodes or
+                      False for leaving them as they are.
+            report: RunReport where the snapshot timestamp is stored.
+        """
+        if snapshot is False:
+            return
+        if snapshot is True:
+            snapshot = datetime.datetime.now(datetime.timezone.utc) - self.SNAPSHOT_LAG
+        elif snapshot is not None and snapshot.tzinfo is None:
+            snapshot = snapshot.replace(tzinfo=datetime.timezone.utc)
+
+        for data_node in self.__nodes.values():
+            if hasattr(data_node, "set_snapshot"):
+                data_node.set_snapshot(snapshot)
+        if report is not None and snapshot is not None:
+            report.set("snapshot_timestamp", snapshot.timestamp())
+
+    @staticmethod
+    def _pop_outputs(
+        scheduler: NodeScheduler, watermarks: Optional[WatermarkStore]
+    ) -> Iterator[PremiseOutput]:
+        """Yields the outputs ready on the scheduler, recording them on the WatermarkStore."""
+        for premise_output in scheduler.pop_outputs():
+            if watermarks is not None:
+                watermarks.record(premise_output)
+            yield premise_output
+
+    @staticmethod
+    def _commit_watermarks(
+        watermarks: Optional[WatermarkStore], premise_outputs: Iterable[PremiseOutput]
+    ) -> None:
+        """Records the outputs of a run on the WatermarkStore, if any, and commits it."""
+        if watermarks is None:
+            return
+        for premise_output in premise_outputs:
+            watermarks.record(premise_output)
+        watermarks.commit()
+
+    def _group_outputs(self, premise_outputs: dict) -> OutputManager:
+        """Groups PremiseOutputs back by DataNode.
+
+        Args:
+            premise_outputs: Dictionary mapping each DataPremise to its PremiseOutput.
+        Returns:
+            An `OutputManager` holding one OutputManager for each DataNode.
+        """
         output_manager = OutputManager()
         for name, data_node in self.__nodes.items():
-            results = data_node.run_premises()
-            output_manager.outputs[name] = results
+            node_premises = list(data_node.premises.values())
+            node_outputs = [premise_outputs[premise] for premise in node_premises]
+            output_manager.outputs[name] = data_node._collect_outputs(
+                node_premises, node_outputs
+            )
 
         return output_manager
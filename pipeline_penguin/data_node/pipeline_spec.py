@@ -0,0 +1,516 @@
+"""Contains the `PipelineSpec` object, which builds the DataNodes, DataPremises, relations and
+Connectors of a pipeline from a declarative YAML or JSON file.
+
+A spec is compiled into an execution plan: every class is resolved to its module, every
+constructor call is validated by building the objects once (DataPremises through
+`insert_premise`), and the result is reduced to plain data. With a cache directory, the plan is
+stored under the content hash of the spec, so later loads of an unchanged spec (i.e. Cloud
+Function cold starts) skip parsing and validation, import only the modules used by the pipeline
+and build the objects directly. Any change to the spec file produces a new hash and a new plan.
+
+Classes are referenced by name (for the classes shipped with pipeline_penguin) or by their full
+dotted path. Constructor arguments given as a mapping with a "class" key are built as objects,
+such as a PartitionFilter. Connectors are instantiated on every load, as they hold credentials,
+and are either registered as default Connectors or attached to the DataNodes naming them.
+
+Location: pipeline_penguin/data_node/
+
+Example usage:
+
+```yaml
+connectors:
+  - name: bigquery
+    class: ConnectorSQLBigQuery
+    limits: {max_concurrency: 50}
+nodes:
+  - name: raw_orders
+    class: DataNodeBigQuery
+    args: {project_id: my_project, dataset_id: raw, table_id: orders}
+    premises:
+      - name: check_nulls
+        class: DataPremiseSQLCheckIsNull
+        args: {column: order_id}
+  - name: trusted_orders
+    class: DataNodeBigQuery
+    args:
+      project_id: my_project
+      dataset_id: trusted
+      table_id: orders
+      partition_filter: {class: PartitionFilter, args: {days: 1}}
+relations:
+  - {source: raw_orders, destination: trusted_orders}
+```
+
+```python
+nodes = node_manager.load_spec("pipeline.yaml", cache_dir="/tmp/pipeline_penguin/plans")
+
+# Or, without registering the DataNodes on the NodeManager
+nodes = PipelineSpec("pipeline.yaml", cache_dir="/tmp/pipeline_penguin/plans").build()
+```
+"""
+import hashlib
+import importlib
+import inspect
+import json
+import os
+import threading
+from typing import Any, List, Optional, Tuple
+
+from pipeline_penguin.connector.connector_manager import ConnectorManager
+from pipeline_penguin.core.connector import Connector
+from pipeline_penguin.core.data_node import DataNode
+from pipeline_penguin.core.data_premise import DataPremise
+from pipeline_penguin.exceptions import InvalidPipelineSpec
+
+# Modules of the classes that may be referenced by name in a spec
+BUILTIN_CLASSES = {
+    "ConnectorSQLBigQuery": "pipeline_penguin.connector.sql.bigquery",
+    "DataNodeBigQuery": "pipeline_penguin.data_node.sql.bigquery",
+    "PartitionFilter": "pipeline_penguin.data_node.sql.partition_filter",
+    "DataPremiseSQLCheckArithmeticOperationEqualsResult": "pipeline_penguin.data_premise.sql.check_arithmetic",
+    "DataPremiseSQLCheckValuesAreBetween": "pipeline_penguin.data_premise.sql.check_between",
+    "DataPremiseSQLCheckLogicalComparisonWithValue": "pipeline_penguin.data_premise.sql.check_comparison",
+    "DataPremiseSQLCheckDistinct": "pipeline_penguin.data_premise.sql.check_distinct",
+    "DataPremiseSQLCheckInArray": "pipeline_penguin.data_premise.sql.check_in",
+    "DataPremiseSQLCheckLikePattern": "pipeline_penguin.data_premise.sql.check_like",
+    "DataPremiseSQLCheckIsNull": "pipeline_penguin.data_premise.sql.check_null",
+    "DataPremiseSQLCheckRegexpContains": "pipeline_penguin.data_premise.sql.check_regexp",
+    "SQLExpression": "pipeline_penguin.core.data_premise.sql_value",
+}
+
+ClassPath = Tuple[str, str]
+
+
+class PipelineSpec:
+    """Declarative description of a pipeline, stored on a YAML or JSON file.
+
+    YAML files (".yaml" or ".yml") require the PyYAML package. Cached plans are JSON files; plans
+    holding values JSON cannot represent (i.e. YAML dates) are compiled on every load. Before a
+    plan is executed, every class it names is checked to be a Connector, DataNode or DataPremise
+    subclass matching its entry, and object arguments are restricted to classes from the modules
+    on `ARGUMENT_MODULES`, so a tampered plan file cannot call arbitrary functions.
+
+    Args:
+        path: Path to the spec file.
+        cache_dir: Directory where compiled plans are stored. Specs are compiled on every load
+                   when not provided.
+    Attributes:
+        path: Path to the spec file.
+        cache_dir: Directory where compiled plans are stored.
+        digest: Content hash of the spec file, identifying its compiled plan.
+    """
+
+    # Changing the layout of compiled plans must increase it, invalidating the cached ones
+    PLAN_FORMAT = 2
+    # Module prefixes of the classes accepted as object arguments (i.e. a PartitionFilter). The
+    # modules of custom argument classes must be added to it.
+    ARGUMENT_MODULES = ("pipeline_penguin.",)
+
+    def __init__(self, path: str, cache_dir: Optional[str] = None):
+        self.path = path
+        self.cache_dir = cache_dir
+        with open(path, "rb") as spec_file:
+            self._content = spec_file.read()
+        self.digest = hashlib.sha256(
+            f"{self.PLAN_FORMAT}:".encode("utf-8") + self._content
+        ).hexdigest()
+
+    def parse(self) -> dict:
+        """Reads the spec file as a dictionary.
+
+        Returns:
+            A `dictionary` with the "nodes", "relations" and "connectors" of the spec.
+        Raises:
+            InvalidPipelineSpec: If the file cannot be parsed or is not a mapping.
+            ImportError: If the spec is a YAML file and PyYAML is not installed.
+        """
+        text = self._content.decode("utf-8")
+        try:
+            if os.path.splitext(self.path)[1].lower() in (".yaml", ".yml"):
+                try:
+                    import yaml
+                except ImportError:
+                    raise ImportError("PyYAML is required for reading YAML specs")
+                spec = yaml.safe_load(text)
+            else:
+                spec = json.loads(text)
+        except ImportError:
+            raise
+        except Exception as e:
+            raise InvalidPipelineSpec(f"{self.path} could not be parsed: {e}")
+
+        if not isinstance(spec, dict):
+            raise InvalidPipelineSpec(f"{self.path} must contain a mapping")
+        return spec
+
+    def plan(self) -> dict:
+        """Returns the compiled plan of the spec, from the cache directory when available.
+
+        Returns:
+            A `dictionary` with the plan, using only built-in data types.
+        Raises:
+            InvalidPipelineSpec: If the spec is not valid.
+        """
+        plan = self._load()
+        if plan is not None:
+            try:
+                self._classes(plan)
+            except InvalidPipelineSpec:
+                # Plans naming unexpected classes are discarded and compiled again
+                plan = None
+        if plan is None:
+            plan = self.compile(self.parse())
+            self._dump(plan)
+        return plan
+
+    def build(self) -> List[DataNode]:
+        """Builds the Connectors, DataNodes, DataPremises and relations of the spec.
+
+        Connectors without DataNodes naming them are registered on the ConnectorManager as
+        default Connectors.
+
+        Returns:
+            A `list` with the DataNodes of the spec, in the order they were declared.
+        Raises:
+            InvalidPipelineSpec: If the spec is not valid.
+        """
+        return self.execute(self.plan())
+
+    @classmethod
+    def compile(cls, spec: dict) -> dict:
+        """Compiles a spec into a plan, validating every class and constructor call.
+
+        Args:
+            spec: Dictionary with the "nodes", "relations" and "connectors" of the spec.
+        Returns:
+            A `dictionary` with the plan, using only built-in data types.
+        Raises:
+            InvalidPipelineSpec: If the spec is not valid.
+        """
+        unknown = set(spec) - {"nodes", "relations", "connectors"}
+        if unknown:
+            raise InvalidPipelineSpec(f"unknown spec sections: {sorted(unknown)}")
+
+        connectors = [
+            cls._compile_connector(entry) for entry in cls._list(spec, "connectors")
+        ]
+        connector_names = {connector["name"] for connector in connectors}
+        if len(connector_names) != len(connectors):
+            raise InvalidPipelineSpec("connector names must be unique")
+
+        nodes = []
+        for entry in cls._list(spec, "nodes"):
+            node = cls._compile_node(entry)
+            for name in node["connectors"]:
+                if name not in connector_names:
+                    raise InvalidPipelineSpec(
+                        f"node {node['name']} uses the unknown connector {name}"
+                    )
+            nodes.append(node)
+        node_names = {node["name"] for node in nodes}
+        if len(node_names) != len(nodes):
+            raise InvalidPipelineSpec("node names must be unique")
+
+        relations = []
+        for entry in cls._list(spec, "relations"):
+            if not isinstance(entry, dict) or set(entry) != {"source", "destination"}:
+                raise InvalidPipelineSpec(
+                    "relations must have a source and a destination"
+                )
+            for name in entry.values():
+                if name not in node_names:
+                    raise InvalidPipelineSpec(f"relation uses the unknown node {name}")
+            relations.append([entry["source"], entry["destination"]])
+
+        return {"connectors": connectors, "nodes": nodes, "relations": relations}
+
+    @classmethod
+    def execute(cls, plan: dict) -> List[DataNode]:
+        """Builds the objects of a compiled plan, without validating them again.
+
+        Args:
+            plan: Plan returned by `compile`.
+        Returns:
+            A `list` with the DataNodes of the plan.
+        Raises:
+            InvalidPipelineSpec: If the plan names a class not allowed on its entry.
+        """
+        classes = cls._classes(plan)
+        connectors = {}
+        used = {name for node in plan["nodes"] for name in node["connectors"]}
+        for entry in plan["connectors"]:
+            connector = cls._import(entry["class"], classes)(
+                **cls._arguments(entry["args"], classes)
+            )
+            if entry["limits"]:
+                connector.set_limits(**entry["limits"])
+            if entry["name"] not in used:
+                ConnectorManager().define_default(connector)
+            connectors[entry["name"]] = connector
+
+        nodes = {}
+        for entry in plan["nodes"]:
+            node = cls._import(entry["class"], classes)(
+                entry["name"], **cls._arguments(entry["args"], classes)
+            )
+            for name in entry["connectors"]:
+                connector = connectors[name]
+                node.connectors[f"{connector.type}{connector.source}"] = connector
+            for premise in entry["premises"]:
+                node.premises[premise["name"]] = cls._import(premise["class"], classes)(
+                    premise["name"], node, **cls._arguments(premise["args"], classes)
+                )
+            nodes[entry["name"]] = node
+
+        for source, destination in plan["relations"]:
+            nodes[source].add_relation(nodes[destination], isDestination=True)
+        return list(nodes.values())
+
+    @classmethod
+    def _classes(cls, plan: dict) -> dict:
+        """Imports every class named by a plan, checking that Connectors, DataNodes and
+        DataPremises are subclasses of their base class and object arguments come from the
+        `ARGUMENT_MODULES`.
+
+        Args:
+            plan: Plan returned by `compile`, possibly read from the cache directory.
+        Returns:
+            A `dictionary` mapping each class path of the plan to its class.
+        Raises:
+            InvalidPipelineSpec: If the plan is malformed or names a class not allowed on its
+                                 entry.
+        """
+        classes = {}
+
+        def check(path: Any, base: Optional[type]) -> None:
+            if (
+                not isinstance(path, (list, tuple))
+                or len(path) != 2
+                or not all(isinstance(part, str) for part in path)
+            ):
+                raise InvalidPipelineSpec(f"invalid class path on plan: {path}")
+            cls._check_class(tuple(path), base, classes)
+
+        def check_arguments(args: dict) -> None:
+            for value in args.values():
+                if isinstance(value, dict) and "class" in value:
+                    check(value["class"], None)
+                    check_arguments(value["args"])
+
+        try:
+            for entry in plan["connectors"]:
+                check(entry["class"], Connector)
+                check_arguments(entry["args"])
+            for entry in plan["nodes"]:
+                check(entry["class"], DataNode)
+                check_arguments(entry["args"])
+                for premise in entry["premises"]:
+                    check(premise["class"], DataPremise)
+                    check_arguments(premise["args"])
+        except (KeyError, TypeError, AttributeError):
+            raise InvalidPipelineSpec("the plan is malformed")
+        return classes
+
+    @classmethod
+    def _check_class(
+        cls, path: ClassPath, base: Optional[type], classes: Optional[dict] = None
+    ) -> type:
+        """Imports a class, checking that it is a subclass of "base" or, without a base, that
+        its module is on `ARGUMENT_MODULES`."""
+        name = ".".join(path)
+        if base is None and not path[0].startswith(cls.ARGUMENT_MODULES):
+            raise InvalidPipelineSpec(
+                f"{name} is not allowed as an argument, its module must be on "
+                "PipelineSpec.ARGUMENT_MODULES"
+            )
+        try:
+            factory = cls._import(path, classes)
+        except (ImportError, AttributeError, ValueError):
+            raise InvalidPipelineSpec(f"class {name} could not be imported")
+        if not inspect.isclass(factory) or (
+            base is not None and (factory is base or not issubclass(factory, base))
+        ):
+            kind = base.__name__ if base is not None else "class"
+            raise InvalidPipelineSpec(f"{name} is not a {kind} subclass")
+        return factory
+
+    @staticmethod
+    def _list(entry: dict, key: str) -> list:
+        """Returns a list entry of a spec, which may be missing."""
+        value = entry.get(key) or []
+        if not isinstance(value, list):
+            raise InvalidPipelineSpec(f"{key} must be a list")
+        return value
+
+    @staticmethod
+    def _mapping(entry: dict, key: str, context: str) -> dict:
+        """Returns a mapping entry of a spec, which may be missing."""
+        value = entry.get(key) or {}
+        if not isinstance(value, dict):
+            raise InvalidPipelineSpec(f"{key} of {context} must be a mapping")
+        return value
+
+    @staticmethod
+    def _name(entry: Any, kind: str, keys: Tuple[str, ...]) -> str:
+        """Returns the name of a spec entry, checking that it only has the given keys."""
+        if not isinstance(entry, dict) or not isinstance(entry.get("name"), str):
+            raise InvalidPipelineSpec(f"every {kind} must be a mapping with a name")
+        unknown = set(entry) - {"name", "class", *keys}
+        if unknown:
+            raise InvalidPipelineSpec(
+                f"unknown keys on {kind} {entry['name']}: {sorted(unknown)}"
+            )
+        return entry["name"]
+
+    @classmethod
+    def _compile_connector(cls, entry: dict) -> dict:
+        """Compiles a Connector entry. Connectors are not instantiated, as they may require
+        credentials only available where the plan is executed."""
+        name = cls._name(entry, "connector", ("args", "limits"))
+        limits = cls._mapping(entry, "limits", f"connector {name}")
+        unknown = set(limits) - {"max_concurrency", "requests_per_second", "burst"}
+        if unknown:
+            raise InvalidPipelineSpec(f"unknown limits of connector {name}: {unknown}")
+        return {
+            "name": name,
+            "class": cls._resolve(entry.get("class"), Connector),
+            "args": cls._compile_arguments(
+                cls._mapping(entry, "args", f"connector {name}")
+            ),
+            "limits": limits,
+        }
+
+    @classmethod
+    def _compile_node(cls, entry: dict) -> dict:
+        """Compiles a DataNode entry, validating it and its DataPremises by building them once,
+        the DataPremises through `DataNode.insert_premise`."""
+        name = cls._name(entry, "node", ("args", "connectors", "premises"))
+        context = f"node {name}"
+        node_class = cls._resolve(entry.get("class"), DataNode)
+        args = cls._compile_arguments(cls._mapping(entry, "args", context))
+        connectors = cls._list(entry, "connectors")
+
+        try:
+            node = cls._import(node_class)(name, **cls._arguments(args))
+        except TypeError as e:
+            raise InvalidPipelineSpec(f"{context} could not be built: {e}")
+
+        premises = []
+        for premise_entry in cls._list(entry, "premises"):
+            premise_name = cls._name(premise_entry, "premise", ("args",))
+            premise_context = f"premise {premise_name} of {context}"
+            premise_class = cls._resolve(premise_entry.get("class"), DataPremise)
+            premise_args = cls._compile_arguments(
+                cls._mapping(premise_entry, "args", premise_context)
+            )
+            if premise_name in node.premises:
+                raise InvalidPipelineSpec(f"{premise_context} is declared twice")
+            try:
+                node.insert_premise(
+                    premise_name,
+                    cls._import(premise_class),
+                    **cls._arguments(premise_args),
+                )
+            except Exception as e:
+                raise InvalidPipelineSpec(f"{premise_context} could not be built: {e}")
+            premises.append(
+                {"name": premise_name, "class": premise_class, "args": premise_args}
+            )
+
+        return {
+            "name": name,
+            "class": node_class,
+            "args": args,
+            "connectors": connectors,
+            "premises": premises,
+        }
+
+    @classmethod
+    def _compile_arguments(cls, args: dict) -> dict:
+        """Resolves the classes of the object arguments (mappings with a "class" key)."""
+        compiled = {}
+        for key, value in args.items():
+            if isinstance(value, dict) and "class" in value:
+                unknown = set(value) - {"class", "args"}
+                if unknown:
+                    raise InvalidPipelineSpec(
+                        f"unknown keys on argument {key}: {unknown}"
+                    )
+                value = {
+                    "class": cls._resolve(value["class"]),
+                    "args": cls._compile_arguments(
+                        cls._mapping(value, "args", f"argument {key}")
+                    ),
+                }
+            compiled[key] = value
+        return compiled
+
+    @classmethod
+    def _arguments(cls, args: dict, classes: Optional[dict] = None) -> dict:
+        """Builds the constructor arguments of a plan entry, instantiating object arguments."""
+        built = {}
+        for key, value in args.items():
+            if isinstance(value, dict) and "class" in value:
+                value = cls._import(value["class"], classes)(
+                    **cls._arguments(value["args"], classes)
+                )
+            built[key] = value
+        return built
+
+    @classmethod
+    def _resolve(cls, name: Any, base: Optional[type] = None) -> ClassPath:
+        """Resolves a class name of the spec into its module and name, checking that it is a
+        subclass of "base" (see `_check_class`)."""
+        if not isinstance(name, str) or not name:
+            raise InvalidPipelineSpec("every entry must have a class")
+        if name in BUILTIN_CLASSES:
+            path = (BUILTIN_CLASSES[name], name)
+        elif "." in name:
+            path = tuple(name.rsplit(".", 1))
+        else:
+            raise InvalidPipelineSpec(f"unknown class {name}, use its full dotted path")
+
+        cls._check_class(path, base)
+        return path
+
+    @staticmethod
+    def _import(path: ClassPath, classes: Optional[dict] = None) -> type:
+        """Imports a class from its module and name, memoized on "classes"."""
+        path = tuple(path)
+        if classes is not None and path in classes:
+            return classes[path]
+        factory = getattr(importlib.import_module(path[0]), path[1])
+        if classes is not None:
+            classes[path] = factory
+        return factory
+
+    def _plan_path(self) -> str:
+        """Returns the file storing the compiled plan of this spec."""
+        return os.path.join(self.cache_dir, f"{self.digest}.json")
+
+    def _load(self) -> Optional[dict]:
+        """Reads the compiled plan of this spec from the cache directory, if any."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._plan_path()) as plan_file:
+                plan = json.load(plan_file)
+        except (OSError, UnicodeDecodeError, json.JSONDecodeError):
+            # Missing or unreadable plans are compiled again
+            return None
+        return plan if isinstance(plan, dict) else None
+
+    def _dump(self, plan: dict) -> None:
+        """Writes the compiled plan of this spec on the cache directory, if any."""
+        if not self.cache_dir:
+            return
+        try:
+            content = json.dumps(plan)
+        except (TypeError, ValueError):
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        plan_path = self._plan_path()
+        temporary_path = f"{plan_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        with open(temporary_path, "w") as plan_file:
+            plan_file.write(content)
+        os.replace(temporary_path, plan_path)
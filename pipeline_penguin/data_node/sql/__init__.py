@@ -6,4 +6,4 @@ abstracting a single data source on an existing data pipeline.
 
 Location: pipeline_penguin/data_node/sql/
 """
-__all__ = ["bigquery"]
+__all__ = ["bigquery", "partition_filter"]
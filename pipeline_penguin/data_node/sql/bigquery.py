@@ -22,14 +22,37 @@ data_node.insert_premise(
     "check_nulls", DataPremiseSQLCheckIsNull, column="test_column"
 )
 result = data_node.run_premises()
+
+# Validate only the newest partition and the rows of a given country
+data_node.set_scope(
+    partition_filter=PartitionFilter(days=1), row_filter="country = 'BR'"
+)
+
+# Validate only the rows ingested since the last run (see `WatermarkStore`)
+data_node.set_watermark("ingestion_time")
+
+# Read every premise from the same snapshot of the table
+data_node.set_snapshot(datetime.datetime.now(datetime.timezone.utc))
+
+# Row count, size, modification time, partitioning and schema of the table, shared by every
+# DataNode of the dataset (see `TableCatalog`)
+data_node.table_metadata().row_count
 ```
 """
 
+import datetime
+import numbers
+from typing import Any, Optional, Tuple, Union
+
+import pandas as pd
+
 from pipeline_penguin.core.data_node import DataNode, NodeType
 from pipeline_penguin.core.data_premise import PremiseType
 from pipeline_penguin.connector.connector_manager import ConnectorManager
 from pipeline_penguin.exceptions import WrongTypeReference
 from pipeline_penguin.connector.sql.bigquery import ConnectorSQLBigQuery
+from pipeline_penguin.connector.sql.table_catalog import TableMetadata
+from .partition_filter import PartitionFilter
 
 
 class DataNodeBigQuery(DataNode):
@@ -41,24 +64,233 @@ class DataNodeBigQuery(DataNode):
         project_id: GCP project where the data is stored.
         dataset_id: BigQuery's dataset where the data is stored.
         table_id: BigQuery's table containing the data.
+        partition_filter: Optional PartitionFilter (or SQL predicate on the partition column)
+                          restricting the validations to a range of partitions.
+        row_filter: Optional SQL predicate restricting the rows read by the validations.
+        watermark_column: Optional monotonically increasing column (i.e. an ingestion timestamp
+                          or id) used for validating only the rows added since the last run.
     Attributes:
         name: Name for this datanode.
         project_id: GCP project where the data is stored.
         dataset_id: BigQuery's dataset where the data is stored.
         table_id: BigQuery's table containing the data.
+        partition_filter: PartitionFilter (or SQL predicate) scoping the validations.
+        row_filter: SQL predicate scoping the validations.
+        watermark_column: Monotonically increasing column used for incremental validations.
+        watermark_range: `(low, high)` tuple of SQL literals with the watermark range of the
+                         current run, set by a `WatermarkStore`. None outside of a run.
+        snapshot_time: Timezone-aware datetime of the table snapshot read by the DataPremises,
+                       through `FOR SYSTEM_TIME AS OF`. The current data is read when None.
         premises: Dictionary holding every data_premise inserted
         supported_premise_types: Array of premise types allowed to be inserted on the data_node.
         source: Type of data source, it is always "BigQuery".
     """
 
-    def __init__(self, name, project_id, dataset_id, table_id):
+    def __init__(
+        self,
+        name,
+        project_id,
+        dataset_id,
+        table_id,
+        partition_filter: Optional[Union[PartitionFilter, str]] = None,
+        row_filter: Optional[str] = None,
+        watermark_column: Optional[str] = None,
+    ):
         """Initialize the constructor."""
         super().__init__(name, NodeType.BIG_QUERY)
         self.project_id = project_id
         self.dataset_id = dataset_id
         self.table_id = table_id
+        self.partition_filter = partition_filter
+        self.row_filter = row_filter
+        self.watermark_column = watermark_column
+        self.watermark_range: Optional[Tuple[Optional[str], Optional[str]]] = None
+        self.snapshot_time: Optional[datetime.datetime] = None
         self.supported_premise_types = [PremiseType.SQL]
 
+    def set_scope(
+        self,
+        partition_filter: Optional[Union[PartitionFilter, str]] = None,
+        row_filter: Optional[str] = None,
+    ) -> None:
+        """Restricts the data read by every DataPremise of this DataNode. Calling it without
+        arguments removes the current scope.
+
+        Args:
+            partition_filter: PartitionFilter (or SQL predicate on the partition column)
+                              restricting the validations to a range of partitions.
+            row_filter: SQL predicate restricting the rows read by the validations.
+        """
+        self.partition_filter = partition_filter
+        self.row_filter = row_filter
+
+    def set_watermark(self, column: Optional[str]) -> None:
+        """Sets the monotonically increasing column used for validating only the rows added since
+        the last run. Calling it with None disables incremental validations.
+
+        Args:
+            column: Watermark column, such as an ingestion timestamp or an incremental id.
+        """
+        self.watermark_column = column
+        self.watermark_range = None
+
+    def set_snapshot(self, snapshot_time: Optional[datetime.datetime]) -> None:
+        """Pins the DataPremises of this DataNode to the snapshot of the table at the given time,
+        so all of them read the same data regardless of concurrent writes. Calling it with None
+        reads the current data again.
+
+        Args:
+            snapshot_time: Time of the snapshot, within the time travel window of the table.
+                           Naive datetimes are considered to be in UTC.
+        """
+        if snapshot_time is not None and snapshot_time.tzinfo is None:
+            snapshot_time = snapshot_time.replace(tzinfo=datetime.timezone.utc)
+        self.snapshot_time = snapshot_time
+
+    def _table_source(
+        self, table: Optional[str] = None, sample_percent: Optional[float] = None
+    ) -> str:
+        """Returns the table reference, followed by the `FOR SYSTEM_TIME AS OF` clause when a
+        snapshot is pinned and by the `TABLESAMPLE` clause when sampled."""
+        if table is None:
+            table = f"`{self.project_id}.{self.dataset_id}.{self.table_id}`"
+        if self.snapshot_time is not None:
+            table += f" FOR SYSTEM_TIME AS OF {self.sql_literal(self.snapshot_time)}"
+        if sample_percent is not None:
+            table += f" TABLESAMPLE SYSTEM ({float(sample_percent):g} PERCENT)"
+        return table
+
+    def table_metadata(self) -> Optional[TableMetadata]:
+        """Returns the metadata of this DataNode's table from the TableCatalog of its connector,
+        which fetches the metadata of the whole dataset with a single query.
+
+        Returns:
+            The `TableMetadata` of the table, or None if the table does not exist.
+        """
+        connector = self.get_connector(PremiseType.SQL)
+        return connector.catalog.get(self.project_id, self.dataset_id, self.table_id)
+
+    async def atable_metadata(self) -> Optional[TableMetadata]:
+        """Awaitable version of `table_metadata`."""
+        connector = self.get_connector(PremiseType.SQL)
+        return await connector.catalog.aget(
+            self.project_id, self.dataset_id, self.table_id
+        )
+
+    def watermark_query(self, low: Optional[str] = None) -> str:
+        """Builds the SQL query returning the current high-water mark of this DataNode, on a
+        "watermark" column.
+
+        Args:
+            low: SQL literal with the previous high-water mark, if any.
+        Returns:
+            A `string` with the SQL query.
+        """
+        table = self._table_source()
+        conditions = [self.scope_condition(watermark=False)]
+        if low is not None:
+            conditions.append(f"{self.watermark_column} > {low}")
+        query = f"SELECT MAX({self.watermark_column}) AS watermark FROM {table}"
+        conditions = [condition for condition in conditions if condition]
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        return query
+
+    def fetch_watermark(self, low: Optional[str] = None) -> Optional[str]:
+        """Queries the current high-water mark of this DataNode.
+
+        Args:
+            low: SQL literal with the previous high-water mark, if any.
+        Returns:
+            A `string` with the high-water mark as a SQL literal, or None if there are no rows
+            beyond "low".
+        """
+        connector = self.get_connector(PremiseType.SQL)
+        data_frame = connector.run(self.watermark_query(low))
+        return self.sql_literal(data_frame["watermark"][0])
+
+    async def afetch_watermark(self, low: Optional[str] = None) -> Optional[str]:
+        """Awaitable version of `fetch_watermark`."""
+        connector = self.get_connector(PremiseType.SQL)
+        data_frame = await connector.arun(self.watermark_query(low))
+        return self.sql_literal(data_frame["watermark"][0])
+
+    @staticmethod
+    def sql_literal(value: Any) -> Optional[str]:
+        """Converts a value read from BigQuery into a SQL literal of the same type.
+
+        Args:
+            value: Value to be converted.
+        Returns:
+            A `string` with the SQL literal, or None for null values.
+        """
+        if value is None or (not isinstance(value, str) and pd.isna(value)):
+            return None
+        if isinstance(value, numbers.Number) and not isinstance(value, bool):
+            return str(value)
+        if isinstance(value, datetime.datetime):
+            kind = "DATETIME" if value.tzinfo is None else "TIMESTAMP"
+            return f"{kind} '{value.isoformat(sep=' ')}'"
+        if isinstance(value, datetime.date):
+            return f"DATE '{value.isoformat()}'"
+        escaped = str(value).replace("\\", "\\\\").replace("'", "\\'")
+        return f"'{escaped}'"
+
+    def scope_condition(self, watermark: bool = True) -> Optional[str]:
+        """Builds the SQL predicate combining the partition and row filters of this DataNode and,
+        during an incremental run, its watermark range.
+
+        Args:
+            watermark: Whether the watermark range is included (default: True).
+        Returns:
+            A `string` with the predicate, or None if the DataNode is not scoped.
+        """
+        conditions = []
+        if isinstance(self.partition_filter, PartitionFilter):
+            conditions.append(self.partition_filter.render())
+        elif self.partition_filter:
+            conditions.append(self.partition_filter)
+        if self.row_filter:
+            conditions.append(self.row_filter)
+        if watermark and self.watermark_range is not None:
+            conditions.append(self._watermark_condition(*self.watermark_range))
+        if not conditions:
+            return None
+        return " AND ".join(f"({condition})" for condition in conditions)
+
+    def _watermark_condition(self, low: Optional[str], high: Optional[str]) -> str:
+        """Builds the SQL predicate selecting the rows in the (low, high] watermark range."""
+        if high is None:
+            return "FALSE"
+        condition = f"{self.watermark_column} <= {high}"
+        if low is not None:
+            condition = f"{self.watermark_column} > {low} AND {condition}"
+        return condition
+
+    def scoped_table(
+        self, table: Optional[str] = None, sample_percent: Optional[float] = None
+    ) -> str:
+        """Builds the table expression read by the DataPremises of this DataNode.
+
+        When the DataNode is scoped, the table is replaced by a subquery filtering it, so
+        BigQuery prunes the partitions (and columns) not used by the validation. When a snapshot
+        is pinned, the table is read `FOR SYSTEM_TIME AS OF` its time.
+
+        Args:
+            table: Table reference to be scoped, this DataNode's table by default.
+            sample_percent: When provided, only this percent of the table's storage blocks is
+                            read (`TABLESAMPLE SYSTEM`).
+        Returns:
+            A `string` with the table reference or the filtering subquery.
+        """
+        table = self._table_source(table, sample_percent)
+        condition = self.scope_condition()
+        if condition is None:
+            if sample_percent is None:
+                return table
+            return f"(SELECT * FROM {table})"
+        return f"(SELECT * FROM {table} WHERE {condition})"
+
     def get_connector(self, premise_type: str) -> ConnectorSQLBigQuery:
         """Method for retrieving the Connector to be used while querying data from
         this DataNode.
@@ -101,5 +333,15 @@ class DataNodeBigQuery(DataNode):
             "dataset_id": self.dataset_id,
             "table_id": self.table_id,
         }
+        if self.partition_filter is not None:
+            result["partition_filter"] = (
+                self.partition_filter.to_serializeble_dict()
+                if isinstance(self.partition_filter, PartitionFilter)
+                else self.partition_filter
+            )
+        if self.row_filter is not None:
+            result["row_filter"] = self.row_filter
+        if self.watermark_column is not None:
+            result["watermark_column"] = self.watermark_column
 
         return result
@@ -0,0 +1,91 @@
+"""Contains the `PartitionFilter` constructor, which restricts the validations of a
+`DataNodeBigQuery` to a relative range of the partitions of its table.
+
+The filter is rendered as a predicate on the partition column (or on the `_PARTITIONTIME`
+pseudo-column of ingestion-time partitioned tables) using constant expressions relative to the
+current date, so BigQuery can prune every partition outside of the range before scanning.
+
+Location: pipeline_penguin/data_node/sql
+
+Example usage:
+
+```python
+# Only the partitions of yesterday and today
+data_node.set_scope(partition_filter=PartitionFilter(days=2))
+
+# Only yesterday's partition of a table partitioned by a DATE column
+data_node.set_scope(
+    partition_filter=PartitionFilter("event_date", days=1, offset=1, data_type="DATE")
+)
+```
+"""
+
+
+class PartitionFilter:
+    """Relative date range on the partition column of a BigQuery table.
+
+    The range covers `days` days, ending `offset` days before the current date (inclusive).
+
+    Args:
+        column: Partition column, "_PARTITIONTIME" by default.
+        days: Number of daily partitions in the range (default: 1).
+        offset: Number of days between the current date and the last day of the range
+                (default: 0).
+        data_type: Type of the partition column, either "TIMESTAMP", "DATETIME" or "DATE"
+                   (default: "TIMESTAMP").
+    Attributes:
+        column: Partition column.
+        days: Number of daily partitions in the range.
+        offset: Number of days between the current date and the last day of the range.
+        data_type: Type of the partition column.
+    Raises:
+        ValueError: If days is lower than 1, offset is negative or data_type is not supported.
+    """
+
+    DATA_TYPES = ("TIMESTAMP", "DATETIME", "DATE")
+
+    def __init__(
+        self,
+        column: str = "_PARTITIONTIME",
+        days: int = 1,
+        offset: int = 0,
+        data_type: str = "TIMESTAMP",
+    ):
+        if days < 1:
+            raise ValueError("days must be greater than 0")
+        if offset < 0:
+            raise ValueError("offset must not be negative")
+        if data_type.upper() not in self.DATA_TYPES:
+            raise ValueError(f"data_type must be one of {', '.join(self.DATA_TYPES)}")
+        self.column = column
+        self.days = int(days)
+        self.offset = int(offset)
+        self.data_type = data_type.upper()
+
+    def render(self) -> str:
+        """Builds the SQL predicate selecting the partitions in the range.
+
+        Returns:
+            A `string` with the SQL predicate.
+        """
+        first_day = self.offset + self.days - 1
+        start = f"DATE_SUB(CURRENT_DATE(), INTERVAL {first_day} DAY)"
+        end = f"DATE_SUB(CURRENT_DATE(), INTERVAL {self.offset - 1} DAY)"
+        if self.data_type != "DATE":
+            start = f"{self.data_type}({start})"
+            end = f"{self.data_type}({end})"
+        return f"{self.column} >= {start} AND {self.column} < {end}"
+
+    def to_serializeble_dict(self) -> dict:
+        """Returns a dictionary representation of the current PartitionFilter using only built-in
+        data types.
+
+        Returns:
+            dict -> Dictionary containing attributes of this PartitionFilter.
+        """
+        return {
+            "column": self.column,
+            "days": self.days,
+            "offset": self.offset,
+            "data_type": self.data_type,
+        }
@@ -14,6 +14,7 @@ from .check_in import DataPremiseSQLCheckInArray
 from .check_like import DataPremiseSQLCheckLikePattern
 from .check_regexp import DataPremiseSQLCheckRegexpContains
 from .check_comparison import DataPremiseSQLCheckLogicalComparisonWithValue
+from pipeline_penguin.core.data_premise.sql_value import SQLExpression
 
 __all__ = [
     "DataPremiseSQLCheckIsNull",
@@ -24,4 +25,5 @@ __all__ = [
     "DataPremiseSQLCheckLikePattern",
     "DataPremiseSQLCheckRegexpContains",
     "DataPremiseSQLCheckLogicalComparisonWithValue",
+    "SQLExpression",
 ]
@@ -16,6 +16,8 @@ data_node.insert_premise(check_arithmetic_prem)
 ```
 """
 
+import pandas as pd
+
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
 from pipeline_penguin.exceptions import WrongTypeReference
@@ -47,6 +49,8 @@ class DataPremiseSQLCheckArithmeticOperationEqualsResult(DataPremiseSQL):
         "/"]
     """
 
+    parameter_names = ("second_term", "expected_result")
+
     def __init__(
         self,
         name: str,
@@ -63,6 +67,9 @@ class DataPremiseSQLCheckArithmeticOperationEqualsResult(DataPremiseSQL):
                 f"Operator not supported, supported operators: {supported_operators}"
             )
         self.query_template = "SELECT {column} as result FROM `{project}.{dataset}.{table}` WHERE {column} {operator} {second_term} = {expected_result}"
+        self.condition_template = (
+            "{column} {operator} {second_term} = {expected_result}"
+        )
         self.operator = operator
         self.second_term = second_term
         self.expected_result = expected_result
@@ -84,17 +91,14 @@ class DataPremiseSQLCheckArithmeticOperationEqualsResult(DataPremiseSQL):
             "expected_result": self.expected_result,
         }
 
-    def validate(self) -> PremiseOutput:
-        """Method for executing the validation over the DataNode.
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Method for building the results of this validation from the query results.
 
+        Args:
+            data_frame: Results of the validation query.
         Returns:
             PremiseOutput: Object storeing the results for this validation.
         """
-
-        query = self.query_template.format(**self.query_args())
-        connector = self.data_node.get_connector(self.type)
-        data_frame = connector.run(query)
-
         failed_count = len(data_frame["result"])
         passed = failed_count == 0
 
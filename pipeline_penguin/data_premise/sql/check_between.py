@@ -14,7 +14,17 @@ data_node.insert_premise(check_between_prem)
 """
 
 
+import datetime
+from decimal import Decimal
+from typing import Union
+
+import pandas as pd
+
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
+from pipeline_penguin.core.data_premise.sql_value import (
+    SQLExpression,
+    parse_sql_literal,
+)
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
 from pipeline_penguin.core.data_node.data_node import DataNode
 
@@ -27,8 +37,10 @@ class DataPremiseSQLCheckValuesAreBetween(DataPremiseSQL):
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
         column: Column to be read by the premise.
-        lower_bound: Minimum allowed value for the column
-        upper_bound: Maximum allowed value for the column
+        lower_bound: Minimum allowed value for the column, sent as a query parameter. Strings are
+                     read as SQL literals (i.e. "10" or "DATE '2020-01-01'") and converted into
+                     typed values, and SQL code must be wrapped on a `SQLExpression`.
+        upper_bound: Maximum allowed value for the column, given like "lower_bound".
     Attributes:
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
@@ -36,18 +48,27 @@ class DataPremiseSQLCheckValuesAreBetween(DataPremiseSQL):
         column: Column to be read by the premise.
         lower_bound: Minimum allowed value for the column
         upper_bound: Maximum allowed value for the column
+    Raises:
+        ValueError: If a bound is a string which is not a SQL literal.
     """
 
+    parameter_names = ("lower_bound", "upper_bound")
+
     def __init__(
         self,
         name: str,
         data_node: DataNode,
         column: str,
-        lower_bound: str,
-        upper_bound: str,
+        lower_bound: Union[int, float, Decimal, datetime.date, str, SQLExpression],
+        upper_bound: Union[int, float, Decimal, datetime.date, str, SQLExpression],
     ):
 
         self.query_template = "SELECT {column} as result FROM `{project}.{dataset}.{table}` WHERE  {column} BETWEEN {lower_bound} AND {upper_bound}"
+        self.condition_template = "{column} BETWEEN {lower_bound} AND {upper_bound}"
+        if isinstance(lower_bound, str):
+            lower_bound = parse_sql_literal(lower_bound)
+        if isinstance(upper_bound, str):
+            upper_bound = parse_sql_literal(upper_bound)
         self.lower_bound = lower_bound
         self.upper_bound = upper_bound
         super().__init__(name, data_node, column)
@@ -68,17 +89,14 @@ class DataPremiseSQLCheckValuesAreBetween(DataPremiseSQL):
             "upper_bound": self.upper_bound,
         }
 
-    def validate(self) -> PremiseOutput:
-        """Method for executing the validation over the DataNode.
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Method for building the results of this validation from the query results.
 
+        Args:
+            data_frame: Results of the validation query.
         Returns:
             PremiseOutput: Object storeing the results for this validation.
         """
-
-        query = self.query_template.format(**self.query_args())
-        connector = self.data_node.get_connector(self.type)
-        data_frame = connector.run(query)
-
         failed_count = len(data_frame["result"])
         passed = failed_count == 0
 
@@ -13,7 +13,17 @@ data_node.insert_premise(check_logical_prem)
 ```
 """
 
+import datetime
+from decimal import Decimal
+from typing import Union
+
+import pandas as pd
+
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
+from pipeline_penguin.core.data_premise.sql_value import (
+    SQLExpression,
+    parse_sql_literal,
+)
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
 from pipeline_penguin.exceptions import WrongTypeReference
 from pipeline_penguin.core.data_node.data_node import DataNode
@@ -28,7 +38,9 @@ class DataPremiseSQLCheckLogicalComparisonWithValue(DataPremiseSQL):
         data_node: Reference to the DataNode used in the validation.
         column: Column to be read by the premise.
         operator: The logical operator (<,<=,=,=>,!=,<>).
-        value: Value for the second term of the operation.
+        value: Value for the second term of the operation, sent as a query parameter. Strings are
+               read as SQL literals (i.e. "10", "'abc'" or "DATE '2020-01-01'") and converted into
+               typed values, and SQL code must be wrapped on a `SQLExpression`.
     Attributes:
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
@@ -39,15 +51,18 @@ class DataPremiseSQLCheckLogicalComparisonWithValue(DataPremiseSQL):
     Raises:
         WrongTypeReference: If the "operator" argument is not a supported character ["<","<=","=",
         "=>","!=","<>"]
+        ValueError: If the value is a string which is not a SQL literal.
     """
 
+    parameter_names = ("value",)
+
     def __init__(
         self,
         name: str,
         data_node: DataNode,
         column: str,
         operator: str,
-        value: str,
+        value: Union[int, float, Decimal, datetime.date, str, SQLExpression],
     ):
         supported_operators = [
             "<",
@@ -63,7 +78,10 @@ class DataPremiseSQLCheckLogicalComparisonWithValue(DataPremiseSQL):
             )
 
         self.query_template = "SELECT {column} result FROM `{project}.{dataset}.{table}` WHERE {column} {operator} {value}"
+        self.condition_template = "{column} {operator} {value}"
         self.operator = operator
+        if isinstance(value, str):
+            value = parse_sql_literal(value)
         self.value = value
         super().__init__(name, data_node, column)
 
@@ -83,17 +101,14 @@ class DataPremiseSQLCheckLogicalComparisonWithValue(DataPremiseSQL):
             "value": self.value,
         }
 
-    def validate(self) -> PremiseOutput:
-        """Method for executing the validation over the DataNode.
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Method for building the results of this validation from the query results.
 
+        Args:
+            data_frame: Results of the validation query.
         Returns:
             PremiseOutput: Object storeing the results for this validation.
         """
-
-        query = self.query_template.format(**self.query_args())
-        connector = self.data_node.get_connector(self.type)
-        data_frame = connector.run(query)
-
         failed_count = len(data_frame["result"])
         passed = failed_count == 0
 
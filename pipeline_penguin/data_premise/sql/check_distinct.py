@@ -9,30 +9,127 @@ check_distinct_prem = DataPremiseSQLCheckDistinct(
     "test_name", data_node, "test_column"
 )
 data_node.insert_premise(check_distinct_prem)
+
+# Approximate count with HyperLogLog++, for high-cardinality columns
+data_node.insert_premise(
+    "unique_ids", DataPremiseSQLCheckDistinct, "id", approximate=True, tolerance=0.005
+)
+
+# Approximate count on every DataPremiseSQLCheckDistinct not choosing a mode
+DataPremiseSQLCheckDistinct.approximate = True
 ```
 """
+import math
+from typing import Optional
+
+import pandas as pd
+
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
-from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
 from pipeline_penguin.core.data_node.data_node import DataNode
 
 
 class DataPremiseSQLCheckDistinct(DataPremiseSQL):
     """This DataPremise is responsible for validating if all values of a column are distinct.
 
+    In approximate mode the distinct values are counted with BigQuery's HyperLogLog++ sketches
+    (`HLL_COUNT`), which avoids the shuffle of an exact `COUNT(DISTINCT)` on high-cardinality
+    columns. The sketch precision is the smallest one whose error bound, at about 95% confidence,
+    is within the given tolerance. The error bound is reported on the output. The column fails when
+    the estimated number of duplicated values (the row count minus the distinct estimate, at least
+    0) exceeds the error bound. Any estimate within the error bound, including estimates at or above
+    the row count, cannot tell whether the column has duplicates, so its output is always
+    "Inconclusive" and does not pass the validation: approximate mode never passes a column.
+
     Args:
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
         column: Column to be read by the premise.
+        approximate: Whether the distinct values are counted approximately. Uses the class
+                     attribute (False by default) when not provided.
+        tolerance: Maximum relative error of the approximate distinct count. Uses the class
+                   attribute (0.01 by default) when not provided.
     Attributes:
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
         type: Type indicator of the premise. It is always "SQL".
         column: Column to be read by the premise.
+        approximate: Whether the distinct values are counted approximately. Setting it on the
+                     class changes the default of every premise not choosing a mode.
+        tolerance: Maximum relative error of the approximate distinct count.
+    Raises:
+        ValueError: If the tolerance cannot be met by the largest sketch precision.
     """
 
-    def __init__(self, name: str, data_node: DataNode, column: str):
+    approximate = False
+    tolerance = 0.01
+    # Precisions accepted by HLL_COUNT.INIT
+    MIN_PRECISION = 10
+    MAX_PRECISION = 24
+    # Relative standard error of HyperLogLog is 1.04 / sqrt(2 ** precision), doubled for ~95%
+    ERROR_FACTOR = 2 * 1.04
+
+    def __init__(
+        self,
+        name: str,
+        data_node: DataNode,
+        column: str,
+        approximate: Optional[bool] = None,
+        tolerance: Optional[float] = None,
+    ):
         super().__init__(name, data_node, column)
-        self.query_template = "SELECT count(DISTINCT {column}) distinct, count({column}) total as total FROM `{project}.{dataset}.{table}`"
+        if approximate is not None:
+            self.approximate = approximate
+        if tolerance is not None:
+            self.tolerance = tolerance
+        # Fails early on unreachable tolerances
+        self.precision()
+
+    @property
+    def query_template(self) -> str:
+        """SQL template of the exact or approximate validation query."""
+        distinct = "count(DISTINCT {column})"
+        if self.approximate:
+            distinct = (
+                f"HLL_COUNT.EXTRACT(HLL_COUNT.INIT({{column}}, {self.precision()}))"
+            )
+        return (
+            f"SELECT {distinct} as result, count({{column}}) as total "
+            "FROM `{project}.{dataset}.{table}`"
+        )
+
+    def _plan_state(self) -> Optional[tuple]:
+        """Adds the mode and tolerance to the versions the QueryPlan depends on, as they may be
+        changed on the class."""
+        state = super()._plan_state()
+        if state is None:
+            return None
+        return state + (self.approximate, self.tolerance)
+
+    def precision(self) -> int:
+        """Returns the smallest HyperLogLog++ precision meeting the tolerance.
+
+        Raises:
+            ValueError: If the tolerance is not positive or is smaller than the error of the
+                        largest precision.
+        """
+        if self.tolerance <= 0:
+            raise ValueError("tolerance must be greater than 0")
+        precision = math.ceil(2 * math.log2(self.ERROR_FACTOR / self.tolerance))
+        if precision > self.MAX_PRECISION:
+            raise ValueError(
+                f"tolerance must be at least {self.relative_error(self.MAX_PRECISION):.6f}"
+            )
+        return max(precision, self.MIN_PRECISION)
+
+    @classmethod
+    def relative_error(cls, precision: int) -> float:
+        """Returns the relative error bound of an approximate distinct count of the given
+        precision."""
+        return cls.ERROR_FACTOR / math.sqrt(2**precision)
 
     def query_args(self):
         """Method for returning the arguments to be passed on the query template of this
@@ -48,21 +145,73 @@ class DataPremiseSQLCheckDistinct(DataPremiseSQL):
             "column": self.column,
         }
 
-    def validate(self) -> PremiseOutput:
-        """Method for executing the validation over the DataNode.
+    def failed_count_expression(self, prefix: str = "") -> Optional[str]:
+        """Builds the SQL expression counting the duplicated values of the column, for fused
+        scans.
 
         Returns:
-            PremiseOutput: Object storeing the results for this validation.
+            A `string` with the expression, or None in approximate mode, whose failed count is
+            not exact.
         """
+        if self.approximate:
+            return None
+        return "COUNT({column}) - COUNT(DISTINCT {column})".format(**self.query_args())
+
+    def sample_query(self, limit: int) -> str:
+        """Builds a SQL query returning a sample of the duplicated values of the column.
 
-        query = self.query_template.format(**self.query_args())
-        connector = self.data_node.get_connector(self.type)
-        data_frame = connector.run(query)
+        Args:
+            limit: Maximum number of rows returned.
+        Returns:
+            A `string` with the SQL query.
+        """
+        args = self.query_args()
+        return (
+            f"SELECT {args['column']} AS result, COUNT(*) AS occurrences "
+            f"FROM {self.table_reference()} GROUP BY 1 HAVING COUNT(*) > 1 "
+            f"LIMIT {int(limit)}"
+        )
 
-        passed = data_frame["result"][0] == data_frame["total"][0]
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Method for building the results of this validation from the query results.
+
+        Args:
+            data_frame: Results of the validation query.
+        Returns:
+            PremiseOutput: Object storeing the results for this validation.
+        """
         failed_count = data_frame["total"][0] - data_frame["result"][0]
+        if not self.approximate:
+            return PremiseOutput(
+                self,
+                self.data_node,
+                self.column,
+                failed_count == 0,
+                failed_count,
+                data_frame,
+            )
 
+        # The estimate may exceed the number of values
+        failed_count = max(failed_count, 0)
+        precision = self.precision()
+        error_bound = math.ceil(
+            self.relative_error(precision) * data_frame["result"][0]
+        )
+        data_frame = data_frame.assign(error_bound=error_bound)
+        if failed_count > error_bound:
+            status = PremiseStatus.FAILED
+        else:
+            status = PremiseStatus.INCONCLUSIVE
         output = PremiseOutput(
-            self, self.data_node, self.column, passed, failed_count, data_frame
+            self,
+            self.data_node,
+            self.column,
+            False,
+            failed_count,
+            data_frame,
+            status=status,
+        )
+        output.message = (
+            f"approximate count (precision {precision}), error bound: {error_bound}"
         )
         return output
@@ -14,6 +14,8 @@ data_node.insert_premise(check_in_prem)
 """
 
 from typing import Union
+import pandas as pd
+
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
 from pipeline_penguin.exceptions import WrongTypeReference
@@ -28,7 +30,8 @@ class DataPremiseSQLCheckInArray(DataPremiseSQL):
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
         column: Column to be read by the premise.
-        array: List of values to be matched against the column.
+        array: List of values to be matched against the column, sent as an array query
+               parameter. A string is still accepted as a SQL array literal.
     Attributes:
         name: Name for the data premise.
         data_node: Reference to the DataNode used in the validation.
@@ -37,6 +40,8 @@ class DataPremiseSQLCheckInArray(DataPremiseSQL):
         array: List of values to be matched against the column.
     """
 
+    parameter_names = ("array",)
+
     def __init__(
         self,
         name: str,
@@ -44,10 +49,8 @@ class DataPremiseSQLCheckInArray(DataPremiseSQL):
         column: str,
         array: Union[str, list, float, bool],
     ):
-        if type(array) == "list":
-            array = str(array)
-
-        self.query_template = "SELECT {column} as result result FROM `{project}.{dataset}.{table}` WHERE {column} IN UNNEST({array})"
+        self.query_template = "SELECT {column} as result FROM `{project}.{dataset}.{table}` WHERE {column} IN UNNEST({array})"
+        self.condition_template = "{column} IN UNNEST({array})"
         self.array = array
         super().__init__(name, data_node, column)
 
@@ -66,17 +69,27 @@ class DataPremiseSQLCheckInArray(DataPremiseSQL):
             "array": self.array,
         }
 
-    def validate(self) -> PremiseOutput:
-        """Method for executing the validation over the DataNode.
+    def query_parameters(self, prefix: str = "") -> dict:
+        """Returns the array sent as a query parameter, unless it was given as a SQL array
+        literal.
 
+        Args:
+            prefix: Prefix added to the parameter name.
         Returns:
-            PremiseOutput: Object storeing the results for this validation.
+            A `dictionary` mapping the parameter name to the array.
         """
+        if isinstance(self.array, str):
+            return {}
+        return super().query_parameters(prefix)
 
-        query = self.query_template.format(**self.query_args())
-        connector = self.data_node.get_connector(self.type)
-        data_frame = connector.run(query)
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Method for building the results of this validation from the query results.
 
+        Args:
+            data_frame: Results of the validation query.
+        Returns:
+            PremiseOutput: Object storeing the results for this validation.
+        """
         failed_count = len(data_frame["result"])
         passed = failed_count == 0
 
@@ -9,6 +9,8 @@ check_null_prem = DataPremiseSQLCheckIsNull("test_name", data_node, "test_column
 data_node.insert_premise(check_null_prem)
 ```
 """
+import pandas as pd
+
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
 from pipeline_penguin.core.data_node.data_node import DataNode
@@ -32,6 +34,7 @@ class DataPremiseSQLCheckIsNull(DataPremiseSQL):
 
         super().__init__(name, data_node, column)
         self.query_template = "SELECT count(*) as total FROM `{project}.{dataset}.{table}` WHERE {column} is null"
+        self.condition_template = "{column} is null"
 
     def query_args(self):
         """Method for returning the arguments to be passed on the query template of this
@@ -47,17 +50,14 @@ class DataPremiseSQLCheckIsNull(DataPremiseSQL):
             "column": self.column,
         }
 
-    def validate(self) -> PremiseOutput:
-        """Method for executing the validation over the DataNode.
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Method for building the results of this validation from the query results.
 
+        Args:
+            data_frame: Results of the validation query.
         Returns:
             PremiseOutput: Object storeing the results for this validation.
         """
-
-        query = self.query_template.format(**self.query_args())
-        connector = self.data_node.get_connector(self.type)
-        data_frame = connector.run(query)
-
         failed_count = data_frame["total"][0]
         passed = failed_count == 0
 
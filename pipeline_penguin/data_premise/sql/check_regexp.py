@@ -13,6 +13,8 @@ data_node.insert_premise(check_regexp_prem)
 ```
 """
 
+import pandas as pd
+
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
 from pipeline_penguin.exceptions import WrongTypeReference
@@ -36,6 +38,8 @@ class DataPremiseSQLCheckRegexpContains(DataPremiseSQL):
         pattern: String with regex pattern to be matched against the column. Supports golang regexp.
     """
 
+    parameter_names = ("pattern",)
+
     def __init__(
         self,
         name: str,
@@ -44,7 +48,8 @@ class DataPremiseSQLCheckRegexpContains(DataPremiseSQL):
         pattern: str,
     ):
 
-        self.query_template = 'SELECT {column} result FROM `{project}.{dataset}.{table}` WHERE REGEXP_CONTAINS({column}, r"{pattern}")'
+        self.query_template = "SELECT {column} result FROM `{project}.{dataset}.{table}` WHERE REGEXP_CONTAINS({column}, {pattern})"
+        self.condition_template = "REGEXP_CONTAINS({column}, {pattern})"
         self.pattern = pattern
         super().__init__(name, data_node, column)
 
@@ -63,17 +68,14 @@ class DataPremiseSQLCheckRegexpContains(DataPremiseSQL):
             "pattern": self.pattern,
         }
 
-    def validate(self) -> PremiseOutput:
-        """Method for executing the validation over the DataNode.
+    def build_output(self, data_frame: pd.DataFrame) -> PremiseOutput:
+        """Method for building the results of this validation from the query results.
 
+        Args:
+            data_frame: Results of the validation query.
         Returns:
             PremiseOutput: Object storeing the results for this validation.
         """
-
-        query = self.query_template.format(**self.query_args())
-        connector = self.data_node.get_connector(self.type)
-        data_frame = connector.run(query)
-
         failed_count = len(data_frame["result"])
         passed = failed_count == 0
 
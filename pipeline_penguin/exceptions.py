@@ -30,3 +30,22 @@ class WrongTypeReference(Exception):
     """Raised when reference is the wrong type."""
 
     pass
+
+
+class CyclicNodeRelation(Exception):
+    """Raised when the NodeRelations between DataNodes form a cycle."""
+
+    pass
+
+
+class DeadlineExceeded(Exception):
+    """Raised when a request is made after the deadline of the validation run expired."""
+
+    pass
+
+
+class InvalidPipelineSpec(Exception):
+    """Raised when a pipeline spec file does not describe valid DataNodes, DataPremises,
+    relations or Connectors."""
+
+    pass
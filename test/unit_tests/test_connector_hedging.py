@@ -0,0 +1,85 @@
+import pytest
+
+from pipeline_penguin.core.connector import HedgingPolicy
+from pipeline_penguin.core.runner import RunReport
+
+
+class TestHedgingPolicy:
+    def test_rejects_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            HedgingPolicy(percentile=0)
+        with pytest.raises(ValueError):
+            HedgingPolicy(max_extra_fraction=-0.1)
+
+    def test_threshold_needs_min_samples(self):
+        policy = HedgingPolicy(min_samples=3)
+        policy.finished("SELECT 1", 1.0, None)
+        policy.finished("SELECT 1", 2.0, None)
+        assert policy.threshold("SELECT 1") is None
+
+        policy.finished("SELECT 1", 3.0, None)
+        assert policy.threshold("SELECT 1") == 3.0
+        assert policy.threshold("SELECT 2") is None
+
+    def test_threshold_is_the_query_percentile(self):
+        policy = HedgingPolicy(percentile=0.95, min_samples=1)
+        for latency in range(1, 101):
+            policy.finished("SELECT 1", float(latency), None)
+
+        assert policy.threshold("SELECT 1") == 95.0
+
+    def test_hedge_wins_record_a_censored_latency(self):
+        policy = HedgingPolicy(percentile=1, min_samples=1)
+        policy.finished("SELECT 1", 10.0, None)
+        policy.finished("SELECT 1", 2.0, hedge_won=True, threshold=11.0)
+        assert list(policy._latencies[policy._key("SELECT 1")]) == [10.0, 11.0]
+        assert policy.threshold("SELECT 1") == 11.0
+
+        policy.finished("SELECT 1", 13.0, hedge_won=True, threshold=11.0)
+        assert policy.threshold("SELECT 1") == 13.0
+
+        policy.finished("SELECT 1", 14.0, hedge_won=False, threshold=11.0)
+        assert policy.threshold("SELECT 1") == 14.0
+
+    def test_slow_tail_is_kept_when_hedges_win(self):
+        policy = HedgingPolicy(percentile=0.95, min_samples=1)
+        for _ in range(19):
+            policy.finished("SELECT 1", 1.0, None)
+        policy.finished("SELECT 1", 30.0, None)
+        threshold = policy.threshold("SELECT 1")
+
+        for _ in range(5):
+            policy.finished("SELECT 1", threshold + 0.5, True, threshold)
+
+        assert policy.threshold("SELECT 1") > threshold
+
+    def test_extra_jobs_are_capped(self):
+        policy = HedgingPolicy(max_extra_fraction=0.2)
+        for _ in range(10):
+            policy.started()
+
+        assert [policy.allow_hedge() for _ in range(3)] == [True, True, False]
+        assert policy.stats()["hedged"] == 2
+
+    def test_outcomes_are_reported(self):
+        policy = HedgingPolicy(max_extra_fraction=1)
+        report = RunReport()
+
+        with report.activate():
+            policy.started()
+            assert policy.allow_hedge()
+            policy.finished("SELECT 1", 1.0, hedge_won=True)
+            policy.started()
+            policy.finished("SELECT 1", 1.0, hedge_won=False)
+
+        assert policy.stats() == {
+            "queries": 2,
+            "hedged": 1,
+            "hedge_wins": 1,
+            "hedge_losses": 1,
+        }
+        assert report.to_serializeble_dict() == {
+            "hedged_queries": 1,
+            "hedge_wins": 1,
+            "hedge_losses": 1,
+        }
@@ -0,0 +1,122 @@
+import asyncio
+import copy
+import threading
+import time
+
+import pytest
+
+from pipeline_penguin.core.connector import Connector, ConnectorLimiter
+
+
+class TestConnectorLimiter:
+    def test_raises_error_on_invalid_limits(self):
+        with pytest.raises(ValueError):
+            ConnectorLimiter(max_concurrency=0)
+
+        with pytest.raises(ValueError):
+            ConnectorLimiter(requests_per_second=-1)
+
+    def test_unlimited_limiter_does_not_wait(self):
+        limiter = ConnectorLimiter()
+        for _ in range(100):
+            with limiter.acquire():
+                pass
+
+        stats = limiter.stats()
+        assert stats["acquired"] == 100
+        assert stats["in_flight"] == 0
+        assert stats["max_wait_seconds"] < 0.05
+
+    def test_concurrency_is_shared_by_threads_and_tasks(self):
+        limiter = ConnectorLimiter(max_concurrency=3)
+        lock = threading.Lock()
+        in_flight = [0]
+        peak = [0]
+
+        def enter():
+            with lock:
+                in_flight[0] += 1
+                peak[0] = max(peak[0], in_flight[0])
+
+        def leave():
+            with lock:
+                in_flight[0] -= 1
+
+        def thread_request():
+            with limiter.acquire():
+                enter()
+                time.sleep(0.02)
+                leave()
+
+        async def task_request():
+            async with limiter.aacquire():
+                enter()
+                await asyncio.sleep(0.02)
+                leave()
+
+        async def main():
+            await asyncio.gather(*[task_request() for _ in range(10)])
+
+        threads = [threading.Thread(target=thread_request) for _ in range(10)]
+        for thread in threads:
+            thread.start()
+        asyncio.run(main())
+        for thread in threads:
+            thread.join()
+
+        assert peak[0] == 3
+        stats = limiter.stats()
+        assert stats["acquired"] == 20
+        assert stats["total_wait_seconds"] > 0
+
+    def test_token_bucket_limits_request_rate(self):
+        limiter = ConnectorLimiter(requests_per_second=20, burst=1)
+
+        start = time.monotonic()
+        for _ in range(5):
+            with limiter.acquire():
+                pass
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.19
+
+    def test_token_bucket_limits_async_request_rate(self):
+        limiter = ConnectorLimiter(requests_per_second=20, burst=1)
+
+        async def request():
+            async with limiter.aacquire():
+                pass
+
+        async def main():
+            await asyncio.gather(*[request() for _ in range(5)])
+
+        start = time.monotonic()
+        asyncio.run(main())
+        elapsed = time.monotonic() - start
+
+        assert elapsed >= 0.19
+        assert limiter.stats()["max_wait_seconds"] >= 0.19
+
+    def test_try_acquire_does_not_wait(self):
+        limiter = ConnectorLimiter(max_concurrency=1)
+
+        assert limiter.try_acquire()
+        assert not limiter.try_acquire()
+        limiter.release()
+        assert limiter.try_acquire()
+        limiter.release()
+        assert limiter.stats()["acquired"] == 2
+        assert limiter.stats()["in_flight"] == 0
+
+
+class TestConnectorLimits:
+    def test_set_limits(self):
+        connector = Connector()
+        connector.set_limits(max_concurrency=2, requests_per_second=5)
+
+        assert connector.limiter.max_concurrency == 2
+        assert connector.limiter.requests_per_second == 5
+
+    def test_copies_share_the_connector(self):
+        connector = Connector()
+        assert copy.deepcopy({"connector": connector})["connector"] is connector
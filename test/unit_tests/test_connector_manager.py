@@ -37,6 +37,17 @@ class TestDefineDefault:
 
         assert connector_manager.define_default(connector) is None
 
+    def test_if_set_connector_limits(self, mock_isfile, mock_from_service_account_file):
+        connector_manager = ConnectorManager()
+        connector = ConnectorSQLBigQuery(credentials_path="true_file.json")
+
+        connector_manager.define_default(
+            connector, max_concurrency=5, requests_per_second=2
+        )
+
+        assert connector.limiter.max_concurrency == 5
+        assert connector.limiter.requests_per_second == 2
+
 
 class TestGetDefault:
     def test_if_get_correct_connector(
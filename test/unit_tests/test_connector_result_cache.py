@@ -0,0 +1,117 @@
+import datetime
+import json
+import time
+
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.connector import ResultCache
+from pipeline_penguin.core.runner import RunReport
+
+
+class TestResultCache:
+    def test_rejects_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ResultCache(max_entries=0)
+        with pytest.raises(ValueError):
+            ResultCache(ttl=0)
+
+    def test_key_depends_on_every_argument(self):
+        key = ResultCache.key("SELECT 1", {"a": 1}, {"t": "v1"}, max_results=10)
+
+        assert key == ResultCache.key("SELECT 1", {"a": 1}, {"t": "v1"}, max_results=10)
+        assert key != ResultCache.key("SELECT 2", {"a": 1}, {"t": "v1"}, max_results=10)
+        assert key != ResultCache.key("SELECT 1", {"a": 2}, {"t": "v1"}, max_results=10)
+        assert key != ResultCache.key("SELECT 1", {"a": 1}, {"t": "v2"}, max_results=10)
+        assert key != ResultCache.key("SELECT 1", {"a": 1}, {"t": "v1"}, max_results=5)
+
+    def test_returns_copies_of_stored_results(self):
+        cache = ResultCache()
+        cache.put("key", pd.DataFrame([1, 2], columns=["result"]))
+
+        result = cache.get("key")
+        result["result"] = 0
+
+        assert list(cache.get("key")["result"]) == [1, 2]
+        assert cache.get("other") is None
+        assert cache.stats() == {"hits": 2, "misses": 1}
+
+    def test_least_recently_used_results_are_evicted(self):
+        cache = ResultCache(max_entries=2)
+        cache.put("a", pd.DataFrame([1]))
+        cache.put("b", pd.DataFrame([2]))
+        cache.get("a")
+        cache.put("c", pd.DataFrame([3]))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        assert cache.get("c") is not None
+
+    def test_results_expire(self, monkeypatch):
+        cache = ResultCache(ttl=60)
+        now = time.time()
+        monkeypatch.setattr(time, "time", lambda: now)
+        cache.put("key", pd.DataFrame([1]))
+
+        monkeypatch.setattr(time, "time", lambda: now + 61)
+
+        assert cache.get("key") is None
+
+    def test_disk_store_is_shared_between_instances(self, tmp_path):
+        data_frame = pd.DataFrame(
+            {
+                "result": [1, 2],
+                "rate": [0.5, None],
+                "value": ["a", "b"],
+                "updated": pd.to_datetime(["2020-01-01", "2020-01-02"], utc=True),
+            }
+        )
+        ResultCache(path=str(tmp_path)).put("key", data_frame)
+
+        cache = ResultCache(path=str(tmp_path))
+
+        pd.testing.assert_frame_equal(cache.get("key"), data_frame)
+
+    def test_disk_store_is_json(self, tmp_path):
+        ResultCache(path=str(tmp_path)).put("key", pd.DataFrame({"total": [1]}))
+
+        with open(tmp_path / "key.json") as result_file:
+            content = json.load(result_file)
+
+        assert set(content) == {"stored_at", "result"}
+
+    def test_results_changed_by_json_are_kept_in_memory_only(self, tmp_path):
+        data_frame = pd.DataFrame({"value": [datetime.date(2020, 1, 1)]})
+        cache = ResultCache(path=str(tmp_path))
+        cache.put("key", data_frame)
+
+        assert list(tmp_path.iterdir()) == []
+        assert cache.get("key")["value"][0] == datetime.date(2020, 1, 1)
+
+    def test_unreadable_files_are_removed(self, tmp_path):
+        (tmp_path / "key.json").write_text("not json")
+
+        assert ResultCache(path=str(tmp_path)).get("key") is None
+        assert list(tmp_path.iterdir()) == []
+
+    def test_disk_store_is_bounded(self, tmp_path):
+        cache = ResultCache(path=str(tmp_path), max_disk_entries=2)
+        for key in ("a", "b", "c"):
+            cache.put(key, pd.DataFrame({"total": [1]}))
+
+        assert len(list(tmp_path.glob("*.json"))) == 2
+
+        cache.clear()
+        assert list(tmp_path.glob("*.json")) == []
+        assert cache.get("c") is None
+
+    def test_lookups_are_reported_on_the_current_run(self):
+        cache = ResultCache()
+        cache.put("key", pd.DataFrame([1]))
+        report = RunReport()
+
+        with report.activate():
+            cache.get("key")
+            cache.get("other")
+
+        assert report.to_serializeble_dict() == {"cache_hits": 1, "cache_misses": 1}
@@ -0,0 +1,280 @@
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from os import path
+
+import pandas as pd
+import pytest
+from google.oauth2.service_account import Credentials
+
+from pipeline_penguin.connector.sql.bigquery import ConnectorSQLBigQuery
+from pipeline_penguin.core.connector import SingleFlight
+from pipeline_penguin.core.runner import Deadline, RunReport
+from pipeline_penguin.exceptions import DeadlineExceeded
+
+
+@pytest.fixture()
+def _slow_query():
+    class SlowQuery:
+        def __init__(self):
+            self.calls = 0
+            self.started = threading.Event()
+            self.release = threading.Event()
+
+        def __call__(self, value):
+            self.calls += 1
+            self.started.set()
+            self.release.wait(timeout=5)
+            return pd.DataFrame([value], columns=["result"])
+
+    yield SlowQuery()
+
+
+def _run_concurrently(single_flight, function, callers):
+    key = single_flight.key("SELECT 1")
+    with ThreadPoolExecutor(max_workers=callers) as executor:
+        leader = executor.submit(single_flight.do, key, function, 1)
+        function.started.wait(timeout=5)
+        waiters = [
+            executor.submit(single_flight.do, key, function, 1)
+            for _ in range(callers - 1)
+        ]
+        while single_flight.stats()["coalesced"] < callers - 1:
+            time.sleep(0.001)
+        function.release.set()
+        return [leader.result()] + [waiter.result() for waiter in waiters]
+
+
+class TestSingleFlight:
+    def test_key_uses_the_canonical_query(self):
+        assert SingleFlight.key("SELECT  1\n;") == SingleFlight.key("SELECT 1")
+        assert SingleFlight.key("SELECT 'a  b'") != SingleFlight.key("SELECT 'a b'")
+        assert SingleFlight.key("SELECT 1", max_results=10) != SingleFlight.key(
+            "SELECT 1", max_results=20
+        )
+        assert SingleFlight.key("SELECT @v", {"v": 1}) != SingleFlight.key(
+            "SELECT @v", {"v": 2}
+        )
+
+    def test_concurrent_calls_execute_once(self, _slow_query):
+        single_flight = SingleFlight()
+
+        results = _run_concurrently(single_flight, _slow_query, 4)
+
+        assert _slow_query.calls == 1
+        assert all(result.equals(results[0]) for result in results)
+        assert single_flight.stats() == {"executed": 1, "coalesced": 3}
+
+    def test_coalesced_calls_receive_copies(self, _slow_query):
+        results = _run_concurrently(SingleFlight(), _slow_query, 3)
+
+        results[1]["result"] = 10
+
+        assert results[0]["result"][0] == 1
+        assert results[2]["result"][0] == 1
+
+    def test_sequential_calls_are_not_coalesced(self, _slow_query):
+        single_flight = SingleFlight()
+        _slow_query.release.set()
+        key = single_flight.key("SELECT 1")
+
+        single_flight.do(key, _slow_query, 1)
+        single_flight.do(key, _slow_query, 1)
+
+        assert _slow_query.calls == 2
+
+    def test_errors_are_raised_on_every_caller(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+
+        def failing():
+            started.set()
+            release.wait(timeout=5)
+            raise ValueError("invalid query")
+
+        key = single_flight.key("SELECT 1")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, key, failing)
+            started.wait(timeout=5)
+            waiter = executor.submit(single_flight.do, key, failing)
+            while single_flight.stats()["coalesced"] < 1:
+                time.sleep(0.001)
+            release.set()
+
+            for future in (leader, waiter):
+                with pytest.raises(ValueError):
+                    future.result()
+
+    def test_waiters_retry_a_flight_abandoned_by_its_deadline(self):
+        single_flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def query():
+            calls.append(1)
+            if len(calls) == 1:
+                started.set()
+                release.wait(timeout=5)
+                raise DeadlineExceeded("the leader's deadline expired")
+            return "result"
+
+        key = single_flight.key("SELECT 1")
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, key, query)
+            started.wait(timeout=5)
+            waiter = executor.submit(single_flight.do, key, query)
+            while single_flight.stats()["coalesced"] < 1:
+                time.sleep(0.001)
+            release.set()
+
+            with pytest.raises(DeadlineExceeded):
+                leader.result()
+            assert waiter.result() == "result"
+        assert len(calls) == 2
+
+    def test_waiters_stop_at_their_deadline(self, _slow_query):
+        single_flight = SingleFlight()
+        key = single_flight.key("SELECT 1")
+
+        def wait_with_deadline():
+            with Deadline(seconds=0.05).activate():
+                return single_flight.do(key, _slow_query, 1)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            leader = executor.submit(single_flight.do, key, _slow_query, 1)
+            _slow_query.started.wait(timeout=5)
+            waiter = executor.submit(wait_with_deadline)
+
+            with pytest.raises(DeadlineExceeded):
+                waiter.result()
+            _slow_query.release.set()
+            leader.result()
+
+    def test_coalesced_calls_are_reported(self, _slow_query):
+        single_flight = SingleFlight()
+        report = RunReport()
+
+        def reported(*args):
+            with report.activate():
+                return single_flight.do(*args)
+
+        key = single_flight.key("SELECT 1")
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            leader = executor.submit(reported, key, _slow_query, 1)
+            _slow_query.started.wait(timeout=5)
+            waiters = [executor.submit(reported, key, _slow_query, 1) for _ in range(2)]
+            while single_flight.stats()["coalesced"] < 2:
+                time.sleep(0.001)
+            _slow_query.release.set()
+            for future in [leader] + waiters:
+                future.result()
+
+        assert report.get("coalesced_queries") == 2
+
+
+class TestSingleFlightAsync:
+    def test_concurrent_tasks_execute_once(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def query():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+            return pd.DataFrame([1], columns=["result"])
+
+        async def main():
+            key = single_flight.key("SELECT 1")
+            return await asyncio.gather(
+                *(single_flight.ado(key, query) for _ in range(5))
+            )
+
+        results = asyncio.run(main())
+
+        assert len(calls) == 1
+        assert all(result.equals(results[0]) for result in results)
+        assert single_flight.stats() == {"executed": 1, "coalesced": 4}
+
+    def test_cancelled_leader_hands_the_query_to_a_waiter(self):
+        single_flight = SingleFlight()
+        calls = []
+
+        async def query():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main():
+            key = single_flight.key("SELECT 1")
+            leader = asyncio.ensure_future(single_flight.ado(key, query))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(single_flight.ado(key, query))
+            await asyncio.sleep(0.01)
+            leader.cancel()
+            return await waiter
+
+        assert asyncio.run(main()) == "result"
+        assert len(calls) == 2
+
+    def test_cancelled_waiter_does_not_cancel_the_flight(self):
+        single_flight = SingleFlight()
+
+        async def query():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def main():
+            key = single_flight.key("SELECT 1")
+            leader = asyncio.ensure_future(single_flight.ado(key, query))
+            await asyncio.sleep(0.01)
+            waiter = asyncio.ensure_future(single_flight.ado(key, query))
+            await asyncio.sleep(0.01)
+            waiter.cancel()
+            return await leader
+
+        assert asyncio.run(main()) == "result"
+
+
+class TestConnectorSQLBigQuerySingleFlight:
+    @pytest.fixture()
+    def _connector(self, monkeypatch):
+        monkeypatch.setattr(path, "isfile", lambda file_path: file_path == "true.json")
+        monkeypatch.setattr(Credentials, "from_service_account_file", lambda path: None)
+        connector = ConnectorSQLBigQuery(credentials_path="true.json")
+        connector.calls = []
+        barrier = threading.Barrier(2, timeout=0.2)
+
+        def mock_function(query, credentials, max_results, project_id):
+            connector.calls.append(query)
+            try:
+                # Keeps the first query in flight until the second call arrives
+                barrier.wait()
+            except threading.BrokenBarrierError:
+                pass
+            return pd.DataFrame([len(connector.calls)], columns=["result"])
+
+        monkeypatch.setattr(pd, "read_gbq", mock_function)
+        yield connector
+
+    def test_identical_concurrent_queries_run_once(self, _connector):
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            first = executor.submit(_connector.run, "SELECT 1")
+            while not _connector.calls:
+                time.sleep(0.001)
+            second = executor.submit(_connector.run, "SELECT  1")
+            first.result()
+            second.result()
+
+        assert len(_connector.calls) == 1
+        assert _connector.single_flight.stats()["coalesced"] == 1
+
+    def test_disabled_single_flight_runs_every_query(self, _connector):
+        _connector.set_single_flight(None)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            results = list(executor.map(_connector.run, ["SELECT 1", "SELECT 1"]))
+
+        assert len(_connector.calls) == 2
+        assert len(results) == 2
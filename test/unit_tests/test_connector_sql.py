@@ -1,3 +1,5 @@
+import asyncio
+
 from pipeline_penguin.core.connector import Connector, ConnectorSQL
 
 
@@ -11,3 +13,10 @@ class TestConnectorSQL:
     def test_connector_type(self):
         conn = ConnectorSQL()
         assert conn.type == "SQL"
+
+    def test_arun_wraps_run(self):
+        class MockConnector(ConnectorSQL):
+            def run(self, query):
+                return f"ran {query}"
+
+        assert asyncio.run(MockConnector().arun("SELECT 1")) == "ran SELECT 1"
@@ -1,3 +1,7 @@
+import asyncio
+import datetime
+import time
+
 import pytest
 
 from google.oauth2.service_account import Credentials
@@ -6,6 +10,9 @@ import pandas as pd
 
 from pipeline_penguin.core.connector import ConnectorSQL
 from pipeline_penguin.connector.sql.bigquery import ConnectorSQLBigQuery
+from pipeline_penguin.core.connector import HedgingPolicy, ResultCache
+from pipeline_penguin.core.runner import Deadline, RunReport
+from pipeline_penguin.exceptions import DeadlineExceeded
 
 
 @pytest.fixture
@@ -97,3 +104,517 @@ class TestConnectorSQLBigQueryRunExecution:
         conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
         result = conn.run("SELECT * FROM `project.dataset.table`", max_results=50)
         assert result.size == 50
+
+
+@pytest.fixture
+def mock_bigquery_client():
+    class MockRows:
+        def __init__(self, max_results):
+            self.max_results = max_results
+
+        def to_dataframe(self):
+            return pd.DataFrame([i for i in range(self.max_results)])
+
+    class MockJob:
+        def __init__(self, polls):
+            self.polls = polls
+            self.cancelled = False
+            self.total_bytes_processed = 1024
+
+        def done(self):
+            self.polls -= 1
+            return self.polls < 0
+
+        def cancel(self):
+            self.cancelled = True
+
+        def result(self, max_results):
+            return MockRows(max_results)
+
+    class MockClient:
+        def __init__(self, polls):
+            self.polls = polls
+            self.jobs = []
+
+        def query(self, query, job_config=None):
+            job = MockJob(self.polls)
+            job.job_config = job_config
+            self.jobs.append(job)
+            return job
+
+    yield MockClient
+
+
+class TestConnectorSQLBigQueryAsyncExecution:
+    def test_arun_returns_dataframe(
+        self, mock_isfile, mock_from_service_account_file, mock_bigquery_client
+    ):
+        conn = ConnectorSQLBigQuery(
+            credentials_path="true_file.json", max_results=10, poll_interval=0
+        )
+        client = mock_bigquery_client(polls=2)
+        conn._client = client
+
+        result = asyncio.run(conn.arun("SELECT * FROM `project.dataset.table`"))
+
+        assert isinstance(result, pd.DataFrame)
+        assert result.size == 10
+        assert client.jobs[0].polls == -1
+
+    def test_cancelling_arun_cancels_job(
+        self, mock_isfile, mock_from_service_account_file, mock_bigquery_client
+    ):
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json", poll_interval=10)
+        client = mock_bigquery_client(polls=100)
+        conn._client = client
+
+        async def run_and_cancel():
+            task = asyncio.ensure_future(conn.arun("SELECT 1"))
+            await asyncio.sleep(0.05)
+            task.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await task
+
+        asyncio.run(run_and_cancel())
+
+        assert client.jobs[0].cancelled
+
+
+class TestConnectorSQLBigQueryDeadline:
+    def test_run_passes_job_timeout(
+        self, monkeypatch, mock_isfile, mock_from_service_account_file
+    ):
+        calls = []
+
+        def mock_function(query, credentials, max_results, project_id, configuration):
+            calls.append(configuration)
+            return pd.DataFrame()
+
+        monkeypatch.setattr(pd, "read_gbq", mock_function)
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+
+        with Deadline(10).activate():
+            conn.run("SELECT 1")
+
+        timeout_ms = calls[0]["query"]["timeoutMs"]
+        assert 9000 < timeout_ms <= 10000
+
+    def test_run_raises_after_deadline(
+        self, mock_isfile, mock_from_service_account_file, mock_pandas_read_gbq
+    ):
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+
+        with Deadline(0).activate():
+            with pytest.raises(DeadlineExceeded):
+                conn.run("SELECT 1")
+
+    @pytest.mark.parametrize(
+        "error",
+        [
+            type("QueryTimeout", (ValueError,), {})("Query timeout: 10 ms"),
+            TimeoutError("job timed out"),
+        ],
+    )
+    def test_run_raises_deadline_exceeded_on_query_timeout(
+        self, monkeypatch, mock_isfile, mock_from_service_account_file, error
+    ):
+        def mock_function(query, credentials, max_results, project_id, configuration):
+            time.sleep(0.02)
+            raise error
+
+        monkeypatch.setattr(pd, "read_gbq", mock_function)
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+
+        with Deadline(0.01).activate():
+            with pytest.raises(DeadlineExceeded):
+                conn.run("SELECT 1")
+
+    def test_run_keeps_query_timeouts_before_the_deadline(
+        self, monkeypatch, mock_isfile, mock_from_service_account_file
+    ):
+        def mock_function(query, credentials, max_results, project_id, configuration):
+            raise TimeoutError("job timed out")
+
+        monkeypatch.setattr(pd, "read_gbq", mock_function)
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+
+        with Deadline(10).activate():
+            with pytest.raises(TimeoutError):
+                conn.run("SELECT 1")
+
+    def test_arun_cancels_job_at_deadline(
+        self, mock_isfile, mock_from_service_account_file, mock_bigquery_client
+    ):
+        conn = ConnectorSQLBigQuery(
+            credentials_path="true_file.json", poll_interval=0.01
+        )
+        client = mock_bigquery_client(polls=1000)
+        conn._client = client
+
+        async def run_with_deadline():
+            with Deadline(0.05).activate():
+                await conn.arun("SELECT 1")
+
+        with pytest.raises(DeadlineExceeded):
+            asyncio.run(run_with_deadline())
+
+        job = client.jobs[0]
+        assert job.cancelled
+        assert 0 < int(job.job_config.job_timeout_ms) <= 50
+
+
+@pytest.fixture
+def _hedging_connector(
+    mock_isfile, mock_from_service_account_file, mock_bigquery_client
+):
+    def hedging_connector(polls):
+        conn = ConnectorSQLBigQuery(
+            credentials_path="true_file.json", poll_interval=0.01
+        )
+        client = mock_bigquery_client(polls=0)
+        job_polls = iter(polls)
+
+        original_query = client.query
+
+        def query(query, job_config=None):
+            client.polls = next(job_polls)
+            return original_query(query, job_config)
+
+        client.query = query
+        conn._client = client
+
+        policy = HedgingPolicy(max_extra_fraction=1, min_samples=1)
+        policy.finished("SELECT 1", 0.0, None)
+        conn.set_hedging(policy)
+        return conn, client, policy
+
+    yield hedging_connector
+
+
+class TestConnectorSQLBigQueryHedging:
+    def test_straggler_is_hedged_and_hedge_wins(self, _hedging_connector):
+        conn, client, policy = _hedging_connector(polls=[1000, 0])
+
+        result = conn.run("SELECT 1", max_results=5)
+
+        assert result.size == 5
+        assert len(client.jobs) == 2
+        assert client.jobs[0].cancelled
+        assert not client.jobs[1].cancelled
+        assert policy.stats()["hedge_wins"] == 1
+        latencies = list(policy._latencies[policy._key("SELECT 1")])
+        assert len(latencies) == 2 and latencies[1] > 0.0
+
+    def test_original_job_can_win(self, _hedging_connector):
+        conn, client, policy = _hedging_connector(polls=[2, 1000])
+
+        conn.run("SELECT 1")
+
+        assert len(client.jobs) == 2
+        assert client.jobs[1].cancelled
+        assert policy.stats()["hedge_losses"] == 1
+        assert len(policy._latencies[policy._key("SELECT 1")]) == 2
+
+    def test_hedges_respect_the_cap(self, _hedging_connector):
+        conn, client, policy = _hedging_connector(polls=[3])
+        conn.hedging.max_extra_fraction = 0
+
+        conn.run("SELECT 1")
+
+        assert len(client.jobs) == 1
+        assert policy.stats() == {
+            "queries": 1,
+            "hedged": 0,
+            "hedge_wins": 0,
+            "hedge_losses": 0,
+        }
+
+    def test_arun_hedges_straggler(self, _hedging_connector):
+        conn, client, policy = _hedging_connector(polls=[1000, 0])
+
+        result = asyncio.run(conn.arun("SELECT 1", max_results=3))
+
+        assert result.size == 3
+        assert client.jobs[0].cancelled
+        assert policy.stats()["hedge_wins"] == 1
+
+    def test_hedges_take_a_limiter_slot(self, _hedging_connector):
+        conn, client, policy = _hedging_connector(polls=[1000, 0])
+        conn.set_limits(max_concurrency=2)
+
+        conn.run("SELECT 1")
+
+        assert len(client.jobs) == 2
+        assert conn.limiter.stats()["acquired"] == 2
+        assert conn.limiter.stats()["in_flight"] == 0
+
+    def test_hedges_are_skipped_without_a_free_limiter_slot(self, _hedging_connector):
+        conn, client, policy = _hedging_connector(polls=[3])
+        conn.set_limits(max_concurrency=1)
+
+        conn.run("SELECT 1")
+
+        assert len(client.jobs) == 1
+        assert policy.stats()["hedged"] == 0
+        assert conn.limiter.stats()["in_flight"] == 0
+
+    def test_arun_hedges_take_a_limiter_slot(self, _hedging_connector):
+        conn, client, policy = _hedging_connector(polls=[1000, 0])
+        conn.set_limits(max_concurrency=2)
+
+        asyncio.run(conn.arun("SELECT 1"))
+
+        assert len(client.jobs) == 2
+        assert conn.limiter.stats()["in_flight"] == 0
+
+
+class TestConnectorSQLBigQueryScript:
+    def test_run_script_reads_child_jobs_in_order(
+        self, mock_isfile, mock_from_service_account_file
+    ):
+        class MockChildJob:
+            def __init__(self, created, value):
+                self.created = created
+                self.value = value
+
+            def result(self, max_results):
+                return self
+
+            def to_dataframe(self):
+                return pd.DataFrame([self.value], columns=["total"])
+
+        class MockScriptJob:
+            job_id = "script_job"
+
+            def result(self):
+                return None
+
+        class MockClient:
+            def query(self, query, job_config=None):
+                self.script = query
+                return MockScriptJob()
+
+            def list_jobs(self, parent_job):
+                assert parent_job == "script_job"
+                return [MockChildJob(2, "second"), MockChildJob(1, "first")]
+
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+        conn._client = MockClient()
+
+        results = conn.run_script(["SELECT 1", "SELECT 2"])
+
+        assert conn._client.script == "SELECT 1;\nSELECT 2;\n"
+        assert [result["total"][0] for result in results] == ["first", "second"]
+
+    def test_run_script_checks_result_count(
+        self, mock_isfile, mock_from_service_account_file
+    ):
+        class MockClient:
+            def query(self, query, job_config=None):
+                class MockScriptJob:
+                    job_id = "script_job"
+
+                    def result(self):
+                        return None
+
+                return MockScriptJob()
+
+            def list_jobs(self, parent_job):
+                return []
+
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+        conn._client = MockClient()
+
+        with pytest.raises(ValueError):
+            conn.run_script(["SELECT 1", "SELECT 2"])
+
+
+class TestConnectorSQLBigQueryParameters:
+    def test_parameter_types(self):
+        parameters = ConnectorSQLBigQuery.query_parameters(
+            {"flag": True, "count": 1, "ratio": 0.5, "name": "abc", "values": [1, 2]}
+        )
+
+        assert [
+            parameter.to_api_repr()["parameterType"] for parameter in parameters
+        ] == [
+            {"type": "BOOL"},
+            {"type": "INT64"},
+            {"type": "FLOAT64"},
+            {"type": "STRING"},
+            {"type": "ARRAY", "arrayType": {"type": "INT64"}},
+        ]
+
+    def test_run_sends_named_parameters(
+        self, monkeypatch, mock_isfile, mock_from_service_account_file
+    ):
+        calls = []
+
+        def mock_function(query, credentials, max_results, project_id, configuration):
+            calls.append(configuration)
+            return pd.DataFrame()
+
+        monkeypatch.setattr(pd, "read_gbq", mock_function)
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+
+        conn.run("SELECT @value", parameters={"value": "it's"})
+
+        assert calls[0]["query"]["parameterMode"] == "NAMED"
+        assert calls[0]["query"]["queryParameters"] == [
+            {
+                "name": "value",
+                "parameterType": {"type": "STRING"},
+                "parameterValue": {"value": "it's"},
+            }
+        ]
+
+    def test_arun_sends_named_parameters(
+        self, mock_isfile, mock_from_service_account_file, mock_bigquery_client
+    ):
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json", poll_interval=0)
+        client = mock_bigquery_client(polls=0)
+        conn._client = client
+
+        asyncio.run(conn.arun("SELECT @value", parameters={"value": 10}))
+
+        [parameter] = client.jobs[0].job_config.query_parameters
+        assert (parameter.name, parameter.type_, parameter.value) == (
+            "value",
+            "INT64",
+            10,
+        )
+
+
+class TestConnectorSQLBigQueryDryRun:
+    def test_dry_run_returns_estimated_bytes(
+        self, mock_isfile, mock_from_service_account_file, mock_bigquery_client
+    ):
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+        client = mock_bigquery_client(polls=0)
+        conn._client = client
+
+        estimate = conn.dry_run("SELECT @value", parameters={"value": 10})
+
+        job_config = client.jobs[0].job_config
+        assert estimate == 1024
+        assert job_config.dry_run is True
+        assert job_config.use_query_cache is False
+        assert job_config.query_parameters[0].name == "value"
+
+    def test_adry_run_returns_estimated_bytes(
+        self, mock_isfile, mock_from_service_account_file, mock_bigquery_client
+    ):
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+        conn._client = mock_bigquery_client(polls=0)
+
+        assert asyncio.run(conn.adry_run("SELECT 1")) == 1024
+
+
+class TestConnectorSQLBigQueryCache:
+    @pytest.fixture()
+    def _cached_connector(
+        self, monkeypatch, mock_isfile, mock_from_service_account_file
+    ):
+        class MockTable:
+            def __init__(self, table_type="TABLE"):
+                self.table_type = table_type
+                self.modified = datetime.datetime(
+                    2021, 1, 1, tzinfo=datetime.timezone.utc
+                )
+                self.streaming_buffer = None
+
+        class MockClient:
+            def __init__(self):
+                self.tables = {"project.dataset.table": MockTable()}
+
+                self.table_requests = 0
+
+            def get_table(self, table_id):
+                self.table_requests += 1
+                return self.tables[table_id]
+
+        queries = []
+
+        def mock_function(query, credentials, max_results, project_id):
+            queries.append(query)
+            return pd.DataFrame([len(queries)], columns=["result"])
+
+        monkeypatch.setattr(pd, "read_gbq", mock_function)
+        conn = ConnectorSQLBigQuery(credentials_path="true_file.json")
+        conn._client = MockClient()
+        conn.set_cache(ResultCache())
+        conn.queries = queries
+        yield conn
+
+    def test_unchanged_tables_are_answered_from_cache(self, _cached_connector):
+        query = "SELECT * FROM `project.dataset.table`"
+
+        first = _cached_connector.run(query)
+        second = _cached_connector.run(query)
+
+        assert len(_cached_connector.queries) == 1
+        assert second.equals(first)
+        assert _cached_connector.cache.stats() == {"hits": 1, "misses": 1}
+
+    def test_modified_tables_are_queried_again(self, _cached_connector):
+        query = "SELECT * FROM `project.dataset.table`"
+        _cached_connector.run(query)
+
+        table = _cached_connector._client.tables["project.dataset.table"]
+        table.modified += datetime.timedelta(minutes=15)
+        _cached_connector.run(query)
+
+        assert len(_cached_connector.queries) == 2
+
+    def test_uncacheable_queries_bypass_the_cache(self, _cached_connector):
+        _cached_connector._client.tables["project.dataset.view"] = type(
+            _cached_connector._client.tables["project.dataset.table"]
+        )("VIEW")
+        queries = [
+            "SELECT * FROM `project.dataset.view`",
+            "SELECT CURRENT_TIMESTAMP() FROM `project.dataset.table`",
+            "SELECT 1",
+        ]
+
+        for query in queries * 2:
+            _cached_connector.run(query)
+
+        assert len(_cached_connector.queries) == 6
+        assert _cached_connector.cache.stats() == {"hits": 0, "misses": 0}
+
+    def test_current_date_is_part_of_the_version(self, _cached_connector):
+        versions = _cached_connector.table_versions(
+            "SELECT * FROM `project.dataset.table` WHERE day = CURRENT_DATE()"
+        )
+
+        assert versions == {
+            "project.dataset.table": "2021-01-01T00:00:00+00:00",
+            "CURRENT_DATE": datetime.datetime.now(datetime.timezone.utc)
+            .date()
+            .isoformat(),
+        }
+
+    def test_table_versions_are_requested_once_per_run(self, _cached_connector):
+        queries = [
+            "SELECT * FROM `project.dataset.table`",
+            "SELECT COUNT(*) FROM `project.dataset.table`",
+        ]
+
+        with RunReport().activate():
+            for query in queries * 2:
+                _cached_connector.run(query)
+        with RunReport().activate():
+            _cached_connector.run(queries[0])
+
+        assert _cached_connector._client.table_requests == 2
+        assert _cached_connector.limiter.stats()["acquired"] == 4
+        assert len(_cached_connector.queries) == 2
+
+    def test_arun_uses_the_cache(self, _cached_connector):
+        query = "SELECT * FROM `project.dataset.table`"
+        _cached_connector.run(query)
+
+        result = asyncio.run(_cached_connector.arun(query))
+
+        assert list(result["result"]) == [1]
+        assert len(_cached_connector.queries) == 1
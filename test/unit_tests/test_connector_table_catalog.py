@@ -0,0 +1,200 @@
+import asyncio
+import datetime
+import threading
+from os import path
+
+import pandas as pd
+import pytest
+from google.oauth2.service_account import Credentials
+
+from pipeline_penguin.connector.sql.bigquery import ConnectorSQLBigQuery
+from pipeline_penguin.connector.sql.table_catalog import TableCatalog, TableMetadata
+from pipeline_penguin.core.runner import RunReport
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+
+MODIFIED = pd.Timestamp(datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc))
+
+
+@pytest.fixture()
+def _metadata_rows():
+    columns = [
+        "table_name",
+        "table_type",
+        "row_count",
+        "size_bytes",
+        "created",
+        "modified",
+        "column_name",
+        "data_type",
+        "is_partitioning_column",
+        "clustering_ordinal_position",
+    ]
+    rows = [
+        ["events", "BASE TABLE", 100, 2048, MODIFIED, MODIFIED]
+        + ["day", "DATE", "YES", None],
+        ["events", "BASE TABLE", 100, 2048, MODIFIED, MODIFIED]
+        + ["country", "STRING", "NO", 2],
+        ["events", "BASE TABLE", 100, 2048, MODIFIED, MODIFIED]
+        + ["user_id", "INT64", "NO", 1],
+        ["live", "BASE TABLE", 10, 64, MODIFIED, MODIFIED]
+        + ["value", "FLOAT64", "NO", None],
+        ["summary", "VIEW", 0, 0, MODIFIED, MODIFIED] + [None, None, None, None],
+    ]
+    yield pd.DataFrame(rows, columns=columns)
+
+
+@pytest.fixture()
+def _connector(monkeypatch, _metadata_rows):
+    monkeypatch.setattr(path, "isfile", lambda file_path: file_path == "true_file.json")
+    monkeypatch.setattr(Credentials, "from_service_account_file", lambda path: None)
+
+    class MockRows:
+        def to_dataframe(self):
+            return _metadata_rows.copy()
+
+    class MockJob:
+        def result(self):
+            return MockRows()
+
+    class MockClient:
+        def __init__(self):
+            self.queries = []
+
+        def query(self, query):
+            self.queries.append(query)
+            return MockJob()
+
+    connector = ConnectorSQLBigQuery(credentials_path="true_file.json")
+    connector._client = MockClient()
+    yield connector
+
+
+class TestTableCatalog:
+    def test_negative_ttl_raises_error(self):
+        with pytest.raises(ValueError):
+            TableCatalog(None, ttl=-1)
+
+    def test_query_reads_the_dataset_metadata_views(self):
+        query = TableCatalog.query("project", "dataset")
+
+        assert "`project.dataset.INFORMATION_SCHEMA.TABLES`" in query
+        assert "`project.dataset.INFORMATION_SCHEMA.COLUMNS`" in query
+        assert "`project.dataset.__TABLES__`" in query
+        # Row counts come from __TABLES__ for partitioned and unpartitioned tables alike
+        assert "PARTITIONS" not in query
+
+    def test_parses_every_table_of_the_dataset(self, _metadata_rows):
+        tables = TableCatalog.parse("project", "dataset", _metadata_rows)
+
+        assert sorted(tables) == ["events", "live", "summary"]
+        events = tables["events"]
+        assert isinstance(events, TableMetadata)
+        assert events.table_type == "TABLE"
+        assert events.row_count == 100 and isinstance(events.row_count, int)
+        assert events.size_bytes == 2048
+        assert events.modified == MODIFIED.to_pydatetime()
+        assert events.schema == {"day": "DATE", "country": "STRING", "user_id": "INT64"}
+        assert events.partition_column == "day"
+        assert events.clustering_columns == ["user_id", "country"]
+
+    def test_parses_views_and_unpartitioned_tables(self, _metadata_rows):
+        tables = TableCatalog.parse("project", "dataset", _metadata_rows)
+
+        assert tables["summary"].table_type == "VIEW"
+        assert tables["summary"].schema == {}
+        assert tables["summary"].partition_column is None
+        assert tables["live"].partition_column is None
+        assert tables["live"].row_count == 10
+
+    def test_dataset_is_fetched_once_for_every_table(self, _connector):
+        catalog = _connector.catalog
+
+        events = catalog.get("project", "dataset", "events")
+        live = catalog.get("project", "dataset", "live")
+
+        assert events.table_id == "events"
+        assert live.table_id == "live"
+        assert catalog.get("project", "dataset", "missing") is None
+        assert len(_connector._client.queries) == 1
+
+    def test_datasets_are_fetched_separately(self, _connector):
+        _connector.catalog.get("project", "dataset", "events")
+        _connector.catalog.get("project", "other_dataset", "events")
+
+        assert len(_connector._client.queries) == 2
+
+    def test_expired_metadata_is_fetched_again(self, _connector):
+        catalog = _connector.catalog
+        catalog.ttl = 0
+        catalog.get("project", "dataset", "events")
+        catalog._datasets[("project", "dataset")] = (
+            catalog._datasets[("project", "dataset")][0] - 1,
+            catalog._datasets[("project", "dataset")][1],
+        )
+
+        catalog.get("project", "dataset", "events")
+
+        assert len(_connector._client.queries) == 2
+
+    def test_invalidate_forgets_the_dataset(self, _connector):
+        catalog = _connector.catalog
+        catalog.get("project", "dataset", "events")
+        catalog.get("project", "other_dataset", "events")
+
+        catalog.invalidate("project", "dataset")
+        catalog.get("project", "dataset", "events")
+        catalog.get("project", "other_dataset", "events")
+
+        assert len(_connector._client.queries) == 3
+
+    def test_concurrent_lookups_share_a_single_query(self, _connector):
+        barrier = threading.Barrier(8)
+
+        def lookup():
+            barrier.wait()
+            _connector.catalog.get("project", "dataset", "events")
+
+        threads = [threading.Thread(target=lookup) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(_connector._client.queries) == 1
+
+    def test_metadata_queries_are_reported(self, _connector):
+        report = RunReport()
+        with report.activate():
+            _connector.catalog.get("project", "dataset", "events")
+            _connector.catalog.get("project", "dataset", "live")
+
+        assert report.get("metadata_queries") == 1
+
+    def test_to_serializeble_dict(self, _metadata_rows):
+        events = TableCatalog.parse("project", "dataset", _metadata_rows)["events"]
+
+        result = events.to_serializeble_dict()
+
+        assert result["modified"] == "2021-01-01T00:00:00+00:00"
+        assert result["partition_column"] == "day"
+        assert result["clustering_columns"] == ["user_id", "country"]
+
+
+class TestDataNodeBigQueryTableMetadata:
+    def test_table_metadata_is_read_from_the_catalog(self, _connector):
+        events = DataNodeBigQuery("events", "project", "dataset", "events")
+        live = DataNodeBigQuery("live", "project", "dataset", "live")
+        for node in (events, live):
+            node.connectors["SQLBigQuery"] = _connector
+
+        assert events.table_metadata().row_count == 100
+        assert live.table_metadata().row_count == 10
+        assert len(_connector._client.queries) == 1
+
+    def test_atable_metadata(self, _connector):
+        node = DataNodeBigQuery("events", "project", "dataset", "events")
+        node.connectors["SQLBigQuery"] = _connector
+
+        metadata = asyncio.run(node.atable_metadata())
+
+        assert metadata.partition_column == "day"
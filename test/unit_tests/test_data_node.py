@@ -1,3 +1,5 @@
+import asyncio
+
 from pipeline_penguin.core.premise_output.output_manager import OutputManager
 import pytest
 
@@ -155,3 +157,29 @@ class TestDataNodeRunPremise:
         assert output_mgr.outputs.get("premise_a").pass_validation
         assert output_mgr.outputs.get("premise_b").pass_validation
         assert output_mgr.outputs.get("premise_c").pass_validation
+
+    def test_run_premises_concurrently(self, _data_node, _premise_check):
+        premise_names = ["premise_a", "premise_b", "premise_c"]
+
+        for name in premise_names:
+            _data_node.insert_premise(
+                name=name, premise_factory=_premise_check(), column="X"
+            )
+
+        output_mgr = _data_node.run_premises(max_workers=3)
+
+        assert list(output_mgr.outputs) == premise_names
+        assert all(output.pass_validation for output in output_mgr.outputs.values())
+
+    def test_arun_premises(self, _data_node, _premise_check):
+        premise_names = ["premise_a", "premise_b", "premise_c"]
+
+        for name in premise_names:
+            _data_node.insert_premise(
+                name=name, premise_factory=_premise_check(), column="X"
+            )
+
+        output_mgr = asyncio.run(_data_node.arun_premises(max_concurrency=2))
+
+        assert list(output_mgr.outputs) == premise_names
+        assert all(output.pass_validation for output in output_mgr.outputs.values())
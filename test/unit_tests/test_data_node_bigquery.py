@@ -1,5 +1,8 @@
+import datetime
+
 from pipeline_penguin.core.data_node import DataNode, NodeType
 from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_node.sql.partition_filter import PartitionFilter
 from pipeline_penguin.data_premise.sql.check_null import DataPremiseSQLCheckIsNull
 from pipeline_penguin.core.data_premise.data_premise import DataPremise
 import pytest
@@ -125,3 +128,81 @@ class TestDataNodeBigQuery:
         )
         with pytest.raises(WrongTypeReference):
             data_node.get_connector("SQL")
+
+
+class TestDataNodeBigQueryScope:
+    def test_unscoped_node_reads_the_whole_table(self):
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+
+        assert node.scope_condition() is None
+        assert node.premises["not_null"].render_query() == (
+            "SELECT count(*) as total FROM `project.dataset.table` WHERE col_a is null"
+        )
+
+    def test_scope_is_injected_on_every_premise_query(self):
+        node = DataNodeBigQuery(
+            "node",
+            "project",
+            "dataset",
+            "table",
+            partition_filter="_PARTITIONTIME >= '2021-01-01'",
+            row_filter="country = 'BR'",
+        )
+        node.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+        premise = node.premises["not_null"]
+        scoped = (
+            "(SELECT * FROM `project.dataset.table` "
+            "WHERE (_PARTITIONTIME >= '2021-01-01') AND (country = 'BR'))"
+        )
+
+        assert premise.render_query() == (
+            f"SELECT count(*) as total FROM {scoped} WHERE col_a is null"
+        )
+        assert premise.count_query() == (
+            f"SELECT COUNTIF(col_a is null) AS failed_count FROM {scoped}"
+        )
+
+    def test_set_scope_with_partition_filter(self):
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.set_scope(partition_filter=PartitionFilter("event_date", data_type="DATE"))
+
+        assert node.scope_condition() == f"({node.partition_filter.render()})"
+        assert node.to_serializeble_dict()["partition_filter"]["column"] == "event_date"
+
+        node.set_scope()
+        assert node.scoped_table() == "`project.dataset.table`"
+
+    def test_snapshot_is_injected_on_every_premise_query(self):
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+        node.set_snapshot(datetime.datetime(2021, 1, 1, 12, 30))
+        snapshot = (
+            "`project.dataset.table` FOR SYSTEM_TIME AS OF "
+            "TIMESTAMP '2021-01-01 12:30:00+00:00'"
+        )
+
+        assert node.premises["not_null"].render_query() == (
+            f"SELECT count(*) as total FROM {snapshot} WHERE col_a is null"
+        )
+
+        node.set_scope(row_filter="country = 'BR'")
+        assert node.scoped_table() == (
+            f"(SELECT * FROM {snapshot} WHERE (country = 'BR'))"
+        )
+
+        node.set_snapshot(None)
+        assert node.scoped_table() == (
+            "(SELECT * FROM `project.dataset.table` WHERE (country = 'BR'))"
+        )
+
+    def test_sampled_table_keeps_snapshot_and_scope(self):
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.set_snapshot(datetime.datetime(2021, 1, 1, 12, 30))
+        node.set_scope(row_filter="country = 'BR'")
+
+        assert node.scoped_table(sample_percent=12.5) == (
+            "(SELECT * FROM `project.dataset.table` FOR SYSTEM_TIME AS OF "
+            "TIMESTAMP '2021-01-01 12:30:00+00:00' TABLESAMPLE SYSTEM (12.5 PERCENT) "
+            "WHERE (country = 'BR'))"
+        )
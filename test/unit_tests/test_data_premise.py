@@ -1,3 +1,6 @@
+import asyncio
+
+import pandas as pd
 import pytest
 
 from pipeline_penguin.core.data_premise import DataPremise
@@ -36,3 +39,44 @@ class TestDataPremiseSQL:
     def test_instance_superclass_type(self, _data_premise_sql_arguments):
         data_premise_sql = DataPremiseSQL(**_data_premise_sql_arguments)
         assert isinstance(data_premise_sql, DataPremiseSQL)
+
+
+class TestDataPremiseAsync:
+    def test_avalidate_wraps_validate(self, _data_premise_arguments):
+        class SyncPremise(DataPremise):
+            def validate(self):
+                return "validated"
+
+        data_premise = SyncPremise(**_data_premise_arguments)
+        assert asyncio.run(data_premise.avalidate()) == "validated"
+
+    def test_sql_avalidate_uses_connector_arun(self):
+        class MockConnector:
+            async def arun(self, query):
+                return pd.DataFrame([query], columns=["result"])
+
+        class MockDataNode:
+            def get_connector(self, premise_type):
+                return MockConnector()
+
+        class MockPremise(DataPremiseSQL):
+            query_template = "SELECT {column}"
+
+            def query_args(self):
+                return {"column": self.column}
+
+            def build_output(self, data_frame):
+                return data_frame["result"][0]
+
+        data_premise = MockPremise("name_test", MockDataNode(), "test_column")
+        assert asyncio.run(data_premise.avalidate()) == "SELECT test_column"
+
+    def test_sql_avalidate_falls_back_to_custom_validate(
+        self, _data_premise_sql_arguments
+    ):
+        class CustomPremise(DataPremiseSQL):
+            def validate(self):
+                return "custom"
+
+        data_premise = CustomPremise(**_data_premise_sql_arguments)
+        assert asyncio.run(data_premise.avalidate()) == "custom"
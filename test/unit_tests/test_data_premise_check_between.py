@@ -1,8 +1,13 @@
+import datetime
 import pytest
 
 from unittest.mock import MagicMock
 import pandas as pd
-from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckValuesAreBetween
+from pipeline_penguin.connector.sql.bigquery import ConnectorSQLBigQuery
+from pipeline_penguin.data_premise.sql import (
+    DataPremiseSQLCheckValuesAreBetween,
+    SQLExpression,
+)
 
 
 @pytest.fixture
@@ -86,3 +91,66 @@ class TestDataPremiseSQLCheckIsNull:
             "lower_bound": 100,
             "upper_bound": 200,
         }
+
+    def test_numeric_values_are_sent_as_typed_query_parameters(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckValuesAreBetween(
+            "test_name", data_node, "test_column", 10, 20
+        )
+        parameters = data_premise.query_parameters()
+
+        assert parameters == {"lower_bound": 10, "upper_bound": 20}
+        assert "@" in data_premise.render_query()
+        assert [
+            parameter.to_api_repr()["parameterType"]
+            for parameter in ConnectorSQLBigQuery.query_parameters(parameters)
+        ] == [{"type": "INT64"}, {"type": "INT64"}]
+
+    def test_string_values_are_sent_as_typed_query_parameters(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckValuesAreBetween(
+            "test_name", data_node, "test_column", "10", "DATE '2020-01-01'"
+        )
+        parameters = data_premise.query_parameters()
+
+        assert parameters == {
+            "lower_bound": 10,
+            "upper_bound": datetime.date(2020, 1, 1),
+        }
+        assert data_premise.render_query().endswith(
+            "test_column BETWEEN @lower_bound AND @upper_bound"
+        )
+        assert [
+            parameter.to_api_repr()["parameterType"]
+            for parameter in ConnectorSQLBigQuery.query_parameters(parameters)
+        ] == [{"type": "INT64"}, {"type": "DATE"}]
+
+    def test_sql_expressions_are_rendered_as_sql(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckValuesAreBetween(
+            "test_name",
+            data_node,
+            "test_column",
+            "'a'",
+            SQLExpression("CURRENT_DATE()"),
+        )
+
+        assert data_premise.render_query().endswith(
+            "test_column BETWEEN @lower_bound AND CURRENT_DATE()"
+        )
+        assert data_premise.query_parameters() == {"lower_bound": "a"}
+
+    def test_raises_value_error_on_strings_which_are_not_sql_literals(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        with pytest.raises(ValueError):
+            DataPremiseSQLCheckValuesAreBetween(
+                "test_name", data_node, "test_column", "0 OR 1=1", 10
+            )
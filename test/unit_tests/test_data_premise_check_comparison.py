@@ -3,8 +3,10 @@ import pytest
 
 from unittest.mock import MagicMock
 import pandas as pd
+from pipeline_penguin.connector.sql.bigquery import ConnectorSQLBigQuery
 from pipeline_penguin.data_premise.sql import (
     DataPremiseSQLCheckLogicalComparisonWithValue,
+    SQLExpression,
 )
 
 
@@ -100,3 +102,55 @@ class TestDataPremiseSQLCheckIsNull:
             data_premise = DataPremiseSQLCheckLogicalComparisonWithValue(
                 "test_name", data_node, "test_column", "G", 100
             )
+
+    def test_numeric_values_are_sent_as_typed_query_parameters(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckLogicalComparisonWithValue(
+            "test_name", data_node, "test_column", "<", 10
+        )
+        parameters = data_premise.query_parameters()
+
+        assert parameters == {"value": 10}
+        assert "@" in data_premise.render_query()
+        assert [
+            parameter.to_api_repr()["parameterType"]
+            for parameter in ConnectorSQLBigQuery.query_parameters(parameters)
+        ] == [{"type": "INT64"}]
+
+    def test_string_values_are_sent_as_typed_query_parameters(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckLogicalComparisonWithValue(
+            "test_name", data_node, "test_column", "<", "'2020-01-01'"
+        )
+        parameters = data_premise.query_parameters()
+
+        assert parameters == {"value": "2020-01-01"}
+        assert data_premise.render_query().endswith("test_column < @value")
+        assert [
+            parameter.to_api_repr()["parameterType"]
+            for parameter in ConnectorSQLBigQuery.query_parameters(parameters)
+        ] == [{"type": "STRING"}]
+
+    def test_sql_expressions_are_rendered_as_sql(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckLogicalComparisonWithValue(
+            "test_name", data_node, "test_column", "<", SQLExpression("CURRENT_DATE()")
+        )
+
+        assert data_premise.render_query().endswith("test_column < CURRENT_DATE()")
+        assert data_premise.query_parameters() == {}
+
+    def test_raises_value_error_on_strings_which_are_not_sql_literals(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        with pytest.raises(ValueError):
+            DataPremiseSQLCheckLogicalComparisonWithValue(
+                "test_name", data_node, "test_column", "<", "1; DROP TABLE t"
+            )
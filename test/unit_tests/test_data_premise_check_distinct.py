@@ -2,6 +2,7 @@ import pytest
 
 from unittest.mock import MagicMock
 import pandas as pd
+from pipeline_penguin.core.premise_output.premise_output import PremiseStatus
 from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckDistinct
 
 
@@ -45,6 +46,28 @@ def _mock_data_node_with_failed_validation(monkeypatch):
     yield mock_data_node
 
 
+@pytest.fixture
+def _mock_data_node_with_estimate():
+    def mock_data_node(distinct, total):
+        class MockDataNode:
+            project_id = "project_test"
+            dataset_id = "dataset_test"
+            table_id = "table_test"
+
+            def get_connector(self, *args, **kwargs):
+                connector_mock = MagicMock()
+                connector_mock.run = MagicMock(
+                    return_value=pd.DataFrame(
+                        [[distinct, total]], columns=["result", "total"]
+                    )
+                )
+                return connector_mock
+
+        return MockDataNode()
+
+    yield mock_data_node
+
+
 class TestDataPremiseSQLCheckIsNull:
     def test_instance_type(self, _mock_data_node_with_passed_validation):
         data_node = _mock_data_node_with_passed_validation()
@@ -84,3 +107,121 @@ class TestDataPremiseSQLCheckIsNull:
             "table": "table_test",
             "column": "test_column",
         }
+
+    def test_exact_query(self, _mock_data_node_with_passed_validation):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckDistinct(
+            "test_name", data_node, "test_column"
+        )
+
+        assert data_premise.render_query() == (
+            "SELECT count(DISTINCT test_column) as result, count(test_column) as total "
+            "FROM `project_test.dataset_test.table_test`"
+        )
+
+
+class TestDataPremiseSQLCheckDistinctApproximate:
+    def test_approximate_query_uses_precision_of_tolerance(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckDistinct(
+            "test_name", data_node, "test_column", approximate=True, tolerance=0.01
+        )
+
+        assert data_premise.precision() == 16
+        assert data_premise.render_query() == (
+            "SELECT HLL_COUNT.EXTRACT(HLL_COUNT.INIT(test_column, 16)) as result, "
+            "count(test_column) as total FROM `project_test.dataset_test.table_test`"
+        )
+        assert data_premise.failed_count_expression() is None
+        assert data_premise.count_query() is None
+
+    def test_rejects_unreachable_tolerance(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+
+        with pytest.raises(ValueError):
+            DataPremiseSQLCheckDistinct(
+                "test_name", data_node, "test_column", tolerance=0.0001
+            )
+
+    def test_duplicates_within_error_bound_are_inconclusive(
+        self, _mock_data_node_with_estimate
+    ):
+        data_premise = DataPremiseSQLCheckDistinct(
+            "test_name",
+            _mock_data_node_with_estimate(999_500, 1_000_000),
+            "test_column",
+            approximate=True,
+        )
+
+        output = data_premise.validate()
+
+        assert output.pass_validation == False
+        assert output.status == PremiseStatus.INCONCLUSIVE
+        assert output.failed_count == 500
+        assert output.failed_values["error_bound"][0] == 8121
+        assert output.message == "approximate count (precision 16), error bound: 8121"
+
+    @pytest.mark.parametrize(
+        "distinct,failed_count",
+        [(1_000_400, 0), (1_000_000, 0), (999_999, 1), (999_500, 500), (992_000, 8000)],
+    )
+    def test_estimates_within_error_bound_are_always_inconclusive(
+        self, _mock_data_node_with_estimate, distinct, failed_count
+    ):
+        data_premise = DataPremiseSQLCheckDistinct(
+            "test_name",
+            _mock_data_node_with_estimate(distinct, 1_000_000),
+            "test_column",
+            approximate=True,
+        )
+
+        output = data_premise.validate()
+
+        assert output.pass_validation == False
+        assert output.status == PremiseStatus.INCONCLUSIVE
+        assert output.failed_count == failed_count
+        assert output.failed_count <= output.failed_values["error_bound"][0]
+
+    def test_estimates_beyond_error_bound_fail(self, _mock_data_node_with_estimate):
+        data_premise = DataPremiseSQLCheckDistinct(
+            "test_name",
+            _mock_data_node_with_estimate(980_000, 1_000_000),
+            "test_column",
+            approximate=True,
+        )
+
+        output = data_premise.validate()
+
+        assert output.status == PremiseStatus.FAILED
+        assert output.failed_count == 20_000
+        assert output.failed_count > output.failed_values["error_bound"][0]
+
+    def test_fails_beyond_error_bound(self, _mock_data_node_with_failed_validation):
+        data_node = _mock_data_node_with_failed_validation()
+        data_premise = DataPremiseSQLCheckDistinct(
+            "test_name", data_node, "test_column", approximate=True
+        )
+
+        output = data_premise.validate()
+
+        assert output.pass_validation == False
+        assert output.status == PremiseStatus.FAILED
+        assert output.failed_count == 60
+
+    def test_class_attribute_sets_global_default(
+        self, monkeypatch, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        monkeypatch.setattr(DataPremiseSQLCheckDistinct, "approximate", True)
+
+        default = DataPremiseSQLCheckDistinct("default", data_node, "test_column")
+        exact = DataPremiseSQLCheckDistinct(
+            "exact", data_node, "test_column", approximate=False
+        )
+
+        assert "HLL_COUNT" in default.render_query()
+        assert "count(DISTINCT test_column)" in exact.render_query()
@@ -85,3 +85,26 @@ class TestDataPremiseSQLCheckIsNull:
             "column": "test_column",
             "array": [],
         }
+
+    def test_array_is_sent_as_query_parameter(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckInArray(
+            "test_name", data_node, "test_column", [1, 2, 3]
+        )
+
+        assert data_premise.render_query() == (
+            "SELECT test_column as result FROM `project_test.dataset_test.table_test` "
+            "WHERE test_column IN UNNEST(@array)"
+        )
+        assert data_premise.query_parameters() == {"array": [1, 2, 3]}
+
+    def test_string_array_is_kept_as_sql(self, _mock_data_node_with_passed_validation):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckInArray(
+            "test_name", data_node, "test_column", "['a', 'b']"
+        )
+
+        assert "IN UNNEST(['a', 'b'])" in data_premise.render_query()
+        assert data_premise.query_parameters() == {}
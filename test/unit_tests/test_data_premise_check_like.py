@@ -85,3 +85,22 @@ class TestDataPremiseSQLCheckIsNull:
             "column": "test_column",
             "pattern": "test_%",
         }
+
+    def test_pattern_is_sent_as_query_parameter(
+        self, _mock_data_node_with_passed_validation
+    ):
+        data_node = _mock_data_node_with_passed_validation()
+        data_premise = DataPremiseSQLCheckLikePattern(
+            "test_name", data_node, "test_column", "x' OR '1'='1"
+        )
+        connector = MagicMock()
+        connector.run = MagicMock(return_value=pd.DataFrame([], columns=["result"]))
+        data_node.get_connector = lambda premise_type: connector
+
+        data_premise.validate()
+
+        connector.run.assert_called_once_with(
+            "SELECT test_column as result FROM `project_test.dataset_test.table_test` "
+            "WHERE test_column LIKE @pattern",
+            parameters={"pattern": "x' OR '1'='1"},
+        )
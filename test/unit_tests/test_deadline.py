@@ -0,0 +1,43 @@
+import asyncio
+import time
+
+import pytest
+
+from pipeline_penguin.core.runner import Deadline
+
+
+class TestDeadline:
+    def test_rejects_negative_seconds(self):
+        with pytest.raises(ValueError):
+            Deadline(-1)
+
+    def test_remaining_and_expired(self):
+        deadline = Deadline(0.05)
+        assert not deadline.expired()
+        assert 0 < deadline.remaining() <= 0.05
+
+        time.sleep(0.06)
+        assert deadline.expired()
+        assert deadline.remaining() == 0
+
+    def test_after_without_seconds_returns_none(self):
+        assert Deadline.after(None) is None
+        assert isinstance(Deadline.after(10), Deadline)
+
+    def test_activate_sets_current_deadline(self):
+        deadline = Deadline(10)
+        assert Deadline.current() is None
+
+        with deadline.activate():
+            assert Deadline.current() is deadline
+
+        assert Deadline.current() is None
+
+    def test_current_deadline_is_visible_on_threads(self):
+        deadline = Deadline(10)
+
+        async def current_on_thread():
+            with deadline.activate():
+                return await asyncio.to_thread(Deadline.current)
+
+        assert asyncio.run(current_on_thread()) is deadline
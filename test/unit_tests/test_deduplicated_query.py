@@ -0,0 +1,115 @@
+import asyncio
+import copy
+
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.core.premise_output.premise_output import PremiseStatus
+from pipeline_penguin.core.runner import DeduplicatedQuery, PremiseRunner
+from pipeline_penguin.core.runner.deduplicated_query import canonical_query
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import (
+    DataPremiseSQLCheckIsNull,
+    DataPremiseSQLCheckValuesAreBetween,
+)
+
+
+class CountingConnector(ConnectorSQL):
+    """Fake connector recording every query executed."""
+
+    source = "BigQuery"
+
+    def __init__(self, fail=False):
+        super().__init__()
+        self.fail = fail
+        self.queries = []
+
+    def run(self, query, max_results=None, parameters=None):
+        self.queries.append(query)
+        if self.fail:
+            raise ValueError("query failed")
+        return pd.DataFrame([3], columns=["total"])
+
+
+@pytest.fixture()
+def _copied_nodes():
+    def copied_nodes(fail=False):
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.connectors["SQLBigQuery"] = CountingConnector(fail)
+        node.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+        node.insert_premise("other_not_null", DataPremiseSQLCheckIsNull, "col_b")
+        copies = [copy.deepcopy(node) for _ in range(2)]
+        for index, copied in enumerate(copies):
+            copied.name = f"copy_{index}"
+        return [node, *copies]
+
+    yield copied_nodes
+
+
+class TestCanonicalQuery:
+    def test_collapses_whitespace_outside_of_strings(self):
+        assert canonical_query("SELECT  a\n FROM\tt WHERE b = 'x  y' ;") == (
+            "SELECT a FROM t WHERE b = 'x  y'"
+        )
+
+
+class TestDeduplicatedQuery:
+    def test_plan_groups_identical_queries(self, _copied_nodes):
+        nodes = _copied_nodes()
+        premises = [premise for node in nodes for premise in node.premises.values()]
+
+        queries = DeduplicatedQuery.plan(premises)
+
+        assert len(queries) == 6
+        assert len(set(queries.values())) == 2
+
+    def test_each_query_runs_once(self, _copied_nodes):
+        nodes = _copied_nodes()
+        premises = [premise for node in nodes for premise in node.premises.values()]
+        runner = PremiseRunner(max_workers=4, dedupe=True)
+
+        outputs = runner.run(premises)
+
+        assert len(nodes[0].connectors["SQLBigQuery"].queries) == 2
+        assert runner.report.get("deduplicated_queries") == 4
+        assert [output.failed_count for output in outputs] == [3] * 6
+        assert len({id(output) for output in outputs}) == 6
+        assert [output.data_node.name for output in outputs] == [
+            "node",
+            "node",
+            "copy_0",
+            "copy_0",
+            "copy_1",
+            "copy_1",
+        ]
+
+    def test_failure_is_not_retried(self, _copied_nodes):
+        nodes = _copied_nodes(fail=True)
+        premises = [node.premises["not_null"] for node in nodes]
+
+        outputs = PremiseRunner(dedupe=True, capture_errors=True).run(premises)
+
+        assert len(nodes[0].connectors["SQLBigQuery"].queries) == 1
+        assert {output.status for output in outputs} == {PremiseStatus.ERROR}
+
+    def test_async_run(self, _copied_nodes):
+        nodes = _copied_nodes()
+        premises = [premise for node in nodes for premise in node.premises.values()]
+
+        outputs = asyncio.run(PremiseRunner(dedupe=True).arun(premises))
+
+        assert len(nodes[0].connectors["SQLBigQuery"].queries) == 2
+        assert [output.failed_count for output in outputs] == [3] * 6
+
+    def test_different_parameters_are_not_shared(self, _copied_nodes):
+        node = _copied_nodes()[0]
+        node.insert_premise("low", DataPremiseSQLCheckValuesAreBetween, "col", 0, 10)
+        node.insert_premise("high", DataPremiseSQLCheckValuesAreBetween, "col", 0, 20)
+        node.insert_premise("same", DataPremiseSQLCheckValuesAreBetween, "col", 0, 20)
+
+        queries = DeduplicatedQuery.plan(
+            [node.premises[name] for name in ("low", "high", "same")]
+        )
+
+        assert set(queries) == {node.premises["high"], node.premises["same"]}
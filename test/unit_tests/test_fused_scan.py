@@ -0,0 +1,125 @@
+import asyncio
+import re
+
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.core.premise_output.premise_output import PremiseStatus
+from pipeline_penguin.core.runner import FusedScan, PremiseRunner
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import (
+    DataPremiseSQLCheckDistinct,
+    DataPremiseSQLCheckIsNull,
+    DataPremiseSQLCheckValuesAreBetween,
+)
+
+
+class RecordingConnector(ConnectorSQL):
+    """Fake connector returning the failed counts configured for each fused expression."""
+
+    source = "BigQuery"
+
+    def __init__(self, failed_counts, fail_fused=False):
+        super().__init__()
+        self.failed_counts = failed_counts
+        self.fail_fused = fail_fused
+        self.queries = []
+        self.parameters = []
+
+    def run(self, query, max_results=None, parameters=None):
+        self.queries.append(query)
+        self.parameters.append(parameters)
+        if " AS p0" in query:
+            if self.fail_fused:
+                raise ValueError("fused query failed")
+            aliases = re.findall(r"AS (p\d+)", query)
+            return pd.DataFrame(
+                [[self.failed_counts[alias] for alias in aliases]], columns=aliases
+            )
+        if query.startswith("SELECT count(*)"):
+            return pd.DataFrame([0], columns=["total"])
+        return pd.DataFrame([1, 2], columns=["result"])
+
+
+@pytest.fixture()
+def _data_node():
+    def data_node(failed_counts, fail_fused=False):
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.connectors["SQLBigQuery"] = RecordingConnector(failed_counts, fail_fused)
+        node.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+        node.insert_premise(
+            "between", DataPremiseSQLCheckValuesAreBetween, "col_b", 0, 10
+        )
+        node.insert_premise("distinct", DataPremiseSQLCheckDistinct, "col_c")
+        return node
+
+    yield data_node
+
+
+class TestFusedScan:
+    def test_plan_groups_premises_by_node(self, _data_node):
+        node_a = _data_node({})
+        node_b = DataNodeBigQuery("other", "project", "dataset", "other_table")
+        node_b.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+        premises = [*node_a.premises.values(), *node_b.premises.values()]
+
+        scans = FusedScan.plan(premises)
+
+        assert set(scans) == set(node_a.premises.values())
+        assert len(set(scans.values())) == 1
+
+    def test_render_query(self, _data_node):
+        premises = list(_data_node({}).premises.values())
+        scan = FusedScan(premises)
+
+        assert scan.render_query() == (
+            "SELECT COUNTIF(col_a is null) AS p0, "
+            "COUNTIF(col_b BETWEEN @p1_lower_bound AND @p1_upper_bound) AS p1, "
+            "COUNT(col_c) - COUNT(DISTINCT col_c) AS p2 "
+            "FROM `project.dataset.table`"
+        )
+
+    def test_single_scan_and_samples_only_for_failures(self, _data_node):
+        node = _data_node({"p0": 0, "p1": 2500, "p2": 0})
+        premises = list(node.premises.values())
+        runner = PremiseRunner(max_workers=3, fuse=True)
+
+        outputs = runner.run(premises)
+        queries = node.connectors["SQLBigQuery"].queries
+
+        assert len(queries) == 2
+        assert "LIMIT 100" in queries[1] and "col_b BETWEEN @lower_bound" in queries[1]
+        assert node.connectors["SQLBigQuery"].parameters == [
+            {"p1_lower_bound": 0, "p1_upper_bound": 10},
+            {"lower_bound": 0, "upper_bound": 10},
+        ]
+        assert [output.failed_count for output in outputs] == [0, 2500, 0]
+        assert [output.status for output in outputs] == [
+            PremiseStatus.PASSED,
+            PremiseStatus.FAILED,
+            PremiseStatus.PASSED,
+        ]
+        assert len(outputs[1].failed_values) == 2
+        assert runner.report.get("fused_scans") == 1
+        assert runner.report.get("fused_premises") == 3
+
+    def test_falls_back_to_individual_queries(self, _data_node):
+        node = _data_node({}, fail_fused=True)
+        premises = list(node.premises.values())[:2]
+
+        outputs = PremiseRunner(fuse=True).run(premises)
+        queries = node.connectors["SQLBigQuery"].queries
+
+        assert len(queries) == 3
+        assert [output.failed_count for output in outputs] == [0, 2]
+
+    def test_async_single_scan(self, _data_node):
+        node = _data_node({"p0": 1, "p1": 0, "p2": 0})
+        premises = list(node.premises.values())
+
+        outputs = asyncio.run(PremiseRunner(fuse=True).arun(premises))
+        queries = node.connectors["SQLBigQuery"].queries
+
+        assert len(queries) == 2
+        assert [output.failed_count for output in outputs] == [1, 0, 0]
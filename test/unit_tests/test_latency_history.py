@@ -0,0 +1,149 @@
+import pandas as pd
+import pytest
+
+from pipeline_penguin.connector.sql.table_catalog import TableMetadata
+from pipeline_penguin.core.data_node.data_node import DataNode
+from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
+from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from pipeline_penguin.core.runner import LatencyHistory
+from pipeline_penguin.data_node import NodeManager
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+
+
+class MockPremise(DataPremiseSQL):
+    def __init__(self, name, data_node, column):
+        super().__init__(name, data_node, column)
+        self.query_template = "SELECT {column} FROM table"
+
+    def query_args(self):
+        return {"column": self.column}
+
+
+class TablePremise(DataPremiseSQL):
+    query_template = "SELECT {column} FROM `{project}.{dataset}.{table}`"
+
+    def query_args(self):
+        return {
+            "column": self.column,
+            "project": self.data_node.project_id,
+            "dataset": self.data_node.dataset_id,
+            "table": self.data_node.table_id,
+        }
+
+    def validate(self):
+        self.queries.append(self.render_query())
+        return PremiseOutput(self, self.data_node, self.column, True, 0, pd.DataFrame())
+
+
+@pytest.fixture()
+def _premises():
+    data_node = DataNode("node_test", "TEST_SOURCE")
+    yield [MockPremise(f"p{i}", data_node, "col") for i in range(4)]
+
+
+class TestLatencyHistory:
+    def test_rejects_invalid_smoothing(self):
+        with pytest.raises(ValueError):
+            LatencyHistory(smoothing=0)
+
+    def test_key_depends_on_rendered_query(self, _premises):
+        premise = _premises[0]
+        key = LatencyHistory.key(premise)
+        assert key.startswith("node_test/p0/")
+
+        premise.column = "other_col"
+        assert LatencyHistory.key(premise) != key
+
+    def test_record_smooths_latencies(self, _premises):
+        history = LatencyHistory(smoothing=0.5)
+        history.record(_premises[0], 2.0)
+        history.record(_premises[0], 4.0)
+
+        assert history.predict(_premises[0]) == 3.0
+
+    def test_predict_without_history(self, _premises):
+        history = LatencyHistory()
+        assert history.predict(_premises[0]) == 0.0
+
+        history.record(_premises[0], 2.0)
+        history.record(_premises[1], 4.0)
+        assert history.predict(_premises[2]) == 3.0
+
+        history = LatencyHistory(fallback=lambda premise: 10.0)
+        assert history.predict(_premises[0]) == 10.0
+
+    def test_order_is_longest_first(self, _premises):
+        history = LatencyHistory()
+        for premise, latency in zip(_premises, [1.0, 5.0, 3.0, 4.0]):
+            history.record(premise, latency)
+
+        ordered = history.order(_premises)
+        assert [premise.name for premise in ordered] == ["p1", "p3", "p2", "p0"]
+
+    def test_makespan(self, _premises):
+        history = LatencyHistory()
+        for premise, latency in zip(_premises, [4.0, 3.0, 2.0, 1.0]):
+            history.record(premise, latency)
+
+        assert history.makespan(_premises, workers=1) == 10.0
+        assert history.makespan(_premises, workers=2) == 5.0
+        assert history.makespan(_premises, workers=8) == 4.0
+
+    def test_save_and_load(self, _premises, tmp_path):
+        path = str(tmp_path / "history" / "latency.json")
+        history = LatencyHistory(path=path)
+        history.record(_premises[0], 2.5)
+        history.save()
+
+        assert LatencyHistory(path=path).predict(_premises[0]) == 2.5
+
+    def test_key_ignores_the_scope_of_the_data_node(self):
+        node_manager = NodeManager()
+        data_node = node_manager.create_node(
+            "Snapshot Node",
+            DataNodeBigQuery,
+            project_id="project",
+            dataset_id="dataset",
+            table_id="table",
+        )
+        data_node.insert_premise("check", TablePremise, "col")
+        premise = data_node.premises["check"]
+        premise.queries = []
+        history = LatencyHistory()
+        hits = []
+
+        def fallback(premise):
+            hits.append(False)
+            return 0.0
+
+        history.fallback = fallback
+        try:
+            node_manager.run_premises(max_workers=2, history=history, snapshot=True)
+            hits.clear()
+            node_manager.run_premises(max_workers=2, history=history, snapshot=True)
+        finally:
+            node_manager.remove_node("Snapshot Node")
+
+        assert "FOR SYSTEM_TIME AS OF" in premise.queries[0]
+        assert premise.queries[0] != premise.queries[1]
+        assert hits == []
+        assert len(history.latencies) == 1
+
+    def test_predict_from_table_size(self):
+        sizes = {"small": 10**9, "large": 4 * 10**9}
+        premises = []
+        for table in ["small", "large", None]:
+            data_node = DataNode(f"node_{table}", "TEST_SOURCE")
+            data_node.table_metadata = lambda table=table: table and TableMetadata(
+                "project", "dataset", table, "TABLE", size_bytes=sizes[table]
+            )
+            premises.append(MockPremise("p", data_node, "col"))
+        history = LatencyHistory()
+
+        assert history.predict(premises[0]) == 1.0
+        assert history.predict(premises[1]) == 4.0
+        assert history.predict(premises[2]) == 0.0
+
+        history.record(premises[0], 2.0)
+        assert history.predict(premises[1]) == 8.0
+        assert history.predict(premises[2]) == 2.0
@@ -0,0 +1,57 @@
+import pytest
+
+from pipeline_penguin.core.data_node.data_node import DataNode
+from pipeline_penguin.core.runner import NodeGraph
+from pipeline_penguin.exceptions import CyclicNodeRelation
+
+
+@pytest.fixture()
+def _nodes():
+    def nodes(*names):
+        return {name: DataNode(name, "TEST_SOURCE") for name in names}
+
+    yield nodes
+
+
+class TestNodeGraph:
+    def test_levels_without_relations(self, _nodes):
+        nodes = _nodes("a", "b", "c")
+        assert NodeGraph(nodes).levels() == [["a", "b", "c"]]
+
+    def test_levels_follow_relations(self, _nodes):
+        nodes = _nodes("raw", "trusted", "refined", "lookup")
+        nodes["raw"].add_relation(nodes["trusted"], isDestination=True)
+        nodes["trusted"].add_relation(nodes["refined"], isDestination=True)
+        nodes["refined"].add_relation("lookup", isDestination=False)
+
+        assert NodeGraph(nodes).levels() == [
+            ["raw", "lookup"],
+            ["trusted"],
+            ["refined"],
+        ]
+
+    def test_duplicated_relations_are_counted_once(self, _nodes):
+        nodes = _nodes("a", "b")
+        nodes["a"].add_relation("b", isDestination=True)
+        nodes["b"].add_relation("a", isDestination=False)
+
+        assert NodeGraph(nodes).levels() == [["a"], ["b"]]
+
+    def test_relations_to_unknown_nodes_are_ignored(self, _nodes):
+        nodes = _nodes("a")
+        nodes["a"].add_relation("external_table", isDestination=False)
+
+        assert NodeGraph(nodes).levels() == [["a"]]
+
+    def test_raises_error_on_cycle(self, _nodes):
+        nodes = _nodes("a", "b", "c", "d")
+        nodes["a"].add_relation("b", isDestination=True)
+        nodes["b"].add_relation("c", isDestination=True)
+        nodes["c"].add_relation("b", isDestination=True)
+
+        with pytest.raises(CyclicNodeRelation) as error:
+            NodeGraph(nodes).levels()
+
+        assert str(error.value) == (
+            "NodeRelations form a cycle between the DataNodes: ['b', 'c']"
+        )
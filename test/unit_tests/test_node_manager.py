@@ -3,6 +3,9 @@ Since the "NodeManager" class uses a Singleton pattern the same instance will be
 every unit test executed. This may cause unpredictible behavior in some of the tests.
 """
 
+import asyncio
+import datetime
+
 import pandas as pd
 from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
 from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
@@ -13,11 +16,13 @@ from pipeline_penguin.core.data_node import DataNode, NodeType
 from pipeline_penguin.data_node import NodeManager, node_manager
 from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
 from pipeline_penguin.exceptions import (
+    CyclicNodeRelation,
     NodeManagerMissingCorrectArgs,
     WrongTypeReference,
 )
 from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckIsNull
 from pipeline_penguin.core.premise_output.output_manager import OutputManager
+from pipeline_penguin.core.runner import FailFastPolicy, LatencyHistory, RunOptions
 
 
 @pytest.fixture()
@@ -362,3 +367,231 @@ class TestRunPremises:
 
         assert isinstance(output_manager, OutputManager)
         assert output_manager.outputs
+
+    def test_run_premises_concurrently_keeps_result_shape(
+        self, bigquery_args, _mock_passing_premise
+    ):
+        node_manager = NodeManager()
+
+        for node_name in ["Node A", "Node B"]:
+            data_node = node_manager.create_node(
+                name=node_name,
+                node_factory=DataNodeBigQuery,
+                **bigquery_args,
+            )
+            for premise_name in ["premise_1", "premise_2", "premise_3"]:
+                data_node.insert_premise(
+                    premise_name, _mock_passing_premise(), "test_column"
+                )
+
+        output_manager = node_manager.run_premises(max_workers=4)
+
+        assert list(output_manager.outputs) == ["Node A", "Node B"]
+        for node_name, node_outputs in output_manager.outputs.items():
+            assert isinstance(node_outputs, OutputManager)
+            assert list(node_outputs.outputs) == ["premise_1", "premise_2", "premise_3"]
+            for premise_output in node_outputs.outputs.values():
+                assert premise_output.data_node.name == node_name
+
+    def test_run_premises_with_node_without_premises(
+        self, bigquery_args, _mock_passing_premise
+    ):
+        node_manager = NodeManager()
+        node_manager.create_node(
+            name="Empty Node", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        data_node = node_manager.create_node(
+            name="Full Node", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        data_node.insert_premise("check null", _mock_passing_premise(), "test_column")
+
+        output_manager = node_manager.run_premises(max_workers=2)
+
+        assert output_manager.outputs["Empty Node"].outputs == {}
+        assert output_manager.outputs["Full Node"].outputs["check null"].pass_validation
+
+    def test_arun_premises(self, bigquery_args, _mock_passing_premise):
+        node_manager = NodeManager()
+
+        for node_name in ["Node A", "Node B"]:
+            data_node = node_manager.create_node(
+                name=node_name,
+                node_factory=DataNodeBigQuery,
+                **bigquery_args,
+            )
+            data_node.insert_premise("check null", _mock_passing_premise(), "col")
+
+        output_manager = asyncio.run(node_manager.arun_premises(max_concurrency=10))
+
+        assert list(output_manager.outputs) == ["Node A", "Node B"]
+        for node_outputs in output_manager.outputs.values():
+            assert node_outputs.outputs["check null"].pass_validation
+
+    def test_run_premises_in_lineage_order(self, bigquery_args):
+        executed = []
+
+        class RecordingPremise(DataPremiseSQL):
+            def validate(self):
+                executed.append(self.data_node.name)
+                return PremiseOutput(
+                    self, self.data_node, self.column, True, 0, pd.DataFrame()
+                )
+
+        node_manager = NodeManager()
+        for node_name in ["refined", "trusted", "raw"]:
+            data_node = node_manager.create_node(
+                name=node_name, node_factory=DataNodeBigQuery, **bigquery_args
+            )
+            for premise_name in ["premise_1", "premise_2"]:
+                data_node.insert_premise(premise_name, RecordingPremise, "col")
+
+        node_manager.get_node("raw").add_relation("trusted", isDestination=True)
+        node_manager.get_node("trusted").add_relation("refined", isDestination=True)
+
+        output_manager = node_manager.run_premises(max_workers=4, lineage=True)
+
+        assert executed == ["raw", "raw", "trusted", "trusted", "refined", "refined"]
+        assert list(output_manager.outputs) == ["refined", "trusted", "raw"]
+
+    def test_run_premises_with_cyclic_lineage(self, bigquery_args):
+        node_manager = NodeManager()
+        for node_name in ["a", "b"]:
+            node_manager.create_node(
+                name=node_name, node_factory=DataNodeBigQuery, **bigquery_args
+            )
+        node_manager.get_node("a").add_relation("b", isDestination=True)
+        node_manager.get_node("b").add_relation("a", isDestination=True)
+
+        with pytest.raises(CyclicNodeRelation):
+            node_manager.run_premises(lineage=True)
+
+    def test_run_premises_with_fail_fast(self, bigquery_args):
+        class FailingPremise(DataPremiseSQL):
+            def validate(self):
+                return PremiseOutput(
+                    self, self.data_node, self.column, False, 1, pd.DataFrame()
+                )
+
+        node_manager = NodeManager()
+        raw = node_manager.create_node(
+            name="raw", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        trusted = node_manager.create_node(
+            name="trusted", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        raw.insert_premise("check", FailingPremise, "col")
+        trusted.insert_premise("check", FailingPremise, "col")
+        raw.add_relation(trusted, isDestination=True)
+
+        output_manager = node_manager.run_premises(fail_fast=FailFastPolicy())
+
+        assert output_manager.outputs["raw"].outputs["check"].status == "Failed"
+        assert output_manager.outputs["trusted"].outputs["check"].status == "Skipped"
+
+    def test_iter_run_streams_outputs_and_skips(self, bigquery_args):
+        class FailingPremise(DataPremiseSQL):
+            def validate(self):
+                return PremiseOutput(
+                    self, self.data_node, self.column, False, 1, pd.DataFrame()
+                )
+
+        node_manager = NodeManager()
+        raw = node_manager.create_node(
+            name="raw", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        trusted = node_manager.create_node(
+            name="trusted", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        for premise_name in ["check_1", "check_2"]:
+            raw.insert_premise(premise_name, FailingPremise, "col")
+            trusted.insert_premise(premise_name, FailingPremise, "col")
+        raw.add_relation(trusted, isDestination=True)
+
+        stream = node_manager.iter_run(max_workers=2, fail_fast=FailFastPolicy())
+        first_output = next(stream)
+        assert first_output.data_node.name == "raw"
+
+        statuses = [(o.data_node.name, o.status) for o in [first_output, *stream]]
+        assert sorted(statuses) == [
+            ("raw", "Failed"),
+            ("raw", "Failed"),
+            ("trusted", "Skipped"),
+            ("trusted", "Skipped"),
+        ]
+
+    def test_aiter_run_streams_outputs(self, bigquery_args, _mock_passing_premise):
+        node_manager = NodeManager()
+        for node_name in ["Node A", "Node B"]:
+            data_node = node_manager.create_node(
+                name=node_name, node_factory=DataNodeBigQuery, **bigquery_args
+            )
+            data_node.insert_premise("check null", _mock_passing_premise(), "col")
+
+        async def collect():
+            return [o async for o in node_manager.aiter_run(max_concurrency=2)]
+
+        outputs = asyncio.run(collect())
+
+        assert sorted(o.data_node.name for o in outputs) == ["Node A", "Node B"]
+        assert all(o.pass_validation for o in outputs)
+
+    def test_run_premises_with_history_reports_makespan(
+        self, bigquery_args, _mock_passing_premise
+    ):
+        node_manager = NodeManager()
+        data_node = node_manager.create_node(
+            name="Node A", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        data_node.insert_premise("check null", _mock_passing_premise(), "col")
+        history = LatencyHistory()
+
+        node_manager.run_premises(max_workers=2, history=history)
+        report = node_manager.last_report.to_serializeble_dict()
+
+        assert len(history.latencies) == 1
+        assert "predicted_makespan_seconds" in report
+        assert "makespan_seconds" in report
+
+    def test_run_premises_with_run_options(self, bigquery_args, _mock_passing_premise):
+        node_manager = NodeManager()
+        data_node = node_manager.create_node(
+            name="Node A", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        data_node.insert_premise("check null", _mock_passing_premise(), "col")
+        history = LatencyHistory()
+        options = RunOptions(max_workers=2, history=history)
+
+        output_manager = node_manager.run_premises(options, max_workers=1)
+        outputs = asyncio.run(node_manager.arun_premises(options))
+
+        assert output_manager.outputs["Node A"].outputs["check null"].pass_validation
+        assert outputs.outputs["Node A"].outputs["check null"].pass_validation
+        assert len(history.latencies) == 1
+        assert options.max_workers == 2
+
+    def test_run_premises_with_snapshot(self, bigquery_args):
+        node_manager = NodeManager()
+        data_node = node_manager.create_node(
+            name="Node A", node_factory=DataNodeBigQuery, **bigquery_args
+        )
+        snapshots = []
+
+        class SnapshotPremise(DataPremiseSQL):
+            def validate(self):
+                snapshots.append(self.data_node.snapshot_time)
+                return PremiseOutput(
+                    self, self.data_node, self.column, True, 0, pd.DataFrame()
+                )
+
+        for premise_name in ["premise_1", "premise_2"]:
+            data_node.insert_premise(premise_name, SnapshotPremise, "col")
+        snapshot = datetime.datetime(2021, 1, 1, tzinfo=datetime.timezone.utc)
+
+        node_manager.run_premises(max_workers=2, snapshot=snapshot)
+
+        assert snapshots == [snapshot, snapshot]
+        assert node_manager.last_report.get("snapshot_timestamp") == 1609459200
+        assert data_node.snapshot_time is None
+
+        node_manager.run_premises(snapshot=True)
+        assert snapshots[2] == snapshots[3] != snapshot
@@ -0,0 +1,133 @@
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.data_node.data_node import DataNode
+from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
+from pipeline_penguin.core.runner import (
+    FailFastPolicy,
+    NodeScheduler,
+    PremiseRunner,
+)
+
+
+class MockPremise(DataPremiseSQL):
+    def __init__(self, name, data_node, column, passed=True):
+        super().__init__(name, data_node, column)
+        self.passed = passed
+        self.executed = False
+
+    def validate(self):
+        self.executed = True
+        return PremiseOutput(
+            self, self.data_node, self.column, self.passed, 0, pd.DataFrame()
+        )
+
+
+@pytest.fixture()
+def _pipeline():
+    def pipeline(failing_premise=None):
+        class MockDataNode(DataNode):
+            def __init__(self, name):
+                super().__init__(name, "TEST_SOURCE")
+                self.supported_premise_types = ["SQL"]
+
+        nodes = {
+            name: MockDataNode(name) for name in ["raw", "trusted", "refined", "other"]
+        }
+        for data_node in nodes.values():
+            for premise_name in ["not_null", "distinct"]:
+                passed = (data_node.name, premise_name) != failing_premise
+                data_node.insert_premise(premise_name, MockPremise, "col", passed)
+
+        nodes["raw"].add_relation("trusted", isDestination=True)
+        nodes["trusted"].add_relation("refined", isDestination=True)
+        return nodes
+
+    yield pipeline
+
+
+def _run(nodes, **kwargs):
+    runner = PremiseRunner()
+    scheduler = NodeScheduler(nodes, **kwargs)
+    for premises in scheduler.batches():
+        scheduler.record(premises, runner.run(premises))
+    return scheduler.outputs
+
+
+class TestNodeScheduler:
+    def test_single_batch_without_lineage(self, _pipeline):
+        nodes = _pipeline()
+        batches = list(NodeScheduler(nodes).batches())
+
+        assert len(batches) == 1
+        assert len(batches[0]) == 8
+
+    def test_one_batch_per_level_with_lineage(self, _pipeline):
+        nodes = _pipeline()
+        batches = list(NodeScheduler(nodes, lineage=True).batches())
+
+        assert [{p.data_node.name for p in batch} for batch in batches] == [
+            {"raw", "other"},
+            {"trusted"},
+            {"refined"},
+        ]
+
+    def test_without_fail_fast_every_premise_runs(self, _pipeline):
+        nodes = _pipeline(failing_premise=("raw", "not_null"))
+        outputs = _run(nodes, lineage=True)
+
+        assert all(premise.executed for premise in outputs)
+
+    def test_fail_fast_skips_transitive_downstream(self, _pipeline):
+        nodes = _pipeline(failing_premise=("raw", "not_null"))
+        outputs = _run(nodes, fail_fast=FailFastPolicy())
+
+        for name in ["trusted", "refined"]:
+            for premise in nodes[name].premises.values():
+                assert not premise.executed
+                assert outputs[premise].status == PremiseStatus.SKIPPED
+                assert outputs[premise].message == "skipped: upstream failed (raw)"
+
+        assert nodes["other"].premises["not_null"].executed
+        assert outputs[nodes["raw"].premises["not_null"]].status == PremiseStatus.FAILED
+        assert len(outputs) == 8
+
+    def test_fail_fast_policy_with_specific_premises(self, _pipeline):
+        nodes = _pipeline(failing_premise=("trusted", "distinct"))
+
+        outputs = _run(
+            nodes, fail_fast=FailFastPolicy(premises={"trusted": ["not_null"]})
+        )
+        assert nodes["refined"].premises["not_null"].executed
+
+        for premise in nodes["refined"].premises.values():
+            premise.executed = False
+        outputs = _run(
+            nodes, fail_fast=FailFastPolicy(premises={"trusted": ["distinct"]})
+        )
+        assert not nodes["refined"].premises["not_null"].executed
+        assert (
+            outputs[nodes["refined"].premises["distinct"]].status
+            == PremiseStatus.SKIPPED
+        )
+
+    def test_pop_outputs_releases_streamed_outputs(self, _pipeline):
+        nodes = _pipeline(failing_premise=("raw", "not_null"))
+        runner = PremiseRunner()
+        scheduler = NodeScheduler(nodes, fail_fast=FailFastPolicy())
+
+        streamed = []
+        for premises in scheduler.batches():
+            streamed.extend(scheduler.pop_outputs())
+            for premise, premise_output in runner.iter_run(premises):
+                scheduler.record_output(premise, premise_output)
+                streamed.extend(scheduler.pop_outputs())
+        streamed.extend(scheduler.pop_outputs())
+
+        assert scheduler.outputs == {}
+        assert len(streamed) == 8
+        assert [o.status for o in streamed].count(PremiseStatus.SKIPPED) == 4
@@ -68,3 +68,22 @@ class TestOutputManager:
 
 
 ##        assert output_manager.format_outputs(formatter) == expected_results
+
+
+class TestExportStream:
+    def test_export_stream(self):
+        exported = []
+
+        class MockPremiseOutput:
+            def __init__(self, name):
+                self.name = name
+
+            def export(self, formatter, exporter):
+                exported.append(self.name)
+
+        def stream():
+            for name in ["a", "b", "c"]:
+                yield MockPremiseOutput(name)
+
+        assert OutputManager.export_stream(stream(), None, None) == 3
+        assert exported == ["a", "b", "c"]
@@ -0,0 +1,35 @@
+import pytest
+
+from pipeline_penguin.data_node.sql.partition_filter import PartitionFilter
+
+
+class TestPartitionFilter:
+    def test_rejects_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            PartitionFilter(days=0)
+        with pytest.raises(ValueError):
+            PartitionFilter(offset=-1)
+        with pytest.raises(ValueError):
+            PartitionFilter(data_type="STRING")
+
+    def test_render_partitiontime(self):
+        assert PartitionFilter(days=2).render() == (
+            "_PARTITIONTIME >= TIMESTAMP(DATE_SUB(CURRENT_DATE(), INTERVAL 1 DAY)) "
+            "AND _PARTITIONTIME < TIMESTAMP(DATE_SUB(CURRENT_DATE(), INTERVAL -1 DAY))"
+        )
+
+    def test_render_date_column(self):
+        partition_filter = PartitionFilter("event_date", offset=1, data_type="date")
+
+        assert partition_filter.render() == (
+            "event_date >= DATE_SUB(CURRENT_DATE(), INTERVAL 1 DAY) "
+            "AND event_date < DATE_SUB(CURRENT_DATE(), INTERVAL 0 DAY)"
+        )
+
+    def test_to_serializeble_dict(self):
+        assert PartitionFilter(days=3).to_serializeble_dict() == {
+            "column": "_PARTITIONTIME",
+            "days": 3,
+            "offset": 0,
+            "data_type": "TIMESTAMP",
+        }
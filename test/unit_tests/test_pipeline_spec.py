@@ -0,0 +1,322 @@
+import json
+from os import path
+
+import pytest
+from google.oauth2.service_account import Credentials
+
+from pipeline_penguin.connector.connector_manager import ConnectorManager
+from pipeline_penguin.connector.sql.bigquery import ConnectorSQLBigQuery
+from pipeline_penguin.data_node import NodeManager
+from pipeline_penguin.data_node.pipeline_spec import PipelineSpec
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_node.sql.partition_filter import PartitionFilter
+from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckIsNull
+from pipeline_penguin.exceptions import InvalidPipelineSpec
+
+YAML_SPEC = """
+connectors:
+  - name: bigquery
+    class: ConnectorSQLBigQuery
+    args: {credentials_path: credentials.json}
+    limits: {max_concurrency: 50}
+  - name: default_bigquery
+    class: pipeline_penguin.connector.sql.bigquery.ConnectorSQLBigQuery
+    args: {credentials_path: credentials.json}
+nodes:
+  - name: raw_orders
+    class: DataNodeBigQuery
+    args: {project_id: project, dataset_id: raw, table_id: orders}
+    connectors: [bigquery]
+    premises:
+      - name: check_nulls
+        class: DataPremiseSQLCheckIsNull
+        args: {column: order_id}
+      - name: check_status
+        class: DataPremiseSQLCheckInArray
+        args: {column: status, array: [1, 2]}
+  - name: trusted_orders
+    class: pipeline_penguin.data_node.sql.bigquery.DataNodeBigQuery
+    args:
+      project_id: project
+      dataset_id: trusted
+      table_id: orders
+      partition_filter: {class: PartitionFilter, args: {days: 2}}
+relations:
+  - {source: raw_orders, destination: trusted_orders}
+"""
+
+
+@pytest.fixture()
+def _defaults(monkeypatch):
+    monkeypatch.setattr(path, "isfile", lambda file_path: True)
+    monkeypatch.setattr(Credentials, "from_service_account_file", lambda path: None)
+    defaults = []
+    monkeypatch.setattr(
+        ConnectorManager,
+        "define_default",
+        lambda self, connector: defaults.append(connector),
+    )
+    yield defaults
+
+
+@pytest.fixture()
+def _write_spec(tmp_path):
+    def write_spec(content, name="pipeline.yaml"):
+        spec_path = tmp_path / name
+        spec_path.write_text(content)
+        return str(spec_path)
+
+    yield write_spec
+
+
+class TestPipelineSpec:
+    def test_builds_nodes_premises_relations_and_connectors(
+        self, _defaults, _write_spec
+    ):
+        nodes = PipelineSpec(_write_spec(YAML_SPEC)).build()
+
+        raw, trusted = nodes
+        assert isinstance(raw, DataNodeBigQuery)
+        assert raw.name == "raw_orders" and raw.dataset_id == "raw"
+        assert isinstance(raw.premises["check_nulls"], DataPremiseSQLCheckIsNull)
+        assert raw.premises["check_nulls"].data_node is raw
+        assert raw.premises["check_status"].array == [1, 2]
+        assert isinstance(trusted.partition_filter, PartitionFilter)
+        assert trusted.partition_filter.days == 2
+        relation = raw.get_relations()[0]
+        assert relation.get_source() == "raw_orders"
+        assert relation.get_destination() is trusted
+
+        connector = raw.get_connector("SQL")
+        assert isinstance(connector, ConnectorSQLBigQuery)
+        assert connector.limiter.max_concurrency == 50
+        assert len(_defaults) == 1 and _defaults[0] is not connector
+
+    def test_json_specs(self, _defaults, _write_spec):
+        spec = {
+            "nodes": [
+                {
+                    "name": "orders",
+                    "class": "DataNodeBigQuery",
+                    "args": {
+                        "project_id": "project",
+                        "dataset_id": "raw",
+                        "table_id": "orders",
+                    },
+                    "premises": [
+                        {
+                            "name": "check_nulls",
+                            "class": "DataPremiseSQLCheckIsNull",
+                            "args": {"column": "id"},
+                        }
+                    ],
+                }
+            ]
+        }
+
+        nodes = PipelineSpec(_write_spec(json.dumps(spec), "pipeline.json")).build()
+
+        assert list(nodes[0].premises) == ["check_nulls"]
+
+    def test_compiled_plan_is_loaded_from_the_cache(
+        self, monkeypatch, tmp_path, _defaults, _write_spec
+    ):
+        spec_path = _write_spec(YAML_SPEC)
+        cache_dir = str(tmp_path / "plans")
+        PipelineSpec(spec_path, cache_dir).build()
+
+        def fail(*args):
+            raise AssertionError("the spec was compiled again")
+
+        monkeypatch.setattr(PipelineSpec, "parse", fail)
+        monkeypatch.setattr(PipelineSpec, "compile", fail)
+        nodes = PipelineSpec(spec_path, cache_dir).build()
+
+        assert [node.name for node in nodes] == ["raw_orders", "trusted_orders"]
+        assert list(nodes[0].premises) == ["check_nulls", "check_status"]
+
+    def test_changed_specs_are_compiled_again(self, tmp_path, _defaults, _write_spec):
+        cache_dir = str(tmp_path / "plans")
+        first = PipelineSpec(_write_spec(YAML_SPEC), cache_dir)
+        first.build()
+
+        changed = PipelineSpec(
+            _write_spec(YAML_SPEC.replace("table_id: orders}", "table_id: items}")),
+            cache_dir,
+        )
+        nodes = changed.build()
+
+        assert changed.digest != first.digest
+        assert nodes[0].table_id == "items"
+
+    def test_unreadable_plans_are_compiled_again(
+        self, tmp_path, _defaults, _write_spec
+    ):
+        spec = PipelineSpec(_write_spec(YAML_SPEC), str(tmp_path / "plans"))
+        spec.build()
+        with open(spec._plan_path(), "wb") as plan_file:
+            plan_file.write(b"not a plan")
+
+        assert len(spec.build()) == 2
+
+    def test_plans_are_cached_as_json(self, tmp_path, _defaults, _write_spec):
+        spec = PipelineSpec(_write_spec(YAML_SPEC), str(tmp_path / "plans"))
+        spec.build()
+
+        with open(spec._plan_path()) as plan_file:
+            assert json.load(plan_file) == json.loads(json.dumps(spec.plan()))
+
+    def test_plans_with_non_json_values_are_not_cached(
+        self, tmp_path, _defaults, _write_spec
+    ):
+        spec_path = _write_spec(
+            YAML_SPEC.replace("args: {column: order_id}", "args: {column: 2021-01-01}")
+        )
+        spec = PipelineSpec(spec_path, str(tmp_path / "plans"))
+
+        nodes = spec.build()
+
+        assert not path.exists(spec._plan_path())
+        assert str(nodes[0].premises["check_nulls"].column) == "2021-01-01"
+
+    @pytest.mark.parametrize(
+        "tamper",
+        [
+            lambda plan: plan["nodes"][0].update({"class": ["subprocess", "run"]}),
+            lambda plan: plan["nodes"][0]["premises"][0].update(
+                {
+                    "class": [
+                        "pipeline_penguin.data_node.sql.bigquery",
+                        "DataNodeBigQuery",
+                    ]
+                }
+            ),
+            lambda plan: plan["nodes"][1]["args"]["partition_filter"].update(
+                {"class": ["subprocess", "Popen"]}
+            ),
+            lambda plan: plan.update({"nodes": "not a list"}),
+        ],
+    )
+    def test_tampered_plans_are_compiled_again(
+        self, monkeypatch, tmp_path, _defaults, _write_spec, tamper
+    ):
+        spec = PipelineSpec(_write_spec(YAML_SPEC), str(tmp_path / "plans"))
+        spec.build()
+        with open(spec._plan_path()) as plan_file:
+            plan = json.load(plan_file)
+        tamper(plan)
+        with open(spec._plan_path(), "w") as plan_file:
+            json.dump(plan, plan_file)
+
+        def fail(*args, **kwargs):
+            raise AssertionError("the tampered plan was executed")
+
+        monkeypatch.setattr("subprocess.run", fail)
+        monkeypatch.setattr("subprocess.Popen", fail)
+        nodes = spec.build()
+
+        assert [node.name for node in nodes] == ["raw_orders", "trusted_orders"]
+        with open(spec._plan_path()) as plan_file:
+            assert json.load(plan_file) != plan
+
+    def test_tampered_plans_are_not_executed(self, _write_spec):
+        plan = PipelineSpec.compile(PipelineSpec(_write_spec(YAML_SPEC)).parse())
+        plan["connectors"][0]["class"] = ["subprocess", "Popen"]
+
+        with pytest.raises(InvalidPipelineSpec):
+            PipelineSpec.execute(plan)
+
+    def test_node_manager_registers_the_nodes(self, _defaults, _write_spec):
+        node_manager = NodeManager()
+
+        nodes = node_manager.load_spec(_write_spec(YAML_SPEC))
+
+        assert node_manager.get_node("raw_orders") is nodes[0]
+        assert node_manager.get_node("trusted_orders") is nodes[1]
+        for node in nodes:
+            node_manager.remove_node(node.name)
+
+
+class TestPipelineSpecValidation:
+    @pytest.mark.parametrize(
+        "spec",
+        [
+            {"tables": []},
+            {"nodes": [{"class": "DataNodeBigQuery"}]},
+            {"nodes": [{"name": "a", "class": "UnknownNode"}]},
+            {"nodes": [{"name": "a", "class": "pipeline_penguin.missing.Node"}]},
+            {"nodes": [{"name": "a", "class": "DataPremiseSQLCheckIsNull"}]},
+            {"nodes": [{"name": "a", "class": "DataNodeBigQuery", "args": {}}]},
+            {
+                "nodes": [
+                    {
+                        "name": "a",
+                        "class": "DataNodeBigQuery",
+                        "args": {"project_id": "p", "dataset_id": "d", "table_id": "t"},
+                        "premises": [
+                            {
+                                "name": "check",
+                                "class": "DataPremiseSQLCheckIsNull",
+                                "args": {"columns": "id"},
+                            }
+                        ],
+                    }
+                ]
+            },
+            {
+                "nodes": [
+                    {
+                        "name": "a",
+                        "class": "DataNodeBigQuery",
+                        "args": {"project_id": "p", "dataset_id": "d", "table_id": "t"},
+                        "tests": [],
+                    }
+                ]
+            },
+            {
+                "nodes": [
+                    {
+                        "name": "a",
+                        "class": "DataNodeBigQuery",
+                        "args": {"project_id": "p", "dataset_id": "d", "table_id": "t"},
+                        "connectors": ["missing"],
+                    }
+                ]
+            },
+            {"relations": [{"source": "a", "destination": "b"}]},
+            {
+                "nodes": [
+                    {
+                        "name": "a",
+                        "class": "DataNodeBigQuery",
+                        "args": {
+                            "project_id": "p",
+                            "dataset_id": "d",
+                            "table_id": "t",
+                            "partition_filter": {"class": "subprocess.Popen"},
+                        },
+                    }
+                ]
+            },
+        ],
+    )
+    def test_invalid_specs_raise_error(self, spec):
+        with pytest.raises(InvalidPipelineSpec):
+            PipelineSpec.compile(spec)
+
+    def test_unparseable_files_raise_error(self, _write_spec):
+        with pytest.raises(InvalidPipelineSpec):
+            PipelineSpec(_write_spec("nodes: [", "pipeline.yml")).parse()
+        with pytest.raises(InvalidPipelineSpec):
+            PipelineSpec(_write_spec("[]", "pipeline.json")).parse()
+
+    def test_plan_uses_only_built_in_types(self, _write_spec):
+        plan = PipelineSpec.compile(PipelineSpec(_write_spec(YAML_SPEC)).parse())
+
+        assert json.loads(json.dumps(plan))["nodes"][1]["args"]["partition_filter"] == {
+            "class": [
+                "pipeline_penguin.data_node.sql.partition_filter",
+                "PartitionFilter",
+            ],
+            "args": {"days": 2},
+        }
@@ -1,6 +1,9 @@
 import pytest
 import pandas as pd
-from pipeline_penguin.core.premise_output.premise_output import PremiseOutput
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
 
 
 @pytest.fixture()
@@ -94,3 +97,26 @@ class TestPremiseOutput:
         result = output.to_serializeble_dict()
 
         assert result == expected_result
+
+    def test_status_is_derived_from_validation(self, _mock_premise, _output_kwargs):
+        data_premise = _mock_premise()
+        kwargs = _output_kwargs()
+        output = PremiseOutput(data_premise, data_premise.data_node, **kwargs)
+        assert output.status == PremiseStatus.PASSED
+
+        kwargs["pass_validation"] = False
+        output = PremiseOutput(data_premise, data_premise.data_node, **kwargs)
+        assert output.status == PremiseStatus.FAILED
+
+    def test_from_status(self, _mock_premise):
+        data_premise = _mock_premise()
+        output = PremiseOutput.from_status(
+            data_premise, PremiseStatus.ERROR, "ValueError: boom"
+        )
+
+        assert not output.pass_validation
+        assert output.failed_count == 0
+        assert output.column == "test_column"
+        result = output.to_serializeble_dict()
+        assert result["status"] == PremiseStatus.ERROR
+        assert result["message"] == "ValueError: boom"
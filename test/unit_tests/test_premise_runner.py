@@ -0,0 +1,384 @@
+import asyncio
+import time
+
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.core.data_node.data_node import DataNode
+from pipeline_penguin.core.data_premise.sql import DataPremiseSQL
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
+from pipeline_penguin.core.runner import PremiseRunner, Deadline, LatencyHistory
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckValuesAreBetween
+
+
+@pytest.fixture()
+def _mock_premise():
+    def mock_premise():
+        class MockPremise(DataPremiseSQL):
+            def __init__(self, name, data_node, column, latency=0, error=None):
+                super().__init__(name, data_node, column)
+                self.latency = latency
+                self.error = error
+
+            def validate(self):
+                self.deadline = Deadline.current()
+                time.sleep(self.latency)
+                if self.error:
+                    raise self.error
+                return PremiseOutput(
+                    self, self.data_node, self.column, True, 0, pd.DataFrame()
+                )
+
+        return MockPremise
+
+    yield mock_premise
+
+
+@pytest.fixture()
+def _data_node():
+    yield DataNode("node_test", "TEST_SOURCE")
+
+
+class TestPremiseRunner:
+    def test_rejects_invalid_max_workers(self):
+        with pytest.raises(ValueError):
+            PremiseRunner(max_workers=0)
+
+    def test_serial_run_keeps_order(self, _mock_premise, _data_node):
+        premises = [_mock_premise()(f"p{i}", _data_node, "col") for i in range(5)]
+        outputs = PremiseRunner().run(premises)
+
+        assert [output.data_premise.name for output in outputs] == [
+            "p0",
+            "p1",
+            "p2",
+            "p3",
+            "p4",
+        ]
+
+    def test_concurrent_run_keeps_order(self, _mock_premise, _data_node):
+        latencies = [0.05, 0.01, 0.04, 0.0, 0.02]
+        premises = [
+            _mock_premise()(f"p{i}", _data_node, "col", latency)
+            for i, latency in enumerate(latencies)
+        ]
+        outputs = PremiseRunner(max_workers=5).run(premises)
+
+        assert [output.data_premise for output in outputs] == premises
+
+    def test_exception_is_captured_as_failed_output(self, _mock_premise, _data_node):
+        premises = [
+            _mock_premise()("ok", _data_node, "col"),
+            _mock_premise()("broken", _data_node, "col", error=KeyError("result")),
+            _mock_premise()("also_ok", _data_node, "col"),
+        ]
+        outputs = PremiseRunner(max_workers=3).run(premises)
+
+        assert outputs[0].status == PremiseStatus.PASSED
+        assert outputs[1].status == PremiseStatus.ERROR
+        assert not outputs[1].pass_validation
+        assert outputs[1].message == "KeyError: 'result'"
+        assert outputs[2].status == PremiseStatus.PASSED
+
+    def test_serial_run_raises_exceptions(self, _mock_premise, _data_node):
+        premises = [
+            _mock_premise()("broken", _data_node, "col", error=KeyError("result")),
+            _mock_premise()("ok", _data_node, "col"),
+        ]
+
+        with pytest.raises(KeyError):
+            PremiseRunner().run(premises)
+
+    def test_serial_run_can_capture_exceptions(self, _mock_premise, _data_node):
+        premises = [
+            _mock_premise()("broken", _data_node, "col", error=KeyError("result")),
+            _mock_premise()("ok", _data_node, "col"),
+        ]
+        outputs = PremiseRunner(capture_errors=True).run(premises)
+
+        assert outputs[0].status == PremiseStatus.ERROR
+        assert outputs[1].status == PremiseStatus.PASSED
+
+    def test_concurrent_run_can_raise_exceptions(self, _mock_premise, _data_node):
+        premises = [
+            _mock_premise()("broken", _data_node, "col", error=KeyError("result")),
+            _mock_premise()("ok", _data_node, "col"),
+        ]
+
+        with pytest.raises(KeyError):
+            PremiseRunner(max_workers=2, capture_errors=False).run(premises)
+
+    def test_concurrent_run_is_faster_than_serial(self, _mock_premise, _data_node):
+        premises = [_mock_premise()(f"p{i}", _data_node, "col", 0.1) for i in range(8)]
+
+        start = time.perf_counter()
+        PremiseRunner(max_workers=8).run(premises)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.4
+
+    def test_iter_run_yields_in_completion_order(self, _mock_premise, _data_node):
+        latencies = [0.15, 0.0, 0.08]
+        premises = [
+            _mock_premise()(f"p{i}", _data_node, "col", latency)
+            for i, latency in enumerate(latencies)
+        ]
+        results = list(PremiseRunner(max_workers=3).iter_run(premises))
+
+        assert [premise.name for premise, _ in results] == ["p1", "p2", "p0"]
+        assert all(output.data_premise is premise for premise, output in results)
+
+    def test_closing_iter_run_cancels_queued(self, _mock_premise, _data_node):
+        premises = [_mock_premise()(f"p{i}", _data_node, "col", 0.05) for i in range(6)]
+        premises[0].latency = 0
+        stream = PremiseRunner(max_workers=1).iter_run(premises)
+
+        next(stream)
+        stream.close()
+        time.sleep(0.1)
+
+        assert not hasattr(premises[-1], "deadline")
+
+
+class TestPremiseRunnerAsync:
+    def test_arun_keeps_order(self, _mock_premise, _data_node):
+        latencies = [0.05, 0.01, 0.04, 0.0, 0.02]
+        premises = [
+            _mock_premise()(f"p{i}", _data_node, "col", latency)
+            for i, latency in enumerate(latencies)
+        ]
+        outputs = asyncio.run(PremiseRunner().arun(premises))
+
+        assert [output.data_premise for output in outputs] == premises
+
+    def test_arun_captures_exceptions(self, _mock_premise, _data_node):
+        premises = [
+            _mock_premise()("broken", _data_node, "col", error=ValueError("boom")),
+            _mock_premise()("ok", _data_node, "col"),
+        ]
+        outputs = asyncio.run(PremiseRunner(max_workers=2).arun(premises))
+
+        assert outputs[0].status == PremiseStatus.ERROR
+        assert outputs[0].message == "ValueError: boom"
+        assert outputs[1].status == PremiseStatus.PASSED
+
+    def test_arun_respects_concurrency_limit(self, _data_node):
+        in_flight = []
+        peak = []
+
+        class AsyncPremise(DataPremiseSQL):
+            async def avalidate(self):
+                in_flight.append(self)
+                peak.append(len(in_flight))
+                await asyncio.sleep(0.01)
+                in_flight.remove(self)
+                return PremiseOutput(
+                    self, self.data_node, self.column, True, 0, pd.DataFrame()
+                )
+
+        premises = [AsyncPremise(f"p{i}", _data_node, "col") for i in range(20)]
+        outputs = asyncio.run(PremiseRunner(max_workers=3).arun(premises))
+
+        assert len(outputs) == 20
+        assert max(peak) == 3
+
+    def test_aiter_run_yields_in_completion_order(self, _data_node):
+        class AsyncPremise(DataPremiseSQL):
+            def __init__(self, name, data_node, column, latency):
+                super().__init__(name, data_node, column)
+                self.latency = latency
+
+            async def avalidate(self):
+                await asyncio.sleep(self.latency)
+                return PremiseOutput(
+                    self, self.data_node, self.column, True, 0, pd.DataFrame()
+                )
+
+        premises = [
+            AsyncPremise("slow", _data_node, "col", 0.1),
+            AsyncPremise("fast", _data_node, "col", 0),
+        ]
+
+        async def collect():
+            return [p.name async for p, _ in PremiseRunner().aiter_run(premises)]
+
+        assert asyncio.run(collect()) == ["fast", "slow"]
+
+
+class TestPremiseRunnerDeadline:
+    def test_expired_deadline_runs_nothing(self, _mock_premise, _data_node):
+        premises = [_mock_premise()(f"p{i}", _data_node, "col") for i in range(3)]
+        outputs = PremiseRunner(deadline=Deadline(0)).run(premises)
+
+        assert [output.status for output in outputs] == [PremiseStatus.NOT_RUN] * 3
+        assert outputs[0].message == "not run (deadline)"
+        assert not outputs[0].pass_validation
+
+    def test_serial_run_stops_at_deadline(self, _mock_premise, _data_node):
+        premises = [_mock_premise()(f"p{i}", _data_node, "col", 0.05) for i in range(5)]
+        outputs = PremiseRunner(deadline=Deadline(0.08)).run(premises)
+
+        assert [output.status for output in outputs] == [
+            PremiseStatus.PASSED,
+            PremiseStatus.PASSED,
+            PremiseStatus.NOT_RUN,
+            PremiseStatus.NOT_RUN,
+            PremiseStatus.NOT_RUN,
+        ]
+
+    def test_concurrent_run_returns_partial_results(self, _mock_premise, _data_node):
+        premises = [
+            _mock_premise()("fast", _data_node, "col", 0.0),
+            _mock_premise()("slow", _data_node, "col", 0.5),
+            _mock_premise()("queued", _data_node, "col", 0.0),
+        ]
+
+        start = time.perf_counter()
+        outputs = PremiseRunner(max_workers=2, deadline=Deadline(0.1)).run(premises)
+        elapsed = time.perf_counter() - start
+
+        assert elapsed < 0.4
+        assert outputs[0].status == PremiseStatus.PASSED
+        assert outputs[1].status == PremiseStatus.NOT_RUN
+        assert outputs[1].message == "cancelled (deadline)"
+        assert outputs[2].status == PremiseStatus.PASSED
+
+    def test_deadline_is_active_during_validation(self, _mock_premise, _data_node):
+        deadline = Deadline(10)
+        premises = [_mock_premise()(f"p{i}", _data_node, "col") for i in range(2)]
+        PremiseRunner(max_workers=2, deadline=deadline).run(premises)
+
+        assert all(premise.deadline is deadline for premise in premises)
+
+    def test_arun_cancels_pending_validations(self, _data_node):
+        cancelled = []
+
+        class AsyncPremise(DataPremiseSQL):
+            def __init__(self, name, data_node, column, latency):
+                super().__init__(name, data_node, column)
+                self.latency = latency
+
+            async def avalidate(self):
+                try:
+                    await asyncio.sleep(self.latency)
+                except asyncio.CancelledError:
+                    cancelled.append(self.name)
+                    raise
+                return PremiseOutput(
+                    self, self.data_node, self.column, True, 0, pd.DataFrame()
+                )
+
+        premises = [
+            AsyncPremise("fast", _data_node, "col", 0),
+            AsyncPremise("slow", _data_node, "col", 10),
+            AsyncPremise("queued", _data_node, "col", 0),
+        ]
+        runner = PremiseRunner(max_workers=2, deadline=Deadline(0.1))
+        outputs = asyncio.run(runner.arun(premises))
+
+        assert cancelled == ["slow"]
+        assert outputs[0].status == PremiseStatus.PASSED
+        assert outputs[1].status == PremiseStatus.NOT_RUN
+        assert outputs[1].message == "cancelled (deadline)"
+        assert outputs[2].status == PremiseStatus.PASSED
+
+
+class TestPremiseRunnerHistory:
+    def test_longest_premises_start_first(self, _mock_premise, _data_node):
+        started = []
+
+        class RecordingPremise(_mock_premise()):
+            def validate(self):
+                started.append(self.name)
+                return super().validate()
+
+        premises = [
+            RecordingPremise(f"p{i}", _data_node, "col", latency)
+            for i, latency in enumerate([0.01, 0.05, 0.0, 0.03])
+        ]
+        history = LatencyHistory()
+        PremiseRunner(max_workers=1, history=history).run(premises)
+
+        started.clear()
+        runner = PremiseRunner(max_workers=1, history=history)
+        outputs = runner.run(premises)
+
+        assert started == ["p1", "p3", "p0", "p2"]
+        assert [output.data_premise for output in outputs] == premises
+
+    def test_report_has_predicted_and_actual_makespan(self, _mock_premise, _data_node):
+        premises = [_mock_premise()(f"p{i}", _data_node, "col", 0.02) for i in range(4)]
+        history = LatencyHistory()
+        for premise in premises:
+            history.record(premise, 0.02)
+
+        runner = PremiseRunner(max_workers=2, history=history)
+        runner.run(premises)
+        report = runner.report.to_serializeble_dict()
+
+        assert report["predicted_makespan_seconds"] == pytest.approx(0.04)
+        assert report["makespan_seconds"] >= 0.04
+
+    def test_errors_are_not_recorded(self, _mock_premise, _data_node):
+        premise = _mock_premise()("broken", _data_node, "col", error=KeyError("x"))
+        history = LatencyHistory()
+        PremiseRunner(history=history, capture_errors=True).run([premise])
+
+        assert history.latencies == {}
+
+
+class TestPremiseRunnerCountOnly:
+    @pytest.fixture()
+    def _count_node(self):
+        class CountingConnector(ConnectorSQL):
+            source = "BigQuery"
+
+            def __init__(self):
+                super().__init__()
+                self.queries = []
+
+            def run(self, query, max_results=None, parameters=None):
+                self.queries.append(query)
+                if "AS failed_count" in query:
+                    return pd.DataFrame([5000], columns=["failed_count"])
+                return pd.DataFrame([1, 2, 3], columns=["result"])
+
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.connectors["SQLBigQuery"] = CountingConnector()
+        node.insert_premise(
+            "between", DataPremiseSQLCheckValuesAreBetween, "col_b", 0, 10
+        )
+        yield node
+
+    def test_rejects_negative_sample_limit(self):
+        with pytest.raises(ValueError):
+            PremiseRunner(sample_limit=-1)
+
+    def test_failed_count_is_exact_and_sample_is_bounded(self, _count_node):
+        premises = list(_count_node.premises.values())
+
+        [output] = PremiseRunner(sample_limit=3).run(premises)
+        queries = _count_node.connectors["SQLBigQuery"].queries
+
+        assert queries == [
+            "SELECT COUNTIF(col_b BETWEEN @lower_bound AND @upper_bound) AS failed_count "
+            "FROM `project.dataset.table`",
+            "SELECT col_b AS result FROM `project.dataset.table` "
+            "WHERE col_b BETWEEN @lower_bound AND @upper_bound LIMIT 3",
+        ]
+        assert output.status == PremiseStatus.FAILED
+        assert output.failed_count == 5000
+        assert len(output.failed_values) == 3
+
+    def test_async_count_only(self, _count_node):
+        premises = list(_count_node.premises.values())
+
+        [output] = asyncio.run(PremiseRunner(sample_limit=0).arun(premises))
+
+        assert len(_count_node.connectors["SQLBigQuery"].queries) == 1
+        assert output.failed_count == 5000
@@ -0,0 +1,105 @@
+import copy
+import pickle
+
+import pytest
+
+from pipeline_penguin.core.data_premise.query_plan import QueryPlan
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import (
+    DataPremiseSQLCheckDistinct,
+    DataPremiseSQLCheckValuesAreBetween,
+)
+
+
+@pytest.fixture()
+def _between_premise():
+    node = DataNodeBigQuery("node", "project", "dataset", "table")
+    node.insert_premise("between", DataPremiseSQLCheckValuesAreBetween, "col", 0, 10)
+    yield node.premises["between"]
+
+
+class TestQueryPlan:
+    def test_plan_holds_rendered_query_and_parameters(self, _between_premise):
+        plan = _between_premise.query_plan()
+
+        assert plan.query == _between_premise.render_query()
+        assert "@lower_bound" in plan.query
+        assert dict(plan.parameters) == {"lower_bound": 0, "upper_bound": 10}
+        assert plan.column == "col"
+        assert plan.table == "`project.dataset.table`"
+        assert plan.count_query == _between_premise.count_query()
+
+    def test_plan_is_immutable(self, _between_premise):
+        plan = _between_premise.query_plan()
+
+        with pytest.raises(AttributeError):
+            plan.query = "SELECT 1"
+        with pytest.raises(TypeError):
+            plan.parameters["lower_bound"] = 5
+
+    def test_plan_is_compiled_once(self, _between_premise, monkeypatch):
+        calls = []
+        query_args = DataPremiseSQLCheckValuesAreBetween.query_args
+
+        def counted_query_args(premise):
+            calls.append(premise)
+            return query_args(premise)
+
+        monkeypatch.setattr(
+            DataPremiseSQLCheckValuesAreBetween, "query_args", counted_query_args
+        )
+        plan = _between_premise.query_plan()
+        compiled_calls = len(calls)
+
+        assert _between_premise.query_plan() is plan
+        assert _between_premise.render_query() == plan.query
+        assert _between_premise.count_query() == plan.count_query
+        assert len(calls) == compiled_calls
+
+    def test_premise_changes_invalidate_the_plan(self, _between_premise):
+        plan = _between_premise.query_plan()
+
+        _between_premise.upper_bound = 20
+
+        assert _between_premise.query_plan() is not plan
+        assert _between_premise.query_plan().parameters["upper_bound"] == 20
+
+    def test_node_changes_invalidate_the_plan(self, _between_premise):
+        plan = _between_premise.query_plan()
+
+        _between_premise.data_node.set_scope(row_filter="country = 'BR'")
+
+        assert _between_premise.query_plan() is not plan
+        assert "country = 'BR'" in _between_premise.render_query()
+
+    def test_copies_do_not_reuse_stale_plans(self, _between_premise):
+        original_query = _between_premise.render_query()
+        copied_node = copy.deepcopy(_between_premise.data_node)
+
+        copied_node.table_id = "other_table"
+
+        assert "other_table" in copied_node.premises["between"].render_query()
+        assert _between_premise.render_query() == original_query
+
+    def test_plan_survives_pickling(self, _between_premise):
+        plan = _between_premise.query_plan()
+
+        restored = pickle.loads(pickle.dumps(plan))
+
+        assert restored.query == plan.query
+        assert dict(restored.parameters) == dict(plan.parameters)
+
+    def test_class_level_mode_changes_invalidate_the_plan(self, monkeypatch):
+        node = DataNodeBigQuery("node", "project", "dataset", "table")
+        node.insert_premise("distinct", DataPremiseSQLCheckDistinct, "col")
+        premise = node.premises["distinct"]
+        assert "count(DISTINCT col)" in premise.render_query()
+
+        monkeypatch.setattr(DataPremiseSQLCheckDistinct, "approximate", True)
+
+        assert "HLL_COUNT" in premise.render_query()
+
+    def test_plan_constructor(self):
+        plan = QueryPlan("SELECT 1", {"a": 1})
+
+        assert (plan.column, plan.table, plan.count_query) == (None, None, None)
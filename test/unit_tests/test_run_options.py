@@ -0,0 +1,51 @@
+import pytest
+
+from pipeline_penguin.core.runner import Deadline, LatencyHistory, RunOptions
+
+
+class TestRunOptions:
+    def test_of_builds_options_from_keyword_arguments(self):
+        options = RunOptions.of(max_workers=4, lineage=True)
+
+        assert options.max_workers == 4
+        assert options.lineage is True
+        assert options.snapshot is False
+
+    def test_of_returns_the_given_options(self):
+        options = RunOptions(max_workers=4)
+
+        assert RunOptions.of(options) is options
+
+    def test_keyword_arguments_override_the_given_options(self):
+        history = LatencyHistory()
+        options = RunOptions(max_workers=4, history=history)
+
+        changed = RunOptions.of(options, max_concurrency=10, full_rescan=True)
+
+        assert changed.max_workers == 10
+        assert changed.full_rescan is True
+        assert changed.history is history
+        assert options.max_workers == 4 and options.full_rescan is False
+
+    def test_max_concurrency_is_an_alias_of_max_workers(self):
+        assert RunOptions(max_concurrency=8).max_workers == 8
+
+    def test_unknown_options_raise_error(self):
+        with pytest.raises(TypeError):
+            RunOptions.of(workers=4)
+        with pytest.raises(TypeError):
+            RunOptions().replace(workers=4)
+
+    def test_runner_uses_the_options(self):
+        history = LatencyHistory()
+        runner = RunOptions(
+            max_workers=3, deadline=60, history=history, sample_limit=10
+        ).runner()
+
+        assert runner.max_workers == 3
+        assert isinstance(runner.deadline, Deadline)
+        assert runner.history is history
+        assert runner.sample_limit == 10
+        assert runner.capture_errors is None
+        assert RunOptions().runner().deadline is None
+        assert RunOptions(capture_errors=True).runner().capture_errors is True
@@ -0,0 +1,47 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from pipeline_penguin.core.runner import RunReport
+
+
+class TestRunReport:
+    def test_increment_and_set(self):
+        report = RunReport()
+        report.increment("queries")
+        report.increment("queries", 2)
+        report.set("makespan_seconds", 1.5)
+
+        assert report.get("queries") == 3
+        assert report.get("missing") == 0
+        assert report.to_serializeble_dict() == {
+            "queries": 3,
+            "makespan_seconds": 1.5,
+        }
+
+    def test_increment_is_thread_safe(self):
+        report = RunReport()
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            for _ in range(1000):
+                executor.submit(report.increment, "queries")
+
+        assert report.get("queries") == 1000
+
+    def test_memoize_computes_each_key_once(self):
+        report = RunReport()
+        calls = []
+
+        def compute(value):
+            calls.append(value)
+            time.sleep(0.01)
+            return value * 2
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            results = list(
+                executor.map(lambda _: report.memoize("key", compute, 2), range(8))
+            )
+
+        assert results == [4] * 8
+        assert calls == [2]
+        assert report.memoize("other", compute, 3) == 6
+        assert report.to_serializeble_dict() == {}
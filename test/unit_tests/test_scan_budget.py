@@ -0,0 +1,185 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.core.premise_output.premise_output import PremiseStatus
+from pipeline_penguin.core.runner import PremiseRunner, ScanBudget
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckIsNull
+
+GIGABYTE = 1024**3
+
+
+@pytest.fixture()
+def _budget_node():
+    class DryRunConnector(ConnectorSQL):
+        source = "BigQuery"
+
+        def __init__(self, estimates):
+            super().__init__()
+            self.estimates = estimates
+            self.dry_runs = []
+            self.queries = []
+
+        def dry_run(self, query, parameters=None):
+            self.dry_runs.append(query)
+            for column, estimate in self.estimates.items():
+                if f"{column} is null" in query:
+                    return estimate
+            raise ValueError("invalid query")
+
+        def run(self, query, max_results=None, parameters=None):
+            self.queries.append(query)
+            return pd.DataFrame([0], columns=["total"])
+
+    def build(name="node", **estimates):
+        node = DataNodeBigQuery(name, "project", "dataset", "table")
+        node.connectors["SQLBigQuery"] = DryRunConnector(estimates)
+        for column in estimates:
+            node.insert_premise(column, DataPremiseSQLCheckIsNull, column)
+        return node
+
+    yield build
+
+
+class TestScanBudget:
+    def test_rejects_invalid_arguments(self):
+        with pytest.raises(ValueError):
+            ScanBudget(max_premise_bytes=-1)
+        with pytest.raises(ValueError):
+            ScanBudget(min_sample_percent=0)
+        with pytest.raises(ValueError):
+            ScanBudget(max_workers=0)
+
+    def test_estimate_dry_runs_every_premise(self, _budget_node):
+        node = _budget_node(small=GIGABYTE, large=20 * GIGABYTE)
+        premises = list(node.premises.values())
+
+        estimates = ScanBudget().estimate(premises)
+
+        assert estimates == {premises[0]: GIGABYTE, premises[1]: 20 * GIGABYTE}
+        assert len(node.connectors["SQLBigQuery"].dry_runs) == 2
+
+    def test_failed_dry_runs_are_not_estimated(self, _budget_node):
+        node = _budget_node(small=GIGABYTE)
+        node.connectors["SQLBigQuery"].estimates = {}
+
+        assert ScanBudget().estimate(list(node.premises.values())) == {}
+
+    def test_aestimate_dry_runs_every_premise(self, _budget_node):
+        node = _budget_node(small=GIGABYTE, large=20 * GIGABYTE)
+        premises = list(node.premises.values())
+
+        estimates = asyncio.run(ScanBudget(max_workers=1).aestimate(premises))
+
+        assert estimates == {premises[0]: GIGABYTE, premises[1]: 20 * GIGABYTE}
+
+    def test_premise_budget_refuses_large_premises(self, _budget_node):
+        node = _budget_node(small=GIGABYTE, large=20 * GIGABYTE)
+        small, large = node.premises.values()
+
+        allowances = ScanBudget(max_premise_bytes=10 * GIGABYTE).allocate(
+            {small: GIGABYTE, large: 20 * GIGABYTE}
+        )
+
+        assert allowances == {small: 100.0, large: 0.0}
+
+    def test_downgrade_samples_large_premises(self, _budget_node):
+        node = _budget_node(small=GIGABYTE, large=20 * GIGABYTE)
+        small, large = node.premises.values()
+        budget = ScanBudget(max_premise_bytes=10 * GIGABYTE, downgrade=True)
+
+        allowances = budget.allocate({small: GIGABYTE, large: 20 * GIGABYTE})
+
+        assert allowances == {small: 100.0, large: 50.0}
+
+    def test_run_budget_admits_cheapest_premises_first(self, _budget_node):
+        node = _budget_node(a=6 * GIGABYTE, b=3 * GIGABYTE, c=3 * GIGABYTE)
+        a, b, c = node.premises.values()
+
+        allowances = ScanBudget(max_run_bytes=10 * GIGABYTE).allocate(
+            {a: 6 * GIGABYTE, b: 3 * GIGABYTE, c: 3 * GIGABYTE}
+        )
+
+        assert allowances == {b: 100.0, c: 100.0, a: 0.0}
+
+    def test_samples_below_minimum_are_refused(self, _budget_node):
+        node = _budget_node(large=1000 * GIGABYTE)
+        [large] = node.premises.values()
+        budget = ScanBudget(max_premise_bytes=GIGABYTE, downgrade=True)
+
+        assert budget.allocate({large: 1000 * GIGABYTE}) == {large: 0.0}
+
+    def test_allocate_reports_estimates(self, _budget_node):
+        first = _budget_node("first", small=GIGABYTE, large=20 * GIGABYTE)
+        second = _budget_node("second", other=2 * GIGABYTE)
+        small, large = first.premises.values()
+        [other] = second.premises.values()
+        report = PremiseRunner().report
+
+        ScanBudget(max_premise_bytes=10 * GIGABYTE).allocate(
+            {small: GIGABYTE, large: 20 * GIGABYTE, other: 2 * GIGABYTE},
+            report=report,
+        )
+
+        assert report.to_serializeble_dict() == {
+            "estimated_bytes": 23 * GIGABYTE,
+            "estimated_bytes.first": 21 * GIGABYTE,
+            "estimated_bytes.second": 2 * GIGABYTE,
+            "refused_premises": 1,
+            "sampled_premises": 0,
+        }
+
+
+class TestPremiseRunnerScanBudget:
+    def test_over_budget_premises_are_not_run(self, _budget_node):
+        node = _budget_node(small=GIGABYTE, large=20 * GIGABYTE)
+        runner = PremiseRunner(budget=ScanBudget(max_premise_bytes=10 * GIGABYTE))
+
+        small, large = runner.run(list(node.premises.values()))
+
+        assert small.status == PremiseStatus.PASSED
+        assert large.status == PremiseStatus.NOT_RUN
+        assert (
+            large.message == f"not run (scan budget: {20 * GIGABYTE} bytes estimated)"
+        )
+        assert len(node.connectors["SQLBigQuery"].queries) == 1
+
+    def test_over_budget_premises_are_sampled(self, _budget_node):
+        node = _budget_node(large=20 * GIGABYTE)
+        budget = ScanBudget(max_premise_bytes=10 * GIGABYTE, downgrade=True)
+
+        [output] = PremiseRunner(budget=budget).run(list(node.premises.values()))
+
+        assert node.connectors["SQLBigQuery"].queries == [
+            "SELECT count(*) as total FROM "
+            "(SELECT * FROM `project.dataset.table` TABLESAMPLE SYSTEM (50 PERCENT)) "
+            "WHERE large is null"
+        ]
+        assert output.status == PremiseStatus.PASSED
+        assert output.message == "sampled 50.00% of the table"
+
+    def test_async_over_budget_premises_are_sampled(self, _budget_node):
+        node = _budget_node(small=GIGABYTE, large=20 * GIGABYTE)
+        budget = ScanBudget(max_premise_bytes=10 * GIGABYTE, downgrade=True)
+        runner = PremiseRunner(max_workers=2, budget=budget)
+
+        small, large = asyncio.run(runner.arun(list(node.premises.values())))
+
+        assert small.message is None
+        assert large.message == "sampled 50.00% of the table"
+        assert runner.report.get("sampled_premises") == 1
+
+    def test_run_budget_spans_every_batch(self, _budget_node):
+        first = _budget_node("first", a=6 * GIGABYTE)
+        second = _budget_node("second", b=6 * GIGABYTE)
+        runner = PremiseRunner(budget=ScanBudget(max_run_bytes=10 * GIGABYTE))
+
+        [first_output] = runner.run(list(first.premises.values()))
+        [second_output] = runner.run(list(second.premises.values()))
+
+        assert first_output.status == PremiseStatus.PASSED
+        assert second_output.status == PremiseStatus.NOT_RUN
+        assert runner.report.get("estimated_bytes") == 12 * GIGABYTE
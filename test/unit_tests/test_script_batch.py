@@ -0,0 +1,102 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.core.runner import PremiseRunner, ScriptBatch
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckIsNull
+
+
+class ScriptConnector(ConnectorSQL):
+    """Fake connector recording the scripts it executes."""
+
+    source = "BigQuery"
+
+    def __init__(self, fail_scripts=False):
+        super().__init__()
+        self.fail_scripts = fail_scripts
+        self.scripts = []
+        self.queries = []
+
+    def run(self, query, max_results=None, parameters=None):
+        self.queries.append(query)
+        return pd.DataFrame([0], columns=["total"])
+
+    def run_script(self, queries, max_results=None, parameters=None):
+        if self.fail_scripts:
+            raise ValueError("script failed")
+        self.scripts.append(queries)
+        return [pd.DataFrame([i], columns=["total"]) for i in range(len(queries))]
+
+
+@pytest.fixture()
+def _nodes():
+    def nodes(node_count, premises_per_node, fail_scripts=False):
+        connector = ScriptConnector(fail_scripts)
+        data_nodes = []
+        for i in range(node_count):
+            node = DataNodeBigQuery(f"node_{i}", "project", "dataset", f"table_{i}")
+            node.connectors["SQLBigQuery"] = connector
+            for j in range(premises_per_node):
+                node.insert_premise(f"check_{j}", DataPremiseSQLCheckIsNull, f"col_{j}")
+            data_nodes.append(node)
+        premises = [p for node in data_nodes for p in node.premises.values()]
+        return connector, premises
+
+    yield nodes
+
+
+class TestScriptBatch:
+    def test_plan_rejects_small_batches(self, _nodes):
+        _, premises = _nodes(1, 2)
+        with pytest.raises(ValueError):
+            ScriptBatch.plan(premises, batch_size=1)
+
+    def test_plan_respects_batch_size_across_nodes(self, _nodes):
+        _, premises = _nodes(3, 3)
+
+        batches = ScriptBatch.plan(premises, batch_size=4)
+        sizes = sorted(len(batch.premises) for batch in set(batches.values()))
+
+        assert sizes == [4, 4]
+        assert premises[-1] not in batches
+
+    def test_plan_respects_script_length(self, _nodes):
+        _, premises = _nodes(1, 4)
+        query_length = len(premises[0].render_query()) + 2
+
+        batches = ScriptBatch.plan(
+            premises, batch_size=10, max_script_length=query_length * 2
+        )
+
+        assert [len(batch.premises) for batch in set(batches.values())] == [2, 2]
+
+    def test_runner_executes_scripts(self, _nodes):
+        connector, premises = _nodes(2, 3)
+        runner = PremiseRunner(max_workers=4, batch_size=3)
+
+        outputs = runner.run(premises)
+
+        assert len(connector.scripts) == 2
+        assert connector.queries == []
+        assert [output.failed_count for output in outputs] == [0, 1, 2, 0, 1, 2]
+        assert runner.report.get("batched_scripts") == 2
+        assert runner.report.get("batched_queries") == 6
+
+    def test_falls_back_to_individual_queries(self, _nodes):
+        connector, premises = _nodes(1, 3, fail_scripts=True)
+
+        outputs = PremiseRunner(batch_size=3).run(premises)
+
+        assert len(connector.queries) == 3
+        assert all(output.pass_validation for output in outputs)
+
+    def test_async_runner_executes_scripts(self, _nodes):
+        connector, premises = _nodes(2, 2)
+
+        outputs = asyncio.run(PremiseRunner(batch_size=4).arun(premises))
+
+        assert len(connector.scripts) == 1
+        assert [output.failed_count for output in outputs] == [0, 1, 2, 3]
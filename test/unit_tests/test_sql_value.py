@@ -0,0 +1,52 @@
+import datetime
+import pytest
+
+from pipeline_penguin.core.data_premise.sql_value import (
+    SQLExpression,
+    parse_sql_literal,
+)
+
+
+class TestParseSQLLiteral:
+    @pytest.mark.parametrize(
+        "literal,expected",
+        [
+            ("10", 10),
+            (" -3 ", -3),
+            ("1.5", 1.5),
+            ("1e3", 1000.0),
+            ("TRUE", True),
+            ("false", False),
+            ("'abc'", "abc"),
+            ('"it\\"s"', 'it"s'),
+            ("'it\\'s'", "it's"),
+            ("DATE '2020-01-01'", datetime.date(2020, 1, 1)),
+            ("DATETIME '2020-01-01 10:00:00'", datetime.datetime(2020, 1, 1, 10)),
+            (
+                "TIMESTAMP '2020-01-01 10:00:00'",
+                datetime.datetime(2020, 1, 1, 10, tzinfo=datetime.timezone.utc),
+            ),
+        ],
+    )
+    def test_converts_sql_literals(self, literal, expected):
+        value = parse_sql_literal(literal)
+
+        assert value == expected
+        assert type(value) is type(expected)
+
+    @pytest.mark.parametrize(
+        "literal",
+        ["CURRENT_DATE()", "0 OR 1=1", "'a' OR 'b'", "DATE '2020-13-01'", ""],
+    )
+    def test_raises_value_error_on_other_strings(self, literal):
+        with pytest.raises(ValueError):
+            parse_sql_literal(literal)
+
+
+class TestSQLExpression:
+    def test_renders_its_sql(self):
+        expression = SQLExpression("CURRENT_DATE()")
+
+        assert str(expression) == "CURRENT_DATE()"
+        assert expression == SQLExpression("CURRENT_DATE()")
+        assert repr(expression) == "SQLExpression('CURRENT_DATE()')"
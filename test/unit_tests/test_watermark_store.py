@@ -0,0 +1,178 @@
+import asyncio
+import datetime
+
+import pandas as pd
+import pytest
+
+from pipeline_penguin.core.connector.sql import ConnectorSQL
+from pipeline_penguin.core.premise_output.premise_output import (
+    PremiseOutput,
+    PremiseStatus,
+)
+from pipeline_penguin.core.runner import PremiseRunner, WatermarkStore
+from pipeline_penguin.data_node import NodeManager
+from pipeline_penguin.data_node.sql.bigquery import DataNodeBigQuery
+from pipeline_penguin.data_premise.sql import DataPremiseSQLCheckIsNull
+
+
+class WatermarkConnector(ConnectorSQL):
+    """Fake connector returning a configurable high-water mark and failed count."""
+
+    source = "BigQuery"
+
+    def __init__(self, watermark, total=1):
+        super().__init__()
+        self.watermark = watermark
+        self.total = total
+        self.queries = []
+
+    def run(self, query, max_results=None, parameters=None):
+        self.queries.append(query)
+        if "AS watermark" in query:
+            return pd.DataFrame({"watermark": [self.watermark]})
+        return pd.DataFrame([self.total], columns=["total"])
+
+
+@pytest.fixture()
+def _data_node():
+    node = DataNodeBigQuery(
+        "incremental", "project", "dataset", "table", watermark_column="id"
+    )
+    node.connectors["SQLBigQuery"] = WatermarkConnector(100)
+    node.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+    yield node
+
+
+def run(store, node, full_rescan=False):
+    store.begin([node], full_rescan)
+    try:
+        for output in PremiseRunner().run(list(node.premises.values())):
+            store.record(output)
+    finally:
+        store.commit()
+
+
+class TestWatermarkStore:
+    def test_first_run_validates_up_to_the_current_watermark(self, _data_node):
+        store = WatermarkStore()
+
+        run(store, _data_node)
+        queries = _data_node.connectors["SQLBigQuery"].queries
+
+        assert queries[0] == (
+            "SELECT MAX(id) AS watermark FROM `project.dataset.table`"
+        )
+        assert "WHERE (id <= 100)" in queries[1]
+        assert store.watermark("incremental") == "100"
+        assert store.total("incremental", "not_null") == 1
+        assert _data_node.watermark_range is None
+
+    def test_next_run_validates_only_new_rows(self, _data_node):
+        store = WatermarkStore()
+        run(store, _data_node)
+        connector = _data_node.connectors["SQLBigQuery"]
+        connector.watermark = 150
+        connector.queries = []
+
+        run(store, _data_node)
+
+        assert connector.queries[0].endswith("WHERE id > 100")
+        assert "WHERE (id > 100 AND id <= 150)" in connector.queries[1]
+        assert store.watermark("incremental") == "150"
+        assert store.total("incremental", "not_null") == 2
+
+    def test_no_new_rows_keeps_the_watermark(self, _data_node):
+        store = WatermarkStore()
+        run(store, _data_node)
+        _data_node.connectors["SQLBigQuery"].watermark = None
+
+        run(store, _data_node)
+
+        assert store.watermark("incremental") == "100"
+
+    def test_full_rescan_resets_totals(self, _data_node):
+        store = WatermarkStore()
+        run(store, _data_node)
+        run(store, _data_node)
+        queries = _data_node.connectors["SQLBigQuery"].queries
+
+        run(store, _data_node, full_rescan=True)
+
+        assert "id >" not in queries[-2]
+        assert store.total("incremental", "not_null") == 1
+
+    def test_incomplete_run_does_not_advance(self, _data_node):
+        store = WatermarkStore()
+        store.begin([_data_node])
+        premise = _data_node.premises["not_null"]
+        store.record(
+            PremiseOutput.from_status(premise, PremiseStatus.ERROR, "ValueError")
+        )
+        store.commit()
+
+        assert store.watermark("incremental") is None
+        assert _data_node.watermark_range is None
+
+    def test_sampled_run_does_not_advance(self, _data_node):
+        store = WatermarkStore()
+        run(store, _data_node)
+        _data_node.connectors["SQLBigQuery"].watermark = 150
+
+        store.begin([_data_node])
+        premise_output = _data_node.premises["not_null"].validate_sample(10)
+        store.record(premise_output)
+        store.commit()
+
+        assert premise_output.sampled
+        assert premise_output.status == PremiseStatus.FAILED
+        assert store.watermark("incremental") == "100"
+        assert store.total("incremental", "not_null") == 1
+
+    def test_persists_to_json(self, tmp_path, _data_node):
+        path = str(tmp_path / "watermarks.json")
+        run(WatermarkStore(path), _data_node)
+
+        assert WatermarkStore(path).watermark("incremental") == "100"
+
+    def test_async_begin(self, _data_node):
+        store = WatermarkStore()
+
+        asyncio.run(store.abegin([_data_node]))
+
+        assert _data_node.watermark_range == (None, "100")
+
+    def test_node_manager_run(self, _data_node):
+        node_manager = NodeManager()
+        node = node_manager.create_node(
+            "Incremental Node",
+            DataNodeBigQuery,
+            project_id="project",
+            dataset_id="dataset",
+            table_id="table",
+            watermark_column="id",
+        )
+        node.connectors["SQLBigQuery"] = WatermarkConnector(7, total=0)
+        node.insert_premise("not_null", DataPremiseSQLCheckIsNull, "col_a")
+        store = WatermarkStore()
+
+        list(node_manager.iter_run(watermarks=store))
+        node_manager.remove_node("Incremental Node")
+
+        assert store.watermark("Incremental Node") == "7"
+        assert store.total("Incremental Node", "not_null") == 0
+
+
+class TestSqlLiteral:
+    def test_literals(self):
+        literal = DataNodeBigQuery.sql_literal
+        timestamp = pd.Timestamp("2021-01-01 10:00:00", tz="UTC")
+
+        assert literal(None) is None
+        assert literal(pd.NaT) is None
+        assert literal(42) == "42"
+        assert literal(timestamp) == "TIMESTAMP '2021-01-01 10:00:00+00:00'"
+        assert (
+            literal(datetime.datetime(2021, 1, 1)) == "DATETIME '2021-01-01 00:00:00'"
+        )
+        assert literal(datetime.date(2021, 1, 1)) == "DATE '2021-01-01'"
+        assert literal("it's") == "'it\\'s'"